@@ -16,7 +16,9 @@ from lorax.artifacts.csr_reader import (
     CSRArtifactReader,
     GenealogyCSR,
     GenealogyMutations,
+    SampleTipPositions,
 )
+from lorax.artifacts.csv_builder import build_csv_csr_artifact
 from lorax.artifacts.runtime import (
     ArtifactContextRegistry,
     ArtifactDatasetContext,
@@ -36,8 +38,10 @@ __all__ = [
     "CSRArtifactReader",
     "GenealogyCSR",
     "GenealogyMutations",
+    "SampleTipPositions",
     "artifact_path_for_source",
     "build_csr_artifact",
+    "build_csv_csr_artifact",
     "ArtifactContextRegistry",
     "ArtifactDatasetContext",
     "ArtifactResolver",
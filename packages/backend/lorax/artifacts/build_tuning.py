@@ -0,0 +1,187 @@
+"""Memory-aware worker and range planning for CSR artifact builds.
+
+Each range worker holds a TreeSequence, one live ``Tree`` and up to one shard
+of pending record batches. The planner estimates that footprint from table
+sizes and fits as many workers as the memory limit allows, and the throttle
+stops new ranges from being scheduled while the build's resident memory is
+near the limit.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+from dataclasses import asdict, dataclass
+from typing import Any
+
+import psutil
+import tskit
+
+AUTO = "auto"
+# Interpreter, numpy/pyarrow/tskit imports and allocator slack per process.
+WORKER_BASELINE_RSS_BYTES = 192 * 1024 * 1024
+# Forked workers share the parent's tables copy-on-write; only pages the
+# worker touches are duplicated.
+FORK_SHARED_TABLE_FRACTION = 0.25
+# Per-node arrays of a live tskit Tree plus the compact CSR copies per tree.
+TREE_STATE_BYTES_PER_NODE = 64
+DEFAULT_MEMORY_FRACTION = 0.85
+THROTTLE_HIGH_WATERMARK = 0.9
+MIN_AUTO_TREES_PER_RANGE = 100
+RANGES_PER_WORKER = 4
+
+
+@dataclass(frozen=True)
+class BuildMemoryPlan:
+    """Worker count and range size chosen for one build invocation."""
+
+    workers: int
+    trees_per_range: int
+    workers_requested: int | str
+    trees_per_range_requested: int | str
+    memory_limit_bytes: int
+    available_memory_bytes: int
+    builder_rss_bytes: int
+    estimated_worker_rss_bytes: int
+    cpu_count: int
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def is_auto(value: Any) -> bool:
+    return isinstance(value, str) and value.lower() == AUTO
+
+
+def process_rss_bytes(process: psutil.Process | None = None) -> int:
+    return int((process or psutil.Process(os.getpid())).memory_info().rss)
+
+
+def estimate_worker_rss_bytes(
+    tree_sequence: tskit.TreeSequence,
+    *,
+    target_shard_bytes: int,
+    start_method: str,
+) -> int:
+    """Estimate the resident memory one range worker adds to the build."""
+    table_bytes = int(tree_sequence.nbytes)
+    if start_method == "fork":
+        table_bytes = math.ceil(table_bytes * FORK_SHARED_TABLE_FRACTION)
+    tree_state_bytes = int(tree_sequence.num_nodes) * TREE_STATE_BYTES_PER_NODE
+    # Pending batches plus the IPC writer's copy while a shard is flushed.
+    shard_bytes = 2 * int(target_shard_bytes)
+    return WORKER_BASELINE_RSS_BYTES + table_bytes + tree_state_bytes + shard_bytes
+
+
+def default_memory_limit_bytes() -> int:
+    """Return the builder's own RSS plus a fraction of available memory."""
+    available = int(psutil.virtual_memory().available)
+    return process_rss_bytes() + int(available * DEFAULT_MEMORY_FRACTION)
+
+
+def plan_build_memory(
+    tree_sequence: tskit.TreeSequence,
+    *,
+    workers: int | str,
+    trees_per_range: int | str,
+    target_shard_bytes: int,
+    start_method: str,
+    max_trees_per_range: int,
+    memory_limit_bytes: int | None = None,
+    cpu_count: int | None = None,
+) -> BuildMemoryPlan:
+    """Resolve ``"auto"`` workers and range sizes against the memory limit."""
+    available = int(psutil.virtual_memory().available)
+    builder_rss = process_rss_bytes()
+    limit = (
+        int(memory_limit_bytes)
+        if memory_limit_bytes is not None
+        else default_memory_limit_bytes()
+    )
+    cpus = max(1, int(cpu_count or os.cpu_count() or 1))
+    per_worker = estimate_worker_rss_bytes(
+        tree_sequence,
+        target_shard_bytes=target_shard_bytes,
+        start_method=start_method,
+    )
+    num_trees = max(1, int(tree_sequence.num_trees))
+
+    if is_auto(workers):
+        fitting = max(0, limit - builder_rss) // max(1, per_worker)
+        chosen_workers = int(max(1, min(cpus, fitting)))
+    else:
+        chosen_workers = int(workers)
+
+    if is_auto(trees_per_range):
+        # Several ranges per worker keep the pool busy near the end of the
+        # build without making resume checkpoints too coarse.
+        chosen_range = math.ceil(num_trees / (chosen_workers * RANGES_PER_WORKER))
+        chosen_range = int(
+            min(
+                int(max_trees_per_range),
+                max(min(MIN_AUTO_TREES_PER_RANGE, num_trees), chosen_range),
+            )
+        )
+    else:
+        chosen_range = int(trees_per_range)
+
+    return BuildMemoryPlan(
+        workers=chosen_workers,
+        trees_per_range=chosen_range,
+        workers_requested=workers,
+        trees_per_range_requested=trees_per_range,
+        memory_limit_bytes=limit,
+        available_memory_bytes=available,
+        builder_rss_bytes=builder_rss,
+        estimated_worker_rss_bytes=per_worker,
+        cpu_count=cpus,
+    )
+
+
+class RSSThrottle:
+    """Track build RSS and report when scheduling more work would exceed it.
+
+    Forked children share pages with the builder, so their shared resident
+    pages are not counted twice.
+    """
+
+    def __init__(
+        self,
+        memory_limit_bytes: int,
+        *,
+        high_watermark: float = THROTTLE_HIGH_WATERMARK,
+    ):
+        self.memory_limit_bytes = int(memory_limit_bytes)
+        self.high_watermark = float(high_watermark)
+        self.throttle_events = 0
+        self.peak_rss_bytes = 0
+        self._process = psutil.Process(os.getpid())
+
+    def sample(self) -> int:
+        total = process_rss_bytes(self._process)
+        for child in self._process.children(recursive=True):
+            try:
+                info = child.memory_info()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            total += max(0, int(info.rss) - int(getattr(info, "shared", 0)))
+        self.peak_rss_bytes = max(self.peak_rss_bytes, total)
+        return total
+
+    def should_throttle(self) -> bool:
+        throttled = (
+            self.sample() >= self.memory_limit_bytes * self.high_watermark
+        )
+        if throttled:
+            self.throttle_events += 1
+        return throttled
+
+
+__all__ = [
+    "AUTO",
+    "BuildMemoryPlan",
+    "RSSThrottle",
+    "estimate_worker_rss_bytes",
+    "is_auto",
+    "plan_build_memory",
+]
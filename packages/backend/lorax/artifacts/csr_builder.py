@@ -8,6 +8,7 @@ that can later be opened without touching the source file.
 
 from __future__ import annotations
 
+import dataclasses
 import hashlib
 import importlib.metadata
 import json
@@ -18,7 +19,7 @@ import shutil
 import sys
 import time
 import uuid
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from pathlib import Path
 from collections import defaultdict
 from typing import Any, Callable, Iterable
@@ -28,7 +29,14 @@ import pyarrow as pa
 import tskit
 import tszip
 
+from lorax.artifacts.build_tuning import (
+    AUTO,
+    RSSThrottle,
+    is_auto,
+    plan_build_memory,
+)
 from lorax.loaders.tskit_loader import get_config_tskit
+from lorax.tree_graph.time_scale import SUPPORTED_TIME_SCALES, times_to_y
 from lorax.tree_graph.tree_graph import _compute_x_postorder
 from lorax.utils import ensure_json_dict, make_json_serializable
 
@@ -38,8 +46,12 @@ CSR_ARTIFACT_SCHEMA_VERSION = 3
 CSR_ARTIFACT_FORMAT = "lorax-csr-v3"
 DEFAULT_TARGET_SHARD_MB = 48
 DEFAULT_TREES_PER_RANGE = 10_000
+# The sample tip-order index is a dense (num_trees, num_samples) matrix;
+# larger ones are skipped and highlights decode genealogies instead.
+DEFAULT_SAMPLE_TIP_ORDER_MAX_MB = 1024
 SUPPORTED_COMPRESSIONS = {"zstd", "lz4", "none"}
 SIDECAR_BATCH_ROWS = 65_536
+RSS_POLL_SECONDS = 1.0
 RANGE_STATE_VERSION = 1
 
 ProgressCallback = Callable[[dict[str, Any]], None]
@@ -370,6 +382,34 @@ def _list_array(values: np.ndarray, value_type: pa.DataType) -> pa.Array:
     return pa.array([values], type=pa.list_(value_type))
 
 
+def _child_csr(
+    node_ids: np.ndarray,
+    parent_ids: np.ndarray,
+    *,
+    tree_index: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Group compact child offsets by parent in ascending node-ID order."""
+    num_nodes = len(node_ids)
+    child_mask = parent_ids != tskit.NULL
+    child_local = np.flatnonzero(child_mask).astype(np.int32)
+    parent_node_ids = parent_ids[child_mask]
+    parent_local = np.searchsorted(node_ids, parent_node_ids).astype(np.int32)
+    if (
+        np.any(parent_local >= num_nodes)
+        or np.any(node_ids[parent_local] != parent_node_ids)
+    ):
+        raise CSRArtifactBuildError(
+            f"Tree {tree_index} contains a parent outside its compact node set"
+        )
+
+    child_counts = np.bincount(parent_local, minlength=num_nodes).astype(np.int32)
+    child_offsets = np.empty(num_nodes + 1, dtype=np.int32)
+    child_offsets[0] = 0
+    np.cumsum(child_counts, out=child_offsets[1:])
+    order = np.argsort(parent_local, kind="stable")
+    return child_offsets, child_local[order]
+
+
 def _compact_topology(
     tree: tskit.Tree,
 ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
@@ -390,24 +430,11 @@ def _compact_topology(
     # Indexing the low-level parent array avoids a Python call per node. The
     # resulting persisted arrays remain compact and contain only this tree.
     parent_ids = np.asarray(tree.parent_array[node_ids], dtype=np.int32).copy()
-    child_mask = parent_ids != tskit.NULL
-    child_local = np.flatnonzero(child_mask).astype(np.int32)
-    parent_node_ids = parent_ids[child_mask]
-    parent_local = np.searchsorted(node_ids, parent_node_ids).astype(np.int32)
-    if (
-        np.any(parent_local >= num_nodes)
-        or np.any(node_ids[parent_local] != parent_node_ids)
-    ):
-        raise CSRArtifactBuildError(
-            f"Tree {tree.index} contains a parent outside its compact node set"
-        )
-
-    child_counts = np.bincount(parent_local, minlength=num_nodes).astype(np.int32)
-    child_offsets = np.empty(num_nodes + 1, dtype=np.int32)
-    child_offsets[0] = 0
-    np.cumsum(child_counts, out=child_offsets[1:])
-    order = np.argsort(parent_local, kind="stable")
-    ordered_child_local = child_local[order]
+    child_offsets, ordered_child_local = _child_csr(
+        node_ids,
+        parent_ids,
+        tree_index=int(tree.index),
+    )
     child_node_ids = node_ids[ordered_child_local].astype(np.int32, copy=True)
 
     roots_local = np.flatnonzero(parent_ids == tskit.NULL).astype(np.int32)
@@ -797,8 +824,14 @@ def _build_genealogy_shards(
     trees_per_range: int,
     progress: ProgressCallback | None,
     started: float,
+    throttle: RSSThrottle | None = None,
 ) -> dict[str, Any]:
-    """Build genealogy shards with a serial disk-estimate pilot and ranges."""
+    """Build genealogy shards with a serial disk-estimate pilot and ranges.
+
+    With ``throttle``, no further range is scheduled while the build's RSS is
+    near the memory limit, so effective concurrency drops instead of the
+    builder being OOM-killed.
+    """
     global _WORKER_SOURCE_PATH, _WORKER_TREE_SEQUENCE
 
     num_trees = int(tree_sequence.num_trees)
@@ -1053,35 +1086,51 @@ def _build_genealogy_shards(
                 initargs=(str(source_path),),
             )
             future_ranges = {}
+            unscheduled = list(reversed(missing_ranges))
             try:
-                for start, end in missing_ranges:
-                    future = executor.submit(
-                        _build_tree_range,
-                        {
-                            "source": str(source_path),
-                            "fingerprint": fingerprint,
-                            "start": start,
-                            "end": end,
-                            "range_directory": str(
-                                _range_directory(staging, start, end)
-                            ),
-                            "target_shard_bytes": target_shard_bytes,
-                            "compression": compression,
-                        },
+                while unscheduled or future_ranges:
+                    while unscheduled and len(future_ranges) < max_workers:
+                        if (
+                            future_ranges
+                            and throttle is not None
+                            and throttle.should_throttle()
+                        ):
+                            break
+                        start, end = unscheduled.pop()
+                        future = executor.submit(
+                            _build_tree_range,
+                            {
+                                "source": str(source_path),
+                                "fingerprint": fingerprint,
+                                "start": start,
+                                "end": end,
+                                "range_directory": str(
+                                    _range_directory(staging, start, end)
+                                ),
+                                "target_shard_bytes": target_shard_bytes,
+                                "compression": compression,
+                            },
+                        )
+                        future_ranges[future] = (start, end)
+                    done, _running = wait(
+                        future_ranges,
+                        timeout=RSS_POLL_SECONDS,
+                        return_when=FIRST_COMPLETED,
                     )
-                    future_ranges[future] = (start, end)
-                for future in as_completed(future_ranges):
-                    start, end = future_ranges[future]
-                    try:
-                        result = future.result()
-                    except Exception as exc:
-                        for pending in future_ranges:
-                            pending.cancel()
-                        raise CSRArtifactBuildError(
-                            f"Worker range [{start}, {end}) failed: {exc}"
-                        ) from exc
-                    completed_results[start] = result
-                    promote_ready()
+                    if throttle is not None:
+                        throttle.sample()
+                    for future in done:
+                        start, end = future_ranges.pop(future)
+                        try:
+                            result = future.result()
+                        except Exception as exc:
+                            for pending in future_ranges:
+                                pending.cancel()
+                            raise CSRArtifactBuildError(
+                                f"Worker range [{start}, {end}) failed: {exc}"
+                            ) from exc
+                        completed_results[start] = result
+                        promote_ready()
             except BaseException:
                 executor.shutdown(wait=True, cancel_futures=True)
                 raise
@@ -1337,12 +1386,22 @@ def _build_node_tree_ranges(
     tree_sequence: tskit.TreeSequence,
 ) -> list[dict[str, Any]]:
     """Build run-length encoded node membership using the sequential iterator."""
+    return _node_tree_ranges_from_memberships(
+        (tree.nodes() for tree in tree_sequence.trees()),
+        int(tree_sequence.num_trees),
+    )
+
+
+def _node_tree_ranges_from_memberships(
+    memberships: Iterable[Iterable[int]],
+    num_trees: int,
+) -> list[dict[str, Any]]:
+    """Run-length encode the node IDs present in each consecutive genealogy."""
     open_starts: dict[int, int] = {}
     previous_nodes: set[int] = set()
     ranges: list[dict[str, Any]] = []
-    for tree in tree_sequence.trees():
-        current_nodes = {int(node_id) for node_id in tree.nodes()}
-        tree_index = int(tree.index)
+    for tree_index, members in enumerate(memberships):
+        current_nodes = {int(node_id) for node_id in members}
         for node_id in current_nodes - previous_nodes:
             open_starts[node_id] = tree_index
         for node_id in previous_nodes - current_nodes:
@@ -1359,7 +1418,7 @@ def _build_node_tree_ranges(
             {
                 "node_id": node_id,
                 "first_tree": open_starts[node_id],
-                "last_tree_exclusive": int(tree_sequence.num_trees),
+                "last_tree_exclusive": int(num_trees),
             }
         )
     ranges.sort(key=lambda row: (row["node_id"], row["first_tree"]))
@@ -1368,8 +1427,9 @@ def _build_node_tree_ranges(
 
 def _write_node_tree_range_sidecars(
     staging: Path,
-    tree_sequence: tskit.TreeSequence,
     *,
+    num_nodes: int,
+    build_ranges: Callable[[], list[dict[str, Any]]],
     compression: str,
     indexes: dict[str, dict[str, Any]],
     checkpoint: Callable[[str, dict[str, Any]], None],
@@ -1382,7 +1442,7 @@ def _write_node_tree_range_sidecars(
     if required_indexes.issubset(indexes):
         return
 
-    node_tree_ranges = _build_node_tree_ranges(tree_sequence)
+    node_tree_ranges = build_ranges()
     if "node_tree_ranges" not in indexes:
         checkpoint(
             "node_tree_ranges",
@@ -1393,12 +1453,9 @@ def _write_node_tree_range_sidecars(
             ),
         )
     if "node_tree_range_offsets" not in indexes:
-        node_tree_offsets = np.zeros(
-            int(tree_sequence.num_nodes) + 1,
-            dtype=np.int64,
-        )
+        node_tree_offsets = np.zeros(int(num_nodes) + 1, dtype=np.int64)
         range_offset = 0
-        for node_id in range(int(tree_sequence.num_nodes)):
+        for node_id in range(int(num_nodes)):
             while (
                 range_offset < len(node_tree_ranges)
                 and int(node_tree_ranges[range_offset]["node_id"]) == node_id
@@ -1413,6 +1470,177 @@ def _write_node_tree_range_sidecars(
         )
 
 
+def _shard_node_memberships(
+    staging: Path,
+    shards: list[dict[str, Any]],
+) -> Iterable[np.ndarray]:
+    """Yield each genealogy's node IDs from completed shards in tree order."""
+    for shard in shards:
+        with pa.memory_map(str(staging / shard["name"]), "r") as source:
+            reader = pa.ipc.open_file(source)
+            for batch_index in range(reader.num_record_batches):
+                batch = reader.get_batch(batch_index)
+                yield batch.column("node_ids")[0].values.to_numpy().copy()
+
+
+def _sample_tip_order_dtype(num_samples: int) -> np.dtype[Any]:
+    """Return the narrowest unsigned rank type that leaves room for sentinels."""
+    if num_samples + 2 <= np.iinfo(np.uint16).max:
+        return np.dtype(np.uint16)
+    return np.dtype(np.uint32)
+
+
+def _write_sample_tip_order_sidecars(
+    staging: Path,
+    shards: list[dict[str, Any]],
+    *,
+    samples: np.ndarray,
+    sample_times: np.ndarray,
+    num_trees: int,
+    num_nodes: int,
+    indexes: dict[str, dict[str, Any]],
+    checkpoint: Callable[[str, dict[str, Any]], None],
+    max_bytes: int,
+) -> str | None:
+    """Write per-tree sample tip ranks gathered from the completed shards.
+
+    ``sample-tip-order.npy`` is a ``(num_trees, num_samples)`` matrix holding
+    each sample's left-to-right tip rank. ``sample-tip-rows.npy`` maps a node
+    ID to its column, so highlight positions for any samples across any trees
+    are a single fancy-indexing gather instead of genealogy decodes.
+
+    The index is optional: when the matrix would exceed ``max_bytes`` or the
+    free disk space, nothing is written and the reason is returned.
+    """
+    required_indexes = {
+        "sample_tip_rows",
+        "sample_tip_order",
+        "tree_tip_counts",
+        "sample_times",
+    }
+    if required_indexes.issubset(indexes):
+        return None
+
+    samples = np.asarray(samples, dtype=np.int32)
+    num_trees = int(num_trees)
+    num_samples = len(samples)
+    dtype = _sample_tip_order_dtype(num_samples)
+    required_bytes = num_trees * num_samples * dtype.itemsize
+    if "sample_tip_order" not in indexes:
+        if required_bytes > max_bytes:
+            return (
+                f"needs {required_bytes} bytes, over the {max_bytes} byte cap"
+            )
+        available = shutil.disk_usage(staging).free
+        if required_bytes > available:
+            return (
+                f"needs {required_bytes} bytes, but only {available} bytes "
+                "of disk are free"
+            )
+    sample_rows = np.full(int(num_nodes), -1, dtype=np.int32)
+    sample_rows[samples] = np.arange(num_samples, dtype=np.int32)
+    if "sample_tip_rows" not in indexes:
+        rows_path = staging / "sample-tip-rows.npy"
+        _write_npy_atomic(rows_path, sample_rows)
+        checkpoint(
+            "sample_tip_rows",
+            _file_metadata(rows_path, rows=len(sample_rows)),
+        )
+    if "sample_times" not in indexes:
+        times_path = staging / "sample-times.npy"
+        _write_npy_atomic(times_path, np.asarray(sample_times, dtype=np.float64))
+        checkpoint("sample_times", _file_metadata(times_path, rows=num_samples))
+    if {"sample_tip_order", "tree_tip_counts"}.issubset(indexes):
+        return None
+
+    absent = np.iinfo(dtype).max
+    internal = absent - 1
+    order_path = staging / "sample-tip-order.npy"
+    tip_counts = np.zeros(num_trees, dtype=np.int32)
+    temporary = order_path.with_name(
+        f".{order_path.name}.{uuid.uuid4().hex}.tmp"
+    )
+    try:
+        tip_order = np.lib.format.open_memmap(
+            temporary,
+            mode="w+",
+            dtype=dtype,
+            shape=(num_trees, num_samples),
+        )
+        tip_order[:] = absent
+        for shard in shards:
+            with pa.memory_map(str(staging / shard["name"]), "r") as source:
+                reader = pa.ipc.open_file(source)
+                for batch_index in range(reader.num_record_batches):
+                    batch = reader.get_batch(batch_index)
+                    tree_index = int(batch.column("tree_index")[0].as_py())
+                    node_ids = batch.column("node_ids")[0].values.to_numpy()
+                    child_offsets = (
+                        batch.column("child_offsets")[0].values.to_numpy()
+                    )
+                    layout_x = batch.column("layout_x")[0].values.to_numpy()
+                    columns = np.full(len(node_ids), -1, dtype=np.int32)
+                    known = node_ids < len(sample_rows)
+                    columns[known] = sample_rows[node_ids[known]]
+                    is_sample = columns >= 0
+                    is_tip = np.diff(child_offsets) == 0
+                    # Tip x values are rank / (tip_count - 1), so a stable
+                    # argsort recovers the exact postorder tip rank.
+                    tips = np.flatnonzero(is_tip)
+                    ranks = np.empty(len(tips), dtype=np.int64)
+                    ranks[np.argsort(layout_x[tips], kind="stable")] = (
+                        np.arange(len(tips))
+                    )
+                    row = tip_order[tree_index]
+                    sample_tips = is_sample[tips]
+                    row[columns[tips[sample_tips]]] = ranks[sample_tips]
+                    row[columns[is_sample & ~is_tip]] = internal
+                    tip_counts[tree_index] = len(tips)
+        tip_order.flush()
+        del tip_order
+        os.replace(temporary, order_path)
+    finally:
+        temporary.unlink(missing_ok=True)
+    checkpoint(
+        "sample_tip_order",
+        _file_metadata(order_path, rows=num_trees),
+    )
+    counts_path = staging / "tree-tip-counts.npy"
+    _write_npy_atomic(counts_path, tip_counts)
+    checkpoint("tree_tip_counts", _file_metadata(counts_path, rows=num_trees))
+    return None
+
+
+def _write_layout_y_sidecars(
+    staging: Path,
+    tree_sequence: tskit.TreeSequence,
+    *,
+    indexes: dict[str, dict[str, Any]],
+    checkpoint: Callable[[str, dict[str, Any]], None],
+) -> None:
+    """Write one float32 y table per time scale, indexed by node ID.
+
+    Node times are global, so a single table per scale serves every
+    genealogy and matches the ``times_to_y`` output sent to the frontend.
+    """
+    node_times = np.asarray(tree_sequence.tables.nodes.time, dtype=np.float64)
+    for time_scale in sorted(SUPPORTED_TIME_SCALES):
+        key = f"node_y_{time_scale}"
+        if key in indexes:
+            continue
+        path = staging / f"node-y-{time_scale}.npy"
+        _write_npy_atomic(
+            path,
+            times_to_y(
+                node_times,
+                float(tree_sequence.min_time),
+                float(tree_sequence.max_time),
+                time_scale,
+            ).astype(np.float32),
+        )
+        checkpoint(key, _file_metadata(path, rows=len(node_times)))
+
+
 def _write_v3_sidecars(
     staging: Path,
     tree_sequence: tskit.TreeSequence,
@@ -1420,6 +1648,9 @@ def _write_v3_sidecars(
     *,
     compression: str,
     skip_node_tree_ranges: bool,
+    skip_sample_tip_order: bool,
+    sample_tip_order_max_bytes: int,
+    precompute_layout_y: bool,
     state: dict[str, Any],
     state_path: Path,
 ) -> tuple[dict[str, dict[str, Any]], dict[str, bool]]:
@@ -1431,6 +1662,8 @@ def _write_v3_sidecars(
         "metadata": True,
         "sample_search": True,
         "node_tree_ranges": not skip_node_tree_ranges,
+        "sample_tip_order": not skip_sample_tip_order,
+        "layout_y": bool(precompute_layout_y),
         "lineage": True,
         "topology_comparison": True,
     }
@@ -1595,11 +1828,35 @@ def _write_v3_sidecars(
     if not skip_node_tree_ranges:
         _write_node_tree_range_sidecars(
             staging,
-            tree_sequence,
+            num_nodes=int(tree_sequence.num_nodes),
+            build_ranges=lambda: _build_node_tree_ranges(tree_sequence),
             compression=compression,
             indexes=indexes,
             checkpoint=checkpoint,
         )
+    if not skip_sample_tip_order:
+        samples = np.asarray(tree_sequence.samples(), dtype=np.int32)
+        skipped = _write_sample_tip_order_sidecars(
+            staging,
+            state["shards"],
+            samples=samples,
+            sample_times=tree_sequence.tables.nodes.time[samples],
+            num_trees=int(tree_sequence.num_trees),
+            num_nodes=int(tree_sequence.num_nodes),
+            indexes=indexes,
+            checkpoint=checkpoint,
+            max_bytes=sample_tip_order_max_bytes,
+        )
+        state["sample_tip_order_skipped"] = skipped
+        if skipped is not None:
+            capabilities["sample_tip_order"] = False
+    if precompute_layout_y:
+        _write_layout_y_sidecars(
+            staging,
+            tree_sequence,
+            indexes=indexes,
+            checkpoint=checkpoint,
+        )
 
     state["sidecars_complete"] = True
     state["sidecar_indexes"] = indexes
@@ -1742,15 +1999,30 @@ def build_csr_artifact(
     *,
     target_shard_mb: int = DEFAULT_TARGET_SHARD_MB,
     compression: str = "zstd",
-    workers: int = 1,
-    trees_per_range: int = DEFAULT_TREES_PER_RANGE,
+    workers: int | str = 1,
+    trees_per_range: int | str = DEFAULT_TREES_PER_RANGE,
+    memory_limit_mb: int | None = None,
     skip_node_tree_ranges: bool = False,
+    skip_sample_tip_order: bool = False,
+    sample_tip_order_max_mb: int = DEFAULT_SAMPLE_TIP_ORDER_MAX_MB,
+    precompute_layout_y: bool = False,
     force: bool = False,
     resume: bool = True,
     format_version: int = CSR_ARTIFACT_SCHEMA_VERSION,
     progress: ProgressCallback | None = None,
 ) -> dict[str, Any]:
-    """Build and atomically publish ``<source>.artifact`` beside the source."""
+    """Build and atomically publish ``<source>.artifact`` beside the source.
+
+    ``workers`` and ``trees_per_range`` accept ``"auto"`` to size the worker
+    pool and range partitioning from the TreeSequence's table sizes and the
+    memory limit (``memory_limit_mb``, default: builder RSS plus most of the
+    currently available memory). Parallel builds throttle scheduling when RSS
+    nears the limit; the plan and peak memory are recorded in the manifest.
+
+    The optional sample tip-order index is left out when it would exceed
+    ``sample_tip_order_max_mb`` or the free disk space; the manifest records
+    why under ``build.sample_tip_order_skipped``.
+    """
     source_path = Path(source).expanduser().resolve()
     if not source_path.is_file():
         raise FileNotFoundError(source_path)
@@ -1758,10 +2030,18 @@ def build_csr_artifact(
         raise ValueError("CSR preprocessing supports only .trees and .tsz files")
     if target_shard_mb < 1:
         raise ValueError("target_shard_mb must be at least 1")
-    if workers < 1:
+    if isinstance(workers, str) and not is_auto(workers):
+        raise ValueError("workers must be a positive integer or 'auto'")
+    if not is_auto(workers) and workers < 1:
         raise ValueError("workers must be at least 1")
-    if trees_per_range < 1:
+    if isinstance(trees_per_range, str) and not is_auto(trees_per_range):
+        raise ValueError("trees_per_range must be a positive integer or 'auto'")
+    if not is_auto(trees_per_range) and trees_per_range < 1:
         raise ValueError("trees_per_range must be at least 1")
+    if memory_limit_mb is not None and memory_limit_mb < 1:
+        raise ValueError("memory_limit_mb must be at least 1")
+    if sample_tip_order_max_mb < 1:
+        raise ValueError("sample_tip_order_max_mb must be at least 1")
     if format_version not in {
         CSR_ARTIFACT_V2_SCHEMA_VERSION,
         CSR_ARTIFACT_SCHEMA_VERSION,
@@ -1830,8 +2110,13 @@ def build_csr_artifact(
         "target_shard_bytes": target_shard_bytes,
         "format_version": format_version,
         "range_state_version": RANGE_STATE_VERSION,
-        "trees_per_range": trees_per_range,
+        "trees_per_range": (
+            AUTO if is_auto(trees_per_range) else int(trees_per_range)
+        ),
         "skip_node_tree_ranges": bool(skip_node_tree_ranges),
+        "skip_sample_tip_order": bool(skip_sample_tip_order),
+        "sample_tip_order_max_bytes": int(sample_tip_order_max_mb) * 1024 * 1024,
+        "precompute_layout_y": bool(precompute_layout_y),
     }
     staging = destination.with_name(f".{destination.name}.inprogress")
     state_path = staging / "build-state.json"
@@ -1882,6 +2167,34 @@ def build_csr_artifact(
     if not breakpoints_path.exists():
         _write_breakpoints(breakpoints_path, tree_sequence)
 
+    memory_plan = plan_build_memory(
+        tree_sequence,
+        workers=workers,
+        trees_per_range=trees_per_range,
+        target_shard_bytes=target_shard_bytes,
+        start_method=_parallel_start_method(2),
+        max_trees_per_range=DEFAULT_TREES_PER_RANGE,
+        memory_limit_bytes=(
+            None if memory_limit_mb is None else memory_limit_mb * 1024 * 1024
+        ),
+    )
+    if is_auto(trees_per_range) and "trees_per_range_selected" in state:
+        # Resumed auto builds keep the range boundaries of their checkpoints.
+        memory_plan = dataclasses.replace(
+            memory_plan,
+            trees_per_range=int(state["trees_per_range_selected"]),
+        )
+    if state.get("trees_per_range_selected") != memory_plan.trees_per_range:
+        state["trees_per_range_selected"] = memory_plan.trees_per_range
+        _write_json_atomic(state_path, state)
+    if progress is not None:
+        progress({"event": "memory-plan", **memory_plan.as_dict()})
+    throttle = (
+        RSSThrottle(memory_plan.memory_limit_bytes)
+        if memory_plan.workers > 1
+        else None
+    )
+
     genealogy_started = time.perf_counter()
     genealogy_metrics = _build_genealogy_shards(
         source_path=source_path,
@@ -1893,10 +2206,11 @@ def build_csr_artifact(
         state_path=state_path,
         target_shard_bytes=target_shard_bytes,
         compression=compression,
-        workers=workers,
-        trees_per_range=trees_per_range,
+        workers=memory_plan.workers,
+        trees_per_range=memory_plan.trees_per_range,
         progress=progress,
         started=started,
+        throttle=throttle,
     )
     genealogy_build_seconds = time.perf_counter() - genealogy_started
 
@@ -1927,6 +2241,9 @@ def build_csr_artifact(
             source_path,
             compression=compression,
             skip_node_tree_ranges=skip_node_tree_ranges,
+            skip_sample_tip_order=skip_sample_tip_order,
+            sample_tip_order_max_bytes=options["sample_tip_order_max_bytes"],
+            precompute_layout_y=precompute_layout_y,
             state=state,
             state_path=state_path,
         )
@@ -1974,8 +2291,17 @@ def build_csr_artifact(
         "build": {
             "compression": compression,
             "target_shard_bytes": target_shard_bytes,
-            "trees_per_range": trees_per_range,
+            "trees_per_range": memory_plan.trees_per_range,
             "skip_node_tree_ranges": bool(skip_node_tree_ranges),
+            "skip_sample_tip_order": bool(skip_sample_tip_order),
+            "sample_tip_order_skipped": state.get("sample_tip_order_skipped"),
+            "memory_plan": memory_plan.as_dict(),
+            "memory_throttle_events": (
+                throttle.throttle_events if throttle is not None else 0
+            ),
+            "peak_build_rss_bytes": (
+                throttle.peak_rss_bytes if throttle is not None else None
+            ),
             "worker_counts_requested": genealogy_metrics[
                 "worker_counts_requested"
             ],
@@ -1997,7 +2323,10 @@ def build_csr_artifact(
             "builder_peak_rss_bytes": _process_peak_rss_bytes(),
             "complete_unsparsified_genealogies": True,
             "precomputed_layout_x": True,
-            "precomputed_layout_y": False,
+            "precomputed_layout_y": bool(
+                precompute_layout_y
+                and format_version == CSR_ARTIFACT_SCHEMA_VERSION
+            ),
         },
         "capabilities": capabilities,
         "indexes": indexes,
@@ -5,9 +5,11 @@ from __future__ import annotations
 import bisect
 import hashlib
 import json
+import math
 import threading
 from collections import OrderedDict, defaultdict
 from dataclasses import dataclass
+from functools import cached_property
 from pathlib import Path
 from typing import Any, Iterable
 
@@ -15,11 +17,13 @@ import numpy as np
 import pyarrow as pa
 
 from lorax.artifacts.metrics import csr_artifact_metrics
+from lorax.tree_graph.time_scale import normalize_time_scale
 from lorax.artifacts.csr_builder import (
     CSR_ARTIFACT_FORMAT,
     CSR_ARTIFACT_SCHEMA_VERSION,
     CSR_ARTIFACT_V2_FORMAT,
     CSR_ARTIFACT_V2_SCHEMA_VERSION,
+    _write_json_atomic,
 )
 
 
@@ -43,6 +47,17 @@ class CSRArtifactCapabilityError(CSRArtifactError):
                 "CSR artifact lacks 'node_tree_ranges'; rebuild it without "
                 "--skip-node-tree-ranges"
             )
+        elif capability == "layout_y":
+            message = (
+                "CSR artifact lacks 'layout_y'; rebuild it with "
+                "--precompute-layout-y"
+            )
+        elif capability == "sample_tip_order":
+            message = (
+                "CSR artifact lacks 'sample_tip_order'; rebuild it without "
+                "--skip-sample-tip-order and with a --sample-tip-order-max-mb "
+                "large enough for the index"
+            )
         else:
             message = (
                 f"CSR artifact lacks {capability!r}; rebuild it as lorax-csr-v3"
@@ -73,10 +88,18 @@ V3_CAPABILITY_INDEXES = {
     "metadata": {"metadata_samples", "sample_names"},
     "sample_search": {"sample_names"},
     "node_tree_ranges": {"node_tree_ranges", "node_tree_range_offsets"},
+    "sample_tip_order": {
+        "sample_tip_rows",
+        "sample_tip_order",
+        "tree_tip_counts",
+        "sample_times",
+    },
+    "layout_y": {"node_y_linear", "node_y_log"},
     "lineage": {"breakpoints", "shards"},
     "topology_comparison": {"breakpoints", "shards"},
 }
-OPTIONAL_V3_CAPABILITIES = {"node_tree_ranges"}
+OPTIONAL_V3_CAPABILITIES = {"node_tree_ranges", "sample_tip_order", "layout_y"}
+DEFAULT_VERIFY_SAMPLE_RATE = 0.01
 
 
 def _checksum(path: Path) -> str:
@@ -96,6 +119,49 @@ def _verify_file(path: Path, metadata: dict[str, Any]) -> None:
         raise CSRArtifactCorruptError(f"Checksum mismatch for {path.name}")
 
 
+_STAMP_EDGE_BYTES = 64 * 1024
+
+
+def _edge_digest(path: Path, size: int) -> str:
+    """SHA-256 of a file's first and last 64 KiB; cheap to recompute."""
+    digest = hashlib.sha256()
+    with path.open("rb") as source:
+        digest.update(source.read(_STAMP_EDGE_BYTES))
+        if size > _STAMP_EDGE_BYTES:
+            source.seek(max(_STAMP_EDGE_BYTES, size - _STAMP_EDGE_BYTES))
+            digest.update(source.read(_STAMP_EDGE_BYTES))
+    return digest.hexdigest()
+
+
+def _shard_verification_stamp(
+    path: Path, shard: dict[str, Any]
+) -> dict[str, Any] | None:
+    # No mtime: cache restores (rsync, gsutil cp, CI caches) rewrite it, and
+    # restored artifacts are the ones incremental verification is for.
+    try:
+        size = int(path.stat().st_size)
+        edges = _edge_digest(path, size)
+    except FileNotFoundError:
+        return None
+    return {
+        "sha256": shard["sha256"],
+        "size_bytes": size,
+        "edge_sha256": edges,
+    }
+
+
+def _stratified_sample(
+    batch_count: int, sample_rate: float, rng: np.random.Generator
+) -> list[int]:
+    if batch_count <= 0 or sample_rate <= 0:
+        return []
+    count = min(batch_count, max(1, math.ceil(batch_count * sample_rate)))
+    if count == batch_count:
+        return list(range(batch_count))
+    offsets = rng.choice(batch_count, size=count, replace=False)
+    return sorted(int(offset) for offset in offsets)
+
+
 def _readonly(array: np.ndarray) -> np.ndarray:
     array.setflags(write=False)
     return array
@@ -117,13 +183,27 @@ class GenealogyMutations:
     parent_ids: np.ndarray
     positions: np.ndarray
     times: np.ndarray
-    ancestral_states: tuple[str, ...]
-    derived_states: tuple[str, ...]
-    inherited_states: tuple[str, ...]
+    ancestral_state_column: pa.Array
+    derived_state_column: pa.Array
+    inherited_state_column: pa.Array
 
     def __len__(self) -> int:
         return len(self.ids)
 
+    # Renders take() the Arrow string columns directly; the Python tuples
+    # are only built for callers that iterate states one by one.
+    @cached_property
+    def ancestral_states(self) -> tuple[str, ...]:
+        return tuple(self.ancestral_state_column.to_pylist())
+
+    @cached_property
+    def derived_states(self) -> tuple[str, ...]:
+        return tuple(self.derived_state_column.to_pylist())
+
+    @cached_property
+    def inherited_states(self) -> tuple[str, ...]:
+        return tuple(self.inherited_state_column.to_pylist())
+
 
 @dataclass(frozen=True)
 class GenealogyCSR:
@@ -139,6 +219,33 @@ class GenealogyCSR:
     layout_x: np.ndarray
     mutations: GenealogyMutations
 
+    @property
+    def nbytes(self) -> int:
+        arrays = (
+            self.node_ids,
+            self.parent_ids,
+            self.child_offsets,
+            self.child_node_ids,
+            self.node_times,
+            self.node_flags,
+            self.layout_x,
+            self.mutations.ids,
+            self.mutations.site_ids,
+            self.mutations.node_ids,
+            self.mutations.parent_ids,
+            self.mutations.positions,
+            self.mutations.times,
+        )
+        state_columns = (
+            self.mutations.ancestral_state_column,
+            self.mutations.derived_state_column,
+            self.mutations.inherited_state_column,
+        )
+        return int(
+            sum(array.nbytes for array in arrays)
+            + sum(column.nbytes for column in state_columns)
+        )
+
     def node_offset(self, node_id: int) -> int:
         offset = int(np.searchsorted(self.node_ids, int(node_id)))
         if offset >= len(self.node_ids) or int(self.node_ids[offset]) != int(node_id):
@@ -206,6 +313,27 @@ class GenealogyCSR:
         }
 
 
+@dataclass(frozen=True)
+class SampleTipPositions:
+    """Sample positions gathered from the tip-order index.
+
+    ``unresolved_node_ids`` are requested nodes that are not samples, and
+    ``internal_tree_indices``/``internal_node_ids`` are samples that are
+    internal nodes in a tree; callers resolve both from decoded genealogies.
+    """
+
+    tree_indices: np.ndarray
+    node_ids: np.ndarray
+    layout_x: np.ndarray
+    node_times: np.ndarray
+    unresolved_node_ids: np.ndarray
+    internal_tree_indices: np.ndarray
+    internal_node_ids: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+
 def _list_numpy(
     batch: pa.RecordBatch, name: str, dtype: np.dtype[Any]
 ) -> np.ndarray:
@@ -227,8 +355,8 @@ def _decode_mutations(batch: pa.RecordBatch) -> GenealogyMutations:
             np.asarray(values.field(name).to_numpy(zero_copy_only=False), dtype=dtype)
         )
 
-    def strings(name: str) -> tuple[str, ...]:
-        return tuple(values.field(name).to_pylist())
+    def strings(name: str) -> pa.Array:
+        return values.field(name)
 
     return GenealogyMutations(
         ids=primitive("id", np.int32),
@@ -237,9 +365,9 @@ def _decode_mutations(batch: pa.RecordBatch) -> GenealogyMutations:
         parent_ids=primitive("parent_id", np.int32),
         positions=primitive("position", np.float64),
         times=primitive("time", np.float64),
-        ancestral_states=strings("ancestral_state"),
-        derived_states=strings("derived_state"),
-        inherited_states=strings("inherited_state"),
+        ancestral_state_column=strings("ancestral_state"),
+        derived_state_column=strings("derived_state"),
+        inherited_state_column=strings("inherited_state"),
     )
 
 
@@ -1013,6 +1141,79 @@ class CSRArtifactReader:
             ).to_pylist()
         ]
 
+    def layout_y(self, time_scale: str) -> np.ndarray | None:
+        """Return the precomputed node-ID-indexed y table for ``time_scale``.
+
+        Returns ``None`` when the artifact was built without precomputed y.
+        """
+        if not self.has_capability("layout_y"):
+            return None
+        return self._mapped_index(f"node_y_{normalize_time_scale(time_scale)}")
+
+    def sample_tip_positions(
+        self,
+        node_ids: Iterable[int],
+        tree_indices: Iterable[int],
+    ) -> SampleTipPositions:
+        """Gather sample x positions across trees without decoding genealogies.
+
+        Results are ordered by requested tree, then by ascending node ID.
+        Unknown and duplicate tree indices are ignored.
+        """
+        self.require_capability("sample_tip_order")
+        requested_nodes = np.unique(np.asarray(list(node_ids), dtype=np.int64))
+        requested_trees = np.asarray(
+            list(dict.fromkeys(int(index) for index in tree_indices)),
+            dtype=np.int64,
+        )
+        requested_trees = requested_trees[
+            (requested_trees >= 0) & (requested_trees < self.num_trees)
+        ]
+        sample_rows = self._mapped_index("sample_tip_rows")
+        valid_nodes = (requested_nodes >= 0) & (
+            requested_nodes < len(sample_rows)
+        )
+        columns = np.full(len(requested_nodes), -1, dtype=np.int64)
+        columns[valid_nodes] = sample_rows[requested_nodes[valid_nodes]]
+        is_sample = columns >= 0
+        sample_nodes = requested_nodes[is_sample]
+        sample_columns = columns[is_sample]
+
+        tip_order = self._mapped_index("sample_tip_order")
+        absent = np.iinfo(tip_order.dtype).max
+        ranks = np.asarray(
+            tip_order[requested_trees[:, None], sample_columns[None, :]]
+        )
+        tree_grid = np.repeat(requested_trees, len(sample_nodes))
+        node_grid = np.tile(sample_nodes, len(requested_trees))
+        column_grid = np.tile(sample_columns, len(requested_trees))
+        ranks = ranks.reshape(-1)
+        is_tip = ranks < absent - 1
+        is_internal = ranks == absent - 1
+
+        # Match the builder's float32 division so gathered x values are
+        # bit-identical to the persisted layout_x column.
+        tip_counts = self._mapped_index("tree_tip_counts")
+        denominators = np.maximum(
+            np.asarray(tip_counts[tree_grid[is_tip]], dtype=np.float32) - 1,
+            np.float32(1),
+        )
+        layout_x = ranks[is_tip].astype(np.float32) / denominators
+        sample_times = self._mapped_index("sample_times")
+        csr_artifact_metrics.increment("sample_tip_order.gather")
+        return SampleTipPositions(
+            tree_indices=tree_grid[is_tip],
+            node_ids=node_grid[is_tip],
+            layout_x=layout_x,
+            node_times=np.asarray(
+                sample_times[column_grid[is_tip]],
+                dtype=np.float64,
+            ),
+            unresolved_node_ids=requested_nodes[~is_sample],
+            internal_tree_indices=tree_grid[is_internal],
+            internal_node_ids=node_grid[is_internal],
+        )
+
     def trees_at_indices(self, indices: Iterable[int]) -> list[GenealogyCSR]:
         requested = [int(index) for index in indices]
         if not requested:
@@ -1043,30 +1244,97 @@ class CSRArtifactReader:
                     results[request_offset] = genealogy
         return [result for result in results if result is not None]
 
-    def verify(self) -> dict[str, Any]:
+    def verify(
+        self,
+        *,
+        sample_rate: float = DEFAULT_VERIFY_SAMPLE_RATE,
+        incremental: bool = False,
+        seed: int | None = None,
+    ) -> dict[str, Any]:
+        """Checksum every file and decode a stratified sample of genealogies.
+
+        Every index and shard is hashed in full. Within each shard,
+        ``ceil(batch_count * sample_rate)`` genealogies (at least one unless
+        the rate is zero) are decoded and checked against the breakpoint
+        index. With ``incremental``, shards whose name, manifest checksum,
+        size and head/tail digest match the manifest's ``verification``
+        record are skipped, and newly validated shards are recorded there.
+        """
+        sample_rate = float(sample_rate)
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be between 0 and 1")
+        rng = np.random.default_rng(seed)
         verified_bytes = 0
         for metadata in self.manifest["indexes"].values():
             path = self.artifact_directory / metadata["name"]
             _verify_file(path, metadata)
             verified_bytes += int(metadata["size_bytes"])
+
+        recorded = (
+            dict((self.manifest.get("verification") or {}).get("shards") or {})
+            if incremental
+            else {}
+        )
+        validated: dict[str, dict[str, Any]] = {}
+        skipped_shards = 0
+        decoded_trees = 0
         for shard in self._shards:
             path = self.artifact_directory / shard["name"]
+            stamp = _shard_verification_stamp(path, shard)
+            if stamp is not None and recorded.get(shard["name"]) == stamp:
+                validated[shard["name"]] = stamp
+                skipped_shards += 1
+                continue
             _verify_file(path, shard)
             verified_bytes += int(shard["size_bytes"])
             with pa.memory_map(str(path), "r") as source:
                 reader = pa.ipc.open_file(source)
-                if reader.num_record_batches != int(shard["batch_count"]):
+                batch_count = int(shard["batch_count"])
+                if reader.num_record_batches != batch_count:
                     raise CSRArtifactCorruptError(
                         f"Batch count mismatch for {shard['name']}"
                     )
+                for batch_offset in _stratified_sample(
+                    batch_count, sample_rate, rng
+                ):
+                    self._verify_genealogy(
+                        reader.get_batch(batch_offset),
+                        int(shard["first_tree"]) + batch_offset,
+                    )
+                    decoded_trees += 1
+            validated[shard["name"]] = _shard_verification_stamp(path, shard)
+
+        if incremental:
+            self.manifest["verification"] = {"shards": validated}
+            _write_json_atomic(
+                self.artifact_directory / "manifest.json",
+                self.manifest,
+            )
         return {
             "ok": True,
             "fingerprint": self.manifest["fingerprint"],
             "num_trees": self.num_trees,
             "num_shards": len(self._shards),
             "verified_bytes": verified_bytes,
+            "sample_rate": sample_rate,
+            "decoded_trees": decoded_trees,
+            "skipped_shards": skipped_shards,
         }
 
+    def _verify_genealogy(self, batch: pa.RecordBatch, tree_index: int) -> None:
+        genealogy = _decode_genealogy(batch)
+        if genealogy.tree_index != tree_index:
+            raise CSRArtifactCorruptError(
+                f"Shard returned tree {genealogy.tree_index}, "
+                f"expected {tree_index}"
+            )
+        if (genealogy.interval_left, genealogy.interval_right) != (
+            self.interval_at_index(tree_index)
+        ):
+            raise CSRArtifactCorruptError(
+                f"Interval mismatch for tree {tree_index}"
+            )
+
 
 __all__ = [
     "CSRArtifactCapabilityError",
@@ -1075,4 +1343,5 @@ __all__ = [
     "CSRArtifactReader",
     "GenealogyCSR",
     "GenealogyMutations",
+    "SampleTipPositions",
 ]
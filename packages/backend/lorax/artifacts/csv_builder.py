@@ -0,0 +1,558 @@
+"""Build lorax-csr-v3 artifacts from Newick-per-row tree CSV files.
+
+CSV datasets otherwise render through ``pd.read_csv`` and on-demand ete3
+parsing. This builder parses every row once with the same
+``parse_newick_to_tree`` layout used by the legacy CSV path and publishes the
+same sharded, checksummed artifact layout as ``build_csr_artifact``, so CSV
+sessions can use the artifact render path.
+
+Leaves use their index in the file-level ``samples`` list as node IDs and
+internal nodes are numbered per genealogy after the samples, matching the
+legacy CSV node IDs. ``node_times`` store branch heights,
+``tree_height - cumulative_distance_from_root``, so ``times_to_y`` reproduces
+the legacy tip-anchored y coordinates.
+"""
+
+from __future__ import annotations
+
+import json
+import shutil
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from lorax.artifacts.csr_builder import (
+    CSR_ARTIFACT_FORMAT,
+    CSR_ARTIFACT_SCHEMA_VERSION,
+    DEFAULT_TARGET_SHARD_MB,
+    GENEALOGY_SCHEMA,
+    GLOBAL_MUTATION_SCHEMA,
+    INDIVIDUAL_SCHEMA,
+    METADATA_SAMPLE_SCHEMA,
+    MUTATION_TYPE,
+    NODE_SCHEMA,
+    POPULATION_SCHEMA,
+    SAMPLE_NAME_SCHEMA,
+    SITE_SCHEMA,
+    SUPPORTED_COMPRESSIONS,
+    CSRArtifactBuildError,
+    ProgressCallback,
+    _builder_version,
+    _checksum,
+    _child_csr,
+    _file_metadata,
+    _list_array,
+    _node_tree_ranges_from_memberships,
+    _process_peak_rss_bytes,
+    _publish,
+    _ready_result,
+    _shard_node_memberships,
+    _table_from_rows,
+    _write_arrow_table_atomic,
+    _write_json_atomic,
+    _write_node_tree_range_sidecars,
+    _write_npy_atomic,
+    _write_shard,
+    _write_shard_index,
+    artifact_path_for_source,
+    source_fingerprint,
+)
+from lorax.csv.config import (
+    MAX_BRANCH_COL,
+    CsvConfigOptions,
+    _is_empty_value,
+    _sorted_reset,
+    build_csv_config,
+)
+from lorax.csv.newick_tree import NewickTreeGraph, parse_newick_to_tree
+
+CSV_SOURCE_FORMAT = "newick-csv"
+
+
+def _tree_max_branch_length(row: pd.Series) -> float | None:
+    value = row.get(MAX_BRANCH_COL)
+    if _is_empty_value(value):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _branch_heights(
+    graph: NewickTreeGraph,
+    *,
+    tree_max_branch_length: float | None,
+    shift_tips_to_one: bool,
+) -> np.ndarray:
+    """Return ``tree_height - root_distance`` for each parsed Newick node."""
+    offsets = {int(node_id): offset for offset, node_id in enumerate(graph.node_id)}
+    root_distance = np.zeros(len(graph.node_id), dtype=np.float64)
+    # Newick graphs are in postorder, so parents are visited before children
+    # when walking the arrays backwards.
+    for offset in range(len(graph.node_id) - 1, -1, -1):
+        parent_id = int(graph.parent_id[offset])
+        if parent_id != -1:
+            root_distance[offset] = root_distance[offsets[parent_id]] + float(
+                graph.branch_length[offset]
+            )
+    tree_height = (
+        float(tree_max_branch_length)
+        if (tree_max_branch_length or 0.0) > 0
+        else float(root_distance.max())
+    )
+    heights = tree_height - root_distance
+    if shift_tips_to_one and np.any(graph.is_tip):
+        heights = heights - float(heights[graph.is_tip].min())
+    return heights
+
+
+def newick_graph_record_batch(
+    graph: NewickTreeGraph | None,
+    *,
+    tree_index: int,
+    interval_left: float,
+    interval_right: float,
+    node_heights: np.ndarray | None,
+) -> pa.RecordBatch:
+    """Convert one parsed CSV Newick genealogy into a CSR record batch."""
+    if graph is None or len(graph.node_id) == 0:
+        node_ids = np.empty(0, dtype=np.int32)
+        parent_ids = np.empty(0, dtype=np.int32)
+        child_offsets = np.zeros(1, dtype=np.int32)
+        child_node_ids = np.empty(0, dtype=np.int32)
+        node_times = np.empty(0, dtype=np.float64)
+        node_flags = np.empty(0, dtype=np.uint32)
+        layout_x = np.empty(0, dtype=np.float32)
+    else:
+        order = np.argsort(graph.node_id, kind="stable")
+        node_ids = np.asarray(graph.node_id[order], dtype=np.int32)
+        parent_ids = np.asarray(graph.parent_id[order], dtype=np.int32)
+        child_offsets, ordered_child_local = _child_csr(
+            node_ids,
+            parent_ids,
+            tree_index=tree_index,
+        )
+        child_node_ids = node_ids[ordered_child_local].astype(np.int32, copy=True)
+        node_times = np.asarray(node_heights[order], dtype=np.float64)
+        node_flags = graph.is_tip[order].astype(np.uint32)
+        layout_x = np.asarray(graph.x[order], dtype=np.float32)
+
+    arrays = [
+        pa.array([int(tree_index)], type=pa.int64()),
+        pa.array([float(interval_left)], type=pa.float64()),
+        pa.array([float(interval_right)], type=pa.float64()),
+        _list_array(node_ids, pa.int32()),
+        _list_array(parent_ids, pa.int32()),
+        _list_array(child_offsets, pa.int32()),
+        _list_array(child_node_ids, pa.int32()),
+        _list_array(node_times, pa.float64()),
+        _list_array(node_flags, pa.uint32()),
+        _list_array(layout_x, pa.float32()),
+        pa.array([[]], type=pa.list_(MUTATION_TYPE)),
+    ]
+    return pa.RecordBatch.from_arrays(arrays, schema=GENEALOGY_SCHEMA)
+
+
+def _write_csv_sidecars(
+    staging: Path,
+    *,
+    config: dict[str, Any],
+    samples: list[str],
+    num_nodes: int,
+    num_trees: int,
+    shards: list[dict[str, Any]],
+    compression: str,
+    skip_node_tree_ranges: bool,
+) -> tuple[dict[str, dict[str, Any]], dict[str, bool]]:
+    capabilities = {
+        "render": True,
+        "intervals": True,
+        "details": True,
+        "mutations": True,
+        "metadata": True,
+        "sample_search": True,
+        "node_tree_ranges": not skip_node_tree_ranges,
+        # Branch heights of CSV tips vary per genealogy, so neither the
+        # per-sample tip-order gather nor node-indexed y tables apply.
+        "sample_tip_order": False,
+        "layout_y": False,
+        "lineage": True,
+        "topology_comparison": True,
+    }
+    indexes: dict[str, dict[str, Any]] = {}
+
+    def checkpoint(key: str, metadata: dict[str, Any]) -> None:
+        indexes[key] = metadata
+
+    def write_arrow(
+        key: str,
+        name: str,
+        rows: list[dict[str, Any]],
+        schema: pa.Schema,
+    ) -> None:
+        checkpoint(
+            key,
+            _write_arrow_table_atomic(
+                staging / name,
+                _table_from_rows(rows, schema),
+                compression=compression,
+            ),
+        )
+
+    def write_npy(key: str, name: str, values: np.ndarray) -> None:
+        path = staging / name
+        _write_npy_atomic(path, values)
+        checkpoint(key, _file_metadata(path, rows=len(values)))
+
+    config = dict(config)
+    config["intervals"] = None
+    config["artifact_format"] = CSR_ARTIFACT_FORMAT
+    config["artifact_capabilities"] = capabilities
+    config_path = staging / "config.json"
+    _write_json_atomic(config_path, config)
+    checkpoint("config", _file_metadata(config_path))
+
+    node_rows = []
+    for node_id in range(num_nodes):
+        is_sample = node_id < len(samples)
+        metadata = {"name": samples[node_id]} if is_sample else {}
+        metadata_json = json.dumps(metadata, sort_keys=True, separators=(",", ":"))
+        node_rows.append(
+            {
+                "id": node_id,
+                "flags": 1 if is_sample else 0,
+                # Branch heights are per genealogy; the global table has none.
+                "time": float("nan"),
+                "population": -1,
+                "individual": -1,
+                "metadata_json": metadata_json,
+                "metadata_raw": metadata_json.encode("utf-8"),
+            }
+        )
+    write_arrow("nodes", "nodes.arrow", node_rows, NODE_SCHEMA)
+    write_arrow("sites", "sites.arrow", [], SITE_SCHEMA)
+    write_arrow("individuals", "individuals.arrow", [], INDIVIDUAL_SCHEMA)
+    write_arrow("populations", "populations.arrow", [], POPULATION_SCHEMA)
+    write_arrow("mutations", "mutations.arrow", [], GLOBAL_MUTATION_SCHEMA)
+    write_npy(
+        "mutation_positions",
+        "mutation-positions.npy",
+        np.empty(0, dtype=np.float64),
+    )
+    write_npy(
+        "mutation_rows_by_id",
+        "mutation-rows-by-id.npy",
+        np.empty(0, dtype=np.int64),
+    )
+    write_npy(
+        "node_mutation_offsets",
+        "node-mutation-offsets.npy",
+        np.zeros(num_nodes + 1, dtype=np.int64),
+    )
+    write_npy(
+        "node_mutation_ids",
+        "node-mutation-ids.npy",
+        np.empty(0, dtype=np.int32),
+    )
+
+    name_rows = sorted(
+        (
+            {
+                "normalized_name": str(name).casefold(),
+                "display_name": str(name),
+                "node_id": node_id,
+            }
+            for node_id, name in enumerate(samples)
+        ),
+        key=lambda row: (row["normalized_name"], row["node_id"]),
+    )
+    metadata_rows = [
+        {
+            "source": "node",
+            "key": "name",
+            "value": str(name),
+            "sample_node_ids": np.asarray([node_id], dtype=np.int32),
+            "sample_names": [str(name)],
+        }
+        for node_id, name in sorted(
+            enumerate(samples),
+            key=lambda item: str(item[1]),
+        )
+    ]
+    write_arrow("sample_names", "sample-names.arrow", name_rows, SAMPLE_NAME_SCHEMA)
+    write_arrow(
+        "metadata_samples",
+        "metadata-samples.arrow",
+        metadata_rows,
+        METADATA_SAMPLE_SCHEMA,
+    )
+
+    if not skip_node_tree_ranges:
+        _write_node_tree_range_sidecars(
+            staging,
+            num_nodes=num_nodes,
+            build_ranges=lambda: _node_tree_ranges_from_memberships(
+                _shard_node_memberships(staging, shards),
+                num_trees,
+            ),
+            compression=compression,
+            indexes=indexes,
+            checkpoint=checkpoint,
+        )
+    return indexes, capabilities
+
+
+def build_csv_csr_artifact(
+    source: str | Path,
+    *,
+    target_shard_mb: int = DEFAULT_TARGET_SHARD_MB,
+    compression: str = "zstd",
+    window_size: int = CsvConfigOptions.window_size,
+    skip_node_tree_ranges: bool = False,
+    shift_tips_to_one: bool | None = None,
+    force: bool = False,
+    progress: ProgressCallback | None = None,
+) -> dict[str, Any]:
+    """Build and atomically publish ``<source>.artifact`` for a tree CSV.
+
+    ``shift_tips_to_one`` defaults to the same per-project rule the legacy CSV
+    renderer applies (``LORAX_CSV_TIP_SHIFT_PROJECTS``).
+    """
+    source_path = Path(source).expanduser().resolve()
+    if not source_path.is_file():
+        raise FileNotFoundError(source_path)
+    if source_path.suffix.lower() != ".csv":
+        raise ValueError("CSV CSR preprocessing supports only .csv files")
+    if target_shard_mb < 1:
+        raise ValueError("target_shard_mb must be at least 1")
+    if window_size < 1:
+        raise ValueError("window_size must be at least 1")
+    compression = compression.lower()
+    if compression not in SUPPORTED_COMPRESSIONS:
+        raise ValueError(
+            f"compression must be one of {sorted(SUPPORTED_COMPRESSIONS)}"
+        )
+    if compression != "none" and not pa.Codec.is_available(compression):
+        raise ValueError(f"PyArrow codec {compression!r} is not available")
+    if shift_tips_to_one is None:
+        from lorax.handlers import should_shift_csv_tips
+
+        shift_tips_to_one = should_shift_csv_tips(str(source_path))
+
+    source_stat = source_path.stat()
+    fingerprint = source_fingerprint(source_path)
+    destination = artifact_path_for_source(source_path)
+    manifest_path = destination / "manifest.json"
+    if manifest_path.exists() and not force:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        if (
+            manifest.get("format") == CSR_ARTIFACT_FORMAT
+            and manifest.get("schema_version") == CSR_ARTIFACT_SCHEMA_VERSION
+            and manifest.get("fingerprint") == fingerprint
+            and (manifest.get("build") or {}).get("source_format")
+            == CSV_SOURCE_FORMAT
+        ):
+            return _ready_result(destination, manifest)
+        raise CSRArtifactBuildError(
+            f"Existing artifact at {destination} is incompatible; use --force"
+        )
+    if destination.exists() and not force:
+        raise CSRArtifactBuildError(
+            f"Existing artifact at {destination} has no valid manifest; use --force"
+        )
+
+    staging = destination.with_name(f".{destination.name}.inprogress")
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+    started = time.perf_counter()
+    try:
+        frame = pd.read_csv(source_path)
+        config = build_csv_config(
+            frame,
+            str(source_path),
+            options=CsvConfigOptions(window_size=window_size),
+        )
+        rows = _sorted_reset(frame)
+        samples = [str(name) for name in config.get("samples") or []]
+        global_max_time = float(config["times"]["values"][1])
+        breakpoints = np.asarray(config["intervals"], dtype=np.float64)
+        num_trees = len(rows)
+        if len(breakpoints) != num_trees + 1:
+            raise CSRArtifactBuildError("CSV intervals do not cover every row")
+
+        target_shard_bytes = target_shard_mb * 1024 * 1024
+        pending: list[pa.RecordBatch] = []
+        pending_bytes = 0
+        shards: list[dict[str, Any]] = []
+        max_internal_nodes = 0
+        total_edges = 0
+
+        def flush() -> None:
+            nonlocal pending, pending_bytes
+            if pending:
+                shards.append(
+                    _write_shard(staging, len(shards), pending, compression)
+                )
+                pending = []
+                pending_bytes = 0
+
+        for tree_index, row in rows.iterrows():
+            tree_index = int(tree_index)
+            newick = row.get("newick")
+            graph = None
+            heights = None
+            if not _is_empty_value(newick):
+                tree_max_branch_length = _tree_max_branch_length(row)
+                try:
+                    graph = parse_newick_to_tree(
+                        str(newick),
+                        global_max_time,
+                        samples_order=samples,
+                        tree_max_branch_length=tree_max_branch_length,
+                    )
+                except ValueError as error:
+                    raise CSRArtifactBuildError(
+                        f"Row {tree_index} has an invalid Newick tree: {error}"
+                    ) from error
+                heights = _branch_heights(
+                    graph,
+                    tree_max_branch_length=tree_max_branch_length,
+                    shift_tips_to_one=bool(shift_tips_to_one),
+                )
+                max_internal_nodes = max(
+                    max_internal_nodes,
+                    int(np.count_nonzero(~graph.is_tip)),
+                )
+                total_edges += max(0, len(graph.node_id) - 1)
+            record = newick_graph_record_batch(
+                graph,
+                tree_index=tree_index,
+                interval_left=float(breakpoints[tree_index]),
+                interval_right=float(breakpoints[tree_index + 1]),
+                node_heights=heights,
+            )
+            if pending and pending_bytes + record.nbytes > target_shard_bytes:
+                flush()
+            pending.append(record)
+            pending_bytes += record.nbytes
+            if progress is not None and (tree_index + 1) % 1_000 == 0:
+                progress(
+                    {
+                        "phase": "genealogies",
+                        "trees_completed": tree_index + 1,
+                        "num_trees": num_trees,
+                    }
+                )
+        flush()
+        genealogy_build_seconds = time.perf_counter() - started
+
+        breakpoints_path = staging / "breakpoints.npy"
+        _write_npy_atomic(breakpoints_path, breakpoints)
+        shard_index_path = staging / "shards.arrow"
+        _write_shard_index(shard_index_path, shards)
+        indexes = {
+            "breakpoints": {
+                "name": breakpoints_path.name,
+                "size_bytes": breakpoints_path.stat().st_size,
+                "sha256": _checksum(breakpoints_path),
+            },
+            "shards": {
+                "name": shard_index_path.name,
+                "size_bytes": shard_index_path.stat().st_size,
+                "sha256": _checksum(shard_index_path),
+            },
+        }
+        num_nodes = len(samples) + max_internal_nodes
+        sidecar_indexes, capabilities = _write_csv_sidecars(
+            staging,
+            config=config,
+            samples=samples,
+            num_nodes=num_nodes,
+            num_trees=num_trees,
+            shards=shards,
+            compression=compression,
+            skip_node_tree_ranges=skip_node_tree_ranges,
+        )
+        indexes.update(sidecar_indexes)
+        shard_bytes = sum(int(item["size_bytes"]) for item in shards)
+        total_size = shard_bytes + sum(
+            int(metadata["size_bytes"]) for metadata in indexes.values()
+        )
+        manifest = {
+            "schema_version": CSR_ARTIFACT_SCHEMA_VERSION,
+            "format": CSR_ARTIFACT_FORMAT,
+            "builder_version": _builder_version(),
+            "created_at_unix": int(time.time()),
+            "build_seconds": round(time.perf_counter() - started, 3),
+            "fingerprint": fingerprint,
+            "source": {
+                "path": str(source_path),
+                "name": source_path.name,
+                "size_bytes": source_stat.st_size,
+                "mtime_ns": source_stat.st_mtime_ns,
+                "sha256": fingerprint,
+            },
+            "dataset": {
+                "sequence_start": float(breakpoints[0]),
+                "sequence_length": float(breakpoints[-1]),
+                "num_trees": num_trees,
+                "num_nodes": num_nodes,
+                "num_edges": total_edges,
+                "num_samples": len(samples),
+                "num_sites": 0,
+                "num_mutations": 0,
+                "num_individuals": 0,
+                "num_populations": 0,
+                "time_units": "branch length",
+                "global_min_time": 0.0,
+                "global_max_time": global_max_time,
+            },
+            "build": {
+                "source_format": CSV_SOURCE_FORMAT,
+                "compression": compression,
+                "target_shard_bytes": target_shard_bytes,
+                "window_size": int(window_size),
+                "skip_node_tree_ranges": bool(skip_node_tree_ranges),
+                "shift_tips_to_one": bool(shift_tips_to_one),
+                "worker_counts_requested": [1],
+                "worker_counts_used": [1],
+                "genealogy_build_seconds": round(genealogy_build_seconds, 3),
+                "builder_peak_rss_bytes": _process_peak_rss_bytes(),
+                "complete_unsparsified_genealogies": True,
+                "precomputed_layout_x": True,
+                "precomputed_layout_y": False,
+                "vertical_coordinate": (
+                    "tree_height_minus_cumulative_root_branch_length"
+                ),
+            },
+            "capabilities": capabilities,
+            "indexes": indexes,
+            "artifact": {
+                "num_shards": len(shards),
+                "size_bytes": total_size,
+                "output_source_ratio": (
+                    total_size / source_stat.st_size
+                    if source_stat.st_size
+                    else None
+                ),
+            },
+        }
+        # The manifest is the artifact commit marker and is always written last.
+        _write_json_atomic(staging / "manifest.json", manifest)
+        _publish(staging, destination)
+        return _ready_result(destination, manifest)
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+
+__all__ = [
+    "CSV_SOURCE_FORMAT",
+    "build_csv_csr_artifact",
+    "newick_graph_record_batch",
+]
@@ -2,14 +2,18 @@
 
 from __future__ import annotations
 
+import threading
 from dataclasses import dataclass
-from typing import Protocol, runtime_checkable
+from typing import TYPE_CHECKING, Protocol, runtime_checkable
 
 import numpy as np
 
 from lorax.artifacts.csr_reader import GenealogyCSR
 from lorax.tree_graph.time_scale import times_to_y
 
+if TYPE_CHECKING:
+    from lorax.artifacts.csr_reader import CSRArtifactReader
+
 
 @runtime_checkable
 class GenealogyGraphProtocol(Protocol):
@@ -43,23 +47,34 @@ class CompactGenealogyGraph:
         global_min_time: float,
         global_max_time: float,
         time_scale: str = "linear",
+        node_y: np.ndarray | None = None,
     ) -> "CompactGenealogyGraph":
-        return cls(
-            genealogy=genealogy,
-            time=np.asarray(genealogy.node_times, dtype=np.float64),
-            x=np.asarray(genealogy.layout_x, dtype=np.float32),
-            y=times_to_y(
+        if node_y is not None:
+            y = np.asarray(node_y[genealogy.node_ids], dtype=np.float32)
+        else:
+            y = times_to_y(
                 genealogy.node_times,
                 global_min_time,
                 global_max_time,
                 time_scale,
-            ).astype(np.float32),
+            ).astype(np.float32)
+        return cls(
+            genealogy=genealogy,
+            time=np.asarray(genealogy.node_times, dtype=np.float64),
+            x=np.asarray(genealogy.layout_x, dtype=np.float32),
+            y=y,
         )
 
     @property
     def tree_index(self) -> int:
         return self.genealogy.tree_index
 
+    @property
+    def nbytes(self) -> int:
+        return int(
+            self.genealogy.nbytes + self.time.nbytes + self.x.nbytes + self.y.nbytes
+        )
+
     @property
     def node_ids(self) -> np.ndarray:
         return self.genealogy.node_ids
@@ -101,6 +116,107 @@ class CompactGenealogyGraph:
         return self.genealogy.descendants(node_id)
 
 
+def artifact_graph_key(
+    reader: "CSRArtifactReader", tree_index: int, time_scale: str = "linear"
+) -> tuple:
+    """Content key for a compact graph in the shared tree graph cache."""
+    return ("csr", reader.manifest["fingerprint"], time_scale, int(tree_index))
+
+
+class LazyCompactGenealogyGraph:
+    """Cache entry that decodes its compact graph on first traversal.
+
+    Renders store one handle per visible tree; only trees later used for
+    lineage, details or search pay for the shard read and graph arrays.
+    """
+
+    def __init__(
+        self,
+        reader: "CSRArtifactReader",
+        tree_index: int,
+        *,
+        time_scale: str = "linear",
+        node_y: np.ndarray | None = None,
+    ):
+        self.reader = reader
+        self.tree_index = int(tree_index)
+        self.time_scale = time_scale
+        self.node_y_table = node_y
+        self._graph: CompactGenealogyGraph | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_materialized(self) -> bool:
+        return self._graph is not None
+
+    def materialize(self) -> CompactGenealogyGraph:
+        graph = self._graph
+        if graph is not None:
+            return graph
+        with self._lock:
+            if self._graph is None:
+                self._graph = CompactGenealogyGraph.from_genealogy(
+                    self.reader.tree_at_index(self.tree_index),
+                    global_min_time=self.reader.global_min_time,
+                    global_max_time=self.reader.global_max_time,
+                    time_scale=self.time_scale,
+                    node_y=self.node_y_table,
+                )
+                # The reader and y table are only needed to decode once.
+                self.reader = None
+                self.node_y_table = None
+            return self._graph
+
+    @property
+    def nbytes(self) -> int:
+        graph = self._graph
+        return 0 if graph is None else graph.nbytes
+
+    @property
+    def genealogy(self) -> GenealogyCSR:
+        return self.materialize().genealogy
+
+    @property
+    def node_ids(self) -> np.ndarray:
+        return self.materialize().node_ids
+
+    def node_offset(self, node_id: int) -> int:
+        return self.materialize().node_offset(node_id)
+
+    def has_node(self, node_id: int) -> bool:
+        return self.materialize().has_node(node_id)
+
+    def parent_of(self, node_id: int) -> int:
+        return self.materialize().parent_of(node_id)
+
+    def children(self, node_id: int) -> np.ndarray:
+        return self.materialize().children(node_id)
+
+    def is_tip(self, node_id: int) -> bool:
+        return self.materialize().is_tip(node_id)
+
+    def node_time(self, node_id: int) -> float:
+        return self.materialize().node_time(node_id)
+
+    def node_x(self, node_id: int) -> float:
+        return self.materialize().node_x(node_id)
+
+    def node_y(self, node_id: int) -> float:
+        return self.materialize().node_y(node_id)
+
+    def edges(self) -> set[tuple[int, int]]:
+        return self.materialize().edges()
+
+    def roots(self) -> np.ndarray:
+        return self.materialize().roots()
+
+    def ancestors(self, node_id: int) -> list[int]:
+        return self.materialize().ancestors(node_id)
+
+    def descendants(self, node_id: int) -> list[int]:
+        return self.materialize().descendants(node_id)
+
+
 @dataclass(frozen=True)
 class LegacyTreeGraphAdapter:
     """Expose a dense legacy TreeGraph through the compact graph protocol."""
@@ -167,5 +283,7 @@ class LegacyTreeGraphAdapter:
 __all__ = [
     "CompactGenealogyGraph",
     "GenealogyGraphProtocol",
+    "LazyCompactGenealogyGraph",
     "LegacyTreeGraphAdapter",
+    "artifact_graph_key",
 ]
@@ -11,6 +11,8 @@ from typing import Iterator
 
 import psutil
 
+from lorax.metrics import observe_stage
+
 
 class CSRArtifactMetrics:
     """Thread-safe counters and bounded latency samples."""
@@ -30,6 +32,7 @@ class CSRArtifactMetrics:
     def observe_ms(self, name: str, duration_ms: float) -> None:
         with self._lock:
             self._latencies[str(name)].append(float(duration_ms))
+        observe_stage(f"csr.{name}", float(duration_ms) / 1_000.0)
 
     def set_gauge(self, name: str, value: float) -> None:
         with self._lock:
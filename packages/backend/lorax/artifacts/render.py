@@ -2,13 +2,17 @@
 
 from __future__ import annotations
 
+import os
 import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Iterable
 
 import numpy as np
 import pyarrow as pa
 
 from lorax.artifacts.csr_reader import GenealogyCSR
+from lorax.cancellation import CancelToken
 from lorax.tree_graph.time_scale import normalize_time_scale, times_to_y
 from lorax.tree_graph.tree_graph import (
     LOW_COVERAGE_NO_INSIDE_SPARSIFY_MULTIPLIER,
@@ -25,8 +29,39 @@ from lorax.tree_graph.tree_graph import (
 )
 
 
-def _filter_tuple(values: tuple[str, ...], mask: np.ndarray) -> list[str]:
-    return [value for value, keep in zip(values, mask) if bool(keep)]
+# Per-tree sparsification runs in nogil Numba kernels, so a small thread
+# pool shared by all renders spreads large overview requests across cores.
+RENDER_THREADS = max(1, min(8, os.cpu_count() or 1))
+PARALLEL_RENDER_THRESHOLD = 4
+_RENDER_POOL: ThreadPoolExecutor | None = None
+_RENDER_POOL_LOCK = threading.Lock()
+
+NODE_ARROW_TYPES = {
+    "node_id": pa.int32(),
+    "parent_id": pa.int32(),
+    "is_tip": pa.bool_(),
+    "tree_idx": pa.int32(),
+    "x": pa.float32(),
+    "y": pa.float32(),
+}
+MUTATION_ARROW_TYPES = {
+    "x": pa.float32(),
+    "y": pa.float32(),
+    "tree_idx": pa.int32(),
+    "node_id": pa.int32(),
+    "id": pa.int32(),
+    "site_id": pa.int32(),
+    "position": pa.float64(),
+    "time": pa.float64(),
+}
+NODE_COLUMN_DTYPES = {
+    name: np.dtype(arrow_type.to_pandas_dtype())
+    for name, arrow_type in NODE_ARROW_TYPES.items()
+}
+MUTATION_COLUMN_DTYPES = {
+    name: np.dtype(arrow_type.to_pandas_dtype())
+    for name, arrow_type in MUTATION_ARROW_TYPES.items()
+}
 
 
 def _process_genealogy(
@@ -39,16 +74,21 @@ def _process_genealogy(
     sparsify_cell_size_multiplier: float | None,
     adaptive_sparsify_bbox: dict | None,
     adaptive_target_tree_idx: int | None,
+    node_y: np.ndarray | None = None,
 ) -> tuple[dict[str, np.ndarray], dict[str, object]]:
     node_ids = np.asarray(genealogy.node_ids, dtype=np.int32)
     parent_ids = np.asarray(genealogy.parent_ids, dtype=np.int32)
     x = np.asarray(genealogy.layout_x, dtype=np.float32)
-    y = times_to_y(
-        np.asarray(genealogy.node_times, dtype=np.float64),
-        min_time,
-        max_time,
-        time_scale,
-    ).astype(np.float32)
+    if node_y is not None:
+        genealogy_y = np.asarray(node_y[node_ids], dtype=np.float32)
+    else:
+        genealogy_y = times_to_y(
+            np.asarray(genealogy.node_times, dtype=np.float64),
+            min_time,
+            max_time,
+            time_scale,
+        ).astype(np.float32)
+    y = genealogy_y
     child_counts = np.diff(genealogy.child_offsets)
     is_tip = (child_counts == 0).astype(np.bool_)
     original_unary_mask = (child_counts == 1) & (parent_ids != -1)
@@ -156,9 +196,7 @@ def _process_genealogy(
         "site_id": np.empty(0, dtype=np.int32),
         "position": np.empty(0, dtype=np.float64),
         "time": np.empty(0, dtype=np.float64),
-        "ancestral_state": [],
-        "derived_state": [],
-        "inherited_state": [],
+        "state_offsets": np.empty(0, dtype=np.int64),
     }
     if mutation_count:
         mutation_node_offsets = np.searchsorted(
@@ -175,12 +213,7 @@ def _process_genealogy(
         nan_mask = np.isnan(mutations.times)
         if np.any(nan_mask):
             nan_offsets = mutation_node_offsets[nan_mask]
-            node_y = times_to_y(
-                genealogy.node_times[nan_offsets],
-                min_time,
-                max_time,
-                time_scale,
-            )
+            nan_node_y = genealogy_y[nan_offsets]
             parent_ids_for_nan = genealogy.parent_ids[nan_offsets]
             parent_y = np.zeros(len(nan_offsets), dtype=np.float32)
             valid_parent = parent_ids_for_nan >= 0
@@ -189,13 +222,8 @@ def _process_genealogy(
                     genealogy.node_ids,
                     parent_ids_for_nan[valid_parent],
                 )
-                parent_y[valid_parent] = times_to_y(
-                    genealogy.node_times[parent_offsets],
-                    min_time,
-                    max_time,
-                    time_scale,
-                )
-            mutation_y[nan_mask] = (node_y + parent_y) / 2.0
+                parent_y[valid_parent] = genealogy_y[parent_offsets]
+            mutation_y[nan_mask] = (nan_node_y + parent_y) / 2.0
 
         mutation_mask = np.ones(mutation_count, dtype=np.bool_)
         if sparsification:
@@ -207,9 +235,7 @@ def _process_genealogy(
         mutation_site_ids = mutations.site_ids[mutation_mask]
         mutation_positions = mutations.positions[mutation_mask]
         mutation_times = mutations.times[mutation_mask]
-        ancestral = _filter_tuple(mutations.ancestral_states, mutation_mask)
-        derived = _filter_tuple(mutations.derived_states, mutation_mask)
-        inherited = _filter_tuple(mutations.inherited_states, mutation_mask)
+        state_offsets = np.flatnonzero(mutation_mask)
 
         if sparsification and len(mutation_ids):
             mutation_tree_ids = np.full(
@@ -247,15 +273,7 @@ def _process_genealogy(
             mutation_site_ids = mutation_site_ids[mutation_keep]
             mutation_positions = mutation_positions[mutation_keep]
             mutation_times = mutation_times[mutation_keep]
-            ancestral = [
-                value for value, keep in zip(ancestral, mutation_keep) if keep
-            ]
-            derived = [
-                value for value, keep in zip(derived, mutation_keep) if keep
-            ]
-            inherited = [
-                value for value, keep in zip(inherited, mutation_keep) if keep
-            ]
+            state_offsets = state_offsets[mutation_keep]
         mutation_data = {
             "tree_idx": np.full(
                 len(mutation_ids),
@@ -269,9 +287,7 @@ def _process_genealogy(
             "site_id": mutation_site_ids,
             "position": mutation_positions,
             "time": mutation_times,
-            "ancestral_state": ancestral,
-            "derived_state": derived,
-            "inherited_state": inherited,
+            "state_offsets": state_offsets,
         }
 
     node_data = {
@@ -290,6 +306,78 @@ def _concat(parts: list[np.ndarray], dtype: np.dtype) -> np.ndarray:
     return np.concatenate(nonempty) if nonempty else np.empty(0, dtype=dtype)
 
 
+def _render_pool() -> ThreadPoolExecutor:
+    global _RENDER_POOL
+    with _RENDER_POOL_LOCK:
+        if _RENDER_POOL is None:
+            _RENDER_POOL = ThreadPoolExecutor(
+                max_workers=RENDER_THREADS,
+                thread_name_prefix="lorax-csr-render",
+            )
+        return _RENDER_POOL
+
+
+def _assemble_columns(
+    parts: list[dict],
+    dtypes: dict[str, np.dtype],
+    pool: ThreadPoolExecutor | None,
+) -> dict[str, np.ndarray]:
+    """Copy each tree's columns into its slice of preallocated outputs."""
+    first_column = next(iter(dtypes))
+    bounds = np.cumsum([0] + [len(part[first_column]) for part in parts])
+    columns = {
+        name: np.empty(int(bounds[-1]), dtype=dtype)
+        for name, dtype in dtypes.items()
+    }
+
+    def fill(offset: int) -> None:
+        start, stop = int(bounds[offset]), int(bounds[offset + 1])
+        if start == stop:
+            return
+        for name, column in columns.items():
+            column[start:stop] = parts[offset][name]
+
+    if pool is None:
+        for offset in range(len(parts)):
+            fill(offset)
+    else:
+        list(pool.map(fill, range(len(parts))))
+    return columns
+
+
+def _mutation_state_columns(
+    genealogies: list[GenealogyCSR],
+    processed: list[tuple[dict, dict]],
+) -> dict[str, pa.Array]:
+    """Gather kept mutation states with one Arrow ``take`` per column.
+
+    Each genealogy's kept offsets are shifted by the number of mutations
+    decoded before it, so the concatenated columns are indexed directly
+    and string values never round-trip through Python objects.
+    """
+    bases = np.cumsum([0] + [len(genealogy.mutations) for genealogy in genealogies])
+    indices = pa.array(
+        _concat(
+            [
+                mutation["state_offsets"] + base
+                for base, (_node, mutation) in zip(bases, processed)
+            ],
+            np.int64,
+        ),
+        type=pa.int64(),
+    )
+    columns = {}
+    for name in ("ancestral_state", "derived_state", "inherited_state"):
+        values = pa.concat_arrays(
+            [
+                getattr(genealogy.mutations, f"{name}_column").cast(pa.string())
+                for genealogy in genealogies
+            ]
+        )
+        columns[f"mut_{name}"] = values.take(indices)
+    return columns
+
+
 def serialize_csr_genealogies(
     genealogies: Iterable[GenealogyCSR],
     *,
@@ -300,12 +388,24 @@ def serialize_csr_genealogies(
     sparsify_cell_size_multiplier: float | None = None,
     adaptive_sparsify_bbox: dict | None = None,
     adaptive_target_tree_idx: int | None = None,
+    node_y: np.ndarray | None = None,
+    cancel_token: CancelToken | None = None,
 ) -> dict:
-    """Serialize CSR genealogies without allocating source-global node arrays."""
+    """Serialize CSR genealogies without allocating source-global node arrays.
+
+    ``node_y`` is an optional node-ID-indexed y table for ``time_scale``
+    (see ``CSRArtifactReader.layout_y``); when given, node y coordinates are
+    gathered from it instead of recomputed from node times. ``cancel_token``
+    is checked before each genealogy and raises ``RequestCancelled`` once the
+    request has been superseded.
+    """
     genealogies = list(genealogies)
     time_scale = normalize_time_scale(time_scale)
-    processed = [
-        _process_genealogy(
+
+    def process(genealogy: GenealogyCSR):
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+        return _process_genealogy(
             genealogy,
             min_time=float(global_min_time),
             max_time=float(global_max_time),
@@ -314,36 +414,24 @@ def serialize_csr_genealogies(
             sparsify_cell_size_multiplier=sparsify_cell_size_multiplier,
             adaptive_sparsify_bbox=adaptive_sparsify_bbox,
             adaptive_target_tree_idx=adaptive_target_tree_idx,
+            node_y=node_y,
         )
-        for genealogy in genealogies
-    ]
 
+    pool = _render_pool() if len(genealogies) >= PARALLEL_RENDER_THRESHOLD else None
+    if pool is None:
+        processed = [process(genealogy) for genealogy in genealogies]
+    else:
+        processed = list(pool.map(process, genealogies))
+
+    node_columns = _assemble_columns(
+        [node for node, _mutation in processed],
+        NODE_COLUMN_DTYPES,
+        pool,
+    )
     node_table = pa.table(
         {
-            "node_id": pa.array(
-                _concat([node["node_id"] for node, _ in processed], np.int32),
-                type=pa.int32(),
-            ),
-            "parent_id": pa.array(
-                _concat([node["parent_id"] for node, _ in processed], np.int32),
-                type=pa.int32(),
-            ),
-            "is_tip": pa.array(
-                _concat([node["is_tip"] for node, _ in processed], np.bool_),
-                type=pa.bool_(),
-            ),
-            "tree_idx": pa.array(
-                _concat([node["tree_idx"] for node, _ in processed], np.int32),
-                type=pa.int32(),
-            ),
-            "x": pa.array(
-                _concat([node["x"] for node, _ in processed], np.float32),
-                type=pa.float32(),
-            ),
-            "y": pa.array(
-                _concat([node["y"] for node, _ in processed], np.float32),
-                type=pa.float32(),
-            ),
+            name: pa.array(node_columns[name], type=arrow_type)
+            for name, arrow_type in NODE_ARROW_TYPES.items()
         }
     )
 
@@ -351,52 +439,18 @@ def serialize_csr_genealogies(
         len(mutation["id"]) for _node, mutation in processed
     )
     if mutation_count:
+        mutation_columns = _assemble_columns(
+            [mutation for _node, mutation in processed],
+            MUTATION_COLUMN_DTYPES,
+            pool,
+        )
         mutation_table = pa.table(
             {
-                "mut_x": pa.array(
-                    _concat([m["x"] for _, m in processed], np.float32),
-                    type=pa.float32(),
-                ),
-                "mut_y": pa.array(
-                    _concat([m["y"] for _, m in processed], np.float32),
-                    type=pa.float32(),
-                ),
-                "mut_tree_idx": pa.array(
-                    _concat([m["tree_idx"] for _, m in processed], np.int32),
-                    type=pa.int32(),
-                ),
-                "mut_node_id": pa.array(
-                    _concat([m["node_id"] for _, m in processed], np.int32),
-                    type=pa.int32(),
-                ),
-                "mut_id": pa.array(
-                    _concat([m["id"] for _, m in processed], np.int32),
-                    type=pa.int32(),
-                ),
-                "mut_site_id": pa.array(
-                    _concat([m["site_id"] for _, m in processed], np.int32),
-                    type=pa.int32(),
-                ),
-                "mut_position": pa.array(
-                    _concat([m["position"] for _, m in processed], np.float64),
-                    type=pa.float64(),
-                ),
-                "mut_time": pa.array(
-                    _concat([m["time"] for _, m in processed], np.float64),
-                    type=pa.float64(),
-                ),
-                "mut_ancestral_state": pa.array(
-                    [value for _, m in processed for value in m["ancestral_state"]],
-                    type=pa.string(),
-                ),
-                "mut_derived_state": pa.array(
-                    [value for _, m in processed for value in m["derived_state"]],
-                    type=pa.string(),
-                ),
-                "mut_inherited_state": pa.array(
-                    [value for _, m in processed for value in m["inherited_state"]],
-                    type=pa.string(),
-                ),
+                **{
+                    f"mut_{name}": pa.array(mutation_columns[name], type=arrow_type)
+                    for name, arrow_type in MUTATION_ARROW_TYPES.items()
+                },
+                **_mutation_state_columns(genealogies, processed),
             }
         )
     else:
@@ -173,6 +173,7 @@ class ArtifactContextRegistry:
         self.max_open_shards = max(1, int(max_open_shards))
         self._lock = threading.RLock()
         self._contexts: OrderedDict[str, ArtifactDatasetContext] = OrderedDict()
+        self._pinned: set[str] = set()
 
     def open(self, resolved: ResolvedArtifact) -> ArtifactDatasetContext:
         artifact_key = str(
@@ -203,11 +204,29 @@ class ArtifactContextRegistry:
             )
             self._contexts[artifact_key] = context
             while len(self._contexts) > self.max_contexts:
-                _artifact_path, evicted = self._contexts.popitem(last=False)
-                evicted.close()
+                victim = next(
+                    (
+                        path
+                        for path in self._contexts
+                        if path not in self._pinned and path != artifact_key
+                    ),
+                    None,
+                )
+                if victim is None:
+                    break
+                self._contexts.pop(victim).close()
                 csr_artifact_metrics.increment("context.eviction")
             return context
 
+    def pin(self, artifact_directory: str | Path, pinned: bool = True) -> None:
+        """Keep an artifact's reader open regardless of LRU pressure."""
+        artifact_key = str(Path(artifact_directory).expanduser().resolve())
+        with self._lock:
+            if pinned:
+                self._pinned.add(artifact_key)
+            else:
+                self._pinned.discard(artifact_key)
+
     def open_path(
         self,
         artifact_directory: str | Path,
@@ -245,6 +264,7 @@ class ArtifactContextRegistry:
                 "fingerprints": [
                     context.fingerprint for context in self._contexts.values()
                 ],
+                "pinned": sorted(self._pinned),
                 "max_contexts": self.max_contexts,
                 "max_open_shards": self.max_open_shards,
             }
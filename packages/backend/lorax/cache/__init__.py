@@ -19,9 +19,16 @@ from lorax.cache.tree_graph import TreeGraphCache
 from lorax.cache.csv_tree_graph import CsvTreeGraphCache
 from lorax.cache.file_context import FileContext
 from lorax.cache.file_cache import (
+    estimate_load_bytes,
     evict_file,
     get_file_context,
     get_file_cache_size,
+    get_file_cache_status,
+    load_admitted,
+    pin_file,
+    reclaim_file_cache,
+    set_load_admission,
+    unpin_file,
     # Backwards compatibility
     get_or_load_ts,
     get_ts_cache_size,
@@ -36,9 +43,16 @@ __all__ = [
     "CsvTreeGraphCache",
     # Unified file caching (preferred API)
     "FileContext",
+    "estimate_load_bytes",
     "evict_file",
     "get_file_context",
     "get_file_cache_size",
+    "get_file_cache_status",
+    "load_admitted",
+    "pin_file",
+    "reclaim_file_cache",
+    "set_load_admission",
+    "unpin_file",
     # Backwards compatibility
     "get_or_load_ts",
     "get_ts_cache_size",
@@ -10,12 +10,16 @@ import json
 import hashlib
 import asyncio
 import fcntl
+import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime, timezone
 from typing import Optional, Dict, Any
 from dataclasses import dataclass, asdict
 
-import aiofiles
+from lorax.cache.eviction import EvictionPolicy, get_eviction_policy
+
 
 
 @dataclass
@@ -36,95 +40,412 @@ class CachedFile:
         return CachedFile(**data)
 
 
+_LEGACY_MANIFEST_VERSION = 1
+
+
 class DiskCacheManifest:
-    """Thread-safe manifest for tracking cached files."""
+    """
+    Manifest for tracking cached files, backed by SQLite in WAL mode.
 
-    def __init__(self, manifest_path: Path):
-        self.manifest_path = manifest_path
-        self._lock = asyncio.Lock()
+    Each record/touch/evict is a single indexed transaction, so cache-hit
+    bookkeeping is O(log n) and safe across worker processes sharing the
+    cache directory. The running total size is maintained by triggers.
 
-    async def load(self) -> Dict[str, Any]:
-        """Load manifest from disk."""
-        if not self.manifest_path.exists():
-            return {"version": 1, "files": {}, "total_size_bytes": 0}
+    ``manifest_path`` names the legacy JSON manifest; the database lives
+    next to it (``manifest.sqlite``) and the JSON file is imported once,
+    then renamed to ``*.migrated``.
 
+    Each row carries a hit count and an eviction priority computed by the
+    configured ``EvictionPolicy`` (registered as the ``lorax_priority`` SQL
+    function); victims are taken in ascending priority order.
+    """
+
+    def __init__(self, manifest_path: Path, policy: EvictionPolicy | str = "lru"):
+        self.manifest_path = Path(manifest_path)
+        self.db_path = self.manifest_path.with_suffix(".sqlite")
+        self.policy = get_eviction_policy(policy)
+        self._local = threading.local()
+        self._ready = False
+        self._ready_lock = threading.Lock()
+
+    # -- connection / schema -------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                self.db_path, timeout=30.0, isolation_level=None
+            )
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA busy_timeout = 30000")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.create_function(
+                "lorax_priority", 4, self.policy.priority, deterministic=True
+            )
+            self._local.conn = conn
+        if not self._ready:
+            with self._ready_lock:
+                if not self._ready:
+                    self._init_schema(conn)
+                    self._ready = True
+        return conn
+
+    def _init_schema(self, conn: sqlite3.Connection):
+        conn.execute("PRAGMA journal_mode = WAL")
+        with _transaction(conn):
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(files)")}
+            for column, ddl in _ADDED_COLUMNS.items():
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE files ADD COLUMN {ddl}")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS files_priority ON files (priority)"
+            )
+            stored_policy = conn.execute(
+                "SELECT value FROM meta WHERE key = 'policy'"
+            ).fetchone()
+            if stored_policy is None or stored_policy["value"] != self.policy.name:
+                # Priorities from another policy are on a different scale.
+                conn.execute(
+                    f"UPDATE files SET priority = lorax_priority("
+                    f"hits, size_bytes, 0.0, {_EPOCH_SQL.format('last_access')})"
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('policy', ?)",
+                    (self.policy.name,),
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('inflation', '0')"
+                )
+            migrated = conn.execute(
+                "SELECT value FROM meta WHERE key = 'json_migrated'"
+            ).fetchone()
+            if migrated is None:
+                self._migrate_json(conn)
+                conn.execute(
+                    "INSERT INTO meta (key, value) VALUES ('json_migrated', '1')"
+                )
+
+    def _migrate_json(self, conn: sqlite3.Connection):
+        """Import the legacy JSON manifest (runs inside the schema transaction)."""
+        if not self.manifest_path.exists():
+            return
         try:
-            async with aiofiles.open(self.manifest_path, "r") as f:
-                content = await f.read()
-                return json.loads(content) if content else {"version": 1, "files": {}, "total_size_bytes": 0}
+            data = json.loads(self.manifest_path.read_text() or "{}")
         except (json.JSONDecodeError, IOError) as e:
-            print(f"Warning: Failed to load manifest: {e}")
-            return {"version": 1, "files": {}, "total_size_bytes": 0}
+            print(f"Warning: Failed to migrate manifest: {e}")
+            return
+        files = data.get("files", {})
+        conn.executemany(_UPSERT, [
+            _row(cache_key, CachedFile.from_dict(file_data))
+            for cache_key, file_data in files.items()
+        ])
+        self.manifest_path.rename(self.manifest_path.with_suffix(".json.migrated"))
+        print(f"Migrated {len(files)} disk cache entries to {self.db_path.name}")
+
+    async def _run(self, fn, *args):
+        return await asyncio.to_thread(fn, *args)
+
+    # -- snapshot API (legacy JSON shape) ------------------------------------
+
+    def _load_sync(self) -> Dict[str, Any]:
+        conn = self._connect()
+        files = {
+            row["cache_key"]: _cached_file(row).to_dict()
+            for row in conn.execute("SELECT * FROM files")
+        }
+        return {
+            "version": _LEGACY_MANIFEST_VERSION,
+            "files": files,
+            "total_size_bytes": self._total_size_sync(),
+        }
+
+    async def load(self) -> Dict[str, Any]:
+        """Return a snapshot of the manifest in the legacy JSON layout."""
+        return await self._run(self._load_sync)
+
+    def _save_sync(self, data: Dict[str, Any]):
+        conn = self._connect()
+        with _transaction(conn):
+            conn.execute("DELETE FROM files")
+            conn.executemany(_UPSERT, [
+                _row(cache_key, CachedFile.from_dict(file_data))
+                for cache_key, file_data in data.get("files", {}).items()
+            ])
 
     async def save(self, data: Dict[str, Any]):
-        """Save manifest to disk atomically."""
-        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
-        tmp_path = self.manifest_path.with_suffix(".tmp")
+        """Replace the manifest contents with a legacy-layout snapshot."""
+        await self._run(self._save_sync, data)
 
-        async with aiofiles.open(tmp_path, "w") as f:
-            await f.write(json.dumps(data, indent=2))
+    # -- per-entry operations ------------------------------------------------
 
-        # Atomic rename
-        tmp_path.rename(self.manifest_path)
+    def _get_file_sync(self, cache_key: str) -> Optional[CachedFile]:
+        row = self._connect().execute(
+            "SELECT * FROM files WHERE cache_key = ?", (cache_key,)
+        ).fetchone()
+        return _cached_file(row) if row else None
 
     async def get_file(self, cache_key: str) -> Optional[CachedFile]:
         """Get cached file metadata."""
-        async with self._lock:
-            data = await self.load()
-            file_data = data["files"].get(cache_key)
-            if file_data:
-                return CachedFile.from_dict(file_data)
-            return None
+        return await self._run(self._get_file_sync, cache_key)
+
+    def _set_file_sync(self, cache_key: str, cached_file: CachedFile):
+        self._connect().execute(_UPSERT, _row(cache_key, cached_file))
 
     async def set_file(self, cache_key: str, cached_file: CachedFile):
         """Set cached file metadata."""
-        async with self._lock:
-            data = await self.load()
-
-            # Update total size
-            old_file = data["files"].get(cache_key)
-            if old_file:
-                data["total_size_bytes"] -= old_file.get("size_bytes", 0)
-
-            data["files"][cache_key] = cached_file.to_dict()
-            data["total_size_bytes"] += cached_file.size_bytes
-
-            await self.save(data)
+        await self._run(self._set_file_sync, cache_key, cached_file)
+
+    def _touch_sync(self, cache_key: str) -> Optional[CachedFile]:
+        now = datetime.now(timezone.utc)
+        row = self._connect().execute(
+            f"""
+            UPDATE files SET
+                last_access = ?,
+                hits = hits + 1,
+                priority = lorax_priority(hits + 1, size_bytes, {_INFLATION_SQL}, ?)
+            WHERE cache_key = ? RETURNING *
+            """,
+            (now.isoformat(), now.timestamp(), cache_key),
+        ).fetchone()
+        return _cached_file(row) if row else None
 
     async def update_access_time(self, cache_key: str):
         """Update last access time for a cached file."""
-        async with self._lock:
-            data = await self.load()
-            if cache_key in data["files"]:
-                data["files"][cache_key]["last_access"] = datetime.now(timezone.utc).isoformat()
-                await self.save(data)
+        await self._run(self._touch_sync, cache_key)
+
+    async def touch(self, cache_key: str) -> Optional[CachedFile]:
+        """Record a cache hit and return the entry in one statement."""
+        return await self._run(self._touch_sync, cache_key)
+
+    def _remove_file_sync(self, cache_key: str) -> Optional[CachedFile]:
+        row = self._connect().execute(
+            "DELETE FROM files WHERE cache_key = ? RETURNING *", (cache_key,)
+        ).fetchone()
+        return _cached_file(row) if row else None
 
     async def remove_file(self, cache_key: str) -> Optional[CachedFile]:
         """Remove a file from the manifest."""
-        async with self._lock:
-            data = await self.load()
-            file_data = data["files"].pop(cache_key, None)
-            if file_data:
-                data["total_size_bytes"] -= file_data.get("size_bytes", 0)
-                await self.save(data)
-                return CachedFile.from_dict(file_data)
-            return None
+        return await self._run(self._remove_file_sync, cache_key)
+
+    def _total_size_sync(self) -> int:
+        row = self._connect().execute(
+            "SELECT total_size_bytes FROM totals WHERE id = 0"
+        ).fetchone()
+        return int(row["total_size_bytes"]) if row else 0
 
     async def get_total_size(self) -> int:
         """Get total size of cached files in bytes."""
-        data = await self.load()
-        return data.get("total_size_bytes", 0)
+        return await self._run(self._total_size_sync)
+
+    def _file_count_sync(self) -> int:
+        row = self._connect().execute(
+            "SELECT file_count FROM totals WHERE id = 0"
+        ).fetchone()
+        return int(row["file_count"]) if row else 0
+
+    async def get_file_count(self) -> int:
+        """Get number of cached files."""
+        return await self._run(self._file_count_sync)
+
+    def _files_by_access_sync(self) -> list:
+        return [
+            (row["cache_key"], _cached_file(row))
+            for row in self._connect().execute(
+                "SELECT * FROM files ORDER BY last_access"
+            )
+        ]
 
     async def get_files_by_access_time(self) -> list:
         """Get all files sorted by last access time (oldest first)."""
-        data = await self.load()
-        files = []
-        for cache_key, file_data in data["files"].items():
-            files.append((cache_key, CachedFile.from_dict(file_data)))
+        return await self._run(self._files_by_access_sync)
+
+    def _pop_victims_sync(self, target_size: int) -> list:
+        conn = self._connect()
+        evicted = []
+        with _transaction(conn):
+            current = self._total_size_sync()
+            inflation = self._inflation_sync()
+            rows = conn.execute(
+                "SELECT * FROM files WHERE pinned = 0 ORDER BY priority"
+            )
+            for row in rows:
+                if current <= target_size:
+                    break
+                evicted.append((row["cache_key"], _cached_file(row)))
+                current -= int(row["size_bytes"])
+                inflation = self.policy.inflation_after_evict(
+                    inflation, row["priority"]
+                )
+            rows.close()
+            conn.executemany(
+                "DELETE FROM files WHERE cache_key = ?",
+                [(cache_key,) for cache_key, _ in evicted],
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('inflation', ?)",
+                (repr(inflation),),
+            )
+        return evicted
 
-        # Sort by last_access (oldest first)
-        files.sort(key=lambda x: x[1].last_access)
-        return files
+    async def pop_victims(self, target_size: int) -> list:
+        """Atomically remove the lowest-priority entries until the total
+        size is at most ``target_size``; returns the removed entries."""
+        return await self._run(self._pop_victims_sync, target_size)
+
+    def _set_pinned_sync(self, cache_key: str, pinned: bool) -> bool:
+        cursor = self._connect().execute(
+            "UPDATE files SET pinned = ? WHERE cache_key = ?",
+            (int(bool(pinned)), cache_key),
+        )
+        return cursor.rowcount > 0
+
+    async def set_pinned(self, cache_key: str, pinned: bool = True) -> bool:
+        """Exempt an entry from eviction; returns False if it is not cached."""
+        return await self._run(self._set_pinned_sync, cache_key, pinned)
+
+    def _pinned_sync(self) -> list:
+        return [
+            (row["cache_key"], _cached_file(row))
+            for row in self._connect().execute(
+                "SELECT * FROM files WHERE pinned = 1 ORDER BY gcs_path"
+            )
+        ]
+
+    async def get_pinned_files(self) -> list:
+        """All pinned entries as (cache_key, CachedFile)."""
+        return await self._run(self._pinned_sync)
+
+    def _most_used_sync(self, limit: int) -> list:
+        return [
+            (row["cache_key"], _cached_file(row))
+            for row in self._connect().execute(
+                "SELECT * FROM files ORDER BY hits DESC, last_access DESC LIMIT ?",
+                (int(limit),),
+            )
+        ]
+
+    async def get_most_used_files(self, limit: int) -> list:
+        """The ``limit`` entries with the most cache hits."""
+        return await self._run(self._most_used_sync, limit)
+
+    def _inflation_sync(self) -> float:
+        row = self._connect().execute(
+            "SELECT value FROM meta WHERE key = 'inflation'"
+        ).fetchone()
+        return float(row["value"]) if row else 0.0
+
+    async def get_inflation(self) -> float:
+        """Current policy inflation value (priority of the last victim)."""
+        return await self._run(self._inflation_sync)
+
+
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS files (
+        cache_key TEXT PRIMARY KEY,
+        gcs_path TEXT NOT NULL,
+        local_path TEXT NOT NULL,
+        size_bytes INTEGER NOT NULL,
+        last_access TEXT NOT NULL,
+        download_complete INTEGER NOT NULL,
+        etag TEXT,
+        hits INTEGER NOT NULL DEFAULT 1,
+        priority REAL NOT NULL DEFAULT 0,
+        pinned INTEGER NOT NULL DEFAULT 0
+    )""",
+    "CREATE INDEX IF NOT EXISTS files_last_access ON files (last_access)",
+    "CREATE INDEX IF NOT EXISTS files_size_bytes ON files (size_bytes)",
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)",
+    """CREATE TABLE IF NOT EXISTS totals (
+        id INTEGER PRIMARY KEY CHECK (id = 0),
+        total_size_bytes INTEGER NOT NULL,
+        file_count INTEGER NOT NULL
+    )""",
+    """INSERT OR IGNORE INTO totals (id, total_size_bytes, file_count)
+    SELECT 0, COALESCE(SUM(size_bytes), 0), COUNT(*) FROM files""",
+    """CREATE TRIGGER IF NOT EXISTS files_insert AFTER INSERT ON files BEGIN
+        UPDATE totals SET total_size_bytes = total_size_bytes + NEW.size_bytes,
+                          file_count = file_count + 1 WHERE id = 0;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS files_delete AFTER DELETE ON files BEGIN
+        UPDATE totals SET total_size_bytes = total_size_bytes - OLD.size_bytes,
+                          file_count = file_count - 1 WHERE id = 0;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS files_resize AFTER UPDATE OF size_bytes ON files BEGIN
+        UPDATE totals
+        SET total_size_bytes = total_size_bytes - OLD.size_bytes + NEW.size_bytes
+        WHERE id = 0;
+    END""",
+)
+
+# Columns added after the first SQLite release of the manifest.
+_ADDED_COLUMNS = {
+    "hits": "hits INTEGER NOT NULL DEFAULT 1",
+    "priority": "priority REAL NOT NULL DEFAULT 0",
+    "pinned": "pinned INTEGER NOT NULL DEFAULT 0",
+}
+
+# Unix time (float seconds) of an ISO-8601 timestamp column or parameter.
+_EPOCH_SQL = "((julianday({}) - 2440587.5) * 86400.0)"
+_INFLATION_SQL = (
+    "COALESCE((SELECT CAST(value AS REAL) FROM meta WHERE key = 'inflation'), 0.0)"
+)
+
+# Re-recording an entry (e.g. a re-download) keeps its hit count.
+_UPSERT = f"""
+INSERT INTO files (cache_key, gcs_path, local_path, size_bytes, last_access,
+                   download_complete, etag, hits, priority)
+VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?7, 1,
+        lorax_priority(1, ?4, {_INFLATION_SQL}, {_EPOCH_SQL.format('?5')}))
+ON CONFLICT (cache_key) DO UPDATE SET
+    gcs_path = excluded.gcs_path,
+    local_path = excluded.local_path,
+    size_bytes = excluded.size_bytes,
+    last_access = excluded.last_access,
+    download_complete = excluded.download_complete,
+    etag = excluded.etag,
+    priority = lorax_priority(
+        files.hits, excluded.size_bytes, {_INFLATION_SQL},
+        {_EPOCH_SQL.format('excluded.last_access')}
+    )
+"""
+
+
+@contextmanager
+def _transaction(conn: sqlite3.Connection):
+    """BEGIN IMMEDIATE so concurrent writers queue on the database lock."""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def _row(cache_key: str, cached_file: CachedFile) -> tuple:
+    return (
+        cache_key,
+        cached_file.gcs_path,
+        cached_file.local_path,
+        int(cached_file.size_bytes),
+        cached_file.last_access,
+        int(bool(cached_file.download_complete)),
+        cached_file.etag,
+    )
+
+
+def _cached_file(row: sqlite3.Row) -> CachedFile:
+    return CachedFile(
+        gcs_path=row["gcs_path"],
+        local_path=row["local_path"],
+        size_bytes=int(row["size_bytes"]),
+        last_access=row["last_access"],
+        download_complete=bool(row["download_complete"]),
+        etag=row["etag"],
+    )
 
 
 class FileLock:
@@ -220,13 +541,17 @@ class RedisLock:
 
 class DiskCacheManager:
     """
-    LRU disk cache manager for GCS file downloads.
+    Disk cache manager for GCS file downloads.
 
     Features:
-    - 50GB (configurable) LRU eviction
+    - 50GB (configurable) size-aware eviction (GDSF or LRU policy)
+    - High/low watermarks: once usage would pass ``high_watermark`` of the
+      budget, entries are evicted down to ``low_watermark``
     - Atomic downloads (temp file + rename)
     - Distributed locking (Redis or file-based)
     - Access time tracking
+    - Derived files (e.g. decompressed .tsz inputs) accounted alongside
+      downloads and revalidated against their source's size and mtime
     """
 
     def __init__(
@@ -234,16 +559,32 @@ class DiskCacheManager:
         cache_dir: Path,
         max_size_bytes: int,
         redis_client=None,
-        enabled: bool = True
+        enabled: bool = True,
+        policy: EvictionPolicy | str = "gdsf",
+        high_watermark: float = 0.95,
+        low_watermark: float = 0.85,
     ):
+        if not 0 < low_watermark <= high_watermark <= 1:
+            raise ValueError(
+                "Disk cache watermarks must satisfy 0 < low <= high <= 1, "
+                f"got low={low_watermark} high={high_watermark}"
+            )
         self.cache_dir = Path(cache_dir)
         self.max_size_bytes = max_size_bytes
         self.redis = redis_client
         self.enabled = enabled
+        self.high_watermark = high_watermark
+        self.low_watermark = low_watermark
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.evicted_bytes = 0
 
         self.files_dir = self.cache_dir / "files"
         self.locks_dir = self.cache_dir / "locks"
-        self.manifest = DiskCacheManifest(self.cache_dir / "manifest.json")
+        self.manifest = DiskCacheManifest(
+            self.cache_dir / "manifest.json", policy=policy
+        )
 
         # Create directories
         if self.enabled:
@@ -287,40 +628,40 @@ class DiskCacheManager:
             return None
 
         cache_key = self._get_cache_key(gcs_bucket, gcs_path)
-        cached_file = await self.manifest.get_file(cache_key)
+        # Lookup and access-time update are a single indexed statement
+        cached_file = await self.manifest.touch(cache_key)
 
         if cached_file and cached_file.download_complete:
             local_path = Path(cached_file.local_path)
             if local_path.exists():
-                # Update access time
-                await self.manifest.update_access_time(cache_key)
                 print(f"Cache hit: {gcs_path}")
+                self.hits += 1
                 return local_path
             else:
                 # File was deleted externally, remove from manifest
                 await self.manifest.remove_file(cache_key)
 
+        self.misses += 1
         return None
 
     async def evict_if_needed(self, required_bytes: int = 0):
-        """Evict oldest files until we have space for required_bytes."""
+        """Make room for ``required_bytes`` if usage would pass the high
+        watermark, evicting lowest-priority files down to the low watermark."""
         if not self.enabled:
             return
 
-        target_size = self.max_size_bytes - required_bytes
         current_size = await self.manifest.get_total_size()
-
-        if current_size <= target_size:
+        if current_size + required_bytes <= self.max_size_bytes * self.high_watermark:
             return
+        target_size = max(0, int(self.max_size_bytes * self.low_watermark) - required_bytes)
 
-        # Get files sorted by access time (oldest first)
-        files = await self.manifest.get_files_by_access_time()
+        # Remove victims from the manifest in one transaction, then delete
+        # their files; concurrent evictors never pick the same entry.
+        evicted = await self.manifest.pop_victims(target_size)
 
-        for cache_key, cached_file in files:
-            if current_size <= target_size:
-                break
-
-            # Delete file
+        self.evictions += len(evicted)
+        self.evicted_bytes += sum(cached_file.size_bytes for _, cached_file in evicted)
+        for cache_key, cached_file in evicted:
             local_path = Path(cached_file.local_path)
             if local_path.exists():
                 try:
@@ -329,9 +670,12 @@ class DiskCacheManager:
                 except OSError as e:
                     print(f"Warning: Failed to delete {local_path}: {e}")
 
-            # Remove from manifest
-            await self.manifest.remove_file(cache_key)
-            current_size -= cached_file.size_bytes
+    async def pin(self, gcs_bucket: str, gcs_path: str, pinned: bool = True) -> bool:
+        """Exempt a cached GCS file from eviction (or release it)."""
+        if not self.enabled:
+            return False
+        cache_key = self._get_cache_key(gcs_bucket, gcs_path)
+        return await self.manifest.set_pinned(cache_key, pinned)
 
     async def cache_file(
         self,
@@ -399,8 +743,9 @@ class DiskCacheManager:
             if cached_path:
                 return cached_path
 
-            # Estimate size and evict if needed (conservative estimate)
-            await self.evict_if_needed(required_bytes=1024 * 1024 * 1024)  # 1GB buffer
+            # Restore headroom if an earlier download left usage past the
+            # high watermark; the real size is accounted for below.
+            await self.evict_if_needed()
 
             # Download to temp file
             tmp_path = local_path.with_suffix(local_path.suffix + ".tmp")
@@ -430,13 +775,110 @@ class DiskCacheManager:
         finally:
             await self._release_lock(lock)
 
+    def _get_derived_key(self, source_path: str, kind: str) -> str:
+        """Cache key for a file derived from a local source."""
+        return self._get_cache_key(kind, str(Path(source_path).resolve()))
+
+    @staticmethod
+    def _source_signature(source_path: str) -> str:
+        stat = Path(source_path).stat()
+        return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+    async def get_derived_path(self, source_path: str, kind: str) -> Optional[Path]:
+        """
+        Path of a cached file derived from ``source_path``, or None.
+
+        Entries whose source changed size or mtime since they were written
+        are dropped. Updates access time on hit.
+        """
+        if not self.enabled:
+            return None
+
+        cache_key = self._get_derived_key(source_path, kind)
+        cached_file = await self.manifest.touch(cache_key)
+        if cached_file is None or not cached_file.download_complete:
+            self.misses += 1
+            return None
+
+        local_path = Path(cached_file.local_path)
+        try:
+            current = self._source_signature(source_path)
+        except OSError:
+            current = None
+        if cached_file.etag == current and local_path.exists():
+            self.hits += 1
+            return local_path
+
+        self.misses += 1
+        await self.manifest.remove_file(cache_key)
+        local_path.unlink(missing_ok=True)
+        return None
+
+    async def pin_derived(self, source_path: str, kind: str, pinned: bool = True) -> bool:
+        """Exempt a derived file from eviction (or release it)."""
+        if not self.enabled:
+            return False
+        cache_key = self._get_derived_key(source_path, kind)
+        return await self.manifest.set_pinned(cache_key, pinned)
+
+    async def store_derived(
+        self,
+        source_path: str,
+        kind: str,
+        write_func,
+        suffix: str = ".dat",
+    ) -> Optional[Path]:
+        """
+        Write a file derived from ``source_path`` into the cache.
+
+        Args:
+            source_path: Local file the derived copy is computed from
+            kind: Derivation name (e.g. "decompressed"), part of the cache key
+            write_func: function(path) that writes the derived file; run in a thread
+            suffix: Extension for the cached file
+
+        Returns:
+            Path to the cached file, or None if the cache is disabled
+        """
+        if not self.enabled:
+            return None
+
+        cache_key = self._get_derived_key(source_path, kind)
+        local_path = self.files_dir / f"{cache_key}{suffix}"
+
+        lock = await self._acquire_lock(cache_key)
+        try:
+            signature = self._source_signature(source_path)
+            tmp_path = local_path.with_suffix(local_path.suffix + ".tmp")
+            try:
+                await asyncio.to_thread(write_func, str(tmp_path))
+                size_bytes = tmp_path.stat().st_size
+                await self.evict_if_needed(required_bytes=size_bytes)
+                tmp_path.replace(local_path)
+            except Exception:
+                tmp_path.unlink(missing_ok=True)
+                raise
+
+            await self.manifest.set_file(cache_key, CachedFile(
+                gcs_path=f"{kind}:{Path(source_path).resolve()}",
+                local_path=str(local_path),
+                size_bytes=size_bytes,
+                last_access=datetime.now(timezone.utc).isoformat(),
+                download_complete=True,
+                etag=signature,
+            ))
+            print(f"Cached {kind} copy of {source_path} ({size_bytes / 1024 / 1024:.1f} MB)")
+            return local_path
+        finally:
+            await self._release_lock(lock)
+
     async def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
         if not self.enabled:
             return {"enabled": False}
 
         total_size = await self.manifest.get_total_size()
-        data = await self.manifest.load()
+        file_count = await self.manifest.get_file_count()
 
         return {
             "enabled": True,
@@ -444,7 +886,18 @@ class DiskCacheManager:
             "total_size_mb": round(total_size / 1024 / 1024, 2),
             "max_size_mb": round(self.max_size_bytes / 1024 / 1024, 2),
             "usage_percent": round(total_size / self.max_size_bytes * 100, 1) if self.max_size_bytes > 0 else 0,
-            "file_count": len(data["files"]),
+            "eviction_policy": self.manifest.policy.name,
+            "pinned_files": [
+                cached_file.gcs_path
+                for _, cached_file in await self.manifest.get_pinned_files()
+            ],
+            "high_watermark": self.high_watermark,
+            "low_watermark": self.low_watermark,
+            "file_count": file_count,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "evicted_bytes": self.evicted_bytes,
             "cache_dir": str(self.cache_dir),
         }
 
@@ -0,0 +1,176 @@
+"""
+Eviction policies for the on-disk file cache.
+
+A policy maps an entry's hit count, size and the cache's current inflation
+value to a priority; the entry with the lowest priority is evicted first.
+The same functions drive the SQLite manifest (registered as a SQL function)
+and the trace simulator below, so simulated hit rates match production.
+
+- ``lru``: priority is the last access time.
+- ``gdsf``: Greedy-Dual-Size-Frequency. Priority is
+  ``inflation + hits * cost / size`` where ``cost`` models a GCS re-fetch as
+  a fixed per-request overhead plus the transfer itself. Small, frequently
+  used files outrank a large one-off upload, and the inflation value (the
+  priority of the last victim) ages out entries that stop being used.
+"""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+# Bytes a re-fetch "costs" before any payload moves (request latency,
+# decompression, config computation) expressed at typical GCS throughput.
+DEFAULT_FETCH_OVERHEAD_BYTES = 16 * 1024 * 1024
+
+
+class EvictionPolicy(ABC):
+    """Priority function shared by the manifest and the simulator."""
+
+    name = "base"
+
+    @abstractmethod
+    def priority(self, hits: int, size_bytes: int, inflation: float, clock: float) -> float:
+        """Eviction priority of an entry; the lowest is evicted first."""
+
+    def inflation_after_evict(self, inflation: float, victim_priority: float) -> float:
+        return inflation
+
+
+class LRUPolicy(EvictionPolicy):
+    """Evict the least recently used entry."""
+
+    name = "lru"
+
+    def priority(self, hits, size_bytes, inflation, clock):
+        return float(clock)
+
+
+class GDSFPolicy(EvictionPolicy):
+    """Greedy-Dual-Size-Frequency: weigh re-fetch cost, size and frequency."""
+
+    name = "gdsf"
+
+    def __init__(self, fetch_overhead_bytes: int = DEFAULT_FETCH_OVERHEAD_BYTES):
+        self.fetch_overhead_bytes = int(fetch_overhead_bytes)
+
+    def priority(self, hits, size_bytes, inflation, clock):
+        size = max(1, int(size_bytes))
+        cost = self.fetch_overhead_bytes + size
+        return float(inflation) + int(hits) * cost / size
+
+    def inflation_after_evict(self, inflation, victim_priority):
+        return max(float(inflation), float(victim_priority))
+
+
+EVICTION_POLICIES = {
+    LRUPolicy.name: LRUPolicy,
+    GDSFPolicy.name: GDSFPolicy,
+}
+
+
+def get_eviction_policy(policy) -> EvictionPolicy:
+    """Return a policy instance from a name or pass an instance through."""
+    if isinstance(policy, EvictionPolicy):
+        return policy
+    name = str(policy or LRUPolicy.name).strip().lower()
+    if name not in EVICTION_POLICIES:
+        raise ValueError(
+            f"Unknown disk cache eviction policy {policy!r}; "
+            f"expected one of {sorted(EVICTION_POLICIES)}"
+        )
+    return EVICTION_POLICIES[name]()
+
+
+@dataclass
+class SimulationResult:
+    """Outcome of replaying an access trace against one policy."""
+
+    policy: str
+    requests: int
+    hits: int
+    bytes_fetched: int
+    evictions: int
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.requests if self.requests else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "policy": self.policy,
+            "requests": self.requests,
+            "hits": self.hits,
+            "hit_rate": round(self.hit_rate, 4),
+            "bytes_fetched": self.bytes_fetched,
+            "evictions": self.evictions,
+        }
+
+
+def simulate(
+    trace: Iterable[tuple[str, int]],
+    policy,
+    capacity_bytes: int,
+    *,
+    high_watermark: float = 1.0,
+    low_watermark: float = 1.0,
+) -> SimulationResult:
+    """Replay ``(key, size_bytes)`` accesses through a cache of ``capacity_bytes``.
+
+    Mirrors ``DiskCacheManager``: a miss fetches the file, then entries are
+    evicted down to the low watermark once the total would exceed the high
+    watermark. Files larger than the cache are fetched but not retained.
+    """
+    policy = get_eviction_policy(policy)
+    high = capacity_bytes * high_watermark
+    low = capacity_bytes * low_watermark
+    entries: dict[str, list] = {}  # key -> [hits, size, priority]
+    total = 0
+    inflation = 0.0
+    result = SimulationResult(policy.name, 0, 0, 0, 0)
+
+    for clock, (key, size_bytes) in enumerate(trace):
+        result.requests += 1
+        entry = entries.get(key)
+        if entry is not None:
+            result.hits += 1
+            entry[0] += 1
+            entry[2] = policy.priority(entry[0], entry[1], inflation, clock)
+            continue
+
+        result.bytes_fetched += size_bytes
+        if size_bytes > capacity_bytes:
+            continue
+        if total + size_bytes > high:
+            target = max(0.0, low - size_bytes)
+            for victim in sorted(entries, key=lambda k: entries[k][2]):
+                if total <= target:
+                    break
+                _, victim_size, victim_priority = entries.pop(victim)
+                total -= victim_size
+                inflation = policy.inflation_after_evict(inflation, victim_priority)
+                result.evictions += 1
+        entries[key] = [1, size_bytes, policy.priority(1, size_bytes, inflation, clock)]
+        total += size_bytes
+
+    return result
+
+
+def compare_policies(
+    trace: list[tuple[str, int]],
+    capacity_bytes: int,
+    *,
+    policies: Optional[Iterable] = None,
+    high_watermark: float = 1.0,
+    low_watermark: float = 1.0,
+) -> list[SimulationResult]:
+    """Simulate the same trace under each policy."""
+    return [
+        simulate(
+            trace,
+            policy,
+            capacity_bytes,
+            high_watermark=high_watermark,
+            low_watermark=low_watermark,
+        )
+        for policy in (policies or EVICTION_POLICIES)
+    ]
@@ -9,16 +9,30 @@ This replaces the separate tree_sequence, config, and metadata caches.
 """
 
 import asyncio
+import json
+import math
+import zipfile
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
 from pathlib import Path
-from typing import Optional
+from typing import AsyncContextManager, Callable, Iterator, Optional
 
+import numpy as np
 import pandas as pd
 import tskit
 import tszip
 
 from lorax.cache.lru import LRUCacheWithMeta
 from lorax.cache.file_context import FileContext
-from lorax.constants import TS_CACHE_SIZE
+from lorax.cache.index_store import DerivedIndexStore
+from lorax.constants import (
+    DERIVED_INDEX_DIR,
+    DERIVED_INDEX_ENABLED,
+    DERIVED_INDEX_MAX_BYTES,
+    PROCESS_FILE_CACHE_MAX_BYTES,
+    TS_CACHE_SIZE,
+)
 
 # Per-file locks to allow concurrent loading of different files
 # (replaces global lock that serialized all loads)
@@ -35,8 +49,70 @@ async def _get_file_lock(file_path: str) -> asyncio.Lock:
 
 
 # Global cache for FileContext objects
-# Uses LRUCacheWithMeta to track file mtime for cache validation
-_file_cache = LRUCacheWithMeta(max_size=TS_CACHE_SIZE)
+# Uses LRUCacheWithMeta to track file mtime for cache validation; entries are
+# sized by FileContext.nbytes so large files count against a byte ceiling
+# (this process's share of the budget when compute workers run).
+_file_cache = LRUCacheWithMeta(
+    max_size=TS_CACHE_SIZE,
+    max_bytes=PROCESS_FILE_CACHE_MAX_BYTES,
+    sizeof=lambda ctx: ctx.nbytes,
+)
+# get_file_context lookups served from _file_cache vs. loaded from disk.
+_file_cache_lookups: Counter = Counter()
+
+# Derived indexes persisted across restarts and evictions (None when disabled).
+_index_store: Optional[DerivedIndexStore] = (
+    DerivedIndexStore(Path(DERIVED_INDEX_DIR), max_bytes=DERIVED_INDEX_MAX_BYTES)
+    if DERIVED_INDEX_ENABLED
+    else None
+)
+
+
+def get_index_store() -> Optional[DerivedIndexStore]:
+    """Return the derived index store, or None when persistence is disabled."""
+    return _index_store
+
+
+# Disk cache holding decompressed copies of .tsz inputs (set by lorax.context).
+_tsz_cache = None
+DECOMPRESSED_KIND = "decompressed"
+# Background writes of decompressed copies, by source path.
+_pending_decompressed_stores: dict[str, asyncio.Task] = {}
+
+
+def set_tsz_cache(disk_cache_manager) -> None:
+    """Keep decompressed .tsz inputs in ``disk_cache_manager`` (None disables)."""
+    global _tsz_cache
+    _tsz_cache = disk_cache_manager
+
+
+# Memory admission for FileContext loads (set by lorax.lorax_app):
+# ``admit(file_path)`` is held around every cache-miss load that its caller
+# has not already admitted, such as reloads after eviction and prefetches.
+_load_admission: Optional[Callable[[str], AsyncContextManager]] = None
+_load_admitted: ContextVar[bool] = ContextVar("lorax_load_admitted", default=False)
+
+
+def set_load_admission(admit: Optional[Callable[[str], AsyncContextManager]]) -> None:
+    """Hold ``admit(file_path)`` around cache-miss loads (None disables)."""
+    global _load_admission
+    _load_admission = admit
+
+
+@contextmanager
+def load_admitted() -> Iterator[None]:
+    """Mark loads in this block as already admitted by the caller."""
+    token = _load_admitted.set(True)
+    try:
+        yield
+    finally:
+        _load_admitted.reset(token)
+
+
+def _admit_load(file_path: str):
+    if _load_admission is None or _load_admitted.get():
+        return nullcontext()
+    return _load_admission(file_path)
 
 
 def _get_file_mtime(file_path: str) -> float:
@@ -59,6 +135,51 @@ def _load_tree_sequence(file_path: str):
         raise ValueError(f"Unsupported file type: {file_path}")
 
 
+async def _load_tree_sequence_cached(file_path: str):
+    """Load a file, decompressing each .tsz at most once per disk cache entry.
+
+    A decompressed copy is written to the disk cache in the background after
+    the first load and read with ``tskit.load`` until the source's size or
+    mtime changes or the cache evicts it.
+    """
+    manager = _tsz_cache
+    if manager is None or not manager.enabled or not file_path.endswith(".tsz"):
+        return await asyncio.to_thread(_load_tree_sequence, file_path)
+
+    cached_path = await manager.get_derived_path(file_path, DECOMPRESSED_KIND)
+    if cached_path is not None:
+        try:
+            return await asyncio.to_thread(tskit.load, str(cached_path))
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable decompressed copy of {file_path}: {e}")
+
+    ts = await asyncio.to_thread(_load_tree_sequence, file_path)
+    _store_decompressed_in_background(manager, file_path, ts)
+    return ts
+
+
+async def _store_decompressed(manager, file_path: str, ts) -> None:
+    try:
+        await manager.store_derived(file_path, DECOMPRESSED_KIND, ts.dump, suffix=".trees")
+    except Exception as e:
+        print(f"⚠️ Failed to cache decompressed copy of {file_path}: {e}")
+
+
+def _store_decompressed_in_background(manager, file_path: str, ts) -> None:
+    """Write the decompressed copy without holding up the load that made it."""
+    if file_path in _pending_decompressed_stores:
+        return
+    task = asyncio.create_task(_store_decompressed(manager, file_path, ts))
+    _pending_decompressed_stores[file_path] = task
+    task.add_done_callback(lambda _task: _pending_decompressed_stores.pop(file_path, None))
+
+
+async def drain_decompressed_stores() -> None:
+    """Wait for background decompressed-copy writes started so far (tests, shutdown)."""
+    while _pending_decompressed_stores:
+        await asyncio.gather(*list(_pending_decompressed_stores.values()), return_exceptions=True)
+
+
 async def get_file_context(file_path: str, root_dir: str = None) -> Optional[FileContext]:
     """
     Get or load a FileContext for the given file path.
@@ -91,6 +212,9 @@ async def get_file_context(file_path: str, root_dir: str = None) -> Optional[Fil
     if ctx is not None:
         if cached_mtime == current_mtime:
             print(f"✅ Using cached FileContext: {file_path}")
+            _file_cache_lookups["hits"] += 1
+            # Metadata and column views may have grown since the last visit.
+            _file_cache.refresh_size(file_path)
             return ctx
         else:
             print(f"🔄 File changed, reloading: {file_path}")
@@ -103,26 +227,42 @@ async def get_file_context(file_path: str, root_dir: str = None) -> Optional[Fil
         ctx, cached_mtime = _file_cache.get_with_meta(file_path)
         if ctx is not None and cached_mtime == current_mtime:
             print(f"✅ Using cached FileContext (after lock): {file_path}")
+            _file_cache_lookups["hits"] += 1
             return ctx
 
         print(f"📂 Loading FileContext: {file_path}")
+        _file_cache_lookups["misses"] += 1
 
         try:
-            # Load tree sequence
-            ts = await asyncio.to_thread(_load_tree_sequence, file_path)
-
-            # Compute config immediately (it's derived from ts)
-            effective_root_dir = root_dir or str(file_path_obj.parent)
-            config = await asyncio.to_thread(
-                compute_config, ts, file_path, effective_root_dir
-            )
+            async with _admit_load(file_path):
+                # Load tree sequence
+                ts = await _load_tree_sequence_cached(file_path)
+
+                # Compute config immediately (it's derived from ts), or reuse
+                # the copy persisted for identical file contents.
+                effective_root_dir = root_dir or str(file_path_obj.parent)
+                index_store = _index_store if isinstance(ts, tskit.TreeSequence) else None
+                fingerprint = config = None
+                if index_store is not None:
+                    fingerprint = await asyncio.to_thread(index_store.fingerprint, file_path)
+                    config = await asyncio.to_thread(
+                        index_store.load_config, fingerprint, file_path, effective_root_dir
+                    )
+                if config is None:
+                    config = await asyncio.to_thread(
+                        compute_config, ts, file_path, effective_root_dir
+                    )
+                    if index_store is not None and config is not None:
+                        await asyncio.to_thread(index_store.save_config, fingerprint, config)
 
             # Create FileContext with empty metadata cache
             ctx = FileContext(
                 file_path=file_path,
                 tree_sequence=ts,
                 config=config,
-                mtime=current_mtime
+                mtime=current_mtime,
+                _content_fingerprint=fingerprint,
+                index_store=index_store,
             )
 
             _file_cache.set(file_path, ctx, meta=current_mtime)
@@ -133,11 +273,115 @@ async def get_file_context(file_path: str, root_dir: str = None) -> Optional[Fil
             return None
 
 
+# Peak resident memory while loading a file and computing its config, as
+# multiples of the input size (measured with msprime simulations): tskit
+# holds the tables and the TreeSequence's copy, tszip additionally keeps
+# zarr chunk buffers, and pandas stores CSV cells as Python objects.
+LOAD_PEAK_FACTOR_TREES = 2.5
+LOAD_PEAK_FACTOR_TSZ_TABLES = 8.0
+LOAD_PEAK_FACTOR_TSZ_FALLBACK = 30.0
+LOAD_PEAK_FACTOR_CSV = 4.0
+
+
+def _tsz_table_bytes(file_path: str) -> Optional[int]:
+    """Uncompressed table bytes of a .tsz, from its zarr array headers."""
+    try:
+        with zipfile.ZipFile(file_path) as archive:
+            total = 0
+            for name in archive.namelist():
+                if name.endswith(".zarray"):
+                    header = json.loads(archive.read(name))
+                    total += math.prod(header["shape"]) * np.dtype(header["dtype"]).itemsize
+            return total or None
+    except Exception:
+        return None
+
+
+async def estimate_load_bytes(file_path: str, *, cold: bool = False) -> int:
+    """Estimated peak memory of loading ``file_path``.
+
+    0 when it is already loaded in this process, unless ``cold`` (the load
+    happens in another process).
+    """
+    try:
+        size = Path(file_path).stat().st_size
+    except OSError:
+        return 0
+    _ctx, cached_mtime = _file_cache.get_with_meta(file_path)
+    if not cold and _ctx is not None and cached_mtime == _get_file_mtime(file_path):
+        return 0
+    if file_path.endswith(".tsz"):
+        manager = _tsz_cache
+        if manager is not None and manager.enabled:
+            cached_path = await manager.get_derived_path(file_path, DECOMPRESSED_KIND)
+            if cached_path is not None:
+                return int(Path(cached_path).stat().st_size * LOAD_PEAK_FACTOR_TREES)
+        tables = await asyncio.to_thread(_tsz_table_bytes, file_path)
+        if tables is None:
+            return int(size * LOAD_PEAK_FACTOR_TSZ_FALLBACK)
+        return int(size + tables * LOAD_PEAK_FACTOR_TSZ_TABLES)
+    if file_path.endswith(".csv"):
+        return int(size * LOAD_PEAK_FACTOR_CSV)
+    return int(size * LOAD_PEAK_FACTOR_TREES)
+
+
 def get_file_cache_size() -> int:
     """Return current number of cached files."""
     return len(_file_cache.cache)
 
 
+def loaded_file_paths() -> list[str]:
+    """Paths with a FileContext in this process's cache."""
+    return list(_file_cache.cache)
+
+
+def get_file_cache_status() -> dict:
+    """Per-entry size estimates for the loaded-file cache, oldest first."""
+    entries = []
+    for file_path, (ctx, mtime) in list(_file_cache.cache.items()):
+        breakdown = ctx.size_breakdown()
+        entries.append({
+            "file_path": file_path,
+            "mtime": mtime,
+            "nbytes": sum(breakdown.values()),
+            "breakdown": breakdown,
+            "pinned": file_path in _file_cache.pinned,
+        })
+    return {
+        "entries": entries,
+        "total_bytes": sum(entry["nbytes"] for entry in entries),
+        "max_bytes": _file_cache.max_bytes,
+        "max_entries": _file_cache.max_size,
+        "hits": _file_cache_lookups["hits"],
+        "misses": _file_cache_lookups["misses"],
+        "evictions": _file_cache.evictions,
+        "pinned": sorted(_file_cache.pinned),
+    }
+
+
+def pin_file(file_path: str) -> None:
+    """Exempt a file's context from eviction (it still counts towards limits)."""
+    _file_cache.pin(file_path)
+
+
+def unpin_file(file_path: str) -> None:
+    """Make a pinned file's context evictable again."""
+    _file_cache.unpin(file_path)
+
+
+def set_file_cache_budget(max_bytes: int) -> None:
+    """Change this process's FileContext byte budget (0 disables it)."""
+    _file_cache.set_max_bytes(max_bytes)
+
+
+def reclaim_file_cache(nbytes: int) -> int:
+    """Evict unpinned FileContexts, least recently used first, to free ``nbytes``.
+
+    Returns the estimated bytes released.
+    """
+    return _file_cache.shed(nbytes)
+
+
 def evict_file(file_path: str) -> None:
     """Evict a specific file from the cache. Useful for benchmarking cold-load times."""
     _file_cache.remove(file_path)
@@ -6,14 +6,98 @@ When a file is evicted from cache, all related data is evicted together,
 preventing orphan metadata and ensuring atomic invalidation.
 """
 
+import hashlib
+import os
+import sys
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import Any, Optional, Union
+from typing import TYPE_CHECKING, Any, Optional, Union
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 import tskit
 
 from lorax.cache.lru import LRUCache
 
+if TYPE_CHECKING:
+    from lorax.cache.index_store import DerivedIndexStore
+
+
+def estimate_nbytes(value: Any) -> int:
+    """Approximate the memory held by a cached value.
+
+    Arrays, Arrow data and frames report their buffer sizes; containers are
+    walked recursively and everything else falls back to ``sys.getsizeof``.
+    """
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (pa.Array, pa.ChunkedArray, pa.Table, pa.RecordBatch)):
+        return int(value.nbytes)
+    if isinstance(value, pa.Buffer):
+        return int(value.size)
+    if isinstance(value, memoryview):
+        return int(value.nbytes)
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_nbytes(k) + estimate_nbytes(v) for k, v in value.items()
+        )
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(estimate_nbytes(v) for v in value)
+    return sys.getsizeof(value)
+
+
+# (resolved path, size, mtime_ns) -> digest, so reloads skip re-hashing.
+_FINGERPRINT_MEMO_MAX = 1024
+_fingerprint_memo: "OrderedDict[tuple, str]" = OrderedDict()
+_fingerprint_lock = threading.Lock()
+
+
+def file_stat_key(file_path: str) -> tuple:
+    """(resolved path, size, mtime_ns): changes whenever the file is rewritten."""
+    resolved = os.path.realpath(file_path)
+    stat = os.stat(resolved)
+    return (resolved, stat.st_size, stat.st_mtime_ns)
+
+
+def file_fingerprint(file_path: str) -> str:
+    """SHA-256 of a file's bytes (same digest as CSR artifact manifests).
+
+    Memoized per process by ``file_stat_key``.
+    """
+    key = file_stat_key(file_path)
+    with _fingerprint_lock:
+        cached = _fingerprint_memo.get(key)
+        if cached is not None:
+            _fingerprint_memo.move_to_end(key)
+            return cached
+    digest = hashlib.sha256()
+    with open(key[0], "rb") as f:
+        while chunk := f.read(8 * 1024 * 1024):
+            digest.update(chunk)
+    fingerprint = digest.hexdigest()
+    with _fingerprint_lock:
+        _fingerprint_memo[key] = fingerprint
+        while len(_fingerprint_memo) > _FINGERPRINT_MEMO_MAX:
+            _fingerprint_memo.popitem(last=False)
+    return fingerprint
+
+
+def _owned_column_nbytes(ts: tskit.TreeSequence) -> int:
+    """Bytes of column arrays tskit materialised outside its tables.
+
+    Numeric columns are views onto table memory (already in ``ts.nbytes``);
+    decoded columns such as mutation states own their buffers.
+    """
+    return sum(
+        int(value.nbytes)
+        for value in vars(ts).values()
+        if isinstance(value, np.ndarray) and value.base is None
+    )
+
 
 @dataclass
 class FileContext:
@@ -43,18 +127,94 @@ class FileContext:
     # Per-key metadata cache (nested within file context)
     # Keys: "population", "region", "population:array", etc.
     _metadata: LRUCache = field(default_factory=lambda: LRUCache(max_size=10))
+    _metadata_nbytes: dict = field(default_factory=dict, repr=False)
+    _static_nbytes: Optional[dict] = field(default=None, repr=False)
+    _content_fingerprint: Optional[str] = field(default=None, repr=False)
+    # Sidecar store for derived indexes; set by the loader when enabled
+    # (requires _content_fingerprint).
+    index_store: Optional["DerivedIndexStore"] = field(default=None, repr=False)
 
     def get_metadata(self, key: str) -> Optional[Any]:
-        """Get cached metadata for a specific key."""
-        return self._metadata.get(key)
+        """Get cached metadata for a specific key.
+
+        Falls back to the persisted index store, so derived structures
+        survive restarts and evictions.
+        """
+        value = self._metadata.get(key)
+        if value is None and self._persists(key):
+            value = self.index_store.load_metadata(self._content_fingerprint, key)
+            if value is not None:
+                self._cache_metadata(key, value)
+        return value
 
     def set_metadata(self, key: str, value: Any) -> None:
         """Cache metadata for a specific key."""
+        self._cache_metadata(key, value)
+        if self._persists(key):
+            self.index_store.save_metadata(self._content_fingerprint, key, value)
+
+    def _persists(self, key: str) -> bool:
+        return (
+            self.index_store is not None
+            and self._content_fingerprint is not None
+            and self.index_store.persists_metadata(key)
+        )
+
+    def _cache_metadata(self, key: str, value: Any) -> None:
         self._metadata.set(key, value)
+        self._metadata_nbytes[key] = estimate_nbytes(value)
+        for stale in set(self._metadata_nbytes) - set(self._metadata.cache):
+            del self._metadata_nbytes[stale]
 
     def clear_metadata(self) -> None:
         """Clear all cached metadata (e.g., when file reloaded)."""
         self._metadata.clear()
+        self._metadata_nbytes.clear()
+
+    def size_breakdown(self) -> dict:
+        """Estimated bytes per component of this cache entry.
+
+        Table and config sizes are measured once; column views and metadata
+        are re-read since they grow as requests touch the file.
+        """
+        if self._static_nbytes is None:
+            if self.is_csv:
+                data_nbytes = estimate_nbytes(self.tree_sequence)
+            else:
+                data_nbytes = int(self.tree_sequence.nbytes)
+            self._static_nbytes = {
+                "tree_sequence": data_nbytes,
+                "config": estimate_nbytes(self.config),
+            }
+        column_nbytes = (
+            _owned_column_nbytes(self.tree_sequence) if self.is_tree_sequence else 0
+        )
+        metadata_nbytes = sum(
+            size
+            for key, size in self._metadata_nbytes.items()
+            if key in self._metadata.cache
+        )
+        return {
+            **self._static_nbytes,
+            "column_views": column_nbytes,
+            "metadata": metadata_nbytes,
+        }
+
+    @property
+    def nbytes(self) -> int:
+        """Estimated total bytes held by this cache entry."""
+        return sum(self.size_breakdown().values())
+
+    def content_fingerprint(self) -> str:
+        """SHA-256 of the file's bytes, computed once per loaded context.
+
+        Unlike ``(file_path, mtime)`` this identifies the same data across
+        hosts and re-downloads, so it can key caches shared between servers.
+        Reads the whole file; call it off the event loop.
+        """
+        if self._content_fingerprint is None:
+            self._content_fingerprint = file_fingerprint(self.file_path)
+        return self._content_fingerprint
 
     @property
     def is_csv(self) -> bool:
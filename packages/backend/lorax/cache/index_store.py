@@ -0,0 +1,394 @@
+"""
+Persisted derived indexes for loaded files.
+
+The config, sample name maps, metadata arrays and value -> sample node
+indexes are pure functions of a file's contents, but decoding them from
+tskit metadata takes tens of seconds for large files and used to be redone
+after every restart or FileContext eviction. DerivedIndexStore keeps them
+in a sidecar directory next to the disk cache, keyed by the file's content
+fingerprint and the Lorax version, so a release that changes how they are
+derived starts clean. Numeric columns are written as ``.npy`` and string
+columns as Arrow IPC files; both are memory-mapped on reload.
+
+Layout::
+
+    <root>/<lorax version>/<fingerprint>/<entry>/{meta.json, *.npy, *.arrow}
+
+Writes go to a temporary directory that is renamed into place, so readers
+never see a partial entry. Store failures are logged and treated as misses.
+
+Directories of other Lorax versions are removed on the first write, and
+with ``max_bytes`` set the least recently used fingerprints are deleted
+once the current version outgrows it. The byte total is measured once per
+process and then tracked, so stores in several processes sharing a root
+only approximate the cap. Content fingerprints are memoized in
+``<root>/fingerprints.json`` by (path, size, mtime) so restarts skip
+re-hashing unchanged files.
+"""
+
+import hashlib
+import importlib.metadata
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+import pyarrow as pa
+
+logger = logging.getLogger(__name__)
+
+METADATA_ARRAY_SUFFIX = ":array"
+VALUE_INDEX_MARKER = ":value_to_sample_nodes:"
+SAMPLE_NAME_MAP_PREFIX = "sample_name_map:"
+
+CONFIG_ENTRY = "config"
+FINGERPRINT_MEMO = "fingerprints.json"
+_FINGERPRINT_MEMO_MAX = 4096
+# Path-dependent config fields, refreshed for the file being loaded.
+_CONFIG_PATH_FIELDS = ("filename", "project")
+
+
+def lorax_version() -> str:
+    try:
+        return importlib.metadata.version("lorax-arg")
+    except importlib.metadata.PackageNotFoundError:
+        return "0.1.7"
+
+
+@dataclass
+class IndexEntry:
+    """One stored entry: small JSON fields plus mmapped arrays and strings."""
+
+    meta: dict = field(default_factory=dict)
+    arrays: dict[str, np.ndarray] = field(default_factory=dict)
+    strings: dict[str, list] = field(default_factory=dict)
+
+
+def _entry_name(key: str) -> str:
+    readable = "".join(c if c.isalnum() or c in "-_" else "_" for c in key)[:48]
+    return f"{readable}-{hashlib.sha1(key.encode()).hexdigest()[:12]}"
+
+
+def _write_strings(path: Path, values: list) -> None:
+    table = pa.table({"value": pa.array([str(v) for v in values], type=pa.large_string())})
+    with pa.OSFile(str(path), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def _dir_bytes(path: Path) -> int:
+    total = 0
+    for child in path.rglob("*"):
+        try:
+            if child.is_file():
+                total += child.stat().st_size
+        except OSError:
+            pass
+    return total
+
+
+def _read_strings(path: Path) -> list:
+    with pa.memory_map(str(path), "r") as source:
+        return pa.ipc.open_file(source).read_all().column("value").to_pylist()
+
+
+# --- codecs for FileContext metadata values ---------------------------------
+
+
+def _encode_metadata_array(value: dict) -> IndexEntry:
+    table = pa.ipc.open_stream(pa.py_buffer(value["arrow_buffer"])).read_all()
+    return IndexEntry(
+        meta={"kind": "metadata_array"},
+        arrays={
+            "sample_node_ids": np.asarray(value["sample_node_ids"], dtype=np.int32),
+            "indices": table.column("idx").to_numpy().astype(np.uint32, copy=False),
+        },
+        strings={"unique_values": value["unique_values"]},
+    )
+
+
+def _decode_metadata_array(entry: IndexEntry) -> dict:
+    from lorax.metadata.loader import _build_metadata_array_result
+
+    return _build_metadata_array_result(
+        entry.arrays["sample_node_ids"],
+        entry.strings["unique_values"],
+        entry.arrays["indices"],
+    )
+
+
+def _encode_value_index(value: dict) -> IndexEntry:
+    values = list(value)
+    lengths = [len(value[v]) for v in values]
+    offsets = np.zeros(len(values) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    node_ids = (
+        np.concatenate([np.asarray(value[v], dtype=np.int32) for v in values])
+        if values
+        else np.zeros(0, dtype=np.int32)
+    )
+    return IndexEntry(
+        meta={"kind": "value_index"},
+        arrays={"offsets": offsets, "node_ids": node_ids},
+        strings={"values": values},
+    )
+
+
+def _decode_value_index(entry: IndexEntry) -> dict:
+    offsets = entry.arrays["offsets"]
+    node_ids = entry.arrays["node_ids"]
+    return {
+        value: node_ids[offsets[i]:offsets[i + 1]]
+        for i, value in enumerate(entry.strings["values"])
+    }
+
+
+def _encode_name_map(value: dict) -> IndexEntry:
+    return IndexEntry(
+        meta={"kind": "sample_name_map"},
+        arrays={"node_ids": np.fromiter(value.values(), dtype=np.int32, count=len(value))},
+        strings={"names": list(value)},
+    )
+
+
+def _decode_name_map(entry: IndexEntry) -> dict:
+    return dict(zip(entry.strings["names"], entry.arrays["node_ids"].tolist()))
+
+
+def _metadata_codec(key: str):
+    """(encode, decode) for persistable metadata cache keys, else None."""
+    if key.startswith(SAMPLE_NAME_MAP_PREFIX):
+        return _encode_name_map, _decode_name_map
+    if VALUE_INDEX_MARKER in key:
+        return _encode_value_index, _decode_value_index
+    if key.endswith(METADATA_ARRAY_SUFFIX):
+        return _encode_metadata_array, _decode_metadata_array
+    return None
+
+
+class DerivedIndexStore:
+    """Sidecar store of derived per-file structures keyed by content fingerprint."""
+
+    def __init__(
+        self,
+        root_dir: Path,
+        *,
+        version: Optional[str] = None,
+        max_bytes: int = 0,
+    ):
+        self.root_dir = Path(root_dir)
+        self.version = version or lorax_version()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.errors = 0
+        self.evictions = 0
+        self.stale_versions_removed = 0
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None
+        self._fingerprints: Optional[dict] = None
+
+    def version_dir(self) -> Path:
+        return self.root_dir / self.version
+
+    def file_dir(self, fingerprint: str) -> Path:
+        return self.version_dir() / fingerprint
+
+    # --- fingerprints ---
+
+    def _fingerprint_memo(self) -> dict:
+        if self._fingerprints is None:
+            try:
+                self._fingerprints = json.loads((self.root_dir / FINGERPRINT_MEMO).read_text())
+            except (OSError, ValueError):
+                self._fingerprints = {}
+        return self._fingerprints
+
+    def fingerprint(self, file_path: str) -> str:
+        """Content fingerprint of ``file_path``, memoized across restarts."""
+        from lorax.cache.file_context import file_fingerprint, file_stat_key
+
+        resolved, size, mtime_ns = file_stat_key(file_path)
+        with self._lock:
+            known = self._fingerprint_memo().get(resolved)
+        if known is not None and known[:2] == [size, mtime_ns]:
+            return known[2]
+
+        fingerprint = file_fingerprint(file_path)
+        with self._lock:
+            memo = self._fingerprint_memo()
+            memo.pop(resolved, None)
+            memo[resolved] = [size, mtime_ns, fingerprint]
+            for stale in list(memo)[:-_FINGERPRINT_MEMO_MAX]:
+                del memo[stale]
+            try:
+                self.root_dir.mkdir(parents=True, exist_ok=True)
+                fd, tmp = tempfile.mkstemp(prefix=".tmp-", dir=self.root_dir)
+                with os.fdopen(fd, "w") as f:
+                    json.dump(memo, f)
+                os.replace(tmp, self.root_dir / FINGERPRINT_MEMO)
+            except OSError as exc:
+                logger.debug("Cannot persist fingerprint memo: %s", exc)
+        return fingerprint
+
+    # --- size accounting ---
+
+    def _measure_locked(self) -> int:
+        """Drop other versions' directories and size this one (once)."""
+        if self._total_bytes is None:
+            if self.root_dir.is_dir():
+                for child in self.root_dir.iterdir():
+                    if child.is_dir() and child.name != self.version:
+                        shutil.rmtree(child, ignore_errors=True)
+                        self.stale_versions_removed += 1
+            self._total_bytes = _dir_bytes(self.version_dir())
+        return self._total_bytes
+
+    def _account(self, fingerprint: str, nbytes: int) -> None:
+        with self._lock:
+            self._total_bytes = self._measure_locked() + nbytes
+            if not self.max_bytes or self._total_bytes <= self.max_bytes:
+                return
+            candidates = []
+            for child in self.version_dir().iterdir():
+                if child.is_dir() and child.name != fingerprint:
+                    try:
+                        candidates.append((child.stat().st_mtime, child))
+                    except OSError:
+                        pass
+            for _, victim in sorted(candidates):
+                if self._total_bytes <= self.max_bytes:
+                    break
+                freed = _dir_bytes(victim)
+                shutil.rmtree(victim, ignore_errors=True)
+                self._total_bytes -= freed
+                self.evictions += 1
+
+    def _entry_dir(self, fingerprint: str, key: str) -> Path:
+        return self.file_dir(fingerprint) / _entry_name(key)
+
+    # --- raw entries ---
+
+    def save_entry(self, fingerprint: str, key: str, entry: IndexEntry) -> bool:
+        target = self._entry_dir(fingerprint, key)
+        if target.exists():
+            return True
+        with self._lock:
+            self._measure_locked()
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            staging = Path(tempfile.mkdtemp(prefix=".tmp-", dir=target.parent))
+            try:
+                for name, array in entry.arrays.items():
+                    np.save(staging / f"{name}.npy", np.ascontiguousarray(array))
+                for name, values in entry.strings.items():
+                    _write_strings(staging / f"{name}.arrow", values)
+                meta = {**entry.meta, "key": key}
+                (staging / "meta.json").write_text(json.dumps(meta))
+                os.rename(staging, target)
+            except OSError:
+                shutil.rmtree(staging, ignore_errors=True)
+                if not target.exists():
+                    raise
+        except Exception as exc:
+            self.errors += 1
+            logger.warning("Failed to persist derived index %r: %s", key, exc)
+            return False
+        self.writes += 1
+        self._account(fingerprint, _dir_bytes(target))
+        return True
+
+    def load_entry(self, fingerprint: str, key: str) -> Optional[IndexEntry]:
+        target = self._entry_dir(fingerprint, key)
+        if not target.is_dir():
+            self.misses += 1
+            return None
+        try:
+            entry = IndexEntry(meta=json.loads((target / "meta.json").read_text()))
+            for path in target.iterdir():
+                if path.suffix == ".npy":
+                    entry.arrays[path.stem] = np.load(path, mmap_mode="r")
+                elif path.suffix == ".arrow":
+                    entry.strings[path.stem] = _read_strings(path)
+        except Exception as exc:
+            self.errors += 1
+            logger.warning("Discarding unreadable derived index %s: %s", target, exc)
+            shutil.rmtree(target, ignore_errors=True)
+            return None
+        self.hits += 1
+        try:
+            # Directory mtime is the recency used for eviction.
+            os.utime(target.parent)
+        except OSError:
+            pass
+        return entry
+
+    # --- typed helpers ---
+
+    def save_config(self, fingerprint: str, config: dict) -> bool:
+        stored = {k: v for k, v in config.items() if k not in _CONFIG_PATH_FIELDS}
+        arrays = {}
+        if stored.get("intervals") is not None:
+            arrays["intervals"] = np.asarray(stored.pop("intervals"), dtype=np.float64)
+        try:
+            meta = {"kind": "config", "config": json.loads(json.dumps(stored))}
+        except (TypeError, ValueError) as exc:
+            logger.debug("Config is not JSON-serialisable, not persisting: %s", exc)
+            return False
+        return self.save_entry(fingerprint, CONFIG_ENTRY, IndexEntry(meta=meta, arrays=arrays))
+
+    def load_config(self, fingerprint: str, file_path: str, root_dir: str) -> Optional[dict]:
+        entry = self.load_entry(fingerprint, CONFIG_ENTRY)
+        if entry is None:
+            return None
+        from lorax.loaders.tskit_loader import _get_project_name
+
+        config = dict(entry.meta["config"])
+        if "intervals" in entry.arrays:
+            config["intervals"] = entry.arrays["intervals"].tolist()
+        config["filename"] = os.path.basename(file_path)
+        config["project"] = _get_project_name(file_path, root_dir)
+        return config
+
+    @staticmethod
+    def persists_metadata(key: str) -> bool:
+        return _metadata_codec(key) is not None
+
+    def save_metadata(self, fingerprint: str, key: str, value: Any) -> bool:
+        codec = _metadata_codec(key)
+        if codec is None:
+            return False
+        try:
+            entry = codec[0](value)
+        except Exception as exc:
+            logger.debug("Cannot encode metadata %r for persistence: %s", key, exc)
+            return False
+        return self.save_entry(fingerprint, key, entry)
+
+    def load_metadata(self, fingerprint: str, key: str) -> Optional[Any]:
+        codec = _metadata_codec(key)
+        if codec is None:
+            return None
+        entry = self.load_entry(fingerprint, key)
+        return codec[1](entry) if entry is not None else None
+
+    def get_stats(self) -> dict:
+        return {
+            "root_dir": str(self.root_dir),
+            "version": self.version,
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "errors": self.errors,
+            "evictions": self.evictions,
+            "stale_versions_removed": self.stale_versions_removed,
+            "total_bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+        }
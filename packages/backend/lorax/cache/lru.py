@@ -48,10 +48,22 @@ class LRUCacheWithMeta:
 
     Stores (value, metadata) tuples, allowing validation against
     external state (e.g., file mtime) before returning cached values.
+
+    When ``max_bytes`` is set, entries are also sized with ``sizeof`` and the
+    least recently used ones are evicted while the total exceeds the budget.
+    The most recent entry is always kept, even if it alone is over budget.
+
+    Keys in ``pinned`` are never evicted; they still count towards both
+    limits, so unpinned entries make way for them.
     """
-    def __init__(self, max_size=5):
+    def __init__(self, max_size=5, max_bytes=None, sizeof=None):
         self.max_size = max_size
+        self.max_bytes = max_bytes or None
+        self.sizeof = sizeof
         self.cache = OrderedDict()  # key -> (value, meta)
+        self.sizes = {}  # key -> estimated bytes (only when sizeof is set)
+        self.pinned = set()
+        self.evictions = 0
 
     def get(self, key):
         """Get value only (ignores metadata)."""
@@ -73,18 +85,75 @@ class LRUCacheWithMeta:
         if key in self.cache:
             self.cache.move_to_end(key)
         self.cache[key] = (value, meta)
-        # Evict if too big
-        if len(self.cache) > self.max_size:
-            old_key, (old_val, old_meta) = self.cache.popitem(last=False)
-            print(f"🧹 Evicted {old_key} from LRU cache to free memory")
+        if self.sizeof is not None:
+            self.sizes[key] = int(self.sizeof(value))
+        self._evict()
+
+    def refresh_size(self, key):
+        """Re-measure an entry that grew in place and enforce the byte budget."""
+        if self.sizeof is None or key not in self.cache:
+            return
+        self.sizes[key] = int(self.sizeof(self.cache[key][0]))
+        self._evict()
+
+    @property
+    def total_bytes(self):
+        # Callers sometimes clear ``cache`` directly; ignore stale sizes.
+        return sum(size for key, size in self.sizes.items() if key in self.cache)
+
+    def pin(self, key):
+        self.pinned.add(key)
+
+    def unpin(self, key):
+        self.pinned.discard(key)
+
+    def _evict(self):
+        while len(self.cache) > self.max_size or (
+            self.max_bytes is not None
+            and len(self.cache) > 1
+            and self.total_bytes > self.max_bytes
+        ):
+            newest = next(reversed(self.cache))
+            old_key = next(
+                (k for k in self.cache if k not in self.pinned and k != newest),
+                None,
+            )
+            if old_key is None:
+                break
+            del self.cache[old_key]
+            freed = self.sizes.pop(old_key, 0)
+            self.evictions += 1
+            print(f"🧹 Evicted {old_key} from LRU cache to free memory ({freed} bytes)")
+
+    def set_max_bytes(self, max_bytes):
+        """Change the byte budget and evict down to it."""
+        self.max_bytes = max_bytes or None
+        self._evict()
+
+    def shed(self, nbytes):
+        """Evict unpinned entries, least recently used first, to free ``nbytes``.
+
+        Returns the bytes freed (by ``sizeof``); needs a sized cache.
+        """
+        freed = 0
+        for key in [k for k in self.cache if k not in self.pinned]:
+            if freed >= nbytes:
+                break
+            del self.cache[key]
+            freed += self.sizes.pop(key, 0)
+            self.evictions += 1
+            print(f"🧹 Evicted {key} from LRU cache under memory pressure")
+        return freed
 
     def remove(self, key):
         """Remove a specific key from the cache."""
         if key in self.cache:
             del self.cache[key]
+        self.sizes.pop(key, None)
 
     def clear(self):
         self.cache.clear()
+        self.sizes.clear()
 
     def __len__(self):
         return len(self.cache)
@@ -0,0 +1,173 @@
+"""
+Pinned-file prefetch for Lorax.
+
+Flagship and demo datasets are listed in ``LORAX_PINNED_FILES`` (and/or
+derived from the disk cache's most-hit entries via ``LORAX_PIN_TOP_N``).
+At startup a background task downloads each one, loads its FileContext,
+opens its CSR artifact when artifacts are enabled, and pins all three
+cache layers so the first user after a deploy opens them warm.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+from lorax.cache.file_cache import DECOMPRESSED_KIND, get_file_context, pin_file
+from lorax.scheduling import BULK
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PinnedFile:
+    """A ``project/filename`` entry, as used by load_file and GCS blob paths."""
+
+    project: str
+    filename: str
+
+    @property
+    def blob_path(self) -> str:
+        return f"{self.project}/{self.filename}"
+
+    def local_path(self, upload_dir: Path) -> Path:
+        return Path(upload_dir) / self.project / self.filename
+
+
+def parse_pin_list(raw: Optional[str]) -> list[PinnedFile]:
+    """Parse ``"Project/a.trees, Project/b.tsz"`` into PinnedFile entries."""
+    pins: list[PinnedFile] = []
+    for item in (raw or "").split(","):
+        item = item.strip().strip("/")
+        if not item:
+            continue
+        project, _, filename = item.partition("/")
+        if not filename:
+            logger.warning("Ignoring pin %r: expected project/filename", item)
+            continue
+        pin = PinnedFile(project, filename)
+        if pin not in pins:
+            pins.append(pin)
+    return pins
+
+
+class FilePrefetcher:
+    """Warm and pin a list of files across the disk, file and artifact caches."""
+
+    def __init__(
+        self,
+        upload_dir: Path,
+        *,
+        bucket_name: Optional[str] = None,
+        disk_cache_manager=None,
+        pins: Optional[list[PinnedFile]] = None,
+        top_n: int = 0,
+        artifacts_enabled: bool = False,
+        scheduler=None,
+    ):
+        self.upload_dir = Path(upload_dir)
+        self.bucket_name = bucket_name
+        self.disk_cache_manager = disk_cache_manager
+        self.configured_pins = list(pins or [])
+        self.top_n = max(0, int(top_n))
+        self.artifacts_enabled = artifacts_enabled
+        self.scheduler = scheduler
+        self._status: dict[str, dict[str, Any]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def resolve_pins(self) -> list[PinnedFile]:
+        """Configured pins followed by the disk cache's most-hit files."""
+        pins = list(self.configured_pins)
+        manager = self.disk_cache_manager
+        if self.top_n and manager is not None and manager.enabled and self.bucket_name:
+            bucket_prefix = f"{self.bucket_name}/"
+            for _, cached_file in await manager.manifest.get_most_used_files(self.top_n):
+                if not cached_file.gcs_path.startswith(bucket_prefix):
+                    continue
+                project, _, filename = cached_file.gcs_path[len(bucket_prefix):].partition("/")
+                pin = PinnedFile(project, filename)
+                if filename and project != "Uploads" and pin not in pins:
+                    pins.append(pin)
+        return pins
+
+    async def warm(self, pin: PinnedFile) -> None:
+        """Download, load and pin one file; failures are recorded, not raised."""
+        status = self._status.setdefault(pin.blob_path, {})
+        status.update(state="loading", error=None)
+        started = time.perf_counter()
+        local_path = pin.local_path(self.upload_dir)
+        try:
+            if self.bucket_name and not local_path.exists():
+                from lorax.cloud.gcs_utils import download_gcs_file
+
+                await download_gcs_file(self.bucket_name, pin.blob_path, str(local_path))
+            if self.disk_cache_manager is not None and self.bucket_name:
+                status["disk_pinned"] = await self.disk_cache_manager.pin(
+                    self.bucket_name, pin.blob_path
+                )
+            # Bulk priority around the CPU-bound loads only: warming never
+            # delays interactive requests, and downloads hold no slot.
+            async with self.scheduler.slot(BULK) if self.scheduler else nullcontext():
+                if self.artifacts_enabled:
+                    status["artifact"] = await asyncio.to_thread(
+                        self._open_artifact, local_path
+                    )
+                ctx = await get_file_context(str(local_path))
+            if ctx is None:
+                raise FileNotFoundError(f"Could not load {local_path}")
+            pin_file(str(local_path))
+            if self.disk_cache_manager is not None and local_path.suffix == ".tsz":
+                status["decompressed_pinned"] = await self.disk_cache_manager.pin_derived(
+                    str(local_path), DECOMPRESSED_KIND
+                )
+            status.update(state="warm", nbytes=ctx.nbytes)
+        except Exception as exc:
+            logger.warning("Prefetch of %s failed: %s", pin.blob_path, exc)
+            status.update(state="failed", error=str(exc))
+        finally:
+            status["seconds"] = round(time.perf_counter() - started, 3)
+
+    @staticmethod
+    def _open_artifact(local_path: Path) -> Optional[str]:
+        from lorax.artifacts.runtime import artifact_context_registry, artifact_resolver
+
+        resolved = artifact_resolver.resolve(local_path)
+        if resolved is None:
+            return None
+        artifact_context_registry.open(resolved)
+        artifact_context_registry.pin(resolved.artifact_directory)
+        return resolved.artifact_directory
+
+    async def prefetch(self) -> None:
+        """Warm every pinned file, one at a time to keep startup memory flat."""
+        pins = await self.resolve_pins()
+        for pin in pins:
+            self._status.setdefault(pin.blob_path, {"state": "pending"})
+        for pin in pins:
+            await self.warm(pin)
+
+    def start(self) -> Optional[asyncio.Task]:
+        """Run prefetch in the background (no-op without pins)."""
+        if self._task is None and (self.configured_pins or self.top_n):
+            self._task = asyncio.create_task(self.prefetch())
+        return self._task
+
+    async def stop(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "configured": [pin.blob_path for pin in self.configured_pins],
+            "top_n": self.top_n,
+            "running": self._task is not None and not self._task.done(),
+            "files": {path: dict(status) for path, status in self._status.items()},
+        }
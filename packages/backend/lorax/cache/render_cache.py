@@ -0,0 +1,243 @@
+"""
+Redis-backed L2 cache for rendered tree buffers.
+
+``process_postorder_layout`` output for a tree is deterministic given the
+file contents, the tree index and the render parameters (sparsification,
+cell size multiplier, time scale), so it can be shared by every server
+instance behind the same Redis. Each tree is stored as its own record:
+compressed Arrow IPC streams for the node and mutation rows, framed like
+the response buffer. A viewport request fetches the trees it needs in one
+MGET, renders only the misses and splices everything back together.
+Decoding, encoding and compression run in worker threads, and new records
+are written in one pipelined round-trip by a background task, so a partial
+miss never waits on Redis before its response goes out.
+
+Keys embed the file's content fingerprint in a hash tag so all trees of a
+file land in one cluster slot. Redis failures are logged and treated as
+misses; the L2 cache never fails a render.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import struct
+from typing import Any, Iterable, Optional
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 24 * 3600
+DEFAULT_MAX_ENTRY_BYTES = 4 * 1024 * 1024
+KEY_NAMESPACE = "lorax:render:v1"
+
+
+def _ipc_bytes(table: pa.Table, options: Optional[pa.ipc.IpcWriteOptions] = None) -> bytes:
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema, options=options) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _read_ipc(data) -> pa.Table:
+    return pa.ipc.open_stream(pa.py_buffer(data)).read_all()
+
+
+def pack_render_buffer(
+    node_table: pa.Table,
+    mut_table: pa.Table,
+    options: Optional[pa.ipc.IpcWriteOptions] = None,
+) -> bytes:
+    """Frame node and mutation tables as ``<u32 node length><nodes><mutations>``."""
+    node_bytes = _ipc_bytes(node_table, options)
+    return struct.pack("<I", len(node_bytes)) + node_bytes + _ipc_bytes(mut_table, options)
+
+
+def unpack_render_buffer(buffer: bytes) -> tuple[pa.Table, pa.Table]:
+    """Inverse of :func:`pack_render_buffer`."""
+    (node_length,) = struct.unpack_from("<I", buffer, 0)
+    view = memoryview(buffer)
+    return _read_ipc(view[4:4 + node_length]), _read_ipc(view[4 + node_length:])
+
+
+def split_render_tables(
+    node_table: pa.Table,
+    mut_table: pa.Table,
+    tree_indices: Iterable[int],
+) -> dict[int, tuple[pa.Table, pa.Table]]:
+    """Per-tree slices of a batch render; trees with no rows get empty tables."""
+    node_tree = node_table.column("tree_idx")
+    mut_tree = mut_table.column("mut_tree_idx")
+    return {
+        int(tree_idx): (
+            node_table.filter(pc.equal(node_tree, int(tree_idx))),
+            mut_table.filter(pc.equal(mut_tree, int(tree_idx))),
+        )
+        for tree_idx in tree_indices
+    }
+
+
+def combine_render_tables(
+    parts: list[tuple[pa.Table, pa.Table]],
+) -> tuple[bytes, list[int]]:
+    """Concatenate per-tree tables in order into an uncompressed response buffer.
+
+    Returns the buffer and the indices of the trees that produced nodes,
+    matching ``construct_trees_batch``'s ``processed_indices``.
+    """
+    node_table = pa.concat_tables([nodes for nodes, _ in parts]).combine_chunks()
+    mut_table = pa.concat_tables([muts for _, muts in parts]).combine_chunks()
+    processed = [
+        int(nodes.column("tree_idx")[0].as_py()) for nodes, _ in parts if nodes.num_rows
+    ]
+    return pack_render_buffer(node_table, mut_table), processed
+
+
+class RenderL2Cache:
+    """Per-tree render records in Redis, keyed by content fingerprint and params."""
+
+    def __init__(
+        self,
+        redis_client,
+        *,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        max_entry_bytes: int = DEFAULT_MAX_ENTRY_BYTES,
+        compression: Optional[str] = "zstd",
+        namespace: str = KEY_NAMESPACE,
+    ):
+        self.redis = redis_client
+        self.ttl_seconds = max(1, int(ttl_seconds))
+        self.max_entry_bytes = max(0, int(max_entry_bytes))
+        self.namespace = namespace
+        self._write_options = pa.ipc.IpcWriteOptions(compression=compression)
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.skipped_oversize = 0
+        self.errors = 0
+        self.bytes_stored = 0
+        self._pending_stores: set[asyncio.Task] = set()
+
+    @staticmethod
+    def params_key(**params: Any) -> str:
+        """Short stable digest of the render parameters that shape the output."""
+        encoded = json.dumps(params, sort_keys=True, default=str)
+        return hashlib.sha1(encoded.encode()).hexdigest()[:16]
+
+    def key(self, fingerprint: str, params_key: str, tree_idx: int) -> str:
+        return f"{self.namespace}:{{{fingerprint}}}:{params_key}:{int(tree_idx)}"
+
+    def encode(self, node_table: pa.Table, mut_table: pa.Table) -> bytes:
+        return pack_render_buffer(node_table, mut_table, self._write_options)
+
+    async def get_many(
+        self,
+        fingerprint: str,
+        params_key: str,
+        tree_indices: Iterable[int],
+    ) -> dict[int, tuple[pa.Table, pa.Table]]:
+        """Cached per-tree tables for whichever of ``tree_indices`` are present."""
+        indices = list(dict.fromkeys(int(t) for t in tree_indices))
+        if not indices:
+            return {}
+        try:
+            values = await self.redis.mget(
+                [self.key(fingerprint, params_key, t) for t in indices]
+            )
+        except Exception as exc:
+            self.errors += 1
+            logger.warning("Render L2 cache read failed: %s", exc)
+            return {}
+        found = await asyncio.to_thread(self._decode_many, indices, values)
+        self.hits += len(found)
+        self.misses += len(indices) - len(found)
+        return found
+
+    def _decode_many(self, indices: list[int], values: list) -> dict[int, tuple[pa.Table, pa.Table]]:
+        found = {}
+        for tree_idx, value in zip(indices, values):
+            if value is None:
+                continue
+            try:
+                found[tree_idx] = unpack_render_buffer(value)
+            except Exception as exc:
+                self.errors += 1
+                logger.warning("Discarding unreadable render L2 entry: %s", exc)
+        return found
+
+    def _encode_many(
+        self, parts: dict[int, tuple[pa.Table, pa.Table]]
+    ) -> dict[int, bytes]:
+        encoded = {}
+        for tree_idx, (node_table, mut_table) in parts.items():
+            value = self.encode(node_table, mut_table)
+            if self.max_entry_bytes and len(value) > self.max_entry_bytes:
+                self.skipped_oversize += 1
+                continue
+            encoded[tree_idx] = value
+        return encoded
+
+    async def set_many(
+        self,
+        fingerprint: str,
+        params_key: str,
+        parts: dict[int, tuple[pa.Table, pa.Table]],
+    ) -> int:
+        """Store per-tree tables with the configured TTL; returns entries written.
+
+        All records go out in one pipeline. Keys share the fingerprint hash
+        tag, so the pipeline stays in one cluster slot.
+        """
+        encoded = await asyncio.to_thread(self._encode_many, parts)
+        if not encoded:
+            return 0
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for tree_idx, value in encoded.items():
+                pipe.set(
+                    self.key(fingerprint, params_key, tree_idx),
+                    value,
+                    ex=self.ttl_seconds,
+                )
+            await pipe.execute()
+        except Exception as exc:
+            self.errors += 1
+            logger.warning("Render L2 cache write failed: %s", exc)
+            return 0
+        self.stores += len(encoded)
+        self.bytes_stored += sum(len(value) for value in encoded.values())
+        return len(encoded)
+
+    def store_in_background(
+        self,
+        fingerprint: str,
+        params_key: str,
+        parts: dict[int, tuple[pa.Table, pa.Table]],
+    ) -> asyncio.Task:
+        """Run ``set_many`` without holding up the caller's response."""
+        task = asyncio.create_task(self.set_many(fingerprint, params_key, parts))
+        self._pending_stores.add(task)
+        task.add_done_callback(self._pending_stores.discard)
+        return task
+
+    async def drain(self) -> None:
+        """Wait for background stores started so far (tests, shutdown)."""
+        while self._pending_stores:
+            await asyncio.gather(*list(self._pending_stores), return_exceptions=True)
+
+    def get_stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "stores": self.stores,
+            "skipped_oversize": self.skipped_oversize,
+            "errors": self.errors,
+            "bytes_stored": self.bytes_stored,
+            "pending_stores": len(self._pending_stores),
+            "ttl_seconds": self.ttl_seconds,
+            "max_entry_bytes": self.max_entry_bytes,
+        }
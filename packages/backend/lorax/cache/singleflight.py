@@ -0,0 +1,132 @@
+"""
+Request coalescing ("singleflight") across sessions.
+
+When many sessions open the same shared link they issue identical render
+and query requests within milliseconds. SingleFlight keys each request by
+(file identity, operation, normalized parameters); while a computation for
+a key is in flight, identical requests await the same task and share its
+result instead of starting their own.
+
+The shared task is shielded, so a caller that goes away (e.g. a
+disconnected socket) does not cancel the work other sessions are waiting
+on. Callers may pass a ``cancelled`` predicate; ``abandoned(key)`` is true
+once every waiter's predicate is, which lets shared work stop cooperatively
+only when nobody still wants its result. Results are shared objects:
+callers must treat them as read-only.
+"""
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+from lorax.cancellation import RequestCancelled
+
+
+def source_identity(file_path: str) -> str:
+    """Cheap file fingerprint: resolved path, size and mtime."""
+    path = Path(file_path).resolve()
+    try:
+        stat = path.stat()
+    except OSError:
+        return str(path)
+    return f"{path}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def _never() -> bool:
+    return False
+
+
+def _always() -> bool:
+    return True
+
+
+class SingleFlight:
+    """Share one in-flight computation between concurrent identical requests."""
+
+    def __init__(self):
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        self._waiters: dict[Hashable, list] = {}
+        self._stats: dict[str, dict[str, int]] = {}
+
+    @staticmethod
+    def key(file_path: str, operation: str, **params: Any) -> tuple:
+        """Request key; parameters are normalized through sorted JSON."""
+        normalized = json.dumps(params, sort_keys=True, default=str)
+        return (source_identity(file_path), operation, normalized)
+
+    async def do(
+        self,
+        key: tuple,
+        fn: Callable[[], Awaitable[Any]],
+        cancelled: Optional[Callable[[], bool]] = None,
+    ) -> Any:
+        """Await ``fn()``, or the in-flight call already running for ``key``.
+
+        ``cancelled`` reports whether this caller still wants the result;
+        see ``abandoned``. A caller that joins shared work just as it stops
+        for having been abandoned runs ``fn`` again, unless it has been
+        cancelled itself.
+        """
+        stats = self._stats.setdefault(
+            key[1], {"calls": 0, "executions": 0, "errors": 0}
+        )
+        stats["calls"] += 1
+        try:
+            return await self._join(key, fn, cancelled, stats)
+        except RequestCancelled:
+            if (cancelled or _never)():
+                raise
+            return await self._join(key, fn, cancelled, stats)
+
+    async def _join(
+        self,
+        key: tuple,
+        fn: Callable[[], Awaitable[Any]],
+        cancelled: Optional[Callable[[], bool]],
+        stats: dict,
+    ) -> Any:
+        task = self._inflight.get(key)
+        if task is None or task.done():
+            stats["executions"] += 1
+            self._waiters[key] = []
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done, stats))
+        waiters = self._waiters[key]
+        waiters.append(cancelled or _never)
+        slot = len(waiters) - 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            waiters[slot] = _always
+            raise
+
+    def abandoned(self, key: tuple) -> bool:
+        """True when ``key`` is in flight and every waiter has given up on it."""
+        waiters = self._waiters.get(key)
+        return bool(waiters) and all(cancelled() for cancelled in list(waiters))
+
+    def _finish(self, key: tuple, task: asyncio.Future, stats: dict) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+            self._waiters.pop(key, None)
+        # Mark the exception retrieved even if every waiter was cancelled.
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None and not isinstance(error, RequestCancelled):
+            stats["errors"] += 1
+
+    def get_stats(self) -> dict:
+        operations = {}
+        for operation, stats in self._stats.items():
+            coalesced = stats["calls"] - stats["executions"]
+            operations[operation] = {
+                **stats,
+                "coalesced": coalesced,
+                "coalescing_ratio": round(coalesced / stats["calls"], 4)
+                if stats["calls"]
+                else 0.0,
+            }
+        return {"in_flight": len(self._inflight), "operations": operations}
@@ -3,16 +3,60 @@ TreeGraph Cache for per-session caching of TreeGraph objects.
 
 This cache is intentionally in-memory only. It stores per-session TreeGraph
 objects and applies opportunistic TTL cleanup to bound long-run memory growth.
+
+Graphs stored with a content key (file identity + tree index) live in a
+shared tier bounded by a process-wide byte budget. Sessions hold only
+references to shared graphs, so memory scales with the distinct trees being
+viewed rather than with sessions x trees.
 """
 
 import asyncio
+import dataclasses
 import time
 from collections import OrderedDict
-from typing import Dict, Optional, TYPE_CHECKING
+from typing import Dict, Hashable, Optional, Set, Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
+    from lorax.cache.file_context import FileContext
     from lorax.tree_graph import TreeGraph
 
+DEFAULT_SHARED_MAX_BYTES = 1024 * 1024 * 1024
+
+
+def tree_graph_content_key(ctx: "FileContext", tree_index: int) -> Tuple:
+    """Content key for a TreeGraph built from a loaded file."""
+    return ("file", ctx.file_path, ctx.mtime, int(tree_index))
+
+
+def graph_nbytes(graph) -> int:
+    """Best-effort resident size of a cached graph object."""
+    return max(0, int(getattr(graph, "nbytes", 0) or 0))
+
+
+def _session_view(graph):
+    # TreeGraph carries per-session adaptive sparsify state; give each session
+    # its own shallow copy that shares the (immutable) numpy arrays.
+    if dataclasses.is_dataclass(graph) and hasattr(graph, "last_outside_cell_size"):
+        return dataclasses.replace(graph)
+    return graph
+
+
+class _SharedEntry:
+    __slots__ = ("graph", "nbytes", "sessions")
+
+    def __init__(self, graph, nbytes: int):
+        self.graph = graph
+        self.nbytes = nbytes
+        self.sessions: Set[Tuple[str, int]] = set()
+
+
+class _SessionEntry:
+    __slots__ = ("graph", "content_key")
+
+    def __init__(self, graph, content_key: Optional[Hashable] = None):
+        self.graph = graph
+        self.content_key = content_key
+
 
 class TreeGraphCache:
     """
@@ -21,6 +65,7 @@ class TreeGraphCache:
     Features:
     - Visibility-based eviction via `evict_not_visible`
     - Per-session TTL expiration
+    - Content-addressed shared tier with LRU eviction under a byte budget
     - Async lock for thread-safe updates
     """
 
@@ -29,23 +74,51 @@ class TreeGraphCache:
         *,
         local_ttl_seconds: int = 3600,
         cleanup_interval_seconds: int = 60,
+        shared_max_bytes: int = DEFAULT_SHARED_MAX_BYTES,
     ):
-        # Local cache: session_id -> OrderedDict{tree_index -> TreeGraph}
+        # Local cache: session_id -> OrderedDict{tree_index -> _SessionEntry}
         # OrderedDict keeps recent access ordering per session.
         self._local_cache: Dict[str, OrderedDict] = {}
         self._session_last_access: Dict[str, float] = {}
         self._local_ttl_seconds = max(1, int(local_ttl_seconds))
         self._cleanup_interval_seconds = max(1, int(cleanup_interval_seconds))
         self._last_cleanup_monotonic = 0.0
+        # Shared tier: content_key -> _SharedEntry, least recently used first.
+        self._shared: "OrderedDict[Hashable, _SharedEntry]" = OrderedDict()
+        self._shared_bytes = 0
+        self._shared_max_bytes = max(0, int(shared_max_bytes))
+        self._shared_hits = 0
+        self._shared_misses = 0
+        self._shared_evictions = 0
         self._lock = asyncio.Lock()
         print(
             "TreeGraphCache initialized (in-memory, "
-            f"ttl={self._local_ttl_seconds}s, cleanup={self._cleanup_interval_seconds}s)"
+            f"ttl={self._local_ttl_seconds}s, cleanup={self._cleanup_interval_seconds}s, "
+            f"shared_budget={self._shared_max_bytes}B)"
         )
 
     def _touch_session_nolock(self, session_id: str, now: Optional[float] = None) -> None:
         self._session_last_access[session_id] = time.monotonic() if now is None else now
 
+    def _drop_session_entry_nolock(self, session_id: str, tree_index: int) -> None:
+        session_cache = self._local_cache.get(session_id)
+        if session_cache is None:
+            return
+        entry = session_cache.pop(tree_index, None)
+        if entry is not None and entry.content_key is not None:
+            shared = self._shared.get(entry.content_key)
+            if shared is not None:
+                shared.sessions.discard((session_id, tree_index))
+
+    def _drop_session_nolock(self, session_id: str) -> int:
+        session_cache = self._local_cache.get(session_id) or {}
+        count = len(session_cache)
+        for tree_index in list(session_cache):
+            self._drop_session_entry_nolock(session_id, tree_index)
+        self._local_cache.pop(session_id, None)
+        self._session_last_access.pop(session_id, None)
+        return count
+
     def _cleanup_expired_sessions_nolock(self, now: float) -> int:
         expired_session_ids = [
             session_id
@@ -53,10 +126,68 @@ class TreeGraphCache:
             if (now - last_access) > self._local_ttl_seconds
         ]
         for session_id in expired_session_ids:
-            self._local_cache.pop(session_id, None)
-            self._session_last_access.pop(session_id, None)
+            self._drop_session_nolock(session_id)
         return len(expired_session_ids)
 
+    def _evict_shared_nolock(self, content_key: Hashable) -> None:
+        shared = self._shared.pop(content_key, None)
+        if shared is None:
+            return
+        self._shared_bytes -= shared.nbytes
+        self._shared_evictions += 1
+        # Session references would keep the graph alive; drop them too.
+        for session_id, tree_index in list(shared.sessions):
+            session_cache = self._local_cache.get(session_id)
+            if session_cache is not None:
+                session_cache.pop(tree_index, None)
+                if not session_cache:
+                    self._local_cache.pop(session_id, None)
+                    self._session_last_access.pop(session_id, None)
+
+    def _enforce_shared_budget_nolock(self, keep: Optional[Hashable] = None) -> None:
+        while self._shared_bytes > self._shared_max_bytes and self._shared:
+            victim = next(iter(self._shared))
+            if victim == keep:
+                if len(self._shared) == 1:
+                    break
+                self._shared.move_to_end(victim)
+                continue
+            self._evict_shared_nolock(victim)
+
+    def set_shared_budget(self, max_bytes: int) -> None:
+        """Change the shared-tier byte budget; call before the cache is in use."""
+        self._shared_max_bytes = max(0, int(max_bytes))
+        self._enforce_shared_budget_nolock()
+
+    def _remeasure_nolock(self, content_key: Hashable, shared: _SharedEntry) -> None:
+        # Lazy graphs grow when they materialize; keep accounting current.
+        nbytes = graph_nbytes(shared.graph)
+        if nbytes != shared.nbytes:
+            self._shared_bytes += nbytes - shared.nbytes
+            shared.nbytes = nbytes
+            self._enforce_shared_budget_nolock(keep=content_key)
+
+    def _attach_nolock(
+        self,
+        session_id: str,
+        tree_index: int,
+        content_key: Hashable,
+        shared: _SharedEntry,
+    ):
+        if session_id not in self._local_cache:
+            self._local_cache[session_id] = OrderedDict()
+        session_cache = self._local_cache[session_id]
+        previous = session_cache.get(tree_index)
+        if previous is not None and previous.content_key == content_key:
+            session_cache.move_to_end(tree_index)
+            return previous.graph
+        self._drop_session_entry_nolock(session_id, tree_index)
+        view = _session_view(shared.graph)
+        session_cache[tree_index] = _SessionEntry(view, content_key)
+        session_cache.move_to_end(tree_index)
+        shared.sessions.add((session_id, tree_index))
+        return view
+
     async def _maybe_cleanup(self) -> None:
         now = time.monotonic()
         if (now - self._last_cleanup_monotonic) < self._cleanup_interval_seconds:
@@ -70,37 +201,92 @@ class TreeGraphCache:
             if evicted_sessions > 0:
                 print(f"TreeGraphCache TTL-evicted {evicted_sessions} expired sessions")
 
-    async def get(self, session_id: str, tree_index: int) -> Optional["TreeGraph"]:
-        """Retrieve a cached TreeGraph."""
+    async def get(
+        self,
+        session_id: str,
+        tree_index: int,
+        *,
+        content_key: Optional[Hashable] = None,
+    ) -> Optional["TreeGraph"]:
+        """Retrieve a cached TreeGraph.
+
+        With ``content_key``, a graph another session already built is
+        attached to this session on a local miss.
+        """
         await self._maybe_cleanup()
         async with self._lock:
             session_cache = self._local_cache.get(session_id)
-            if not session_cache:
-                return None
-            tree_graph = session_cache.get(tree_index)
-            if tree_graph is None:
+            entry = session_cache.get(tree_index) if session_cache else None
+            if entry is not None and (
+                content_key is None or entry.content_key in (None, content_key)
+            ):
+                session_cache.move_to_end(tree_index)
                 self._touch_session_nolock(session_id)
-                return None
-            session_cache.move_to_end(tree_index)
-            self._touch_session_nolock(session_id)
-            return tree_graph
+                if entry.content_key is not None:
+                    shared = self._shared.get(entry.content_key)
+                    if shared is not None:
+                        self._shared.move_to_end(entry.content_key)
+                        self._remeasure_nolock(entry.content_key, shared)
+                return entry.graph
+            if content_key is not None:
+                shared = self._shared.get(content_key)
+                if shared is not None:
+                    self._shared_hits += 1
+                    self._shared.move_to_end(content_key)
+                    self._remeasure_nolock(content_key, shared)
+                    if content_key in self._shared:
+                        graph = self._attach_nolock(
+                            session_id, tree_index, content_key, shared
+                        )
+                        self._touch_session_nolock(session_id)
+                        return graph
+                else:
+                    self._shared_misses += 1
+            if session_cache is not None:
+                self._touch_session_nolock(session_id)
+            return None
 
     async def set(
         self,
         session_id: str,
         tree_index: int,
         tree_graph: "TreeGraph",
+        *,
+        content_key: Optional[Hashable] = None,
     ) -> None:
-        """Cache a TreeGraph object."""
+        """Cache a TreeGraph object.
+
+        With ``content_key`` the graph is published to the shared tier (the
+        first published graph wins) and the session keeps a reference.
+        Graphs larger than the whole shared budget stay session-local.
+        """
         await self._maybe_cleanup()
         async with self._lock:
+            nbytes = graph_nbytes(tree_graph)
+            if content_key is not None and nbytes <= self._shared_max_bytes:
+                shared = self._shared.get(content_key)
+                if shared is None:
+                    shared = _SharedEntry(tree_graph, nbytes)
+                    self._shared[content_key] = shared
+                    self._shared_bytes += nbytes
+                self._shared.move_to_end(content_key)
+                self._attach_nolock(session_id, tree_index, content_key, shared)
+                self._touch_session_nolock(session_id)
+                self._enforce_shared_budget_nolock(keep=content_key)
+                return
+            self._drop_session_entry_nolock(session_id, tree_index)
             if session_id not in self._local_cache:
                 self._local_cache[session_id] = OrderedDict()
             session_cache = self._local_cache[session_id]
-            session_cache[tree_index] = tree_graph
+            session_cache[tree_index] = _SessionEntry(tree_graph)
             session_cache.move_to_end(tree_index)
             self._touch_session_nolock(session_id)
 
+    async def discard_shared(self, content_key: Hashable) -> None:
+        """Drop a shared graph and every session reference to it."""
+        async with self._lock:
+            self._evict_shared_nolock(content_key)
+
     async def get_all_for_session(self, session_id: str) -> Dict[int, "TreeGraph"]:
         """Retrieve all cached TreeGraphs for a session."""
         await self._maybe_cleanup()
@@ -109,20 +295,25 @@ class TreeGraphCache:
             if not session_cache:
                 return {}
             self._touch_session_nolock(session_id)
-            return dict(session_cache)
+            return {
+                tree_index: entry.graph
+                for tree_index, entry in session_cache.items()
+            }
 
     async def clear_session(self, session_id: str) -> None:
         """Clear all cached TreeGraphs for a session."""
         await self._maybe_cleanup()
         async with self._lock:
-            count = len(self._local_cache.get(session_id, {}))
-            self._local_cache.pop(session_id, None)
-            self._session_last_access.pop(session_id, None)
+            count = self._drop_session_nolock(session_id)
             if count > 0:
                 print(f"TreeGraphCache cleared {count} trees for session {session_id[:8]}...")
 
     async def evict_not_visible(self, session_id: str, visible_indices: set) -> int:
-        """Evict trees that are not currently visible."""
+        """Evict trees that are not currently visible.
+
+        Only the session's references are dropped; shared graphs stay
+        available to other sessions until the byte budget evicts them.
+        """
         await self._maybe_cleanup()
         async with self._lock:
             session_cache = self._local_cache.get(session_id)
@@ -130,7 +321,7 @@ class TreeGraphCache:
                 return 0
             keys_to_remove = [idx for idx in session_cache.keys() if idx not in visible_indices]
             for idx in keys_to_remove:
-                session_cache.pop(idx, None)
+                self._drop_session_entry_nolock(session_id, idx)
             if not session_cache:
                 self._local_cache.pop(session_id, None)
                 self._session_last_access.pop(session_id, None)
@@ -155,7 +346,15 @@ class TreeGraphCache:
             "mode": "in-memory",
             "sessions": len(self._local_cache),
             "total_trees": total_trees,
-            "eviction_strategy": "visibility+ttl",
+            "eviction_strategy": "visibility+ttl+shared-lru-bytes",
             "ttl_seconds": self._local_ttl_seconds,
             "cleanup_interval_seconds": self._cleanup_interval_seconds,
+            "shared": {
+                "graphs": len(self._shared),
+                "bytes": self._shared_bytes,
+                "max_bytes": self._shared_max_bytes,
+                "hits": self._shared_hits,
+                "misses": self._shared_misses,
+                "evictions": self._shared_evictions,
+            },
         }
@@ -0,0 +1,69 @@
+"""
+Cooperative cancellation of superseded requests.
+
+A fast pan or zoom emits one ``process_postorder_layout`` event per frame
+and the client keeps only the newest response. RequestGenerations numbers
+the requests on each channel (one socket of one session); starting a new
+request supersedes the older ones, whose CancelTokens then report
+cancelled. Queued work checks its token before it starts and long-running
+builds poll it between trees, stopping with RequestCancelled.
+"""
+
+import itertools
+from collections import Counter
+from typing import Callable, Hashable, Optional
+
+
+class RequestCancelled(Exception):
+    """Raised by work whose request has been superseded."""
+
+
+class CancelToken:
+    """Cancellation flag polled by running work; safe to read from threads."""
+
+    __slots__ = ("_is_cancelled",)
+
+    def __init__(self, is_cancelled: Optional[Callable[[], bool]] = None):
+        self._is_cancelled = is_cancelled
+
+    @property
+    def cancelled(self) -> bool:
+        return self._is_cancelled is not None and self._is_cancelled()
+
+    def raise_if_cancelled(self) -> None:
+        if self.cancelled:
+            raise RequestCancelled("Request superseded by a newer request")
+
+
+class RequestGenerations:
+    """Latest request generation per channel, plus cancellation counters."""
+
+    def __init__(self):
+        self._generations = itertools.count(1)
+        self._current: dict[Hashable, int] = {}
+        self._stats: Counter[str] = Counter()
+
+    def begin(self, channel: Hashable) -> CancelToken:
+        """Start a request on ``channel``, superseding any earlier one."""
+        generation = next(self._generations)
+        if channel in self._current:
+            self._stats["superseded"] += 1
+        self._current[channel] = generation
+        self._stats["requests"] += 1
+        return CancelToken(lambda: self._current.get(channel) != generation)
+
+    def finish(self, channel: Hashable, token: CancelToken) -> None:
+        """Forget ``channel`` if ``token`` belongs to its latest request."""
+        if not token.cancelled:
+            self._current.pop(channel, None)
+
+    def record_cancelled(self) -> None:
+        self._stats["cancelled"] += 1
+
+    def get_stats(self) -> dict:
+        return {
+            "active_channels": len(self._current),
+            "requests": self._stats["requests"],
+            "superseded": self._stats["superseded"],
+            "cancelled": self._stats["cancelled"],
+        }
@@ -2,20 +2,36 @@ from google.cloud import storage
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Optional
+from urllib.parse import quote
 import zoneinfo
 import aiofiles
 import asyncio
 import aiohttp
+import base64
+import hashlib
+import json
 import logging
 import os
+import shutil
 import time
 
+try:
+    import google_crc32c
+except ImportError:  # pragma: no cover - shipped with google-cloud-storage
+    google_crc32c = None
+
 from lorax.utils import is_csr_artifact_directory
 
 logger = logging.getLogger(__name__)
 
 _DEFAULT_GCS_PROJECTS_CACHE_TTL_SEC = 15.0
 _DEFAULT_GCS_PROJECTS_TIMEOUT_SEC = 5.0
+_DEFAULT_GCS_BASE_URL = "https://storage.googleapis.com"
+_DEFAULT_DOWNLOAD_CHUNK_MB = 32.0
+_DEFAULT_DOWNLOAD_CONCURRENCY = 8.0
+_DEFAULT_DIRECTORY_CONCURRENCY = 4.0
+_CHUNK_ATTEMPTS = 3
+_STREAM_PIECE_BYTES = 1024 * 1024
 _GCS_PROJECTS_CACHE: dict[tuple[str, str], dict[str, Any]] = {}
 _GCS_PROJECTS_CACHE_LOCKS: dict[tuple[str, str], asyncio.Lock] = {}
 
@@ -45,6 +61,28 @@ def _get_projects_timeout_sec() -> float:
     )
 
 
+def _gcs_base_url() -> str:
+    """Storage endpoint; overridable so tests can point at a fake server."""
+    return os.getenv("LORAX_GCS_BASE_URL", _DEFAULT_GCS_BASE_URL).rstrip("/")
+
+
+def _get_download_chunk_bytes() -> int:
+    chunk_mb = _get_float_env("LORAX_GCS_DOWNLOAD_CHUNK_MB", _DEFAULT_DOWNLOAD_CHUNK_MB)
+    return max(_STREAM_PIECE_BYTES, int(chunk_mb * 1024 * 1024))
+
+
+def _get_download_concurrency() -> int:
+    return max(1, int(_get_float_env(
+        "LORAX_GCS_DOWNLOAD_CONCURRENCY", _DEFAULT_DOWNLOAD_CONCURRENCY
+    )))
+
+
+def _get_directory_concurrency() -> int:
+    return max(1, int(_get_float_env(
+        "LORAX_GCS_DIRECTORY_CONCURRENCY", _DEFAULT_DIRECTORY_CONCURRENCY
+    )))
+
+
 def _projects_cache_key(bucket_name: str, prefix: str) -> tuple[str, str]:
     return (bucket_name, prefix or "")
 
@@ -74,7 +112,7 @@ def _get_fresh_cached_items(cache_key: tuple[str, str]) -> list[dict[str, Any]]
 
 
 async def _fetch_public_bucket_items(bucket_name: str, prefix: str = "") -> list[dict[str, Any]]:
-    api_url = f"https://storage.googleapis.com/storage/v1/b/{bucket_name}/o"
+    api_url = f"{_gcs_base_url()}/storage/v1/b/{bucket_name}/o"
     params = {"prefix": prefix or "", "fields": "items(name)"}
     timeout = aiohttp.ClientTimeout(total=_get_projects_timeout_sec())
     async with aiohttp.ClientSession(timeout=timeout) as session:
@@ -124,19 +162,198 @@ def get_gcs_client():
     return storage.Client()
 
 
-async def _download_gcs_file_direct(bucket_name: str, blob_path: str, local_path: str):
+class GCSIntegrityError(RuntimeError):
+    """Downloaded bytes do not match the blob's published checksum."""
+
+
+class _RangeUnsupported(Exception):
+    """The server answered a ranged request with the whole object."""
+
+
+async def _fetch_blob_metadata(
+    session: aiohttp.ClientSession, bucket_name: str, blob_path: str
+) -> Optional[dict[str, Any]]:
+    """Return size/generation/checksums for a blob, or None if unavailable."""
+    url = (
+        f"{_gcs_base_url()}/storage/v1/b/{bucket_name}/o/"
+        f"{quote(blob_path, safe='')}"
+    )
+    params = {"fields": "size,generation,md5Hash,crc32c"}
+    try:
+        async with session.get(url, params=params) as resp:
+            if resp.status != 200:
+                return None
+            payload = await resp.json()
+    except aiohttp.ClientError:
+        return None
+    if not isinstance(payload, dict) or "size" not in payload:
+        return None
+    return payload
+
+
+def _file_checksums(path: Path, metadata: dict[str, Any]) -> tuple[str, str, str]:
+    """Return (algorithm, expected, actual) base64 digests for a file.
+
+    crc32c is preferred since composite objects publish no md5.
+    """
+    if metadata.get("crc32c") and google_crc32c is not None:
+        algorithm, expected = "crc32c", metadata["crc32c"]
+        digest = google_crc32c.Checksum()
+    elif metadata.get("md5Hash"):
+        algorithm, expected = "md5", metadata["md5Hash"]
+        digest = hashlib.md5()
+    else:
+        return "none", "", ""
+    with open(path, "rb") as f:
+        while piece := f.read(8 * 1024 * 1024):
+            digest.update(piece)
+    return algorithm, expected, base64.b64encode(digest.digest()).decode("ascii")
+
+
+def _read_journal(journal_path: Path, expected: dict[str, Any]) -> set[int]:
+    """Completed chunk indexes from a journal matching this blob and layout."""
+    try:
+        journal = json.loads(journal_path.read_text())
+    except (OSError, ValueError):
+        return set()
+    if any(journal.get(key) != value for key, value in expected.items()):
+        return set()
+    return {int(index) for index in journal.get("done", [])}
+
+
+async def _stream_to_file(resp: aiohttp.ClientResponse, fd: int, offset: int) -> int:
+    written = 0
+    while piece := await resp.content.read(_STREAM_PIECE_BYTES):
+        await asyncio.to_thread(os.pwrite, fd, piece, offset + written)
+        written += len(piece)
+    return written
+
+
+async def _download_chunked(
+    session: aiohttp.ClientSession,
+    url: str,
+    local_path: Path,
+    metadata: dict[str, Any],
+    chunk_size: int,
+    concurrency: int,
+) -> bool:
+    """Download ``url`` as concurrent ranged chunks into ``local_path``.
+
+    Progress is journaled next to the ``.part`` file so an interrupted
+    download resumes with the missing chunks only. Returns False when the
+    server ignores Range requests, so the caller can stream instead.
+    """
+    size = int(metadata["size"])
+    part_path = local_path.with_name(local_path.name + ".part")
+    journal_path = local_path.with_name(local_path.name + ".part.json")
+    layout = {
+        "generation": str(metadata.get("generation", "")),
+        "size": size,
+        "chunk_size": chunk_size,
+    }
+    done = _read_journal(journal_path, layout) if part_path.exists() else set()
+    if not done:
+        with open(part_path, "wb") as f:
+            f.truncate(size)
+
+    num_chunks = -(-size // chunk_size)
+    pending = [index for index in range(num_chunks) if index not in done]
+    semaphore = asyncio.Semaphore(concurrency)
+    journal_lock = asyncio.Lock()
+    fd = os.open(part_path, os.O_WRONLY)
+
+    async def fetch(index: int) -> None:
+        start = index * chunk_size
+        end = min(size, start + chunk_size) - 1
+        headers = {"Range": f"bytes={start}-{end}"}
+        async with semaphore:
+            for attempt in range(1, _CHUNK_ATTEMPTS + 1):
+                try:
+                    async with session.get(url, headers=headers) as resp:
+                        if resp.status == 200 and size > 0:
+                            raise _RangeUnsupported()
+                        if resp.status != 206:
+                            raise RuntimeError(
+                                f"Failed to download {url} bytes {start}-{end} "
+                                f"(HTTP {resp.status})"
+                            )
+                        written = await _stream_to_file(resp, fd, start)
+                    if written != end - start + 1:
+                        raise RuntimeError(
+                            f"Short read for {url} bytes {start}-{end}: {written}"
+                        )
+                    break
+                except (aiohttp.ClientError, RuntimeError):
+                    if attempt == _CHUNK_ATTEMPTS:
+                        raise
+                    await asyncio.sleep(0.1 * attempt)
+        async with journal_lock:
+            done.add(index)
+            journal_path.write_text(json.dumps({**layout, "done": sorted(done)}))
+
+    try:
+        results = await asyncio.gather(
+            *(fetch(index) for index in pending), return_exceptions=True
+        )
+    finally:
+        os.close(fd)
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if any(isinstance(error, _RangeUnsupported) for error in errors):
+        part_path.unlink(missing_ok=True)
+        journal_path.unlink(missing_ok=True)
+        return False
+    if errors:
+        raise errors[0]
+
+    algorithm, expected, actual = await asyncio.to_thread(
+        _file_checksums, part_path, metadata
+    )
+    if expected != actual:
+        part_path.unlink(missing_ok=True)
+        journal_path.unlink(missing_ok=True)
+        raise GCSIntegrityError(
+            f"{algorithm} mismatch for {url}: expected {expected}, got {actual}"
+        )
+    part_path.rename(local_path)
+    journal_path.unlink(missing_ok=True)
+    return True
+
+
+async def _download_gcs_file_direct(
+    bucket_name: str,
+    blob_path: str,
+    local_path: str,
+    *,
+    chunk_size: Optional[int] = None,
+    concurrency: Optional[int] = None,
+):
     """
     Internal: Download a public GCS blob to a local file.
 
+    Blobs with published metadata are fetched as concurrent ranged chunks,
+    resumed from a partial-file journal and validated against the blob's
+    crc32c/md5. Otherwise the blob is streamed sequentially.
+
     Args:
         bucket_name (str): Name of the public GCS bucket (e.g. "lorax_projects")
         blob_path (str): Path inside the bucket (e.g. "1000Genomes/1kg_chr20.trees.tsz")
         local_path (str): Local destination path (e.g. "uploads/1kg_chr20.trees.tsz")
+        chunk_size (int): Bytes per ranged request (LORAX_GCS_DOWNLOAD_CHUNK_MB)
+        concurrency (int): Parallel ranged requests (LORAX_GCS_DOWNLOAD_CONCURRENCY)
     """
-    url = f"https://storage.googleapis.com/{bucket_name}/{blob_path}"
-    Path(local_path).parent.mkdir(parents=True, exist_ok=True)
+    url = f"{_gcs_base_url()}/{bucket_name}/{blob_path}"
+    local_path_obj = Path(local_path)
+    local_path_obj.parent.mkdir(parents=True, exist_ok=True)
+    chunk_size = chunk_size or _get_download_chunk_bytes()
+    concurrency = concurrency or _get_download_concurrency()
 
     async with aiohttp.ClientSession() as session:
+        metadata = await _fetch_blob_metadata(session, bucket_name, blob_path)
+        if metadata is not None and await _download_chunked(
+            session, url, local_path_obj, metadata, chunk_size, concurrency
+        ):
+            return local_path_obj
+
         async with session.get(url) as resp:
             if resp.status != 200:
                 raise RuntimeError(f"Failed to download {url} (HTTP {resp.status})")
@@ -145,7 +362,73 @@ async def _download_gcs_file_direct(bucket_name: str, blob_path: str, local_path
                 while chunk := await resp.content.read(1024 * 1024):  # 1 MB chunks
                     await f.write(chunk)
 
-    return Path(local_path)
+    if metadata is not None:
+        algorithm, expected, actual = await asyncio.to_thread(
+            _file_checksums, local_path_obj, metadata
+        )
+        if expected != actual:
+            local_path_obj.unlink(missing_ok=True)
+            raise GCSIntegrityError(
+                f"{algorithm} mismatch for {url}: expected {expected}, got {actual}"
+            )
+    return local_path_obj
+
+
+async def _list_blob_names(bucket_name: str, prefix: str) -> list[str]:
+    api_url = f"{_gcs_base_url()}/storage/v1/b/{bucket_name}/o"
+    names: list[str] = []
+    params = {"prefix": prefix, "fields": "items(name),nextPageToken"}
+    async with aiohttp.ClientSession() as session:
+        while True:
+            async with session.get(api_url, params=params) as resp:
+                resp.raise_for_status()
+                payload = await resp.json()
+            names.extend(
+                item["name"]
+                for item in payload.get("items", [])
+                if isinstance(item, dict) and not item.get("name", "").endswith("/")
+            )
+            token = payload.get("nextPageToken")
+            if not token:
+                return names
+            params = {**params, "pageToken": token}
+
+
+async def download_gcs_directory(
+    bucket_name: str,
+    prefix: str,
+    local_dir: str,
+    *,
+    concurrency: Optional[int] = None,
+) -> Path:
+    """
+    Download every blob under ``prefix`` (e.g. a CSR artifact directory).
+
+    Files download with bounded parallelism into a sibling ``.inprogress``
+    directory that is renamed into place once all of them validate, so a
+    partially downloaded artifact is never visible to the resolver.
+    """
+    prefix = prefix.rstrip("/") + "/"
+    target = Path(local_dir)
+    staging = target.with_name(target.name + ".inprogress")
+    staging.mkdir(parents=True, exist_ok=True)
+    names = await _list_blob_names(bucket_name, prefix)
+    if not names:
+        raise FileNotFoundError(f"No objects under gs://{bucket_name}/{prefix}")
+
+    semaphore = asyncio.Semaphore(concurrency or _get_directory_concurrency())
+
+    async def fetch(name: str) -> None:
+        async with semaphore:
+            await _download_gcs_file_direct(
+                bucket_name, name, str(staging / name[len(prefix):])
+            )
+
+    await asyncio.gather(*(fetch(name) for name in names))
+    if target.exists():
+        shutil.rmtree(target)
+    staging.rename(target)
+    return target
 
 
 async def download_gcs_file(bucket_name: str, blob_path: str, local_path: str):
@@ -0,0 +1,5 @@
+"""Multi-process compute tier for CPU-heavy render and query jobs."""
+
+from lorax.compute.pool import ComputePool
+
+__all__ = ["ComputePool"]
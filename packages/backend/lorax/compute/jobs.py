@@ -0,0 +1,113 @@
+"""
+Jobs executed inside compute worker processes.
+
+Each worker imports ``lorax.context`` once, so it builds the same caches
+(FileContext, TreeGraph, render L2, decompressed .tsz) from the same
+configuration as the socket process, and runs every job on one persistent
+event loop. Jobs take a file path plus JSON-like keyword arguments and
+return plain dicts whose Arrow buffers are ``bytes``, so results pickle
+cheaply across the process boundary.
+
+A worker's in-memory caches are its own: its FileContext and TreeGraph
+budgets are a per-worker share (``LORAX_WORKER_*_MAX_MB``), and the
+TreeGraphs it builds for renders are not visible to the socket process's
+session cache. Lineage and search events, which run in the socket
+process, build their own graphs on first use.
+"""
+
+import asyncio
+import os
+from typing import Any, Optional
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def init_worker() -> None:
+    """Process initializer: create the worker's event loop and shared state."""
+    global _loop
+    _loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(_loop)
+    from lorax.cache.file_cache import set_file_cache_budget
+    from lorax.constants import (
+        WORKER_FILE_CACHE_MAX_BYTES,
+        WORKER_TREE_GRAPH_SHARED_MAX_BYTES,
+    )
+    from lorax.context import tree_graph_cache  # builds this worker's caches
+
+    set_file_cache_budget(WORKER_FILE_CACHE_MAX_BYTES)
+    tree_graph_cache.set_shared_budget(WORKER_TREE_GRAPH_SHARED_MAX_BYTES)
+
+
+async def _tree_graph(file_path: str, **kwargs) -> dict:
+    from lorax.context import csv_tree_graph_cache, render_cache, tree_graph_cache
+    from lorax.handlers import handle_tree_graph_query
+
+    result = await handle_tree_graph_query(
+        file_path,
+        tree_graph_cache=tree_graph_cache,
+        csv_tree_graph_cache=csv_tree_graph_cache,
+        render_cache=render_cache,
+        **kwargs,
+    )
+    # The worker loop only runs while a job does, so finish render L2 stores
+    # here; this delays the worker, not the socket process's event loop.
+    if render_cache is not None:
+        await render_cache.drain()
+    return result
+
+
+async def _metadata_array(file_path: str, key: str) -> dict:
+    from lorax.cache import get_file_context
+    from lorax.metadata.loader import get_metadata_array_for_key
+
+    ctx = await get_file_context(file_path)
+    if ctx is None:
+        return {"error": "Failed to load tree sequence"}
+    return await asyncio.to_thread(get_metadata_array_for_key, ctx, key)
+
+
+async def _compare_trees(file_path: str, **kwargs) -> dict:
+    from lorax.context import csv_tree_graph_cache, tree_graph_cache
+    from lorax.handlers import get_compare_trees_diff
+
+    return await get_compare_trees_diff(
+        file_path,
+        tree_graph_cache=tree_graph_cache,
+        csv_tree_graph_cache=csv_tree_graph_cache,
+        **kwargs,
+    )
+
+
+async def _worker_info(file_path: Optional[str] = None) -> dict:
+    from lorax.cache import get_file_cache_status
+    from lorax.context import tree_graph_cache
+
+    return {
+        "pid": os.getpid(),
+        "file_cache": get_file_cache_status(),
+        "tree_graph_shared": tree_graph_cache.get_stats()["shared"],
+    }
+
+
+JOBS = {
+    "tree_graph": _tree_graph,
+    "metadata_array": _metadata_array,
+    "compare_trees": _compare_trees,
+    "worker_info": _worker_info,
+}
+
+
+def run_job(name: str, file_path: Optional[str], kwargs: dict) -> tuple[Any, list[str]]:
+    """Entry point called in the worker for each submitted job.
+
+    Returns the job's result and the files now loaded in this worker, which
+    the pool uses to decide whether a later job needs memory admission.
+    """
+    if name not in JOBS:
+        raise ValueError(f"Unknown compute job {name!r}; expected one of {sorted(JOBS)}")
+    if _loop is None:
+        init_worker()
+    from lorax.cache.file_cache import loaded_file_paths
+
+    result = _loop.run_until_complete(JOBS[name](file_path, **kwargs))
+    return result, loaded_file_paths()
@@ -0,0 +1,167 @@
+"""
+Local compute tier: a pool of worker processes behind the socket process.
+
+The Socket.IO server runs as a single process, so tree construction,
+sparsification, metadata decoding and tree comparison from every user used
+to share one interpreter. ComputePool fans that work out to worker
+processes over ``concurrent.futures`` pipes while keeping one socket
+endpoint.
+
+Jobs are routed by file path: each file hashes to a home worker, which
+keeps that file's FileContext and TreeGraphs warm in its own caches. When
+the home worker already has ``spill_depth`` jobs queued, a job may run on
+the least-loaded worker instead (which then loads the file too), so a
+single hot file can still use several cores.
+
+Workers report the files they hold after every job. A job that would make
+a worker load a file it does not hold first enters the ``admit`` context
+given to start(), so worker loads wait on the same memory admission as
+loads in the socket process, whose ceiling covers the RSS of the socket
+process and its workers together. Each worker's caches get a share of the
+FileContext and TreeGraph budgets (see ``lorax.compute.jobs``).
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import zlib
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, AsyncContextManager, Callable, Optional
+
+from lorax.compute.jobs import init_worker, run_job
+
+logger = logging.getLogger(__name__)
+
+
+class ComputePool:
+    """File-affine pool of single-process executors."""
+
+    def __init__(self, num_workers: int, *, spill_depth: int = 0):
+        self.num_workers = max(0, int(num_workers))
+        self.spill_depth = max(0, int(spill_depth))
+        self._executors: list[Optional[ProcessPoolExecutor]] = [None] * self.num_workers
+        self._queued = [0] * self.num_workers
+        self._resident: list[set[str]] = [set() for _ in range(self.num_workers)]
+        self._admit: Optional[Callable[[str], AsyncContextManager]] = None
+        self._admitted = 0
+        self._completed = [0] * self.num_workers
+        self._failed = 0
+        self._restarts = 0
+        self._spilled = 0
+        self._started = False
+
+    @property
+    def enabled(self) -> bool:
+        return self._started and self.num_workers > 0
+
+    def start(self, *, admit: Optional[Callable[[str], AsyncContextManager]] = None) -> None:
+        """Spawn the worker processes (no-op without workers).
+
+        ``admit(file_path)`` is held around jobs that load a file into a
+        worker that does not hold it yet.
+        """
+        self._admit = admit
+        if self.num_workers and not self._started:
+            for index in range(self.num_workers):
+                self._executor(index)
+            self._started = True
+
+    def shutdown(self, wait: bool = True) -> None:
+        for index, executor in enumerate(self._executors):
+            if executor is not None:
+                executor.shutdown(wait=wait, cancel_futures=True)
+                self._executors[index] = None
+        self._started = False
+
+    def _executor(self, index: int) -> ProcessPoolExecutor:
+        executor = self._executors[index]
+        if executor is None:
+            # spawn: workers must not inherit the socket process's event
+            # loop, threads or open Redis connections.
+            executor = ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=init_worker,
+            )
+            self._executors[index] = executor
+        return executor
+
+    def _restart(self, index: int, executor: ProcessPoolExecutor) -> None:
+        # Every job queued on a dead worker fails; only the first replaces
+        # it, so later ones do not shut down the new worker's jobs.
+        if self._executors[index] is not executor:
+            return
+        self._executors[index] = None
+        executor.shutdown(wait=False, cancel_futures=True)
+        self._resident[index] = set()
+        self._restarts += 1
+
+    def home_worker(self, file_path: Optional[str]) -> int:
+        """Stable worker index for a file."""
+        key = str(Path(file_path).resolve()) if file_path else ""
+        return zlib.crc32(key.encode()) % self.num_workers
+
+    def worker_for(self, file_path: Optional[str]) -> int:
+        """Home worker, or the least-loaded one when home is ``spill_depth`` deep."""
+        home = self.home_worker(file_path)
+        if not self.spill_depth or self._queued[home] < self.spill_depth:
+            return home
+        least = min(range(self.num_workers), key=self._queued.__getitem__)
+        if self._queued[least] < self._queued[home]:
+            self._spilled += 1
+            return least
+        return home
+
+    async def submit(self, job: str, file_path: Optional[str] = None, **kwargs) -> Any:
+        """Run ``job`` for ``file_path`` on a worker and return its result.
+
+        Exceptions raised by the job propagate. If the worker process dies
+        it is replaced and the call raises ``BrokenProcessPool``.
+        """
+        if not self.enabled:
+            raise RuntimeError("Compute pool is not running")
+        index = self.worker_for(file_path)
+        cold = (
+            self._admit is not None
+            and file_path is not None
+            and file_path not in self._resident[index]
+        )
+        self._queued[index] += 1
+        executor = None
+        try:
+            async with self._admit(file_path) if cold else nullcontext():
+                executor = self._executor(index)
+                future = executor.submit(run_job, job, file_path, kwargs)
+                result, resident = await asyncio.wrap_future(future)
+            self._resident[index] = set(resident)
+        except BrokenProcessPool:
+            self._failed += 1
+            logger.error("Compute worker %d died running %s; restarting it", index, job)
+            if executor is not None:
+                self._restart(index, executor)
+            raise
+        except Exception:
+            self._failed += 1
+            raise
+        finally:
+            self._queued[index] -= 1
+        self._completed[index] += 1
+        self._admitted += cold
+        return result
+
+    def snapshot(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "workers": self.num_workers,
+            "spill_depth": self.spill_depth,
+            "queued": list(self._queued),
+            "completed": list(self._completed),
+            "failed": self._failed,
+            "restarts": self._restarts,
+            "spilled": self._spilled,
+            "admitted_loads": self._admitted,
+            "resident": [sorted(paths) for paths in self._resident],
+        }
@@ -7,6 +7,8 @@ Mode-aware configuration based on deployment environment.
 
 import os
 
+import psutil
+
 # Import mode configuration
 from lorax.modes import (
     get_mode_config,
@@ -28,6 +30,16 @@ def _get_env_int(name: str, default: int, min_value: int = 0) -> int:
     return max(min_value, parsed)
 
 
+def _get_env_float(name: str, default: float) -> float:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        return float(raw)
+    except (TypeError, ValueError):
+        return default
+
+
 def _get_env_bool(name: str, default: bool = False) -> bool:
     raw = os.getenv(name)
     if raw is None:
@@ -39,17 +51,122 @@ def _get_env_bool(name: str, default: bool = False) -> bool:
 SESSION_COOKIE = "lorax_sid"
 COOKIE_MAX_AGE = _get_env_int("LORAX_COOKIE_MAX_AGE_SEC", 3600, min_value=1)
 INMEM_TTL_SECONDS = _get_env_int("LORAX_INMEM_TTL_SEC", 3600, min_value=1)
+# In-process copies of Redis sessions, invalidated over pub/sub; entries are
+# re-read from Redis after this many seconds at the latest (0 disables).
+SESSION_LOCAL_CACHE_SECONDS = _get_env_int("LORAX_SESSION_LOCAL_CACHE_SEC", 30, min_value=0)
+SESSION_LOCAL_CACHE_MAX_ENTRIES = _get_env_int(
+    "LORAX_SESSION_LOCAL_CACHE_MAX_ENTRIES", 10_000, min_value=1
+)
 
 # Cache Configuration (mode-aware)
 TS_CACHE_SIZE = CURRENT_CONFIG.ts_cache_size
 CONFIG_CACHE_SIZE = CURRENT_CONFIG.config_cache_size
 METADATA_CACHE_SIZE = CURRENT_CONFIG.metadata_cache_size
 CACHE_CLEANUP_INTERVAL_SECONDS = _get_env_int("LORAX_CACHE_CLEANUP_INTERVAL_SEC", 60, min_value=1)
+# Byte ceiling for loaded FileContexts (0 disables); defaults to a quarter of RAM.
+FILE_CACHE_MAX_BYTES = (
+    _get_env_int(
+        "LORAX_FILE_CACHE_MAX_MB",
+        psutil.virtual_memory().total // (4 * 1024 * 1024),
+        min_value=0,
+    )
+    * 1024
+    * 1024
+)
+# Process-wide byte budget for TreeGraphs shared across sessions.
+TREE_GRAPH_SHARED_MAX_BYTES = (
+    _get_env_int("LORAX_TREE_GRAPH_SHARED_MAX_MB", 1024, min_value=0) * 1024 * 1024
+)
 
 # Disk Cache Configuration (mode-aware)
 DISK_CACHE_ENABLED = CURRENT_CONFIG.disk_cache_enabled
 DISK_CACHE_DIR = get_cache_dir(CURRENT_CONFIG)
 DISK_CACHE_MAX_BYTES = CURRENT_CONFIG.disk_cache_max_gb * 1024 * 1024 * 1024
+# Eviction policy ("gdsf" or "lru") and the usage fractions that trigger
+# eviction (high) and where it stops (low).
+DISK_CACHE_EVICTION_POLICY = os.getenv("LORAX_DISK_CACHE_POLICY", "gdsf")
+DISK_CACHE_HIGH_WATERMARK = _get_env_float("LORAX_DISK_CACHE_HIGH_WATERMARK", 0.95)
+DISK_CACHE_LOW_WATERMARK = _get_env_float("LORAX_DISK_CACHE_LOW_WATERMARK", 0.85)
+
+# Keep a decompressed .trees copy of each .tsz input in the disk cache.
+TSZ_DECOMPRESS_CACHE_ENABLED = _get_env_bool("LORAX_TSZ_DECOMPRESS_CACHE", True)
+
+# Derived per-file indexes (config, metadata arrays, sample lookups) persisted
+# beside the disk cache, keyed by content hash and Lorax version.
+DERIVED_INDEX_ENABLED = _get_env_bool("LORAX_DERIVED_INDEX_ENABLED", DISK_CACHE_ENABLED)
+DERIVED_INDEX_DIR = os.getenv("LORAX_DERIVED_INDEX_DIR") or str(
+    DISK_CACHE_DIR / "indexes"
+)
+# Byte cap for the derived index directory (0 disables); defaults to a
+# quarter of the disk cache budget.
+DERIVED_INDEX_MAX_BYTES = (
+    _get_env_int(
+        "LORAX_DERIVED_INDEX_MAX_MB",
+        DISK_CACHE_MAX_BYTES // (4 * 1024 * 1024),
+        min_value=0,
+    )
+    * 1024
+    * 1024
+)
+
+# Files kept warm and exempt from eviction: comma-separated project/filename
+# entries, plus the N most-hit disk cache entries. Prefetched at startup.
+PINNED_FILES = os.getenv("LORAX_PINNED_FILES", "")
+PIN_TOP_N = _get_env_int("LORAX_PIN_TOP_N", 0, min_value=0)
+
+# Redis L2 cache for rendered trees, shared across server instances (needs
+# REDIS_CLUSTER). Entries larger than the cap are not stored.
+RENDER_L2_CACHE_ENABLED = _get_env_bool("LORAX_RENDER_L2_ENABLED", False)
+RENDER_L2_TTL_SECONDS = _get_env_int("LORAX_RENDER_L2_TTL_SEC", 24 * 3600, min_value=1)
+RENDER_L2_MAX_ENTRY_BYTES = (
+    _get_env_int("LORAX_RENDER_L2_MAX_ENTRY_KB", 4096, min_value=0) * 1024
+)
+
+# Worker processes for CPU-heavy render/query jobs (0 runs them in the
+# socket process). Jobs spill off a file's home worker once it has this
+# many queued (0 never spills).
+COMPUTE_WORKERS = _get_env_int("LORAX_COMPUTE_WORKERS", 0, min_value=0)
+COMPUTE_SPILL_DEPTH = _get_env_int("LORAX_COMPUTE_SPILL_DEPTH", 4, min_value=0)
+# The socket process and every worker keep their own FileContexts and
+# TreeGraphs, so each gets an equal share of the budgets above. The
+# LORAX_WORKER_* variables override the share for workers.
+PROCESS_FILE_CACHE_MAX_BYTES = FILE_CACHE_MAX_BYTES // (COMPUTE_WORKERS + 1)
+PROCESS_TREE_GRAPH_SHARED_MAX_BYTES = TREE_GRAPH_SHARED_MAX_BYTES // (COMPUTE_WORKERS + 1)
+WORKER_FILE_CACHE_MAX_BYTES = (
+    _get_env_int(
+        "LORAX_WORKER_FILE_CACHE_MAX_MB",
+        PROCESS_FILE_CACHE_MAX_BYTES // (1024 * 1024),
+        min_value=0,
+    )
+    * 1024
+    * 1024
+)
+WORKER_TREE_GRAPH_SHARED_MAX_BYTES = (
+    _get_env_int(
+        "LORAX_WORKER_TREE_GRAPH_SHARED_MAX_MB",
+        PROCESS_TREE_GRAPH_SHARED_MAX_BYTES // (1024 * 1024),
+        min_value=0,
+    )
+    * 1024
+    * 1024
+)
+
+# Priority scheduling of socket work (interactive > viewport > bulk). The
+# total defaults to the size of asyncio's default thread pool, so excess work
+# queues where priorities apply instead of inside the executor; the lower
+# classes' defaults leave headroom for interactive requests.
+WORK_MAX_CONCURRENCY = _get_env_int(
+    "LORAX_WORK_MAX_CONCURRENCY", min(32, (os.cpu_count() or 1) + 4), min_value=1
+)
+WORK_INTERACTIVE_CONCURRENCY = _get_env_int(
+    "LORAX_WORK_INTERACTIVE_CONCURRENCY", WORK_MAX_CONCURRENCY, min_value=1
+)
+WORK_VIEWPORT_CONCURRENCY = _get_env_int(
+    "LORAX_WORK_VIEWPORT_CONCURRENCY", max(1, WORK_MAX_CONCURRENCY // 2), min_value=1
+)
+WORK_BULK_CONCURRENCY = _get_env_int(
+    "LORAX_WORK_BULK_CONCURRENCY", max(1, WORK_MAX_CONCURRENCY // 4), min_value=1
+)
 
 # Artifact-backed TreeSequence loading (opt-in during rollout).
 CSR_ARTIFACTS_ENABLED = _get_env_bool("LORAX_CSR_ARTIFACTS_ENABLED", False)
@@ -97,9 +214,21 @@ def print_config():
     """Print current configuration for debugging."""
     print(f"Mode: {CURRENT_MODE}")
     print(f"TS Cache Size: {TS_CACHE_SIZE}")
+    print(f"File Cache Budget (bytes): {FILE_CACHE_MAX_BYTES}")
     print(f"Disk Cache: {DISK_CACHE_ENABLED} ({CURRENT_CONFIG.disk_cache_max_gb}GB)")
+    print(
+        f"Disk Cache Eviction: {DISK_CACHE_EVICTION_POLICY} "
+        f"(watermarks {DISK_CACHE_LOW_WATERMARK}-{DISK_CACHE_HIGH_WATERMARK})"
+    )
     print(f"Max Sockets/Session: {MAX_SOCKETS_PER_SESSION}")
     print(f"Cookie Max Age (sec): {COOKIE_MAX_AGE}")
     print(f"In-Memory TTL (sec): {INMEM_TTL_SECONDS}")
     print(f"Cleanup Interval (sec): {CACHE_CLEANUP_INTERVAL_SECONDS}")
+    print(f"Shared TreeGraph Budget (bytes): {TREE_GRAPH_SHARED_MAX_BYTES}")
+    if COMPUTE_WORKERS:
+        print(
+            f"Compute Workers: {COMPUTE_WORKERS} (per-worker file cache "
+            f"{WORKER_FILE_CACHE_MAX_BYTES}B, TreeGraphs {WORKER_TREE_GRAPH_SHARED_MAX_BYTES}B)"
+        )
+    print(f"Pinned Files: {PINNED_FILES or '-'} (top {PIN_TOP_N} by hits)")
     print(f"Uploads Dir: {UPLOADS_DIR}")
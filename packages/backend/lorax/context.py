@@ -15,12 +15,37 @@ from lorax.modes import (
 from lorax.session_manager import SessionManager
 from lorax.redis_utils import create_redis_client, get_redis_config
 from lorax.cache import DiskCacheManager, TreeGraphCache, CsvTreeGraphCache
+from lorax.cache.file_cache import set_tsz_cache
+from lorax.cache.prefetch import FilePrefetcher, parse_pin_list
+from lorax.cache.render_cache import RenderL2Cache
+from lorax.cache.singleflight import SingleFlight
+from lorax.cancellation import RequestGenerations
+from lorax.compute import ComputePool
+from lorax.scheduling import BULK, INTERACTIVE, VIEWPORT, PriorityScheduler
 from lorax.constants import (
     DISK_CACHE_ENABLED,
     DISK_CACHE_DIR,
     DISK_CACHE_MAX_BYTES,
+    DISK_CACHE_EVICTION_POLICY,
+    DISK_CACHE_HIGH_WATERMARK,
+    DISK_CACHE_LOW_WATERMARK,
     INMEM_TTL_SECONDS,
     CACHE_CLEANUP_INTERVAL_SECONDS,
+    COMPUTE_SPILL_DEPTH,
+    COMPUTE_WORKERS,
+    PROCESS_TREE_GRAPH_SHARED_MAX_BYTES,
+    CSR_ARTIFACTS_ENABLED,
+    PINNED_FILES,
+    PIN_TOP_N,
+    TSZ_DECOMPRESS_CACHE_ENABLED,
+    RENDER_L2_CACHE_ENABLED,
+    RENDER_L2_TTL_SECONDS,
+    RENDER_L2_MAX_ENTRY_BYTES,
+    UPLOADS_DIR,
+    WORK_BULK_CONCURRENCY,
+    WORK_INTERACTIVE_CONCURRENCY,
+    WORK_MAX_CONCURRENCY,
+    WORK_VIEWPORT_CONCURRENCY,
 )
 
 # Validate mode requirements
@@ -63,12 +88,21 @@ disk_cache_manager = DiskCacheManager(
     max_size_bytes=DISK_CACHE_MAX_BYTES,
     redis_client=_redis_client,
     enabled=DISK_CACHE_ENABLED,
+    policy=DISK_CACHE_EVICTION_POLICY,
+    high_watermark=DISK_CACHE_HIGH_WATERMARK,
+    low_watermark=DISK_CACHE_LOW_WATERMARK,
 )
 
-# Initialize TreeGraph Cache for per-session tree caching (in-memory only).
+# Decompressed .tsz inputs share the disk cache's budget and eviction.
+if TSZ_DECOMPRESS_CACHE_ENABLED:
+    set_tsz_cache(disk_cache_manager)
+
+# Initialize TreeGraph Cache: per-session references over a shared,
+# byte-budgeted tier of content-addressed graphs (in-memory only).
 tree_graph_cache = TreeGraphCache(
     local_ttl_seconds=INMEM_TTL_SECONDS,
     cleanup_interval_seconds=CACHE_CLEANUP_INTERVAL_SECONDS,
+    shared_max_bytes=PROCESS_TREE_GRAPH_SHARED_MAX_BYTES,
 )
 
 # CSV mode: cache parsed Newick trees per session (in-memory only)
@@ -77,4 +111,55 @@ csv_tree_graph_cache = CsvTreeGraphCache(
     cleanup_interval_seconds=CACHE_CLEANUP_INTERVAL_SECONDS,
 )
 
+# Rendered tree buffers shared across instances through Redis (opt-in).
+# Values are binary, so this uses its own client without response decoding.
+render_cache = None
+if REDIS_CLUSTER_URL and RENDER_L2_CACHE_ENABLED:
+    try:
+        render_cache = RenderL2Cache(
+            create_redis_client(
+                REDIS_CLUSTER_URL,
+                decode_responses=False,
+                cluster=REDIS_CLUSTER,
+            ),
+            ttl_seconds=RENDER_L2_TTL_SECONDS,
+            max_entry_bytes=RENDER_L2_MAX_ENTRY_BYTES,
+        )
+        print("Render L2 cache enabled (Redis)")
+    except Exception as e:
+        print(f"Warning: Failed to connect Redis for render cache: {e}")
+
+# Identical render/query requests from different sessions share one
+# in-flight computation.
+request_coalescer = SingleFlight()
+
+# Per-socket render generations: a newer layout request cancels older ones.
+render_generations = RequestGenerations()
+
+# Priority classes for socket work: interactive > viewport > bulk.
+work_scheduler = PriorityScheduler(
+    {
+        INTERACTIVE: WORK_INTERACTIVE_CONCURRENCY,
+        VIEWPORT: WORK_VIEWPORT_CONCURRENCY,
+        BULK: WORK_BULK_CONCURRENCY,
+    },
+    max_concurrency=WORK_MAX_CONCURRENCY,
+)
+
+# Local compute tier for render/query jobs; workers are spawned by the app
+# lifespan, so importing this module (as each worker does) never forks.
+compute_pool = ComputePool(COMPUTE_WORKERS, spill_depth=COMPUTE_SPILL_DEPTH)
+
+# Pinned datasets: warmed in the background at startup and exempt from
+# eviction in the disk, file and artifact caches.
+file_prefetcher = FilePrefetcher(
+    Path(UPLOADS_DIR),
+    bucket_name=BUCKET_NAME,
+    disk_cache_manager=disk_cache_manager,
+    pins=parse_pin_list(PINNED_FILES),
+    top_n=PIN_TOP_N,
+    artifacts_enabled=CSR_ARTIFACTS_ENABLED,
+    scheduler=work_scheduler,
+)
+
 print(f"Context initialized: mode={CURRENT_MODE}, disk_cache={DISK_CACHE_ENABLED}")
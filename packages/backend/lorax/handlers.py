@@ -37,7 +37,15 @@ from lorax.metadata.mutations import (
     search_mutations_by_position
 )
 from lorax.buffer import mutations_to_arrow_buffer
-from lorax.cache import get_file_context, get_file_cache_size
+from lorax.cache import get_file_context, get_file_cache_size, get_file_cache_status
+from lorax.cache.file_cache import get_index_store
+from lorax.cache.render_cache import (
+    combine_render_tables,
+    split_render_tables,
+    unpack_render_buffer,
+)
+from lorax.cache.tree_graph import tree_graph_content_key
+from lorax.metrics import registry as metrics_registry, sample, stage_timer
 
 logger = logging.getLogger(__name__)
 
@@ -89,11 +97,40 @@ async def cache_status():
 
     from lorax.artifacts.metrics import csr_artifact_metrics
     from lorax.artifacts.runtime import artifact_context_registry
+    from lorax.context import (
+        compute_pool,
+        disk_cache_manager,
+        file_prefetcher,
+        render_cache,
+        render_generations,
+        request_coalescer,
+        session_manager,
+        tree_graph_cache,
+        work_scheduler,
+    )
+    from lorax.sockets.load_scheduler import load_scheduler
 
     return {
         "rss_MB": round(rss_mb, 2),
         "vms_MB": round(vms_mb, 2),
         "file_cache_size": get_file_cache_size(),
+        "file_cache": get_file_cache_status(),
+        "disk_cache": await disk_cache_manager.get_stats(),
+        "prefetch": file_prefetcher.snapshot(),
+        "compute_pool": compute_pool.snapshot(),
+        "coalescing": request_coalescer.get_stats(),
+        "cancellation": render_generations.get_stats(),
+        "scheduler": work_scheduler.snapshot(),
+        "session_cache": session_manager.get_cache_stats(),
+        "load_admission": {
+            **(await load_scheduler.get_state()),
+            "counters": await load_scheduler.get_counters(),
+        },
+        "tree_graph": tree_graph_cache.get_stats(),
+        "render_l2": render_cache.get_stats() if render_cache is not None else None,
+        "derived_indexes": (
+            get_index_store().get_stats() if get_index_store() is not None else None
+        ),
         "pid": os.getpid(),
         "csr_artifacts": {
             "metrics": csr_artifact_metrics.snapshot(),
@@ -102,6 +139,119 @@ async def cache_status():
     }
 
 
+async def _status_metrics():
+    """Scrape-time Prometheus samples derived from cache_status()."""
+    status = await cache_status()
+    rows = [
+        sample("lorax_process_resident_memory_bytes", "gauge",
+               "Resident memory of the socket process.",
+               psutil.Process(os.getpid()).memory_info().rss),
+    ]
+
+    cache_help = {
+        "hits": "Cache lookups served from the tier.",
+        "misses": "Cache lookups the tier could not serve.",
+        "evictions": "Entries evicted from the tier.",
+    }
+    tiers = {
+        "file": status["file_cache"],
+        "tree_graph": status["tree_graph"]["shared"],
+        "disk": status["disk_cache"] if status["disk_cache"].get("enabled") else None,
+        "render_l2": status["render_l2"],
+        "derived_index": status["derived_indexes"],
+        "session": status["session_cache"] if status["session_cache"]["enabled"] else None,
+    }
+    for tier, stats in tiers.items():
+        if not stats:
+            continue
+        for field, help_text in cache_help.items():
+            if field in stats:
+                rows.append(sample(f"lorax_cache_{field}_total", "counter", help_text,
+                                   stats[field], cache=tier))
+    rows += [
+        sample("lorax_cache_entries", "gauge", "Entries held by the tier.",
+               len(status["file_cache"]["entries"]), cache="file"),
+        sample("lorax_cache_bytes", "gauge", "Estimated bytes held by the tier.",
+               status["file_cache"]["total_bytes"], cache="file"),
+    ]
+    if tiers["session"]:
+        rows.append(sample("lorax_cache_invalidations_total", "counter",
+                           "Local session copies dropped after a write on another instance.",
+                           tiers["session"]["invalidations"], cache="session"))
+    if tiers["tree_graph"]:
+        shared = tiers["tree_graph"]
+        rows += [
+            sample("lorax_cache_entries", "gauge", "Entries held by the tier.",
+                   shared["graphs"], cache="tree_graph"),
+            sample("lorax_cache_bytes", "gauge", "Estimated bytes held by the tier.",
+                   shared["bytes"], cache="tree_graph"),
+        ]
+    if tiers["disk"]:
+        rows += [
+            sample("lorax_cache_entries", "gauge", "Entries held by the tier.",
+                   tiers["disk"]["file_count"], cache="disk"),
+            sample("lorax_cache_bytes", "gauge", "Estimated bytes held by the tier.",
+                   tiers["disk"]["total_size_bytes"], cache="disk"),
+        ]
+
+    for operation, stats in status["coalescing"]["operations"].items():
+        rows += [
+            sample("lorax_coalescing_calls_total", "counter",
+                   "Requests entering request coalescing.", stats["calls"], operation=operation),
+            sample("lorax_coalescing_executions_total", "counter",
+                   "Computations actually run after coalescing.", stats["executions"],
+                   operation=operation),
+        ]
+    cancellation = status["cancellation"]
+    rows += [
+        sample("lorax_render_superseded_total", "counter",
+               "Layout requests superseded by a newer one.", cancellation["superseded"]),
+        sample("lorax_render_cancelled_total", "counter",
+               "Superseded layout requests that stopped early.", cancellation["cancelled"]),
+    ]
+
+    for priority, stats in status["scheduler"]["classes"].items():
+        rows += [
+            sample("lorax_work_running", "gauge", "Socket work running, by priority class.",
+                   stats["running"], priority=priority),
+            sample("lorax_work_queued", "gauge", "Socket work waiting, by priority class.",
+                   stats["queued"], priority=priority),
+            sample("lorax_work_failed_total", "counter", "Socket work that raised, by priority class.",
+                   stats["failed"], priority=priority),
+        ]
+
+    loads = status["load_admission"]
+    rows += [
+        sample("lorax_load_in_system", "gauge",
+               "File loads running or queued for a loader.", loads["in_system"]),
+        sample("lorax_load_memory_waiting", "gauge",
+               "File loads waiting for memory admission.", loads["memory_waiting"]),
+        sample("lorax_load_memory_reserved_bytes", "gauge",
+               "Estimated peak bytes reserved by running file loads.", loads["memory_reserved_bytes"]),
+        sample("lorax_load_memory_ceiling_bytes", "gauge",
+               "Memory ceiling for file load admission (0 when disabled).",
+               loads["memory_ceiling_bytes"] or 0),
+    ]
+    for name, value in loads["counters"].items():
+        rows.append(sample("lorax_load_events_total", "counter",
+                           "File load scheduler events.", value, event=name.removeprefix("load_file_")))
+
+    pool = status["compute_pool"]
+    if pool["enabled"]:
+        rows += [
+            sample("lorax_compute_queued", "gauge", "Jobs queued on compute workers.",
+                   sum(pool["queued"])),
+            sample("lorax_compute_failed_total", "counter", "Compute jobs that failed.",
+                   pool["failed"]),
+            sample("lorax_compute_restarts_total", "counter", "Compute worker restarts.",
+                   pool["restarts"]),
+        ]
+    return rows
+
+
+metrics_registry.add_collector(_status_metrics)
+
+
 async def handle_upload(file_path, root_dir):
     """Load a file and return its FileContext."""
     ctx = await get_file_context(file_path, root_dir)
@@ -206,6 +356,16 @@ def _build_sample_name_mapping(ts, sample_name_key="name"):
     return name_to_node_id
 
 
+def _get_sample_name_mapping(ctx, sample_name_key="name"):
+    """Cached (and persisted) lowercase sample name -> node_id map for a file."""
+    cache_key = f"sample_name_map:{sample_name_key}"
+    cached = ctx.get_metadata(cache_key)
+    if cached is None:
+        cached = _build_sample_name_mapping(ctx.tree_sequence, sample_name_key)
+        ctx.set_metadata(cache_key, cached)
+    return cached
+
+
 def _compute_lineage_paths(tree, tree_seeds, name_map, sample_colors):
     """
     Compute ancestry paths for seed nodes in a tree.
@@ -252,7 +412,8 @@ def search_nodes_in_trees(
     tree_indices,
     show_lineages=False,
     sample_colors=None,
-    sample_name_key="name"
+    sample_name_key="name",
+    ctx=None,
 ):
     """
     Search for nodes matching sample names in specified trees.
@@ -265,6 +426,7 @@ def search_nodes_in_trees(
         show_lineages: Whether to compute lineage (ancestry) paths
         sample_colors: Optional dict {sample_name: [r,g,b,a]} for coloring
         sample_name_key: Key in node metadata used as sample name
+        ctx: Optional FileContext for ts; reuses its cached sample name map
 
     Returns:
         dict with:
@@ -275,7 +437,10 @@ def search_nodes_in_trees(
         return {"highlights": {}, "lineage": {}}
 
     # Build sample_name -> node_id mapping
-    name_to_node_id = _build_sample_name_mapping(ts, sample_name_key)
+    if ctx is not None:
+        name_to_node_id = _get_sample_name_mapping(ctx, sample_name_key)
+    else:
+        name_to_node_id = _build_sample_name_mapping(ts, sample_name_key)
 
     # Convert sample_names to node_ids
     target_node_ids = set()
@@ -553,6 +718,8 @@ async def handle_tree_graph_query(
     adaptive_target_tree_idx: int | None = None,
     adaptive_outside_cell_size: float | None = None,
     time_scale: str = "linear",
+    render_cache=None,
+    cancel_token=None,
 ):
     """
     Construct trees using Numba-optimized tree_graph module.
@@ -568,6 +735,10 @@ async def handle_tree_graph_query(
         adaptive_target_tree_idx: Optional tree index that adaptive bbox applies to.
         adaptive_outside_cell_size: Optional fixed outside-bbox cell size for adaptive sparsification.
         time_scale: Time coordinate scale for emitted y coordinates ("linear" or "log").
+        render_cache: Optional RenderL2Cache shared across server instances. Consulted
+            per tree before construction; adaptive requests bypass it.
+        cancel_token: Optional CancelToken; superseded requests stop before
+            construction starts or between trees with RequestCancelled.
 
     Returns:
         dict with:
@@ -602,6 +773,8 @@ async def handle_tree_graph_query(
             from lorax.csv.newick_tree import parse_newick_to_tree
 
             for tree_idx in indices:
+                if cancel_token is not None:
+                    cancel_token.raise_if_cancelled()
                 cached = await csv_tree_graph_cache.get(session_id, int(tree_idx))
                 if cached is not None:
                     pre_parsed_graphs[int(tree_idx)] = cached
@@ -652,11 +825,37 @@ async def handle_tree_graph_query(
             time_scale=time_scale,
         )
 
+    # Rendered trees shared through Redis. Adaptive sparsification depends on
+    # per-session density state, so only fixed-parameter renders are cached.
+    requested_indices = [int(t) for t in (tree_indices or []) if 0 <= int(t) < ts.num_trees]
+    l2_parts = {}
+    if (
+        render_cache is not None
+        and requested_indices
+        and adaptive_sparsify_bbox is None
+        and adaptive_target_tree_idx is None
+    ):
+        fingerprint = await asyncio.to_thread(ctx.content_fingerprint)
+        params_key = render_cache.params_key(
+            sparsification=bool(sparsification),
+            multiplier=sparsify_cell_size_multiplier,
+            time_scale=time_scale,
+        )
+        with stage_timer("render_l2.lookup"):
+            l2_parts = await render_cache.get_many(fingerprint, params_key, requested_indices)
+        tree_indices = [t for t in dict.fromkeys(requested_indices) if t not in l2_parts]
+    else:
+        render_cache = None
+
     # Collect pre-cached TreeGraphs
     pre_cached_graphs = {}
     if session_id and tree_graph_cache:
         for tree_idx in tree_indices:
-            cached = await tree_graph_cache.get(session_id, int(tree_idx))
+            cached = await tree_graph_cache.get(
+                session_id,
+                int(tree_idx),
+                content_key=tree_graph_content_key(ctx, tree_idx),
+            )
             if cached is not None:
                 pre_cached_graphs[int(tree_idx)] = cached
         if pre_cached_graphs:
@@ -664,20 +863,37 @@ async def handle_tree_graph_query(
 
     # Run in thread pool to avoid blocking
     def process_trees():
-        return construct_trees_batch(
-            ts,
-            tree_indices,
-            sparsification=sparsification,
-            sparsify_mutations=sparsification,  # When nodes are sparsified, sparsify mutations too
-            pre_cached_graphs=pre_cached_graphs,
-            sparsify_cell_size_multiplier=sparsify_cell_size_multiplier,
-            adaptive_sparsify_bbox=adaptive_sparsify_bbox,
-            adaptive_target_tree_idx=adaptive_target_tree_idx,
-            adaptive_outside_cell_size=adaptive_outside_cell_size,
-            time_scale=time_scale,
-        )
+        with stage_timer("tree_graph.build"):
+            return construct_trees_batch(
+                ts,
+                tree_indices,
+                sparsification=sparsification,
+                sparsify_mutations=sparsification,  # When nodes are sparsified, sparsify mutations too
+                pre_cached_graphs=pre_cached_graphs,
+                sparsify_cell_size_multiplier=sparsify_cell_size_multiplier,
+                adaptive_sparsify_bbox=adaptive_sparsify_bbox,
+                adaptive_target_tree_idx=adaptive_target_tree_idx,
+                adaptive_outside_cell_size=adaptive_outside_cell_size,
+                time_scale=time_scale,
+                cancel_token=cancel_token,
+            )
 
-    buffer, min_time, max_time, processed_indices, newly_built = await asyncio.to_thread(process_trees)
+    if render_cache is not None and not tree_indices:
+        buffer, min_time, max_time = None, float(ts.min_time), float(ts.max_time)
+        newly_built = {}
+    else:
+        buffer, min_time, max_time, processed_indices, newly_built = await asyncio.to_thread(process_trees)
+
+    if render_cache is not None:
+        if tree_indices:
+            fresh_parts = await asyncio.to_thread(
+                lambda: split_render_tables(*unpack_render_buffer(buffer), tree_indices)
+            )
+            render_cache.store_in_background(fingerprint, params_key, fresh_parts)
+            l2_parts.update(fresh_parts)
+        buffer, processed_indices = await asyncio.to_thread(
+            combine_render_tables, [l2_parts[t] for t in requested_indices]
+        )
 
     buffer_mb = len(buffer) / (1024 * 1024)
     # print(f"Tree graph buffer size: {buffer_mb:.2f} MB")
@@ -685,7 +901,12 @@ async def handle_tree_graph_query(
     # Cache newly built TreeGraphs
     if session_id and tree_graph_cache and newly_built:
         for tree_idx, graph in newly_built.items():
-            await tree_graph_cache.set(session_id, tree_idx, graph)
+            await tree_graph_cache.set(
+                session_id,
+                tree_idx,
+                graph,
+                content_key=tree_graph_content_key(ctx, tree_idx),
+            )
         print(f"TreeGraph cached: {len(newly_built)} new trees for session {session_id[:8]}...")
 
     # Evict trees no longer in visible set (visibility-based eviction)
@@ -738,6 +959,14 @@ async def get_or_construct_tree_graph(
     if isinstance(ts, pd.DataFrame):
         return None
 
+    # Another session may already have built this tree.
+    content_key = tree_graph_content_key(ctx, tree_index)
+    shared = await tree_graph_cache.get(
+        session_id, tree_index, content_key=content_key
+    )
+    if shared is not None:
+        return shared
+
     # Construct tree graph
     def _construct():
         edges = ts.tables.edges
@@ -750,7 +979,9 @@ async def get_or_construct_tree_graph(
     tree_graph = await asyncio.to_thread(_construct)
 
     # Cache it
-    await tree_graph_cache.set(session_id, tree_index, tree_graph)
+    await tree_graph_cache.set(
+        session_id, tree_index, tree_graph, content_key=content_key
+    )
     print(f"TreeGraph cached: session={session_id[:8]}... tree={tree_index}")
 
     return tree_graph
@@ -947,8 +1178,11 @@ async def ensure_trees_cached(
     for tree_index in tree_indices:
         tree_index = int(tree_index)
 
-        # Skip if already cached
-        cached = await tree_graph_cache.get(session_id, tree_index)
+        # Skip if already cached (for this session or shared by another)
+        content_key = tree_graph_content_key(ctx, tree_index)
+        cached = await tree_graph_cache.get(
+            session_id, tree_index, content_key=content_key
+        )
         if cached is not None:
             continue
 
@@ -957,7 +1191,9 @@ async def ensure_trees_cached(
             return construct_tree(ts, edges, nodes, breakpoints, idx, min_time, max_time)
 
         tree_graph = await asyncio.to_thread(_construct, tree_index)
-        await tree_graph_cache.set(session_id, tree_index, tree_graph)
+        await tree_graph_cache.set(
+            session_id, tree_index, tree_graph, content_key=content_key
+        )
         newly_cached += 1
 
     if newly_cached > 0:
@@ -1100,7 +1336,8 @@ async def _ensure_tree_graph_loaded(
     nodes,
     breakpoints,
     min_time,
-    max_time
+    max_time,
+    content_key=None,
 ):
     """
     Get tree graph from cache or construct and cache it.
@@ -1111,12 +1348,15 @@ async def _ensure_tree_graph_loaded(
         session_id: Session ID for cache key
         tree_graph_cache: TreeGraphCache instance
         edges, nodes, breakpoints, min_time, max_time: Pre-extracted table data
+        content_key: Optional shared-cache key (see tree_graph_content_key)
 
     Returns:
         TreeGraph object
     """
     # Try to get from cache first
-    graph = await tree_graph_cache.get(session_id, tree_idx)
+    graph = await tree_graph_cache.get(
+        session_id, tree_idx, content_key=content_key
+    )
     if graph is not None:
         return graph
 
@@ -1129,7 +1369,9 @@ async def _ensure_tree_graph_loaded(
             created_task = True
 
             async def _build_and_cache():
-                cached = await tree_graph_cache.get(session_id, tree_idx)
+                cached = await tree_graph_cache.get(
+                    session_id, tree_idx, content_key=content_key
+                )
                 if cached is not None:
                     return cached
 
@@ -1139,7 +1381,9 @@ async def _ensure_tree_graph_loaded(
                     )
 
                 built_graph = await asyncio.to_thread(_construct)
-                await tree_graph_cache.set(session_id, tree_idx, built_graph)
+                await tree_graph_cache.set(
+                    session_id, tree_idx, built_graph, content_key=content_key
+                )
                 return built_graph
 
             task = asyncio.create_task(_build_and_cache())
@@ -1237,7 +1481,10 @@ async def get_highlight_positions(
     for tree_idx in valid_tree_indices:
         graph = await _ensure_tree_graph_loaded(
             ts, tree_idx, session_id, tree_graph_cache,
-            edges, nodes, breakpoints, min_time, max_time
+            edges, nodes, breakpoints, min_time, max_time,
+            content_key=(
+                tree_graph_content_key(ctx, tree_idx) if ctx is not None else None
+            ),
         )
 
         # Vectorized extraction for nodes that are present in this tree.
@@ -1343,7 +1590,10 @@ async def get_multi_value_highlight_positions(
     for tree_idx in valid_tree_indices:
         graphs_by_tree_idx[tree_idx] = await _ensure_tree_graph_loaded(
             ts, tree_idx, session_id, tree_graph_cache,
-            edges, nodes, breakpoints, min_time, max_time
+            edges, nodes, breakpoints, min_time, max_time,
+            content_key=(
+                tree_graph_content_key(ctx, tree_idx) if ctx is not None else None
+            ),
         )
 
     trees_by_tree_idx = {}
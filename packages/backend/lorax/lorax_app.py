@@ -5,24 +5,51 @@ Run with:
     uvicorn lorax_socketio_app:sio_app --host 0.0.0.0 --port 8080 --reload
 """
 import os
+from contextlib import asynccontextmanager
+
 import socketio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.gzip import GZipMiddleware
 from dotenv import load_dotenv
 
-from lorax.context import REDIS_CLUSTER_URL, REDIS_CLUSTER
+from lorax.cache import set_load_admission
+from lorax.context import (
+    REDIS_CLUSTER_URL,
+    REDIS_CLUSTER,
+    compute_pool,
+    file_prefetcher,
+    session_manager,
+)
 from lorax.constants import (
     SOCKET_PING_TIMEOUT, SOCKET_PING_INTERVAL, MAX_HTTP_BUFFER_SIZE
 )
 from lorax.routes import router
 from lorax.sockets import register_socket_events
+from lorax.sockets.load_scheduler import load_scheduler
 
 load_dotenv()
 
 # Setup
 
-app = FastAPI(title="Lorax Backend", version="1.0.0")
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    # Worker loads count against the same memory ceiling as socket loads.
+    compute_pool.start(admit=load_scheduler.reserve_file_memory)
+    # So are reloads after eviction and prefetches through get_file_context.
+    set_load_admission(load_scheduler.reserve_file_memory)
+    # Serve repeated socket-event session reads from memory (Redis mode).
+    session_manager.start()
+    # Warm pinned datasets without delaying readiness.
+    file_prefetcher.start()
+    yield
+    await file_prefetcher.stop()
+    await session_manager.stop()
+    compute_pool.shutdown()
+    set_load_admission(None)
+
+
+app = FastAPI(title="Lorax Backend", version="1.0.0", lifespan=lifespan)
 app.add_middleware(GZipMiddleware, minimum_size=1000)
 
 
@@ -0,0 +1,283 @@
+"""
+Prometheus metrics for the Lorax backend.
+
+A small dependency-free registry that renders the Prometheus text
+exposition format (version 0.0.4), served at ``/metrics``:
+
+- ``lorax_socket_event_duration_seconds``: latency histogram per socket event
+- ``lorax_socket_events_total``: socket events by event and outcome
+- ``lorax_socket_emits_total``: payloads emitted to clients by event and
+  outcome, since most handlers answer with ``emit`` rather than a return
+- ``lorax_stage_duration_seconds``: latency histogram per internal stage
+  (scheduler queue waits, file loads, tree builds, artifact reads)
+- ``lorax_bytes_served_total``: binary payload bytes returned or emitted
+  per event
+
+Histograms keep one count per fixed bucket, so memory is bounded by the
+number of label combinations, not by traffic. Point-in-time state (cache
+hit/miss/eviction counters, queue depths) is read from the existing stats
+objects at scrape time through collectors.
+
+The registry is per process. Stages timed inside compute-pool workers
+(tree builds and artifact reads for jobs routed there) are recorded in
+the worker's own registry and are not exported from ``/metrics``; the
+socket process still exports each event's end-to-end latency.
+"""
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Iterable, Iterator, Optional, Union
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; spans hover lookups (~1 ms) to cold loads of large files.
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+# (name, type, help, labels, value) rows produced by collectors.
+Sample = tuple[str, str, str, dict, float]
+Collector = Callable[[], Union[Iterable[Sample], Awaitable[Iterable[Sample]]]]
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    value = float(value)
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(int(value)) if value.is_integer() else repr(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """Monotonic counter per label combination."""
+
+    kind = "counter"
+
+    def __init__(self, name, help_text, labelnames=()):
+        super().__init__(name, help_text, labelnames)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        lines = self._header()
+        for key, value in values:
+            labels = dict(zip(self.labelnames, key))
+            lines.append(f"{self.name}{_format_labels(labels)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    """Fixed-bucket histogram per label combination."""
+
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(float(bound) for bound in buckets))
+        # key -> [per-bucket counts..., +Inf count, sum]
+        self._values: dict[tuple, list[float]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        slot = next(
+            (i for i, bound in enumerate(self.buckets) if value <= bound),
+            len(self.buckets),
+        )
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            state[slot] += 1
+            state[-1] += value
+
+    def count(self, **labels) -> int:
+        state = self._values.get(self._key(labels))
+        return int(sum(state[:-1])) if state else 0
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = sorted((key, list(state)) for key, state in self._values.items())
+        lines = self._header()
+        bounds = [*self.buckets, math.inf]
+        for key, state in values:
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0.0
+            for bound, count in zip(bounds, state):
+                cumulative += count
+                bucket_labels = _format_labels({**labels, "le": _format_value(bound)})
+                lines.append(f"{self.name}_bucket{bucket_labels} {_format_value(cumulative)}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(state[-1])}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {_format_value(cumulative)}")
+        return lines
+
+
+class MetricsRegistry:
+    """Instruments plus scrape-time collectors, rendered as Prometheus text."""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[Collector] = []
+
+    def _register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames=()) -> Counter:
+        return self._register(Counter(name, help_text, labelnames))
+
+    def histogram(self, name: str, help_text: str, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def add_collector(self, collector: Collector) -> None:
+        """Register a callable (sync or async) returning ``Sample`` rows."""
+        self._collectors.append(collector)
+
+    async def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+
+        families: dict[str, tuple[str, str, list]] = {}
+        for collector in self._collectors:
+            try:
+                samples = collector()
+                if hasattr(samples, "__await__"):
+                    samples = await samples
+                samples = list(samples)
+            except Exception as exc:
+                print(f"⚠️ Metrics collector {getattr(collector, '__name__', collector)} failed: {exc}")
+                continue
+            for name, kind, help_text, labels, value in samples:
+                if value is None:
+                    continue
+                families.setdefault(name, (kind, help_text, []))[2].append((labels, value))
+
+        for name, (kind, help_text, samples) in families.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+socket_event_seconds = registry.histogram(
+    "lorax_socket_event_duration_seconds",
+    "Socket event handler latency.",
+    ("event",),
+)
+socket_events_total = registry.counter(
+    "lorax_socket_events_total",
+    "Socket events handled, by outcome (ok, error, exception).",
+    ("event", "outcome"),
+)
+stage_seconds = registry.histogram(
+    "lorax_stage_duration_seconds",
+    "Latency of internal stages such as queue waits, file loads and tree builds.",
+    ("stage",),
+)
+socket_emits_total = registry.counter(
+    "lorax_socket_emits_total",
+    "Payloads emitted to clients, by outcome (ok, error).",
+    ("event", "outcome"),
+)
+bytes_served_total = registry.counter(
+    "lorax_bytes_served_total",
+    "Binary payload bytes returned or emitted to clients.",
+    ("event",),
+)
+
+
+def observe_stage(stage: str, seconds: float) -> None:
+    stage_seconds.observe(seconds, stage=stage)
+
+
+@contextmanager
+def stage_timer(stage: str) -> Iterator[None]:
+    """Time a block into ``lorax_stage_duration_seconds``; safe in threads."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, time.perf_counter() - started)
+
+
+def payload_bytes(payload) -> int:
+    """Size of the binary values in a handler response (top level only)."""
+    if isinstance(payload, (bytes, bytearray, memoryview)):
+        return len(payload)
+    if isinstance(payload, dict):
+        return sum(
+            len(value)
+            for value in payload.values()
+            if isinstance(value, (bytes, bytearray, memoryview))
+        )
+    return 0
+
+
+def sample(name: str, kind: str, help_text: str, value: Optional[float], **labels) -> Sample:
+    """Build a collector row."""
+    return (name, kind, help_text, labels, value)
+
+
+__all__ = [
+    "CONTENT_TYPE",
+    "Counter",
+    "Histogram",
+    "MetricsRegistry",
+    "registry",
+    "socket_event_seconds",
+    "socket_events_total",
+    "socket_emits_total",
+    "stage_seconds",
+    "bytes_served_total",
+    "observe_stage",
+    "stage_timer",
+    "payload_bytes",
+    "sample",
+]
@@ -11,11 +11,18 @@ from lorax.context import session_manager, BUCKET_NAME
 from lorax.modes import CURRENT_MODE
 from lorax.constants import UPLOADS_DIR
 from lorax.cloud.gcs_utils import upload_to_gcs
+from lorax.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, registry as metrics_registry
+from lorax.cache import estimate_load_bytes
 from lorax.handlers import (
     handle_upload,
     get_projects,
     cache_status,
 )
+from lorax.sockets.load_scheduler import (
+    load_scheduler,
+    LoadQueueTimeoutError,
+    LoadTooLargeError,
+)
 
 router = APIRouter()
 UPLOAD_DIR = Path(UPLOADS_DIR)
@@ -51,6 +58,10 @@ async def memory_status():
     print("cache-status")
     return await cache_status()
 
+@router.get("/metrics")
+async def metrics():
+    return Response(content=await metrics_registry.render(), media_type=METRICS_CONTENT_TYPE)
+
 @router.get("/{file}")
 async def get_file(
     request: Request,
@@ -78,7 +89,10 @@ async def get_file(
         file = "1kg_chr20.trees.tsz"
         file_path = UPLOAD_DIR / (project or "1000Genomes") / file
     try:
-        ctx = await handle_upload(str(file_path), str(UPLOAD_DIR))
+        # Same memory admission and load workers as the load_file event.
+        estimated_bytes = await estimate_load_bytes(str(file_path))
+        async with load_scheduler.admit(estimated_bytes, lorax_sid=sid):
+            ctx = await handle_upload(str(file_path), str(UPLOAD_DIR))
         viz_config = ctx.config
 
         # Override initial_position if client provided genomic coordinates
@@ -89,6 +103,10 @@ async def get_file(
         session.file_path = str(file_path)
         await session_manager.save_session(session)
 
+    except LoadTooLargeError as e:
+        return JSONResponse(status_code=413, content={"error": str(e)})
+    except LoadQueueTimeoutError as e:
+        return JSONResponse(status_code=503, content={"error": f"{e}. Please retry shortly."})
     except Exception as e:
         print(f"❌ Error loading file: {e}")
         return {"error": str(e)}
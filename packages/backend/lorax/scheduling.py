@@ -0,0 +1,130 @@
+"""
+Priority scheduling of socket work.
+
+Render, lineage, search and metadata handlers all hand their CPU work to
+the same thread pool, so a large overview render or metadata build could
+stall a small hover-details request behind it. PriorityScheduler admits
+work in three classes, highest priority first:
+
+- ``interactive``: details, lineage and searches the user is waiting on
+- ``viewport``: tree layout renders, the metadata arrays that colour them
+  and other viewport-driven queries
+- ``bulk``: tree pre-caching and the loads behind startup prefetch
+
+Each class has its own concurrency limit and all classes share a total
+limit. A freed slot goes to the highest-priority queued request whose
+class is under its limit, so interactive work waits only for running
+jobs, never behind queued bulk work. Queue times are sampled per class.
+"""
+
+import asyncio
+import time
+from collections import Counter, deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from lorax.metrics import observe_stage
+
+INTERACTIVE = "interactive"
+VIEWPORT = "viewport"
+BULK = "bulk"
+PRIORITIES = (INTERACTIVE, VIEWPORT, BULK)
+
+
+def _percentile(ordered: list[float], percentile: float) -> Optional[float]:
+    if not ordered:
+        return None
+    return round(ordered[int(round((len(ordered) - 1) * percentile))], 3)
+
+
+class PriorityScheduler:
+    """Admission control with per-class and total concurrency limits."""
+
+    def __init__(
+        self,
+        limits: dict[str, int],
+        *,
+        max_concurrency: int,
+        max_samples: int = 2_048,
+    ):
+        self.limits = {priority: max(1, int(limits[priority])) for priority in PRIORITIES}
+        self.max_concurrency = max(1, int(max_concurrency))
+        self._running = dict.fromkeys(PRIORITIES, 0)
+        self._waiters: dict[str, deque] = {priority: deque() for priority in PRIORITIES}
+        self._counters: dict[str, Counter] = {priority: Counter() for priority in PRIORITIES}
+        self._queue_waits: dict[str, deque] = {
+            priority: deque(maxlen=max_samples) for priority in PRIORITIES
+        }
+
+    def _can_start(self, priority: str) -> bool:
+        return (
+            self._running[priority] < self.limits[priority]
+            and sum(self._running.values()) < self.max_concurrency
+        )
+
+    def _dispatch(self) -> None:
+        for priority in PRIORITIES:
+            waiters = self._waiters[priority]
+            while waiters and self._can_start(priority):
+                self._running[priority] += 1
+                waiters.popleft().set_result(None)
+
+    def _release(self, priority: str) -> None:
+        self._running[priority] -= 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, priority: str) -> AsyncIterator[None]:
+        """Hold a ``priority`` slot for the duration of the block."""
+        if priority not in self.limits:
+            raise ValueError(f"Unknown priority {priority!r}; expected one of {PRIORITIES}")
+        queued_at = time.perf_counter()
+        if not self._waiters[priority] and self._can_start(priority):
+            self._running[priority] += 1
+        else:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters[priority].append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    self._release(priority)
+                else:
+                    self._waiters[priority].remove(waiter)
+                raise
+        counters = self._counters[priority]
+        waited = time.perf_counter() - queued_at
+        self._queue_waits[priority].append(waited * 1_000.0)
+        observe_stage(f"queue_wait.{priority}", waited)
+        counters["started"] += 1
+        try:
+            yield
+        except BaseException:
+            counters["failed"] += 1
+            raise
+        else:
+            counters["completed"] += 1
+        finally:
+            self._release(priority)
+
+    def snapshot(self) -> dict:
+        classes = {}
+        for priority in PRIORITIES:
+            waits = sorted(self._queue_waits[priority])
+            counters = self._counters[priority]
+            classes[priority] = {
+                "limit": self.limits[priority],
+                "running": self._running[priority],
+                "queued": len(self._waiters[priority]),
+                "started": counters["started"],
+                "completed": counters["completed"],
+                "failed": counters["failed"],
+                "queue_wait_ms": {
+                    "count": len(waits),
+                    "p50": _percentile(waits, 0.50),
+                    "p95": _percentile(waits, 0.95),
+                    "p99": _percentile(waits, 0.99),
+                    "max": round(waits[-1], 3) if waits else None,
+                },
+            }
+        return {"max_concurrency": self.max_concurrency, "classes": classes}
@@ -1,6 +1,7 @@
 import json
 import time
 import asyncio
+from collections import Counter, OrderedDict
 from uuid import uuid4
 from datetime import datetime, timezone
 from typing import Optional, Dict
@@ -15,8 +16,14 @@ from lorax.constants import (
     ENFORCE_CONNECTION_LIMITS,
     INMEM_TTL_SECONDS,
     CACHE_CLEANUP_INTERVAL_SECONDS,
+    SESSION_LOCAL_CACHE_SECONDS,
+    SESSION_LOCAL_CACHE_MAX_ENTRIES,
 )
 
+# Pub/sub channel announcing session writes to other instances.
+SESSION_INVALIDATION_CHANNEL = "lorax:sessions:invalidate"
+_INVALIDATION_RETRY_SEC = 1.0
+
 def _is_https_request(request: Request) -> bool:
     """
     Determine whether the *original* request was HTTPS.
@@ -150,6 +157,20 @@ class Session:
         return len(self.socket_connections) >= MAX_SOCKETS_PER_SESSION
 
 class SessionManager:
+    """
+    Session storage in Redis, or in process memory without Redis.
+
+    With Redis, sessions read by socket events are also kept in a local
+    read-through cache so repeated events skip the Redis round-trip. Every
+    save stamps the stored session with a new version and publishes
+    (sid, version) on SESSION_INVALIDATION_CHANNEL; other instances drop
+    their copy unless it already has that version. Local copies are only
+    served while the invalidation subscription is live (see start()), are
+    dropped whenever it reconnects, and expire after local_cache_seconds
+    regardless, so a session that moves between instances is never read
+    stale for longer than that even if a message is lost.
+    """
+
     def __init__(
         self,
         redis_url: Optional[str] = None,
@@ -158,6 +179,8 @@ class SessionManager:
         redis_cluster: bool = False,
         memory_ttl_seconds: int = INMEM_TTL_SECONDS,
         cleanup_interval_seconds: int = CACHE_CLEANUP_INTERVAL_SECONDS,
+        local_cache_seconds: float = SESSION_LOCAL_CACHE_SECONDS,
+        local_cache_max_entries: int = SESSION_LOCAL_CACHE_MAX_ENTRIES,
     ):
         self.redis_url = redis_url
         self.redis_client = redis_client
@@ -168,6 +191,17 @@ class SessionManager:
         self._memory_lock = asyncio.Lock()
         self._last_cleanup_monotonic = 0.0
 
+        self.instance_id = uuid4().hex
+        self.local_cache_seconds = max(0.0, float(local_cache_seconds))
+        self.local_cache_max_entries = max(1, int(local_cache_max_entries))
+        # sid -> (version, stored payload, expires_at monotonic)
+        self._local_sessions: "OrderedDict[str, tuple]" = OrderedDict()
+        self._local_cache_live = False
+        self._invalidations_seen = 0
+        self._pubsub_unavailable = False
+        self._invalidation_task: Optional[asyncio.Task] = None
+        self._local_stats: Counter = Counter()
+
         if self.redis_client is None and self.redis_url:
             self.redis_client = create_redis_client(
                 self.redis_url,
@@ -223,6 +257,148 @@ class SessionManager:
         async with self._memory_lock:
             return await self._cleanup_expired_memory_sessions_locked(time.monotonic())
 
+    # ------------------------------------------------------------------
+    # Local read-through cache (Redis mode)
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Subscribe to session invalidations; enables the local cache."""
+        if (
+            self.redis_client is None
+            or self.local_cache_seconds <= 0
+            or self._invalidation_task is not None
+        ):
+            return
+        self._invalidation_task = asyncio.create_task(self._listen_for_invalidations())
+
+    async def stop(self) -> None:
+        task, self._invalidation_task = self._invalidation_task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def _open_pubsub(self):
+        """(pubsub, client to close) for the invalidation channel.
+
+        redis-py's async RedisCluster has no pubsub() before 5.3, so cluster
+        clients subscribe through a plain connection to one node; a regular
+        PUBLISH reaches every node of the cluster. Returns (None, None) when
+        the client cannot subscribe at all.
+        """
+        client = self.redis_client
+        if callable(getattr(client, "get_default_node", None)):
+            from redis.asyncio import ConnectionPool, Redis
+
+            await client.initialize()
+            node = client.get_default_node()
+            node_client = Redis(
+                connection_pool=ConnectionPool(
+                    connection_class=node.connection_class,
+                    **node.connection_kwargs,
+                )
+            )
+            return node_client.pubsub(), node_client
+        if callable(getattr(client, "pubsub", None)):
+            return client.pubsub(), None
+        return None, None
+
+    async def _listen_for_invalidations(self) -> None:
+        while True:
+            pubsub = owned_client = None
+            try:
+                pubsub, owned_client = await self._open_pubsub()
+                if pubsub is None:
+                    # Without invalidations local copies could go stale, so
+                    # every read goes to Redis.
+                    self._pubsub_unavailable = True
+                    print("⚠️ Redis client has no pub/sub; session reads bypass the local cache")
+                    return
+                await pubsub.subscribe(SESSION_INVALIDATION_CHANNEL)
+                async for message in pubsub.listen():
+                    kind = message.get("type")
+                    if kind == "subscribe":
+                        self._local_cache_live = True
+                    elif kind == "message":
+                        self._apply_invalidation(message.get("data"))
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                print(f"⚠️ Session invalidation subscription failed: {exc}")
+            finally:
+                # Messages may have been missed: forget every local copy.
+                self._local_cache_live = False
+                self._local_sessions.clear()
+                for closable in (pubsub, owned_client):
+                    if closable is None:
+                        continue
+                    try:
+                        await closable.aclose()
+                    except Exception:
+                        pass
+            self._local_stats["resubscribes"] += 1
+            await asyncio.sleep(_INVALIDATION_RETRY_SEC)
+
+    def _apply_invalidation(self, data) -> None:
+        try:
+            message = json.loads(data)
+            sid = message["sid"]
+        except (TypeError, ValueError, KeyError):
+            return
+        if message.get("origin") == self.instance_id:
+            return
+        self._invalidations_seen += 1
+        entry = self._local_sessions.get(sid)
+        if entry is not None and entry[0] != message.get("version"):
+            del self._local_sessions[sid]
+            self._local_stats["invalidations"] += 1
+
+    def _remember_session(self, payload: dict) -> None:
+        sid = payload["sid"]
+        self._local_sessions[sid] = (
+            payload.get("version"),
+            payload,
+            time.monotonic() + self.local_cache_seconds,
+        )
+        self._local_sessions.move_to_end(sid)
+        while len(self._local_sessions) > self.local_cache_max_entries:
+            self._local_sessions.popitem(last=False)
+
+    def _cached_session(self, sid: str) -> Optional[Session]:
+        if not self._local_cache_live:
+            return None
+        entry = self._local_sessions.get(sid)
+        if entry is None:
+            return None
+        _version, payload, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._local_sessions[sid]
+            return None
+        self._local_sessions.move_to_end(sid)
+        # Callers mutate the Session they get, so hand out a fresh one.
+        return Session.from_dict(
+            {**payload, "socket_connections": dict(payload.get("socket_connections") or {})}
+        )
+
+    def get_cache_stats(self) -> dict:
+        reads = self._local_stats["hits"] + self._local_stats["misses"]
+        return {
+            "enabled": self.redis_client is not None and self.local_cache_seconds > 0,
+            "live": self._local_cache_live,
+            "pubsub_unavailable": self._pubsub_unavailable,
+            "entries": len(self._local_sessions),
+            "ttl_seconds": self.local_cache_seconds,
+            "hits": self._local_stats["hits"],
+            "misses": self._local_stats["misses"],
+            "hit_ratio": round(self._local_stats["hits"] / reads, 4) if reads else 0.0,
+            "invalidations": self._local_stats["invalidations"],
+            "publish_errors": self._local_stats["publish_errors"],
+            "resubscribes": self._local_stats["resubscribes"],
+        }
+
     def _set_session_cookie(self, response: Response, sid: str, secure: bool) -> None:
         """
         Set/refresh session cookie.
@@ -246,10 +422,22 @@ class SessionManager:
             return None
             
         if self.redis_client:
+            session = self._cached_session(sid)
+            if session is not None:
+                self._local_stats["hits"] += 1
+                return session
+            self._local_stats["misses"] += 1
+            invalidations_seen = self._invalidations_seen
             data = await self.redis_client.get(f"sessions:{sid}")
-            if data:
-                return Session.from_dict(json.loads(data))
-            return None
+            if not data:
+                return None
+            payload = json.loads(data)
+            # Skip caching if a write elsewhere may have raced this read.
+            if self._local_cache_live and invalidations_seen == self._invalidations_seen:
+                self._remember_session(
+                    {**payload, "socket_connections": dict(payload.get("socket_connections") or {})}
+                )
+            return Session.from_dict(payload)
         else:
             await self._maybe_cleanup_memory_sessions()
             async with self._memory_lock:
@@ -274,11 +462,30 @@ class SessionManager:
     async def save_session(self, session: Session):
         """Persist session state."""
         if self.redis_client:
+            payload = {**session.to_dict(), "version": uuid4().hex}
             await self.redis_client.setex(
-                f"sessions:{session.sid}", 
-                COOKIE_MAX_AGE, 
-                json.dumps(session.to_dict())
+                f"sessions:{session.sid}",
+                COOKIE_MAX_AGE,
+                json.dumps(payload)
             )
+            if self.local_cache_seconds <= 0:
+                return
+            if self._local_cache_live:
+                self._remember_session(
+                    {**payload, "socket_connections": dict(session.socket_connections)}
+                )
+            try:
+                await self.redis_client.publish(
+                    SESSION_INVALIDATION_CHANNEL,
+                    json.dumps({
+                        "sid": session.sid,
+                        "version": payload["version"],
+                        "origin": self.instance_id,
+                    }),
+                )
+            except Exception as exc:
+                self._local_stats["publish_errors"] += 1
+                print(f"⚠️ Failed to publish invalidation for session {session.sid}: {exc}")
         else:
             await self._maybe_cleanup_memory_sessions()
             async with self._memory_lock:
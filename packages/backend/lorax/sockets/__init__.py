@@ -12,13 +12,16 @@ This package provides modularized socket event handling:
 - debug: cache_stats events
 """
 
-from lorax.sockets.utils import is_csv_session_file
+from lorax.sockets.utils import is_csv_session, is_csv_session_file
 from lorax.sockets.decorators import (
     require_session,
     with_session,
     with_file_loaded,
     csv_not_supported,
     socket_error_handler,
+    prioritized,
+    timed_event,
+    TimedEvents,
 )
 
 # Will be populated by individual modules after split
@@ -35,6 +38,7 @@ from lorax.sockets.intervals import register_interval_events
 
 def register_socket_events(sio):
     """Register all socket event handlers."""
+    sio = TimedEvents(sio)
     register_connection_events(sio)
     register_file_events(sio)
     register_tree_layout_events(sio)
@@ -49,9 +53,13 @@ def register_socket_events(sio):
 __all__ = [
     "register_socket_events",
     "is_csv_session_file",
+    "is_csv_session",
     "require_session",
     "with_session",
     "with_file_loaded",
     "csv_not_supported",
     "socket_error_handler",
+    "prioritized",
+    "timed_event",
+    "TimedEvents",
 ]
@@ -4,7 +4,12 @@ Debug event handlers for Lorax Socket.IO.
 Handles cache statistics and debugging events.
 """
 
-from lorax.context import tree_graph_cache
+from lorax.context import (
+    render_generations,
+    request_coalescer,
+    tree_graph_cache,
+    work_scheduler,
+)
 from lorax.sockets.decorators import require_session
 
 
@@ -43,6 +48,9 @@ def register_debug_events(sio):
                 "session_trees": len(cached_trees),
                 "cached_tree_indices": list(cached_trees.keys()),
                 "stats": global_stats,
+                "coalescing": request_coalescer.get_stats(),
+                "cancellation": render_generations.get_stats(),
+                "scheduler": work_scheduler.snapshot(),
                 "csr_artifacts": {
                     "metrics": csr_artifact_metrics.snapshot(),
                     "registry": artifact_context_registry.snapshot(),
@@ -6,16 +6,26 @@ Provides common patterns as decorators to reduce boilerplate:
 - File loaded checks
 - CSV not supported handling
 - Error wrapping
+- Priority scheduling
+- Latency and payload metrics for every registered event
 """
 
 import functools
 import os
 import time
-from typing import Callable, Any
+from contextvars import ContextVar
+from typing import Callable, Any, Optional
 
-from lorax.context import session_manager
+from lorax.context import session_manager, work_scheduler
 from lorax.constants import ERROR_SESSION_NOT_FOUND, ERROR_NO_FILE_LOADED
-from lorax.sockets.utils import is_csv_session_file
+from lorax.metrics import (
+    bytes_served_total,
+    payload_bytes,
+    socket_emits_total,
+    socket_event_seconds,
+    socket_events_total,
+)
+from lorax.sockets.utils import is_csv_session
 
 _SESSION_ACTIVITY_TOUCH_SEC = max(
     0.0,
@@ -111,7 +121,7 @@ def csv_not_supported(sio, result_event: str, empty_result: dict = None):
     def decorator(func: Callable):
         @functools.wraps(func)
         async def wrapper(sid, data, session):
-            if is_csv_session_file(session.file_path):
+            if is_csv_session(session):
                 result = empty_result if empty_result else {"error": f"{func.__name__} is not supported for CSV yet."}
                 await sio.emit(result_event, result, to=sid)
                 return
@@ -140,3 +150,88 @@ def socket_error_handler(sio, result_event: str = "error"):
                 return {"error": str(e)}
         return wrapper
     return decorator
+
+
+def prioritized(priority: str):
+    """
+    Decorator that runs the handler in a work scheduler slot of ``priority``
+    (see lorax.scheduling).
+    """
+    def decorator(func: Callable):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            async with work_scheduler.slot(priority):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# State of the timed event running in the current task; TimedEvents.emit
+# marks it failed when the handler emits an error payload.
+_current_event: ContextVar[Optional[dict]] = ContextVar("lorax_socket_event", default=None)
+
+
+def _is_error_payload(payload) -> bool:
+    return isinstance(payload, dict) and (
+        "error" in payload or payload.get("ok") is False
+    )
+
+
+def timed_event(func: Callable):
+    """
+    Decorator that records the handler's latency, outcome and returned
+    binary bytes under its event name (see lorax.metrics). Error payloads
+    emitted through TimedEvents also make the outcome "error".
+    """
+    event = func.__name__
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        outcome = "exception"
+        state = {"emitted_error": False}
+        token = _current_event.set(state)
+        try:
+            result = await func(*args, **kwargs)
+            failed = _is_error_payload(result) or state["emitted_error"]
+            outcome = "error" if failed else "ok"
+            served = payload_bytes(result)
+            if served:
+                bytes_served_total.inc(served, event=event)
+            return result
+        finally:
+            _current_event.reset(token)
+            socket_event_seconds.observe(time.perf_counter() - started, event=event)
+            socket_events_total.inc(event=event, outcome=outcome)
+    return wrapper
+
+
+class TimedEvents:
+    """
+    Socket.IO server wrapper whose ``event`` decorator applies timed_event.
+
+    Passed to the register_* functions so every handler is measured without
+    touching each registration. ``emit`` counts each emitted payload's
+    outcome and binary bytes under the emitted event's name.
+    """
+
+    def __init__(self, sio):
+        self._sio = sio
+
+    def event(self, func: Callable):
+        return self._sio.event(timed_event(func))
+
+    async def emit(self, event: str, data=None, *args, **kwargs):
+        failed = event == "error" or _is_error_payload(data)
+        socket_emits_total.inc(event=event, outcome="error" if failed else "ok")
+        served = payload_bytes(data)
+        if served:
+            bytes_served_total.inc(served, event=event)
+        if failed:
+            state = _current_event.get()
+            if state is not None:
+                state["emitted_error"] = True
+        return await self._sio.emit(event, data, *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._sio, name)
@@ -25,6 +25,7 @@ from lorax.artifacts.csr_reader import (
     CSRArtifactCorruptError,
 )
 from lorax.artifacts.features import artifact_details
+from lorax.cache import estimate_load_bytes
 from lorax.artifacts.runtime import (
     artifact_context_registry,
     artifact_resolver,
@@ -35,13 +36,15 @@ from lorax.phlag import PHLAG_PROJECT_NAMES, resolve_phlag_source
 from lorax.cloud.gcs_utils import download_gcs_file
 from lorax.datasets import log_dataset_backend
 from lorax.handlers import handle_upload, handle_details
-from lorax.sockets.decorators import require_session
+from lorax.scheduling import INTERACTIVE
+from lorax.sockets.decorators import prioritized, require_session
 from lorax.sockets.load_scheduler import (
     load_scheduler,
     LoadQueueFullError,
     LoadQueueTimeoutError,
+    LoadTooLargeError,
 )
-from lorax.sockets.utils import is_csv_session_file
+from lorax.sockets.utils import is_csv_session
 
 UPLOAD_DIR = Path(UPLOADS_DIR)
 UPLOAD_DIR.mkdir(exist_ok=True)
@@ -98,6 +101,25 @@ def register_file_events(sio):
         # Legacy event path for existing clients.
         await sio.emit("load-file-result", payload, to=sid)
 
+    def _queued_status(sid, request_id, filename, project, reason):
+        """Status emitter for a load waiting on the load queue or on memory."""
+        waiting_for = (
+            "server memory to free up" if reason == "memory" else "an available file loader"
+        )
+
+        async def emit(position):
+            await sio.emit("status", {
+                "status": "queued",
+                "reason": reason,
+                "queue_position": position,
+                "message": f"Waiting for {waiting_for} (position {position} in queue)...",
+                "filename": filename,
+                "project": project,
+                "request_id": request_id,
+            }, to=sid)
+
+        return emit
+
     async def _process_load_file(sid, data):
         data = data or {}
         request_id = data.get("request_id")
@@ -197,10 +219,7 @@ def register_file_events(sio):
                     blob_path = f"{project}/{filename}"
 
             artifact_context = None
-            if (
-                (CSR_ARTIFACTS_ENABLED or project in PHLAG_PROJECT_NAMES)
-                and not str(file_path).lower().endswith(".csv")
-            ):
+            if CSR_ARTIFACTS_ENABLED or project in PHLAG_PROJECT_NAMES:
                 try:
                     resolved_artifact = await asyncio.to_thread(
                         artifact_resolver.resolve,
@@ -331,18 +350,44 @@ def register_file_events(sio):
             session.artifact_format = None
             await session_manager.save_session(session)
 
-            await sio.emit("status", {
-                "status": "processing-file",
-                "message": "Processing file...",
-                "filename": filename,
-                "project": project
-            }, to=sid)
+            # Admit the load once its estimated peak memory fits, then wait
+            # for a load worker.
+            estimated_bytes = await estimate_load_bytes(str(file_path))
+            try:
+                async with load_scheduler.admit(
+                    estimated_bytes,
+                    on_queued=_queued_status(sid, request_id, filename, project, "concurrency"),
+                    on_memory_queued=_queued_status(sid, request_id, filename, project, "memory"),
+                    request_id=request_id,
+                    socket_sid=sid,
+                    lorax_sid=lorax_sid,
+                ):
+                    await sio.emit("status", {
+                        "status": "processing-file",
+                        "message": "Processing file...",
+                        "filename": filename,
+                        "project": project
+                    }, to=sid)
 
-            dev_print("loading file", file_path, os.getpid())
-            ctx = await handle_upload(
-                str(file_path),
-                None if file_path_override else str(UPLOAD_DIR),
-            )
+                    dev_print("loading file", file_path, os.getpid())
+                    ctx = await handle_upload(
+                        str(file_path),
+                        None if file_path_override else str(UPLOAD_DIR),
+                    )
+            except LoadTooLargeError as e:
+                return _load_file_failure_payload(
+                    request_id=request_id,
+                    code="FILE_TOO_LARGE",
+                    message=str(e),
+                    recoverable=False,
+                )
+            except LoadQueueTimeoutError as e:
+                return _load_file_failure_payload(
+                    request_id=request_id,
+                    code="SERVER_BUSY",
+                    message=f"{e}. Please retry shortly.",
+                    recoverable=True,
+                )
 
             # Config is already computed and cached in FileContext
             config = ctx.config if ctx else None
@@ -405,13 +450,6 @@ def register_file_events(sio):
                 message="Server is busy processing other file load requests. Please retry shortly.",
                 recoverable=True,
             )
-        except LoadQueueTimeoutError:
-            payload = _load_file_failure_payload(
-                request_id=request_id,
-                code="SERVER_BUSY",
-                message="Timed out waiting for an available file loader. Please retry shortly.",
-                recoverable=True,
-            )
         except Exception as e:
             payload = _load_file_failure_payload(
                 request_id=request_id,
@@ -425,6 +463,7 @@ def register_file_events(sio):
         return payload
 
     @sio.event
+    @prioritized(INTERACTIVE)
     async def details(sid, data):
         data = data or {}
         request_id = data.get("request_id")
@@ -442,7 +481,7 @@ def register_file_events(sio):
                 }, to=sid)
                 return
 
-            if is_csv_session_file(session.file_path):
+            if is_csv_session(session):
                 await sio.emit("details-result", {
                     "request_id": request_id,
                     "data": {"error": "Details are not supported for CSV yet."}
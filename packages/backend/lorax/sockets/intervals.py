@@ -11,7 +11,8 @@ import numpy as np
 
 from lorax.artifacts.metrics import csr_artifact_metrics
 from lorax.artifacts.runtime import context_for_session, is_artifact_session
-from lorax.sockets.decorators import require_session
+from lorax.scheduling import VIEWPORT
+from lorax.sockets.decorators import prioritized, require_session
 
 
 def _matrix(translate_x: float, scale_x: float) -> list[float]:
@@ -205,6 +206,7 @@ def _query_local_data(reader, data: dict[str, Any]) -> dict[str, Any]:
 
 def register_interval_events(sio):
     @sio.event
+    @prioritized(VIEWPORT)
     async def query_intervals(sid, data):
         data = data or {}
         session = await require_session(data.get("lorax_sid"), sid, sio)
@@ -225,6 +227,7 @@ def register_interval_events(sio):
             return {"error": str(exc)}
 
     @sio.event
+    @prioritized(VIEWPORT)
     async def query_local_data(sid, data):
         data = data or {}
         session = await require_session(data.get("lorax_sid"), sid, sio)
@@ -11,7 +11,12 @@ Handles ancestry and descendant operations:
 
 import asyncio
 
-from lorax.artifacts.graph import CompactGenealogyGraph
+from lorax.artifacts.csr_reader import CSRArtifactError
+from lorax.artifacts.graph import (
+    CompactGenealogyGraph,
+    LazyCompactGenealogyGraph,
+    artifact_graph_key,
+)
 from lorax.artifacts.runtime import context_for_session, is_artifact_session
 from lorax.context import tree_graph_cache
 from lorax.handlers import get_or_construct_tree_graph
@@ -19,16 +24,36 @@ from lorax.lineage import (
     get_ancestors, get_descendants, search_nodes_by_criteria,
     get_subtree, get_mrca
 )
-from lorax.sockets.decorators import require_session
-from lorax.sockets.utils import is_csv_session_file
+from lorax.scheduling import INTERACTIVE
+from lorax.sockets.decorators import prioritized, require_session
+from lorax.sockets.utils import is_csv_session
 
 
 async def _ensure_session_graph(session, tree_index: int):
     cached = await tree_graph_cache.get(session.sid, tree_index)
+    if isinstance(cached, LazyCompactGenealogyGraph):
+        # Decode off the event loop; a handle whose reader was closed by
+        # registry eviction is rebuilt from a fresh context below.
+        try:
+            await asyncio.to_thread(cached.materialize)
+            return cached
+        except CSRArtifactError:
+            await tree_graph_cache.discard_shared(
+                artifact_graph_key(cached.reader, tree_index, cached.time_scale)
+            )
+            cached = None
     if cached is not None:
         return cached
     if is_artifact_session(session):
         context = await asyncio.to_thread(context_for_session, session)
+        content_key = artifact_graph_key(context.reader, tree_index)
+        shared = await tree_graph_cache.get(
+            session.sid,
+            tree_index,
+            content_key=content_key,
+        )
+        if shared is not None:
+            return shared
         genealogy = await asyncio.to_thread(
             context.reader.tree_at_index,
             tree_index,
@@ -38,7 +63,12 @@ async def _ensure_session_graph(session, tree_index: int):
             global_min_time=context.reader.global_min_time,
             global_max_time=context.reader.global_max_time,
         )
-        await tree_graph_cache.set(session.sid, tree_index, graph)
+        await tree_graph_cache.set(
+            session.sid,
+            tree_index,
+            graph,
+            content_key=content_key,
+        )
         return graph
     return await get_or_construct_tree_graph(
         session.file_path,
@@ -52,6 +82,7 @@ def register_lineage_events(sio):
     """Register lineage-related socket events."""
 
     @sio.event
+    @prioritized(INTERACTIVE)
     async def get_ancestors_event(sid, data):
         """Socket event to get ancestors (path to root) for a node.
 
@@ -79,7 +110,7 @@ def register_lineage_events(sio):
             if not session.file_path:
                 return {"error": "No file loaded", "ancestors": [], "path": []}
 
-            if is_csv_session_file(session.file_path):
+            if is_csv_session(session):
                 return {"error": "Lineage not supported for CSV", "ancestors": [], "path": []}
 
             tree_index = data.get("tree_index")
@@ -103,6 +134,7 @@ def register_lineage_events(sio):
             return {"error": str(e), "ancestors": [], "path": []}
 
     @sio.event
+    @prioritized(INTERACTIVE)
     async def get_descendants_event(sid, data):
         """Socket event to get all descendants of a node.
 
@@ -130,7 +162,7 @@ def register_lineage_events(sio):
             if not session.file_path:
                 return {"error": "No file loaded", "descendants": [], "tips": []}
 
-            if is_csv_session_file(session.file_path):
+            if is_csv_session(session):
                 return {"error": "Lineage not supported for CSV", "descendants": [], "tips": []}
 
             tree_index = data.get("tree_index")
@@ -156,6 +188,7 @@ def register_lineage_events(sio):
             return {"error": str(e), "descendants": [], "tips": []}
 
     @sio.event
+    @prioritized(INTERACTIVE)
     async def search_nodes_by_criteria_event(sid, data):
         """Socket event to search nodes by criteria (time, tip status, etc).
 
@@ -186,7 +219,7 @@ def register_lineage_events(sio):
             if not session.file_path:
                 return {"error": "No file loaded", "matches": [], "positions": []}
 
-            if is_csv_session_file(session.file_path):
+            if is_csv_session(session):
                 return {"error": "Search not supported for CSV", "matches": [], "positions": []}
 
             tree_index = data.get("tree_index")
@@ -210,6 +243,7 @@ def register_lineage_events(sio):
             return {"error": str(e), "matches": [], "positions": []}
 
     @sio.event
+    @prioritized(INTERACTIVE)
     async def get_subtree_event(sid, data):
         """Socket event to get the complete subtree rooted at a node.
 
@@ -234,7 +268,7 @@ def register_lineage_events(sio):
             if not session.file_path:
                 return {"error": "No file loaded", "nodes": [], "edges": []}
 
-            if is_csv_session_file(session.file_path):
+            if is_csv_session(session):
                 return {"error": "Subtree not supported for CSV", "nodes": [], "edges": []}
 
             tree_index = data.get("tree_index")
@@ -258,6 +292,7 @@ def register_lineage_events(sio):
             return {"error": str(e), "nodes": [], "edges": []}
 
     @sio.event
+    @prioritized(INTERACTIVE)
     async def get_mrca_event(sid, data):
         """Socket event to find the Most Recent Common Ancestor of multiple nodes.
 
@@ -284,7 +319,7 @@ def register_lineage_events(sio):
             if not session.file_path:
                 return {"error": "No file loaded", "mrca": None}
 
-            if is_csv_session_file(session.file_path):
+            if is_csv_session(session):
                 return {"error": "MRCA not supported for CSV", "mrca": None}
 
             tree_index = data.get("tree_index")
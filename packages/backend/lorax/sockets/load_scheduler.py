@@ -2,7 +2,13 @@
 Load-file scheduling and backpressure for Socket.IO handlers.
 
 This module provides a bounded queue plus concurrency limiter for file loads so
-CPU-heavy requests cannot starve the service under concurrent usage.
+CPU-heavy requests cannot starve the service under concurrent usage, and a
+memory admission gate so loads of large files cannot push the process past
+its memory limit. Every FileContext load goes through the gate: socket
+load_file requests and the HTTP ``/{file}`` route admit their load and take
+a worker slot, other cache misses in get_file_context (reloads after
+eviction, prefetches) reserve memory on the miss path, and cold loads in
+compute workers reserve before their job is submitted.
 """
 
 from __future__ import annotations
@@ -11,7 +17,16 @@ import asyncio
 import json
 import os
 import time
-from typing import Awaitable, Callable, Dict, Tuple
+from collections import deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+
+import psutil
+
+from lorax.cache import estimate_load_bytes, load_admitted, reclaim_file_cache
+from lorax.metrics import observe_stage
 
 
 def _env_int(name: str, default: int, minimum: int) -> int:
@@ -49,12 +64,189 @@ class LoadQueueTimeoutError(Exception):
     """Raised when a queued load waits too long for a worker slot."""
 
 
+class LoadTooLargeError(Exception):
+    """Raised when a load's estimated peak memory exceeds the ceiling outright."""
+
+
+QueuedCallback = Callable[[int], Awaitable[None]]
+
+# Seconds the load running in the current task spent in admission; run()
+# reports it as the queue wait.
+_admission_wait: ContextVar[float] = ContextVar("lorax_load_admission_wait", default=0.0)
+
+
+def _memory_limit_bytes() -> int:
+    """Physical memory available to this process: RAM, or a lower cgroup limit."""
+    limit = psutil.virtual_memory().total
+    for cgroup_file in (
+        "/sys/fs/cgroup/memory.max",
+        "/sys/fs/cgroup/memory/memory.limit_in_bytes",
+    ):
+        try:
+            raw = Path(cgroup_file).read_text().strip()
+        except OSError:
+            continue
+        if raw.isdigit():
+            limit = min(limit, int(raw))
+    return limit
+
+
+def _process_tree_rss() -> int:
+    """RSS of this process plus its children (compute workers)."""
+    process = psutil.Process(os.getpid())
+    total = process.memory_info().rss
+    for child in process.children(recursive=True):
+        try:
+            total += child.memory_info().rss
+        except psutil.Error:
+            pass
+    return total
+
+
+class _Waiter:
+    """A load waiting for memory; ``reclaim`` is cleared once evicting stops helping."""
+
+    __slots__ = ("reclaim",)
+
+    def __init__(self):
+        self.reclaim = True
+
+
+class MemoryAdmission:
+    """
+    Admits file loads against a resident-memory ceiling.
+
+    A load is admitted when current RSS (of this process and its compute
+    workers, so both share one ceiling) plus the reservations of loads still
+    running plus its own estimated peak fits under the ceiling, even when it
+    is the only load. RSS already includes whatever running loads have
+    allocated so far, so this errs on the side of waiting. When a load does
+    not fit, ``reclaim(nbytes)`` is asked to free the shortfall first (by
+    default: evict unpinned FileContexts). If that freed bytes but RSS did
+    not drop (the memory is still referenced elsewhere, or the allocator
+    keeps it), the load stops reclaiming, so it does not keep evicting files
+    other sessions will reload. Waiting loads are admitted in FIFO order and
+    re-checked every poll interval, since RSS also falls as other caches
+    evict; a load that still does not fit times out as busy.
+    """
+
+    def __init__(
+        self,
+        *,
+        ceiling_bytes: int | None = None,
+        poll_interval_sec: float = 0.25,
+        rss_bytes: Callable[[], int] | None = None,
+        reclaim: Callable[[int], int] | None = reclaim_file_cache,
+    ):
+        if ceiling_bytes is None:
+            ceiling_mb = _env_int(
+                "LORAX_LOAD_MEMORY_CEILING_MB",
+                int(_memory_limit_bytes() * 0.85) // (1024 * 1024),
+                0,
+            )
+            ceiling_bytes = ceiling_mb * 1024 * 1024
+        self.ceiling_bytes = max(0, int(ceiling_bytes))
+        self.poll_interval_sec = poll_interval_sec
+        self._rss_bytes = rss_bytes or _process_tree_rss
+        self._reclaim = reclaim
+        self.reclaimed_bytes = 0
+        self._reserved = 0
+        self._active = 0
+        self._waiting: deque = deque()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ceiling_bytes > 0
+
+    def _shortfall(self, nbytes: int) -> int:
+        return self._rss_bytes() + self._reserved + nbytes - self.ceiling_bytes
+
+    def _fits(self, waiter: _Waiter, nbytes: int) -> bool:
+        if self._waiting[0] is not waiter:
+            return False
+        shortfall = self._shortfall(nbytes)
+        if shortfall <= 0:
+            return True
+        if self._reclaim is None or not waiter.reclaim:
+            return False
+        freed = self._reclaim(shortfall)
+        if freed <= 0:
+            return False
+        self.reclaimed_bytes += freed
+        remaining = self._shortfall(nbytes)
+        if remaining >= shortfall:
+            waiter.reclaim = False
+        return remaining <= 0
+
+    @asynccontextmanager
+    async def reserve(
+        self,
+        nbytes: int,
+        *,
+        timeout_sec: float,
+        on_queued: Optional[QueuedCallback] = None,
+    ) -> AsyncIterator[None]:
+        """
+        Hold a reservation of ``nbytes`` while the block runs.
+
+        ``on_queued(position)`` is awaited whenever the load has to wait and
+        its 1-based queue position changes.
+        """
+        nbytes = max(0, int(nbytes))
+        if not self.enabled or nbytes == 0:
+            yield
+            return
+        if nbytes > self.ceiling_bytes:
+            raise LoadTooLargeError(
+                f"Loading this file needs about {nbytes / 2**30:.1f} GiB, more than the "
+                f"server's {self.ceiling_bytes / 2**30:.1f} GiB load limit"
+            )
+
+        waiter = _Waiter()
+        self._waiting.append(waiter)
+        deadline = time.monotonic() + timeout_sec
+        reported_position = None
+        try:
+            while not self._fits(waiter, nbytes):
+                position = self._waiting.index(waiter) + 1
+                if on_queued is not None and position != reported_position:
+                    reported_position = position
+                    await on_queued(position)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise LoadQueueTimeoutError(
+                        f"Timed out waiting for memory to load after {timeout_sec:.1f}s"
+                    )
+                await asyncio.sleep(min(self.poll_interval_sec, remaining))
+        finally:
+            self._waiting.remove(waiter)
+
+        self._reserved += nbytes
+        self._active += 1
+        try:
+            yield
+        finally:
+            self._reserved -= nbytes
+            self._active -= 1
+
+    def get_state(self) -> Dict[str, int]:
+        return {
+            "memory_ceiling_bytes": self.ceiling_bytes,
+            "memory_reserved_bytes": self._reserved,
+            "memory_active_loads": self._active,
+            "memory_waiting": len(self._waiting),
+            "memory_reclaimed_bytes": self.reclaimed_bytes,
+        }
+
+
 class LoadScheduler:
     """
     Enforces bounded queueing and concurrency limits for load_file requests.
 
-    in_system counts all active + queued jobs. Worker slots limit concurrent
-    execution once a job reaches the front of the queue.
+    in_system counts all active + queued jobs. Inside a job, admit() first
+    reserves the load's estimated peak memory and only then waits for one of
+    the worker slots that limit concurrent loads, so a worker never sits
+    idle holding a slot while memory frees up.
     """
 
     def __init__(
@@ -63,6 +255,7 @@ class LoadScheduler:
         max_concurrency: int | None = None,
         max_queue: int | None = None,
         queue_timeout_sec: float | None = None,
+        memory: MemoryAdmission | None = None,
     ):
         self.max_concurrency = max_concurrency if max_concurrency is not None else _env_int(
             "LORAX_LOAD_FILE_MAX_CONCURRENCY", 1, 1
@@ -76,17 +269,21 @@ class LoadScheduler:
             else _env_float("LORAX_LOAD_FILE_QUEUE_TIMEOUT_SEC", 30.0, 0.1)
         )
         self.max_in_system = self.max_concurrency + self.max_queue
+        self.memory = memory if memory is not None else MemoryAdmission()
 
         self._worker_slots = asyncio.Semaphore(self.max_concurrency)
         self._state_lock = asyncio.Lock()
         self._counter_lock = asyncio.Lock()
         self._in_system = 0
+        self._slot_waiting = 0
         self._counters = {
             "load_file_started": 0,
             "load_file_success": 0,
             "load_file_failed": 0,
             "load_file_busy": 0,
             "load_file_timeout": 0,
+            "load_file_memory_queued": 0,
+            "load_file_too_large": 0,
         }
 
     async def get_counters(self) -> Dict[str, int]:
@@ -101,6 +298,7 @@ class LoadScheduler:
             "max_queue": self.max_queue,
             "queue_timeout_sec": self.queue_timeout_sec,
             "in_system": in_system,
+            **self.memory.get_state(),
         }
 
     async def run(
@@ -112,7 +310,10 @@ class LoadScheduler:
         lorax_sid: str | None = None,
     ) -> Tuple[dict, int, int]:
         """
-        Execute a load job with bounded queue and limited concurrency.
+        Execute a load job within the bounded queue.
+
+        The job calls admit() around its load; the time spent there is
+        reported as the queue wait and excluded from the duration.
 
         Returns:
             (payload, queue_wait_ms, duration_ms)
@@ -129,42 +330,14 @@ class LoadScheduler:
             )
             raise LoadQueueFullError("Load queue is full")
 
-        acquired_worker = False
-        queue_wait_start = time.perf_counter()
+        wait_token = _admission_wait.set(0.0)
         try:
-            try:
-                await asyncio.wait_for(
-                    self._worker_slots.acquire(), timeout=self.queue_timeout_sec
-                )
-            except asyncio.TimeoutError as exc:
-                await self._increment("load_file_busy", "load_file_timeout")
-                await self._log(
-                    "load_file_queue_timeout",
-                    request_id=request_id,
-                    socket_sid=socket_sid,
-                    lorax_sid=lorax_sid,
-                    wait_timeout_sec=self.queue_timeout_sec,
-                )
-                raise LoadQueueTimeoutError(
-                    f"Timed out waiting for load worker after {self.queue_timeout_sec:.1f}s"
-                ) from exc
-
-            acquired_worker = True
-            queue_wait_ms = int((time.perf_counter() - queue_wait_start) * 1000)
-            await self._increment("load_file_started")
-            await self._log(
-                "load_file_started",
-                request_id=request_id,
-                socket_sid=socket_sid,
-                lorax_sid=lorax_sid,
-                queue_wait_ms=queue_wait_ms,
-            )
-
             run_start = time.perf_counter()
             try:
                 payload = await job()
             except Exception as exc:
-                duration_ms = int((time.perf_counter() - run_start) * 1000)
+                queue_wait_ms = int(_admission_wait.get() * 1000)
+                duration_ms = int((time.perf_counter() - run_start) * 1000) - queue_wait_ms
                 await self._increment("load_file_failed")
                 await self._log(
                     "load_file_failed",
@@ -177,7 +350,11 @@ class LoadScheduler:
                 )
                 raise
 
-            duration_ms = int((time.perf_counter() - run_start) * 1000)
+            queue_wait_sec = _admission_wait.get()
+            duration_sec = time.perf_counter() - run_start - queue_wait_sec
+            queue_wait_ms = int(queue_wait_sec * 1000)
+            duration_ms = int(duration_sec * 1000)
+            observe_stage("load_file.run", duration_sec)
             if payload.get("ok"):
                 await self._increment("load_file_success")
                 outcome = "success"
@@ -197,10 +374,159 @@ class LoadScheduler:
             )
             return payload, queue_wait_ms, duration_ms
         finally:
-            if acquired_worker:
-                self._worker_slots.release()
+            _admission_wait.reset(wait_token)
             await self._release_slot()
 
+    @asynccontextmanager
+    async def admit(
+        self,
+        nbytes: int,
+        *,
+        on_queued: Optional[QueuedCallback] = None,
+        on_memory_queued: Optional[QueuedCallback] = None,
+        request_id: str | int | None = None,
+        socket_sid: str | None = None,
+        lorax_sid: str | None = None,
+    ) -> AsyncIterator[None]:
+        """
+        Reserve ``nbytes`` of memory, then a worker slot, for one load.
+
+        ``on_memory_queued(position)`` is awaited while waiting for memory
+        and ``on_queued(position)`` once if all worker slots are busy.
+        Raises LoadTooLargeError or LoadQueueTimeoutError.
+        """
+        queue_wait_start = time.perf_counter()
+        async with self.reserve_memory(
+            nbytes,
+            on_queued=on_memory_queued,
+            request_id=request_id,
+            socket_sid=socket_sid,
+            lorax_sid=lorax_sid,
+        ):
+            if self._worker_slots.locked():
+                self._slot_waiting += 1
+                position = self._slot_waiting
+            else:
+                position = None
+            try:
+                if position is not None and on_queued is not None:
+                    await on_queued(position)
+                try:
+                    await asyncio.wait_for(
+                        self._worker_slots.acquire(), timeout=self.queue_timeout_sec
+                    )
+                except asyncio.TimeoutError as exc:
+                    await self._increment("load_file_busy", "load_file_timeout")
+                    await self._log(
+                        "load_file_queue_timeout",
+                        request_id=request_id,
+                        socket_sid=socket_sid,
+                        lorax_sid=lorax_sid,
+                        wait_timeout_sec=self.queue_timeout_sec,
+                    )
+                    raise LoadQueueTimeoutError(
+                        f"Timed out waiting for load worker after {self.queue_timeout_sec:.1f}s"
+                    ) from exc
+            finally:
+                if position is not None:
+                    self._slot_waiting -= 1
+
+            try:
+                queue_wait_sec = time.perf_counter() - queue_wait_start
+                _admission_wait.set(_admission_wait.get() + queue_wait_sec)
+                observe_stage("load_file.queue_wait", queue_wait_sec)
+                await self._increment("load_file_started")
+                await self._log(
+                    "load_file_started",
+                    request_id=request_id,
+                    socket_sid=socket_sid,
+                    lorax_sid=lorax_sid,
+                    queue_wait_ms=int(queue_wait_sec * 1000),
+                    estimated_bytes=nbytes,
+                )
+                # get_file_context must not reserve this load a second time.
+                with load_admitted():
+                    yield
+            finally:
+                self._worker_slots.release()
+
+    @asynccontextmanager
+    async def reserve_file_memory(self, file_path: str) -> AsyncIterator[None]:
+        """
+        Reserve memory for loading ``file_path`` without a worker slot.
+
+        Used for compute-worker loads and, through set_load_admission, for
+        get_file_context cache misses outside admit(): they count against
+        the same ceiling but take no load worker slot here.
+        """
+        nbytes = await estimate_load_bytes(file_path, cold=True)
+        async with self.reserve_memory(nbytes):
+            yield
+
+    @asynccontextmanager
+    async def reserve_memory(
+        self,
+        nbytes: int,
+        *,
+        on_queued: Optional[QueuedCallback] = None,
+        request_id: str | int | None = None,
+        socket_sid: str | None = None,
+        lorax_sid: str | None = None,
+    ) -> AsyncIterator[None]:
+        """
+        Reserve a load's estimated peak memory for the duration of the block.
+
+        Raises LoadTooLargeError if the estimate exceeds the ceiling and
+        LoadQueueTimeoutError if memory does not free up within the queue
+        timeout.
+        """
+        counted = False
+
+        async def queued(position: int) -> None:
+            nonlocal counted
+            if not counted:
+                counted = True
+                await self._increment("load_file_memory_queued")
+            await self._log(
+                "load_file_memory_queued",
+                request_id=request_id,
+                socket_sid=socket_sid,
+                lorax_sid=lorax_sid,
+                estimated_bytes=nbytes,
+                queue_position=position,
+            )
+            if on_queued is not None:
+                await on_queued(position)
+
+        try:
+            async with self.memory.reserve(
+                nbytes,
+                timeout_sec=self.queue_timeout_sec,
+                on_queued=queued,
+            ):
+                yield
+        except LoadTooLargeError:
+            await self._increment("load_file_too_large")
+            await self._log(
+                "load_file_rejected",
+                request_id=request_id,
+                socket_sid=socket_sid,
+                lorax_sid=lorax_sid,
+                estimated_bytes=nbytes,
+                reason="too_large",
+            )
+            raise
+        except LoadQueueTimeoutError:
+            await self._increment("load_file_busy", "load_file_timeout")
+            await self._log(
+                "load_file_memory_timeout",
+                request_id=request_id,
+                socket_sid=socket_sid,
+                lorax_sid=lorax_sid,
+                estimated_bytes=nbytes,
+            )
+            raise
+
     async def _try_reserve_slot(self) -> bool:
         async with self._state_lock:
             if self._in_system >= self.max_in_system:
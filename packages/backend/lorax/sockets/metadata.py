@@ -10,18 +10,21 @@ from lorax.artifacts.csr_reader import CSRArtifactCapabilityError
 from lorax.artifacts.features import artifact_metadata_array
 from lorax.artifacts.runtime import context_for_session, is_artifact_session
 from lorax.constants import ERROR_NO_FILE_LOADED
+from lorax.context import compute_pool, request_coalescer
 from lorax.metadata.loader import (
     search_samples_by_metadata, get_metadata_array_for_key
 )
 from lorax.cache import get_file_context
-from lorax.sockets.decorators import require_session
-from lorax.sockets.utils import is_csv_session_file
+from lorax.scheduling import INTERACTIVE, VIEWPORT
+from lorax.sockets.decorators import prioritized, require_session
+from lorax.sockets.utils import is_csv_session
 
 
 def register_metadata_events(sio):
     """Register metadata-related socket events."""
 
     @sio.event
+    @prioritized(INTERACTIVE)
     async def search_metadata(sid, data):
         """Socket event to search for samples matching a metadata value."""
         try:
@@ -38,7 +41,7 @@ def register_metadata_events(sio):
                 }, to=sid)
                 return
 
-            if is_csv_session_file(session.file_path):
+            if is_csv_session(session):
                 key = data.get("key")
                 value = data.get("value")
                 if key == "sample":
@@ -116,6 +119,9 @@ def register_metadata_events(sio):
             await sio.emit("search-result", {"error": str(e)}, to=sid)
 
     @sio.event
+    # The viewport is coloured from this array, so it must not queue behind
+    # pre-caching and prefetch work.
+    @prioritized(VIEWPORT)
     async def fetch_metadata_array(sid, data):
         """Socket event to fetch metadata as efficient PyArrow array format.
 
@@ -137,7 +143,7 @@ def register_metadata_events(sio):
                 }, to=sid)
                 return
 
-            if is_csv_session_file(session.file_path):
+            if is_csv_session(session):
                 key = data.get("key")
                 if key == "sample":
                     ctx = await get_file_context(session.file_path)
@@ -198,17 +204,27 @@ def register_metadata_events(sio):
                     )
                     return
             else:
-                ctx = await get_file_context(session.file_path)
-                if ctx is None:
-                    await sio.emit("metadata-array-result", {
-                        "error": "Failed to load tree sequence"
-                    }, to=sid)
-                    return
-                result = await asyncio.to_thread(
-                    get_metadata_array_for_key,
-                    ctx,
-                    key,
+                async def build_array():
+                    if compute_pool.enabled:
+                        return await compute_pool.submit(
+                            "metadata_array", session.file_path, key=key
+                        )
+                    ctx = await get_file_context(session.file_path)
+                    if ctx is None:
+                        return {"error": "Failed to load tree sequence"}
+                    return await asyncio.to_thread(
+                        get_metadata_array_for_key,
+                        ctx,
+                        key,
+                    )
+
+                result = await request_coalescer.do(
+                    request_coalescer.key(session.file_path, "metadata_array", key=key),
+                    build_array,
                 )
+                if "error" in result:
+                    await sio.emit("metadata-array-result", result, to=sid)
+                    return
 
             # Send metadata with Arrow buffer as binary
             await sio.emit("metadata-array-result", {
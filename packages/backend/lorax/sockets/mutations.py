@@ -15,14 +15,16 @@ from lorax.metadata.mutations import (
 )
 from lorax.buffer import mutations_to_arrow_buffer
 from lorax.cache import get_file_context
-from lorax.sockets.decorators import require_session
-from lorax.sockets.utils import is_csv_session_file
+from lorax.scheduling import INTERACTIVE, VIEWPORT
+from lorax.sockets.decorators import prioritized, require_session
+from lorax.sockets.utils import is_csv_session
 
 
 def register_mutations_events(sio):
     """Register mutation-related socket events."""
 
     @sio.event
+    @prioritized(VIEWPORT)
     async def query_mutations_window(sid, data):
         """Socket event to fetch mutations within a genomic window.
 
@@ -43,7 +45,7 @@ def register_mutations_events(sio):
                 }, to=sid)
                 return
 
-            if is_csv_session_file(session.file_path):
+            if is_csv_session(session):
                 await sio.emit("mutations-window-result", {
                     "error": "Mutations are not supported for CSV yet."
                 }, to=sid)
@@ -105,6 +107,7 @@ def register_mutations_events(sio):
             await sio.emit("mutations-window-result", {"error": str(e)}, to=sid)
 
     @sio.event
+    @prioritized(INTERACTIVE)
     async def search_mutations(sid, data):
         """Socket event to search mutations by position with configurable range.
 
@@ -125,7 +128,7 @@ def register_mutations_events(sio):
                 }, to=sid)
                 return
 
-            if is_csv_session_file(session.file_path):
+            if is_csv_session(session):
                 await sio.emit("mutations-search-result", {
                     "error": "Mutations search is not supported for CSV yet."
                 }, to=sid)
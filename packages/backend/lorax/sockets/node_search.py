@@ -5,11 +5,19 @@ Handles search_nodes and get_highlight_positions_event events.
 """
 
 import asyncio
+from collections import defaultdict
+
+import numpy as np
 
 from lorax.artifacts.graph import CompactGenealogyGraph
 from lorax.artifacts.csr_reader import CSRArtifactCapabilityError
 from lorax.artifacts.runtime import context_for_session, is_artifact_session
-from lorax.context import tree_graph_cache, csv_tree_graph_cache
+from lorax.context import (
+    compute_pool,
+    csv_tree_graph_cache,
+    request_coalescer,
+    tree_graph_cache,
+)
 from lorax.constants import ERROR_NO_FILE_LOADED
 from lorax.handlers import (
     should_shift_csv_tips,
@@ -19,8 +27,9 @@ from lorax.handlers import (
     get_compare_trees_diff,
 )
 from lorax.cache import get_file_context
-from lorax.sockets.decorators import require_session
-from lorax.sockets.utils import is_csv_session_file
+from lorax.scheduling import INTERACTIVE, VIEWPORT
+from lorax.sockets.decorators import prioritized, require_session
+from lorax.sockets.utils import is_csv_session
 from lorax.tree_graph.time_scale import (
     newick_node_position,
     normalize_time_scale,
@@ -126,7 +135,7 @@ def _artifact_matching_nodes(reader, metadata_key, metadata_value):
     )["sample_node_ids"]
 
 
-def _artifact_positions(
+def _artifact_genealogy_positions(
     context,
     node_ids,
     tree_indices,
@@ -181,6 +190,97 @@ def _artifact_positions(
     return positions, lineages
 
 
+def _artifact_positions(
+    context,
+    node_ids,
+    tree_indices,
+    time_scale,
+    *,
+    show_lineages=False,
+):
+    reader = context.reader
+    # Position features stay gated on node_tree_ranges, which also resolves
+    # non-sample nodes the tip-order index does not cover.
+    reader.require_capability("node_tree_ranges")
+    if not reader.has_capability("sample_tip_order"):
+        return _artifact_genealogy_positions(
+            context,
+            node_ids,
+            tree_indices,
+            time_scale,
+            show_lineages=show_lineages,
+        )
+
+    # Sample positions come from the persisted tip-order index, so the cost
+    # depends on the number of highlighted samples and trees, not tree size.
+    gathered = reader.sample_tip_positions(node_ids, tree_indices)
+    y_values = times_to_y(
+        gathered.node_times,
+        reader.global_min_time,
+        reader.global_max_time,
+        time_scale,
+    )
+    positions = [
+        {"node_id": node_id, "tree_idx": tree_idx, "x": x, "y": y}
+        for node_id, tree_idx, x, y in zip(
+            gathered.node_ids.tolist(),
+            gathered.tree_indices.tolist(),
+            gathered.layout_x.astype(np.float64).tolist(),
+            np.asarray(y_values, dtype=np.float64).tolist(),
+        )
+    ]
+    # Samples that are internal nodes in a tree are not tips and keep their
+    # midpoint x, so only those genealogies are decoded.
+    internal_nodes = defaultdict(list)
+    for tree_idx, node_id in zip(
+        gathered.internal_tree_indices.tolist(),
+        gathered.internal_node_ids.tolist(),
+    ):
+        internal_nodes[tree_idx].append(node_id)
+    for genealogy in reader.trees_at_indices(internal_nodes):
+        for node_id in internal_nodes[genealogy.tree_index]:
+            offset = genealogy.node_offset(node_id)
+            positions.append(
+                {
+                    "node_id": node_id,
+                    "tree_idx": genealogy.tree_index,
+                    "x": float(genealogy.layout_x[offset]),
+                    "y": float(
+                        times_to_y(
+                            [genealogy.node_times[offset]],
+                            reader.global_min_time,
+                            reader.global_max_time,
+                            time_scale,
+                        )[0]
+                    ),
+                }
+            )
+    lineages = {}
+    if show_lineages:
+        hit_nodes = defaultdict(list)
+        for position in positions:
+            hit_nodes[position["tree_idx"]].append(position["node_id"])
+        for genealogy in reader.trees_at_indices(hit_nodes):
+            for node_id in hit_nodes[genealogy.tree_index]:
+                path = list(reversed(genealogy.ancestors(node_id)))
+                if len(path) > 1:
+                    lineages.setdefault(genealogy.tree_index, []).append(
+                        {"path_node_ids": path, "color": None}
+                    )
+    if len(gathered.unresolved_node_ids):
+        extra_positions, extra_lineages = _artifact_genealogy_positions(
+            context,
+            gathered.unresolved_node_ids.tolist(),
+            tree_indices,
+            time_scale,
+            show_lineages=show_lineages,
+        )
+        positions.extend(extra_positions)
+        for tree_idx, paths in extra_lineages.items():
+            lineages.setdefault(tree_idx, []).extend(paths)
+    return positions, lineages
+
+
 def _artifact_search_nodes(context, data):
     name_map = _artifact_sample_name_map(context.reader)
     names = [str(name) for name in data.get("sample_names", [])]
@@ -254,6 +354,7 @@ def register_node_search_events(sio):
     """Register node search socket events."""
 
     @sio.event
+    @prioritized(INTERACTIVE)
     async def search_nodes(sid, data):
         """Socket event to search for nodes matching metadata values in trees.
 
@@ -288,7 +389,7 @@ def register_node_search_events(sio):
                 }, to=sid)
                 return
 
-            if is_csv_session_file(session.file_path):
+            if is_csv_session(session):
                 sample_names = data.get("sample_names", [])
                 tree_indices = data.get("tree_indices", [])
                 show_lineages = data.get("show_lineages", False)
@@ -383,7 +484,8 @@ def register_node_search_events(sio):
                 sample_names,
                 tree_indices,
                 show_lineages,
-                sample_colors
+                sample_colors,
+                ctx=ctx,
             )
 
             await sio.emit("search-nodes-result", result, to=sid)
@@ -392,6 +494,7 @@ def register_node_search_events(sio):
             await sio.emit("search-nodes-result", {"error": str(e)}, to=sid)
 
     @sio.event
+    @prioritized(INTERACTIVE)
     async def get_highlight_positions_event(sid, data):
         """Socket event to get positions for all tip nodes matching a metadata value.
 
@@ -423,7 +526,7 @@ def register_node_search_events(sio):
                 }, to=sid)
                 return
 
-            if is_csv_session_file(session.file_path):
+            if is_csv_session(session):
                 metadata_key = data.get("metadata_key")
                 metadata_value = data.get("metadata_value")
                 tree_indices = data.get("tree_indices", [])
@@ -546,6 +649,7 @@ def register_node_search_events(sio):
             await sio.emit("highlight-positions-result", {"error": str(e)}, to=sid)
 
     @sio.event
+    @prioritized(INTERACTIVE)
     async def search_metadata_multi_event(sid, data):
         """Socket event for multi-value metadata search.
 
@@ -581,7 +685,7 @@ def register_node_search_events(sio):
                 }, to=sid)
                 return
 
-            if is_csv_session_file(session.file_path):
+            if is_csv_session(session):
                 metadata_key = data.get("metadata_key")
                 metadata_values = data.get("metadata_values", [])
                 tree_indices = data.get("tree_indices", [])
@@ -757,6 +861,7 @@ def register_node_search_events(sio):
             await sio.emit("search-metadata-multi-result", {"error": str(e)}, to=sid)
 
     @sio.event
+    @prioritized(VIEWPORT)
     async def compare_trees_event(sid, data):
         """Socket event for compare mode: receive visible tree indices from frontend.
 
@@ -789,13 +894,32 @@ def register_node_search_events(sio):
                     time_scale,
                 )
             else:
-                result = await get_compare_trees_diff(
-                    session.file_path,
-                    tree_indices,
-                    lorax_sid,
-                    tree_graph_cache,
-                    csv_tree_graph_cache=csv_tree_graph_cache,
-                    time_scale=time_scale,
+                async def compare():
+                    if compute_pool.enabled:
+                        return await compute_pool.submit(
+                            "compare_trees",
+                            session.file_path,
+                            tree_indices=tree_indices,
+                            session_id=lorax_sid,
+                            time_scale=time_scale,
+                        )
+                    return await get_compare_trees_diff(
+                        session.file_path,
+                        tree_indices,
+                        lorax_sid,
+                        tree_graph_cache,
+                        csv_tree_graph_cache=csv_tree_graph_cache,
+                        time_scale=time_scale,
+                    )
+
+                result = await request_coalescer.do(
+                    request_coalescer.key(
+                        session.file_path,
+                        "compare_trees",
+                        tree_indices=tree_indices,
+                        time_scale=time_scale,
+                    ),
+                    compare,
                 )
             await sio.emit("compare-trees-result", result, to=sid)
         except Exception as e:
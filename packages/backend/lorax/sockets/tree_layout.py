@@ -9,10 +9,16 @@ import math
 import asyncio
 from pathlib import Path
 
+from lorax.cancellation import CancelToken, RequestCancelled
 from lorax.context import (
+    compute_pool,
+    render_generations,
+    request_coalescer,
     tree_graph_cache,
     csv_tree_graph_cache,
+    render_cache,
     session_manager,
+    work_scheduler,
 )
 from lorax.artifacts.csr_reader import (
     CSRArtifactCapabilityError,
@@ -20,7 +26,11 @@ from lorax.artifacts.csr_reader import (
 )
 from lorax.artifacts.metrics import csr_artifact_metrics
 from lorax.artifacts.render import serialize_csr_genealogies
-from lorax.artifacts.graph import CompactGenealogyGraph
+from lorax.artifacts.graph import (
+    CompactGenealogyGraph,
+    LazyCompactGenealogyGraph,
+    artifact_graph_key,
+)
 from lorax.artifacts.runtime import (
     artifact_context_registry,
     artifact_resolver,
@@ -29,8 +39,9 @@ from lorax.artifacts.runtime import (
 )
 from lorax.datasets import log_dataset_backend, resolve_dataset_context
 from lorax.handlers import handle_tree_graph_query, ensure_trees_cached
-from lorax.sockets.decorators import require_session
-from lorax.sockets.utils import is_csv_session_file
+from lorax.scheduling import BULK, VIEWPORT
+from lorax.sockets.decorators import prioritized, require_session
+from lorax.sockets.utils import is_csv_session, is_csv_session_file
 from lorax.tree_graph.time_scale import normalize_time_scale
 
 logger = logging.getLogger(__name__)
@@ -192,12 +203,17 @@ async def _render_artifact_session(
     adaptive_sparsify_bbox,
     adaptive_target_tree_idx,
     time_scale,
+    cancel_token=None,
 ):
     context = context or await asyncio.to_thread(context_for_session, session)
     if context is None:
         raise CSRArtifactError("Artifact session has no readable context")
 
+    node_y = context.reader.layout_y(time_scale)
+
     def render():
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
         with csr_artifact_metrics.timer("shard.read_decode"):
             genealogies = context.reader.trees_at_indices(display_array)
         with csr_artifact_metrics.timer("render.serialize"):
@@ -210,6 +226,8 @@ async def _render_artifact_session(
                 sparsify_cell_size_multiplier=sparsify_cell_size_multiplier,
                 adaptive_sparsify_bbox=adaptive_sparsify_bbox,
                 adaptive_target_tree_idx=adaptive_target_tree_idx,
+                node_y=node_y,
+                cancel_token=cancel_token,
             ), genealogies
 
     (result, genealogies) = await asyncio.to_thread(render)
@@ -221,11 +239,16 @@ async def _render_artifact_session(
         await tree_graph_cache.set(
             session.sid,
             genealogy.tree_index,
-            CompactGenealogyGraph.from_genealogy(
-                genealogy,
-                global_min_time=context.reader.global_min_time,
-                global_max_time=context.reader.global_max_time,
+            LazyCompactGenealogyGraph(
+                context.reader,
+                genealogy.tree_index,
                 time_scale=time_scale,
+                node_y=node_y,
+            ),
+            content_key=artifact_graph_key(
+                context.reader,
+                genealogy.tree_index,
+                time_scale,
             ),
         )
     if actual_display_array is not None:
@@ -237,21 +260,22 @@ async def _render_artifact_session(
 
 
 async def _fallback_artifact_session(session) -> bool:
-    """Switch a failed artifact session to legacy when the source is available."""
+    """Switch a failed artifact session to its source backend when available."""
     artifact_path = session.artifact_path
     if artifact_path:
         artifact_resolver.mark_unhealthy(artifact_path)
         artifact_context_registry.discard(artifact_path)
     if not session.file_path or not Path(session.file_path).is_file():
         return False
-    session.dataset_backend = "legacy"
+    backend = "csv" if is_csv_session_file(session.file_path) else "legacy"
+    session.dataset_backend = backend
     session.artifact_path = None
     session.artifact_fingerprint = None
     session.artifact_format = None
     await session_manager.save_session(session)
     csr_artifact_metrics.increment("fallback.shard_error")
     log_dataset_backend(
-        "legacy",
+        backend,
         session.file_path,
         reason="artifact read failure",
     )
@@ -270,7 +294,14 @@ def register_tree_layout_events(sio):
 
         Uses Socket.IO acknowledgement callback pattern - returns result directly
         instead of emitting to ensure request-response correlation.
+
+        Each request supersedes the previous one from the same socket and
+        session; superseded work is dropped before it starts or stopped
+        between trees, and answered with code REQUEST_SUPERSEDED. Rendering
+        runs in a viewport-priority scheduler slot.
         """
+        channel = None
+        cancel_token = None
         try:
             lorax_sid = data.get("lorax_sid")
             session = await require_session(lorax_sid, sid, sio)
@@ -281,6 +312,9 @@ def register_tree_layout_events(sio):
                 print(f"⚠️ No file loaded for session {lorax_sid}")
                 return {"error": "No file loaded for session", "request_id": data.get("request_id")}
 
+            channel = (lorax_sid, sid)
+            cancel_token = render_generations.begin(channel)
+
             display_array = []
             display_array_raw = data.get("displayArray", [])
             if isinstance(display_array_raw, list):
@@ -335,17 +369,21 @@ def register_tree_layout_events(sio):
             if is_artifact_session(session):
                 try:
                     dataset_context = await resolve_dataset_context(session)
-                    result = await _render_artifact_session(
-                        session,
-                        context=dataset_context,
-                        display_array=display_array,
-                        actual_display_array=actual_display_array,
-                        sparsification=sparsification,
-                        sparsify_cell_size_multiplier=target_sparsify_multiplier,
-                        adaptive_sparsify_bbox=target_sparsify_bbox,
-                        adaptive_target_tree_idx=target_tree_idx,
-                        time_scale=time_scale,
-                    )
+                    async with work_scheduler.slot(VIEWPORT):
+                        result = await _render_artifact_session(
+                            session,
+                            context=dataset_context,
+                            display_array=display_array,
+                            actual_display_array=actual_display_array,
+                            sparsification=sparsification,
+                            sparsify_cell_size_multiplier=target_sparsify_multiplier,
+                            adaptive_sparsify_bbox=target_sparsify_bbox,
+                            adaptive_target_tree_idx=target_tree_idx,
+                            time_scale=time_scale,
+                            cancel_token=cancel_token,
+                        )
+                except RequestCancelled:
+                    raise
                 except CSRArtifactCapabilityError as exc:
                     return {
                         "error": str(exc),
@@ -365,13 +403,9 @@ def register_tree_layout_events(sio):
                 # Resolve legacy/CSV state through the shared dispatcher before
                 # entering the unchanged source-backed renderer.
                 await resolve_dataset_context(session)
-                result = await handle_tree_graph_query(
-                    session.file_path,
-                    display_array,
+                query = dict(
                     sparsification=sparsification,
                     session_id=lorax_sid,
-                    tree_graph_cache=tree_graph_cache,
-                    csv_tree_graph_cache=csv_tree_graph_cache,
                     actual_display_array=actual_display_array,
                     sparsify_cell_size_multiplier=target_sparsify_multiplier,
                     adaptive_sparsify_bbox=target_sparsify_bbox,
@@ -380,6 +414,51 @@ def register_tree_layout_events(sio):
                     time_scale=time_scale,
                 )
 
+                async def render(token):
+                    async with work_scheduler.slot(VIEWPORT):
+                        token.raise_if_cancelled()
+                        if compute_pool.enabled:
+                            # Workers keep their own TreeGraph and render caches;
+                            # superseded jobs are only dropped before submission.
+                            return await compute_pool.submit(
+                                "tree_graph",
+                                session.file_path,
+                                tree_indices=display_array,
+                                **query,
+                            )
+                        return await handle_tree_graph_query(
+                            session.file_path,
+                            display_array,
+                            tree_graph_cache=tree_graph_cache,
+                            csv_tree_graph_cache=csv_tree_graph_cache,
+                            render_cache=render_cache,
+                            cancel_token=token,
+                            **query,
+                        )
+
+                if target_sparsify_bbox is None and target_tree_idx is None:
+                    # Output depends only on the file and these parameters, so
+                    # sessions opening the same view share one render. It is
+                    # cancelled only once every waiting request is superseded.
+                    coalesce_key = request_coalescer.key(
+                        session.file_path,
+                        "tree_graph",
+                        tree_indices=display_array,
+                        sparsification=sparsification,
+                        multiplier=target_sparsify_multiplier,
+                        time_scale=time_scale,
+                    )
+                    shared_token = CancelToken(
+                        lambda: request_coalescer.abandoned(coalesce_key)
+                    )
+                    result = await request_coalescer.do(
+                        coalesce_key,
+                        lambda: render(shared_token),
+                        cancelled=lambda: cancel_token.cancelled,
+                    )
+                else:
+                    result = await render(cancel_token)
+
             if "error" in result:
                 return {"error": result["error"], "request_id": request_id}
             else:
@@ -392,11 +471,22 @@ def register_tree_layout_events(sio):
                     "tree_intervals": result.get("tree_intervals"),
                     "request_id": request_id
                 }
+        except RequestCancelled:
+            render_generations.record_cancelled()
+            return {
+                "error": "Request superseded",
+                "code": "REQUEST_SUPERSEDED",
+                "request_id": data.get("request_id"),
+            }
         except Exception as e:
             print(f"❌ Postorder layout query error: {e}")
             return {"error": str(e), "request_id": data.get("request_id")}
+        finally:
+            if cancel_token is not None:
+                render_generations.finish(channel, cancel_token)
 
     @sio.event
+    @prioritized(BULK)
     async def cache_trees(sid, data):
         """Socket event to pre-cache TreeGraph objects for lineage operations.
 
@@ -421,7 +511,7 @@ def register_tree_layout_events(sio):
             if not session.file_path:
                 return {"error": "No file loaded", "cached_count": 0}
 
-            if is_csv_session_file(session.file_path):
+            if is_csv_session(session):
                 return {"error": "Lineage not supported for CSV", "cached_count": 0}
 
             tree_indices = data.get("tree_indices", [])
@@ -436,11 +526,17 @@ def register_tree_layout_events(sio):
                 )
                 newly_cached = 0
                 for genealogy in genealogies:
+                    content_key = artifact_graph_key(
+                        context.reader,
+                        genealogy.tree_index,
+                    )
                     if await tree_graph_cache.get(
                         lorax_sid,
                         genealogy.tree_index,
-                    ) is None:
-                        newly_cached += 1
+                        content_key=content_key,
+                    ) is not None:
+                        continue
+                    newly_cached += 1
                     await tree_graph_cache.set(
                         lorax_sid,
                         genealogy.tree_index,
@@ -449,6 +545,7 @@ def register_tree_layout_events(sio):
                             global_min_time=context.reader.global_min_time,
                             global_max_time=context.reader.global_max_time,
                         ),
+                        content_key=content_key,
                     )
                 await tree_graph_cache.evict_not_visible(
                     lorax_sid,
@@ -4,7 +4,22 @@ Socket utility functions for Lorax.
 Common helpers shared across socket event handlers.
 """
 
+from typing import Any
+
+from lorax.artifacts.runtime import is_artifact_session
+
 
 def is_csv_session_file(file_path: str | None) -> bool:
     """Check if the session file is a CSV file."""
     return bool(file_path) and str(file_path).lower().endswith(".csv")
+
+
+def is_csv_session(session: Any) -> bool:
+    """Check if the session uses the legacy CSV path.
+
+    CSV files with a published CSR artifact are served through the artifact
+    handlers instead.
+    """
+    if is_artifact_session(session):
+        return False
+    return is_csv_session_file(getattr(session, "file_path", None))
@@ -19,6 +19,7 @@ from numba import njit
 from numba import types
 from numba.typed import Dict
 
+from lorax.cancellation import CancelToken
 from lorax.tree_graph.time_scale import normalize_time_scale, times_to_y
 
 logger = logging.getLogger(__name__)
@@ -230,7 +231,7 @@ def _resolve_adaptive_inside_cell_size(
         )
     return inside_cell_size
 
-@njit(cache=True)
+@njit(cache=True, nogil=True)
 def _compute_x_postorder(children_indptr, children_data, roots, num_nodes):
     """
     Numba-compiled post-order traversal for computing x (layout) coordinates.
@@ -336,6 +337,19 @@ class TreeGraph:
         """Get the x (layout) coordinate for a node."""
         return self.x[node_id] if node_id >= 0 and node_id < len(self.x) else 0.5
 
+    @property
+    def nbytes(self) -> int:
+        """Total bytes held by the graph's arrays."""
+        return int(
+            self.parent.nbytes
+            + self.time.nbytes
+            + self.children_indptr.nbytes
+            + self.children_data.nbytes
+            + self.x.nbytes
+            + self.y.nbytes
+            + self.in_tree.nbytes
+        )
+
     def to_pyarrow(self, tree_idx: int = 0) -> bytes:
         """
         Serialize TreeGraph to PyArrow IPC format for frontend rendering.
@@ -691,6 +705,7 @@ def construct_trees_batch(
     adaptive_target_tree_idx: Optional[int] = None,
     adaptive_outside_cell_size: Optional[float] = None,
     time_scale: str = "linear",
+    cancel_token: Optional[CancelToken] = None,
 ) -> Tuple[bytes, float, float, List[int], dict]:
     """
     Construct multiple trees and return combined PyArrow buffer.
@@ -710,11 +725,16 @@ def construct_trees_batch(
         adaptive_target_tree_idx: Optional target tree index for adaptive in-bbox densification.
         adaptive_outside_cell_size: Legacy outside override (kept for API compatibility).
         time_scale: Time coordinate scale for emitted y coordinates ("linear" or "log").
+        cancel_token: Optional CancelToken checked before each tree; raises
+            RequestCancelled once the request is superseded.
 
     Returns:
         Tuple of (buffer, global_min_time, global_max_time, tree_indices, newly_built_graphs)
         where newly_built_graphs is a dict mapping tree_idx -> TreeGraph for trees constructed
     """
+    if cancel_token is not None:
+        cancel_token.raise_if_cancelled()
+
     # Pre-extract tables for reuse
     edges = ts.tables.edges
     nodes = ts.tables.nodes
@@ -902,6 +922,8 @@ def construct_trees_batch(
                 target_cached_graph.last_outside_cell_size = float(outside_cell_size)
 
     def process_one(tidx):
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
         return _process_single_tree(
             ts,
             tidx,
@@ -1166,7 +1188,7 @@ def construct_trees_batch(
     return combined, min_time, max_time, processed_indices, newly_built_graphs
 
 
-@njit(cache=True)
+@njit(cache=True, nogil=True)
 def _sparsify_mutations(mut_x, mut_y, mut_tree_idx, mut_node_id, resolution):
     """
     Grid-deduplicate mutations by (mut_x, mut_y) per tree.
@@ -1206,7 +1228,7 @@ def _sparsify_mutations(mut_x, mut_y, mut_tree_idx, mut_node_id, resolution):
     return keep
 
 
-@njit(cache=True)
+@njit(cache=True, nogil=True)
 def _sparsify_mutations_adaptive(
     mut_x,
     mut_y,
@@ -1263,7 +1285,7 @@ def _sparsify_mutations_adaptive(
     return keep
 
 
-@njit(cache=True)
+@njit(cache=True, nogil=True)
 def _force_keep_unary_nodes_and_anchors(keep_mask, parent_local, original_unary_mask):
     """
     Preserve original unary nodes through sparsification.
@@ -1296,7 +1318,7 @@ def _force_keep_unary_nodes_and_anchors(keep_mask, parent_local, original_unary_
     return result, forced_mask
 
 
-@njit(cache=True)
+@njit(cache=True, nogil=True)
 def _collapse_degree1_nodes(node_ids, parent_ids, is_tip, x, y, parent_local, preserve_mask, n):
     """
     Collapse degree-1 (single-child) internal nodes after sparsification.
@@ -1365,7 +1387,7 @@ def _collapse_degree1_nodes(node_ids, parent_ids, is_tip, x, y, parent_local, pr
     return kept_node_ids, kept_parent_ids, kept_is_tip, kept_x, kept_y, kept_count
 
 
-@njit(cache=True)
+@njit(cache=True, nogil=True)
 def _build_parent_local(node_ids, parent_ids, n):
     """
     Build local parent index mapping using a hash map (O(n) instead of O(n log n) sort).
@@ -1393,7 +1415,7 @@ def _build_parent_local(node_ids, parent_ids, n):
     return parent_local
 
 
-@njit(cache=True)
+@njit(cache=True, nogil=True)
 def _sparsify_edges(x, y, parent_indices, resolution, use_midpoint_only=False):
     """
     Edge-centric sparsification: grid-deduplicate edges by midpoint position.
@@ -1485,7 +1507,7 @@ def _sparsify_edges(x, y, parent_indices, resolution, use_midpoint_only=False):
     return keep
 
 
-@njit(cache=True)
+@njit(cache=True, nogil=True)
 def _sparsify_edges_adaptive(
     x,
     y,
@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-"""Preprocess a TreeSequence into a random-access Lorax CSR artifact."""
+"""Preprocess a TreeSequence or tree CSV into a random-access Lorax CSR artifact."""
 
 from __future__ import annotations
 
@@ -16,11 +16,16 @@ if str(BACKEND_DIRECTORY) not in sys.path:
 
 with contextlib.redirect_stdout(sys.stderr):
     from lorax.artifacts.csr_builder import (  # noqa: E402
+        DEFAULT_SAMPLE_TIP_ORDER_MAX_MB,
         DEFAULT_TARGET_SHARD_MB,
         DEFAULT_TREES_PER_RANGE,
         build_csr_artifact,
     )
-    from lorax.artifacts.csr_reader import CSRArtifactReader  # noqa: E402
+    from lorax.artifacts.csr_reader import (  # noqa: E402
+        DEFAULT_VERIFY_SAMPLE_RATE,
+        CSRArtifactReader,
+    )
+    from lorax.artifacts.csv_builder import build_csv_csr_artifact  # noqa: E402
 
 
 def _positive_int(value: str) -> int:
@@ -30,12 +35,25 @@ def _positive_int(value: str) -> int:
     return parsed
 
 
+def _positive_int_or_auto(value: str) -> int | str:
+    if value.lower() == "auto":
+        return "auto"
+    return _positive_int(value)
+
+
+def _unit_fraction(value: str) -> float:
+    parsed = float(value)
+    if not 0.0 <= parsed <= 1.0:
+        raise argparse.ArgumentTypeError("value must be between 0 and 1")
+    return parsed
+
+
 def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description=(
-            "Convert every genealogy in a .trees or .tsz TreeSequence into "
-            "compressed, indexed CSR shards stored at <input>.artifact for "
-            "future Lorax loading."
+            "Convert every genealogy in a .trees or .tsz TreeSequence, or "
+            "every Newick row in a tree .csv, into compressed, indexed CSR "
+            "shards stored at <input>.artifact for future Lorax loading."
         ),
         formatter_class=argparse.ArgumentDefaultsHelpFormatter,
     )
@@ -53,15 +71,27 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     )
     parser.add_argument(
         "--workers",
-        type=_positive_int,
+        type=_positive_int_or_auto,
         default=1,
-        help="Worker processes for contiguous genealogy ranges",
+        help=(
+            "Worker processes for contiguous genealogy ranges, or 'auto' to "
+            "fit the count to the memory limit"
+        ),
     )
     parser.add_argument(
         "--trees-per-range",
-        type=_positive_int,
+        type=_positive_int_or_auto,
         default=DEFAULT_TREES_PER_RANGE,
-        help="Genealogies assigned to each resumable worker range",
+        help="Genealogies assigned to each resumable worker range, or 'auto'",
+    )
+    parser.add_argument(
+        "--memory-limit-mb",
+        type=_positive_int,
+        default=None,
+        help=(
+            "Resident memory budget for the build and its workers; defaults "
+            "to the builder's RSS plus most of the available memory"
+        ),
     )
     parser.add_argument(
         "--skip-node-tree-ranges",
@@ -71,6 +101,31 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
             "all other v3 features"
         ),
     )
+    parser.add_argument(
+        "--skip-sample-tip-order",
+        action="store_true",
+        help=(
+            "Skip the optional per-tree sample tip-order index used for fast "
+            "highlight positions"
+        ),
+    )
+    parser.add_argument(
+        "--sample-tip-order-max-mb",
+        type=_positive_int,
+        default=DEFAULT_SAMPLE_TIP_ORDER_MAX_MB,
+        help=(
+            "Skip the sample tip-order index when its trees x samples matrix "
+            "would be larger than this"
+        ),
+    )
+    parser.add_argument(
+        "--precompute-layout-y",
+        action="store_true",
+        help=(
+            "Store per-node y coordinates for every time scale so renders "
+            "gather instead of recomputing them"
+        ),
+    )
     parser.add_argument(
         "--force",
         action="store_true",
@@ -84,7 +139,24 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     parser.add_argument(
         "--verify",
         action="store_true",
-        help="Hash and validate every output file after the build",
+        help=(
+            "Hash every output file and decode a per-shard sample of "
+            "genealogies after the build"
+        ),
+    )
+    parser.add_argument(
+        "--verify-sample-rate",
+        type=_unit_fraction,
+        default=DEFAULT_VERIFY_SAMPLE_RATE,
+        help="Fraction of genealogies in each shard decoded by --verify",
+    )
+    parser.add_argument(
+        "--verify-incremental",
+        action="store_true",
+        help=(
+            "Skip shards the manifest records as already verified and record "
+            "newly verified shards"
+        ),
     )
     return parser.parse_args(argv)
 
@@ -96,20 +168,37 @@ def main(argv: list[str] | None = None) -> int:
         print(json.dumps(event, sort_keys=True), file=sys.stderr, flush=True)
 
     try:
-        result = build_csr_artifact(
-            args.input_path,
-            target_shard_mb=args.target_shard_mb,
-            compression=args.compression,
-            workers=args.workers,
-            trees_per_range=args.trees_per_range,
-            skip_node_tree_ranges=args.skip_node_tree_ranges,
-            force=args.force,
-            resume=not args.no_resume,
-            progress=report_progress,
-        )
+        if args.input_path.suffix.lower() == ".csv":
+            result = build_csv_csr_artifact(
+                args.input_path,
+                target_shard_mb=args.target_shard_mb,
+                compression=args.compression,
+                skip_node_tree_ranges=args.skip_node_tree_ranges,
+                force=args.force,
+                progress=report_progress,
+            )
+        else:
+            result = build_csr_artifact(
+                args.input_path,
+                target_shard_mb=args.target_shard_mb,
+                compression=args.compression,
+                workers=args.workers,
+                trees_per_range=args.trees_per_range,
+                memory_limit_mb=args.memory_limit_mb,
+                skip_node_tree_ranges=args.skip_node_tree_ranges,
+                skip_sample_tip_order=args.skip_sample_tip_order,
+                sample_tip_order_max_mb=args.sample_tip_order_max_mb,
+                precompute_layout_y=args.precompute_layout_y,
+                force=args.force,
+                resume=not args.no_resume,
+                progress=report_progress,
+            )
         if args.verify:
             with CSRArtifactReader.open(result["artifact_dir"]) as reader:
-                result["verification"] = reader.verify()
+                result["verification"] = reader.verify(
+                    sample_rate=args.verify_sample_rate,
+                    incremental=args.verify_incremental,
+                )
         print(
             json.dumps(
                 {
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Compare disk cache eviction policies by replaying an access trace.
+
+A trace is a CSV with ``key,size_bytes`` rows (one per file request, in
+order). Without --trace, a synthetic trace is generated: Zipf-distributed
+requests over many small project files interleaved with occasional large
+one-off uploads.
+
+Usage:
+    python simulate_disk_cache_eviction.py --capacity-gb 10
+    python simulate_disk_cache_eviction.py --trace access_log.csv --capacity-gb 50
+"""
+
+import argparse
+import csv
+import json
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from lorax.cache.eviction import EVICTION_POLICIES, compare_policies  # noqa: E402
+
+GB = 1024 * 1024 * 1024
+MB = 1024 * 1024
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Replay an access trace against each disk cache eviction policy.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--trace", type=str, default=None, help="CSV of key,size_bytes rows")
+    parser.add_argument("--capacity-gb", type=float, default=10.0)
+    parser.add_argument("--high-watermark", type=float, default=0.95)
+    parser.add_argument("--low-watermark", type=float, default=0.85)
+    parser.add_argument(
+        "--policies",
+        type=str,
+        default=",".join(EVICTION_POLICIES),
+        help="Comma-separated policy names",
+    )
+    parser.add_argument("--requests", type=int, default=20000, help="Synthetic trace length")
+    parser.add_argument("--files", type=int, default=500, help="Synthetic project files")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    return parser.parse_args()
+
+
+def load_trace(path: str) -> list[tuple[str, int]]:
+    with open(path, newline="") as f:
+        return [(row["key"], int(row["size_bytes"])) for row in csv.DictReader(f)]
+
+
+def synthetic_trace(num_requests: int, num_files: int, seed: int) -> list[tuple[str, int]]:
+    rng = random.Random(seed)
+    sizes = {f"project/{i}.trees.tsz": rng.randint(20 * MB, 400 * MB) for i in range(num_files)}
+    keys = list(sizes)
+    weights = [1.0 / (rank + 1) for rank in range(num_files)]
+    trace = []
+    for i in range(num_requests):
+        if rng.random() < 0.01:
+            trace.append((f"Uploads/one-off-{i}.trees", rng.randint(2 * GB, 6 * GB)))
+        else:
+            key = rng.choices(keys, weights)[0]
+            trace.append((key, sizes[key]))
+    return trace
+
+
+def main() -> None:
+    args = parse_args()
+    trace = (
+        load_trace(args.trace)
+        if args.trace
+        else synthetic_trace(args.requests, args.files, args.seed)
+    )
+    results = compare_policies(
+        trace,
+        int(args.capacity_gb * GB),
+        policies=[name.strip() for name in args.policies.split(",") if name.strip()],
+        high_watermark=args.high_watermark,
+        low_watermark=args.low_watermark,
+    )
+    if args.json:
+        print(json.dumps([result.to_dict() for result in results], indent=2))
+        return
+    print(f"{'policy':<8} {'hit rate':>9} {'GB fetched':>11} {'evictions':>10}")
+    for result in results:
+        print(
+            f"{result.policy:<8} {result.hit_rate:>9.3f} "
+            f"{result.bytes_fetched / GB:>11.1f} {result.evictions:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
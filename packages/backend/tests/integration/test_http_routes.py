@@ -7,6 +7,7 @@ Tests all 8 HTTP endpoints:
 - POST /init-session
 - GET /projects
 - GET /memory_status
+- GET /metrics
 - GET /{file}
 - POST /upload
 - GET /favicon.ico
@@ -159,6 +160,26 @@ class TestMemoryStatusEndpoint:
         assert isinstance(data["pid"], int)
 
 
+class TestMetricsEndpoint:
+    """Tests for the /metrics endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_metrics_in_prometheus_text_format(self, async_client):
+        """Test /metrics exposes histograms, cache counters and loader state."""
+        await async_client.get("/memory_status")
+        response = await async_client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        body = response.text
+        assert "# TYPE lorax_socket_event_duration_seconds histogram" in body
+        assert "# TYPE lorax_stage_duration_seconds histogram" in body
+        assert 'lorax_cache_hits_total{cache="file"}' in body
+        assert 'lorax_cache_evictions_total{cache="tree_graph"}' in body
+        assert "lorax_load_in_system 0" in body
+        assert 'lorax_work_queued{priority="interactive"}' in body
+
+
 class TestFileEndpoint:
     """Tests for the /{file} endpoint."""
 
@@ -357,6 +357,209 @@ class TestLoadFileEvent:
         assert len(emitted) == 2
         assert any(evt["data"]["ok"] is False and evt["data"]["code"] == "SERVER_BUSY" for evt in emitted)
 
+    @pytest.mark.asyncio
+    async def test_load_file_waits_for_memory_and_reports_queue_position(
+        self, socket_harness, mock_sio, session_manager_memory, temp_dir
+    ):
+        from lorax.sockets import register_socket_events
+        from lorax.sockets.load_scheduler import LoadScheduler, MemoryAdmission
+
+        sessions = [await session_manager_memory.create_session() for _ in range(2)]
+        file_path = temp_dir / "Uploads" / "big.trees"
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text("not-a-real-tree")
+
+        loading = []
+
+        async def _slow_upload(*args, **kwargs):
+            loading.append(len(loading))
+            await asyncio.sleep(0.1)
+            return SimpleNamespace(config={"initial_position": [0, 1], "times": {"values": [0, 1]}})
+
+        memory = MemoryAdmission(ceiling_bytes=1_000, poll_interval_sec=0.01, rss_bytes=lambda: 100)
+        scheduler = LoadScheduler(max_concurrency=2, max_queue=0, queue_timeout_sec=5, memory=memory)
+
+        with (
+            patch("lorax.sockets.file_ops.session_manager", session_manager_memory),
+            patch("lorax.sockets.connection.session_manager", session_manager_memory),
+            patch("lorax.sockets.file_ops.UPLOAD_DIR", temp_dir),
+            patch("lorax.sockets.file_ops.BUCKET_NAME", None),
+            patch("lorax.sockets.file_ops.handle_upload", new=_slow_upload),
+            patch("lorax.sockets.file_ops.estimate_load_bytes", AsyncMock(return_value=600)),
+            patch("lorax.sockets.file_ops.load_scheduler", scheduler),
+        ):
+            register_socket_events(mock_sio)
+            handler = socket_harness._event_handlers["load_file"]
+            first = asyncio.create_task(handler(
+                "socket-1",
+                {"lorax_sid": sessions[0].sid, "project": "Uploads", "file": "big.trees", "request_id": 1},
+            ))
+            await asyncio.sleep(0.02)
+            second = asyncio.create_task(handler(
+                "socket-2",
+                {"lorax_sid": sessions[1].sid, "project": "Uploads", "file": "big.trees", "request_id": 2},
+            ))
+            await asyncio.sleep(0.05)
+            # 100 B RSS + 600 B reserved + 600 B estimate exceeds the 1000 B ceiling.
+            assert len(loading) == 1
+            assert (await scheduler.get_state())["memory_waiting"] == 1
+
+            results = await asyncio.gather(first, second)
+            assert [result["ok"] for result in results] == [True, True]
+            queued = [
+                evt for evt in socket_harness.get_emitted("status")
+                if evt["data"]["status"] == "queued"
+            ]
+            assert len(queued) == 1
+            assert queued[0]["to"] == "socket-2"
+            assert queued[0]["data"]["reason"] == "memory"
+            assert queued[0]["data"]["queue_position"] == 1
+            assert (await scheduler.get_counters())["load_file_memory_queued"] == 1
+            assert (await scheduler.get_state())["memory_reserved_bytes"] == 0
+
+    @pytest.mark.asyncio
+    async def test_lone_load_checks_memory_at_default_concurrency(
+        self, socket_harness, mock_sio, session_manager_memory, temp_dir
+    ):
+        from lorax.sockets import register_socket_events
+        from lorax.sockets.load_scheduler import LoadScheduler, MemoryAdmission
+
+        sessions = [await session_manager_memory.create_session() for _ in range(3)]
+        file_path = temp_dir / "Uploads" / "big.trees"
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text("not-a-real-tree")
+
+        rss = [1_100]
+        reclaimable = [300]
+
+        def reclaim(nbytes):
+            freed, reclaimable[0] = reclaimable[0], 0
+            rss[0] -= freed
+            return freed
+
+        release = asyncio.Event()
+
+        async def _upload(*args, **kwargs):
+            await release.wait()
+            return SimpleNamespace(config={"initial_position": [0, 1], "times": {"values": [0, 1]}})
+
+        upload = AsyncMock(side_effect=_upload)
+        memory = MemoryAdmission(
+            ceiling_bytes=1_200, poll_interval_sec=0.01,
+            rss_bytes=lambda: rss[0], reclaim=reclaim,
+        )
+        scheduler = LoadScheduler(queue_timeout_sec=5, memory=memory)
+        assert scheduler.max_concurrency == 1
+
+        with (
+            patch("lorax.sockets.file_ops.session_manager", session_manager_memory),
+            patch("lorax.sockets.connection.session_manager", session_manager_memory),
+            patch("lorax.sockets.file_ops.UPLOAD_DIR", temp_dir),
+            patch("lorax.sockets.file_ops.BUCKET_NAME", None),
+            patch("lorax.sockets.file_ops.handle_upload", new=upload),
+            patch("lorax.sockets.file_ops.estimate_load_bytes", AsyncMock(return_value=200)),
+            patch("lorax.sockets.file_ops.load_scheduler", scheduler),
+        ):
+            register_socket_events(mock_sio)
+            handler = socket_harness._event_handlers["load_file"]
+
+            def load(i):
+                return asyncio.create_task(handler(
+                    f"socket-{i}",
+                    {"lorax_sid": sessions[i].sid, "project": "Uploads", "file": "big.trees"},
+                ))
+
+            # 1100 B RSS + 200 B does not fit even alone: cached files are
+            # evicted first, bringing RSS to 800 B.
+            first = load(0)
+            await asyncio.sleep(0.05)
+            assert upload.await_count == 1
+            assert memory.reclaimed_bytes == 300
+
+            # Memory is reserved before the worker slot: the second load
+            # holds its 200 B while queued behind the first.
+            second = load(1)
+            await asyncio.sleep(0.05)
+            state = await scheduler.get_state()
+            assert state["memory_reserved_bytes"] == 400
+            assert upload.await_count == 1
+
+            # 800 + 400 + 200 exceeds the ceiling and nothing is left to
+            # evict, so the third load queues for memory.
+            third = load(2)
+            await asyncio.sleep(0.05)
+            assert (await scheduler.get_state())["memory_waiting"] == 1
+
+            release.set()
+            results = await asyncio.gather(first, second, third)
+            assert [result["ok"] for result in results] == [True, True, True]
+            assert upload.await_count == 3
+            reasons = [
+                (evt["to"], evt["data"]["reason"])
+                for evt in socket_harness.get_emitted("status")
+                if evt["data"]["status"] == "queued"
+            ]
+            assert ("socket-1", "concurrency") in reasons
+            assert ("socket-2", "memory") in reasons
+            assert (await scheduler.get_state())["memory_reserved_bytes"] == 0
+
+    @pytest.mark.asyncio
+    async def test_memory_wait_stops_reclaiming_when_rss_does_not_drop(self):
+        from lorax.sockets.load_scheduler import LoadQueueTimeoutError, MemoryAdmission
+
+        calls = []
+
+        def reclaim(nbytes):
+            calls.append(nbytes)
+            return 300
+
+        memory = MemoryAdmission(
+            ceiling_bytes=1_000, poll_interval_sec=0.01,
+            rss_bytes=lambda: 900, reclaim=reclaim,
+        )
+        with pytest.raises(LoadQueueTimeoutError):
+            async with memory.reserve(200, timeout_sec=0.1):
+                pass
+
+        # Evicting freed bytes but RSS stayed put: no further evictions.
+        assert calls == [100]
+        assert memory.reclaimed_bytes == 300
+
+    @pytest.mark.asyncio
+    async def test_load_file_over_memory_ceiling_is_rejected(
+        self, socket_harness, mock_sio, session_manager_memory, temp_dir
+    ):
+        from lorax.sockets import register_socket_events
+        from lorax.sockets.load_scheduler import LoadScheduler, MemoryAdmission
+
+        session = await session_manager_memory.create_session()
+        file_path = temp_dir / "Uploads" / "huge.trees"
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text("x" * 1_000)
+        upload = AsyncMock()
+
+        scheduler = LoadScheduler(memory=MemoryAdmission(ceiling_bytes=1_000))
+
+        with (
+            patch("lorax.sockets.file_ops.session_manager", session_manager_memory),
+            patch("lorax.sockets.connection.session_manager", session_manager_memory),
+            patch("lorax.sockets.file_ops.UPLOAD_DIR", temp_dir),
+            patch("lorax.sockets.file_ops.BUCKET_NAME", None),
+            patch("lorax.sockets.file_ops.handle_upload", new=upload),
+            patch("lorax.sockets.file_ops.load_scheduler", scheduler),
+        ):
+            register_socket_events(mock_sio)
+            result = await socket_harness._event_handlers["load_file"](
+                "socket-1",
+                {"lorax_sid": session.sid, "project": "Uploads", "file": "huge.trees"},
+            )
+
+        assert result["ok"] is False
+        assert result["code"] == "FILE_TOO_LARGE"
+        assert result["recoverable"] is False
+        upload.assert_not_awaited()
+        assert (await scheduler.get_counters())["load_file_too_large"] == 1
+
     @pytest.mark.asyncio
     async def test_artifact_without_node_ranges_keeps_non_position_features(
         self,
@@ -906,6 +1109,111 @@ class TestProcessPostorderLayout:
         assert first_kwargs["sparsification"] is True
         assert second_kwargs["sparsification"] is True
 
+    @pytest.mark.asyncio
+    async def test_postorder_coalesces_identical_requests_across_sessions(
+        self, socket_harness, mock_sio, session_manager_memory, minimal_ts_file
+    ):
+        """Sessions requesting the same view share one in-flight render."""
+        from lorax.context import request_coalescer
+        from lorax.sockets import register_socket_events
+
+        sessions = []
+        for _ in range(3):
+            session = await session_manager_memory.create_session()
+            session.file_path = str(minimal_ts_file)
+            await session_manager_memory.save_session(session)
+            sessions.append(session)
+
+        async def slow_query(*args, **kwargs):
+            await asyncio.sleep(0.05)
+            return {
+                "buffer": b"\x00\x01",
+                "global_min_time": 0.0,
+                "global_max_time": 1.0,
+                "tree_indices": [0, 1],
+            }
+
+        mock_query = AsyncMock(side_effect=slow_query)
+        before = request_coalescer.get_stats()["operations"].get("tree_graph", {}).get("coalesced", 0)
+
+        with (
+            patch("lorax.sockets.decorators.session_manager", session_manager_memory),
+            patch("lorax.sockets.tree_layout.session_manager", session_manager_memory),
+            patch("lorax.sockets.tree_layout.handle_tree_graph_query", mock_query),
+        ):
+            register_socket_events(mock_sio)
+            handler = socket_harness._event_handlers["process_postorder_layout"]
+            results = await asyncio.gather(*(
+                handler(
+                    f"socket-{i}",
+                    {"lorax_sid": session.sid, "displayArray": [0, 1], "request_id": f"r{i}"},
+                )
+                for i, session in enumerate(sessions)
+            ))
+
+        assert mock_query.await_count == 1
+        assert [result["request_id"] for result in results] == ["r0", "r1", "r2"]
+        assert all(result["buffer"] == b"\x00\x01" for result in results)
+        after = request_coalescer.get_stats()["operations"]["tree_graph"]["coalesced"]
+        assert after - before == 2
+
+    @pytest.mark.asyncio
+    async def test_postorder_newer_request_cancels_superseded_render(
+        self, socket_harness, mock_sio, session_manager_memory, minimal_ts_file
+    ):
+        """A newer layout request from the same socket cancels the older one."""
+        from lorax.context import render_generations
+        from lorax.sockets import register_socket_events
+
+        session = await session_manager_memory.create_session()
+        session.file_path = str(minimal_ts_file)
+        await session_manager_memory.save_session(session)
+
+        first_started = asyncio.Event()
+
+        async def cooperative_query(file_path, tree_indices, cancel_token=None, **kwargs):
+            if tree_indices == [0]:
+                first_started.set()
+                for _ in range(200):
+                    cancel_token.raise_if_cancelled()
+                    await asyncio.sleep(0.01)
+            return {
+                "buffer": b"\x00\x01",
+                "global_min_time": 0.0,
+                "global_max_time": 1.0,
+                "tree_indices": tree_indices,
+            }
+
+        before = render_generations.get_stats()["cancelled"]
+
+        with (
+            patch("lorax.sockets.decorators.session_manager", session_manager_memory),
+            patch("lorax.sockets.tree_layout.session_manager", session_manager_memory),
+            patch(
+                "lorax.sockets.tree_layout.handle_tree_graph_query",
+                AsyncMock(side_effect=cooperative_query),
+            ),
+        ):
+            register_socket_events(mock_sio)
+            handler = socket_harness._event_handlers["process_postorder_layout"]
+            stale = asyncio.create_task(
+                handler("socket-1", {"lorax_sid": session.sid, "displayArray": [0], "request_id": 1})
+            )
+            await first_started.wait()
+            latest = await handler(
+                "socket-1", {"lorax_sid": session.sid, "displayArray": [1], "request_id": 2}
+            )
+            stale = await asyncio.wait_for(stale, timeout=1.0)
+
+        assert latest["request_id"] == 2
+        assert latest["buffer"] == b"\x00\x01"
+        assert stale == {
+            "error": "Request superseded",
+            "code": "REQUEST_SUPERSEDED",
+            "request_id": 1,
+        }
+        assert render_generations.get_stats()["cancelled"] == before + 1
+
     @pytest.mark.asyncio
     async def test_postorder_lock_view_single_tree_forces_non_sparse(
         self, socket_harness, mock_sio, session_manager_memory, minimal_ts_file
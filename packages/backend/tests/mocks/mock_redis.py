@@ -15,15 +15,19 @@ class MockRedis:
     In-memory Redis mock for testing.
 
     Implements the subset of redis.asyncio API used by Lorax:
-    - get, set, setex, delete
+    - get, mget, set, setex, delete
     - ping
     - eval (for Lua scripts)
+    - publish, pubsub (subscribe/listen)
+    - pipeline (queued set/setex, one execute)
     """
 
     def __init__(self):
         self._data: Dict[str, Any] = {}
         self._expiry: Dict[str, float] = {}
         self._lock = asyncio.Lock()
+        self._subscribers: Dict[str, list] = {}
+        self.pipeline_executions = 0
 
     async def ping(self) -> bool:
         """Simulate Redis ping."""
@@ -40,6 +44,12 @@ class MockRedis:
                     return None
             return self._data.get(key)
 
+    async def mget(self, keys, *args) -> list:
+        """Get several values at once (None for missing or expired keys)."""
+        if isinstance(keys, str):
+            keys = [keys, *args]
+        return [await self.get(key) for key in keys]
+
     async def set(
         self,
         key: str,
@@ -114,6 +124,19 @@ class MockRedis:
 
         return 0
 
+    async def publish(self, channel: str, message: str) -> int:
+        """Deliver a message to current subscribers; returns the receiver count."""
+        queues = list(self._subscribers.get(channel, ()))
+        for queue in queues:
+            queue.put_nowait({"type": "message", "channel": channel, "data": message})
+        return len(queues)
+
+    def pubsub(self) -> "MockPubSub":
+        return MockPubSub(self)
+
+    def pipeline(self, transaction: bool = True) -> "MockPipeline":
+        return MockPipeline(self)
+
     async def keys(self, pattern: str = "*") -> list:
         """Get keys matching pattern (simplified: supports * and prefix*)."""
         async with self._lock:
@@ -143,6 +166,68 @@ class MockRedis:
         self._data[key] = value
 
 
+class MockPipeline:
+    """Queues commands and runs them in order on ``execute``."""
+
+    def __init__(self, redis: MockRedis):
+        self._redis = redis
+        self._commands: list = []
+
+    def set(self, *args, **kwargs) -> "MockPipeline":
+        self._commands.append(("set", args, kwargs))
+        return self
+
+    def setex(self, *args, **kwargs) -> "MockPipeline":
+        self._commands.append(("setex", args, kwargs))
+        return self
+
+    async def execute(self) -> list:
+        commands, self._commands = self._commands, []
+        self._redis.pipeline_executions += 1
+        return [
+            await getattr(self._redis, name)(*args, **kwargs)
+            for name, args, kwargs in commands
+        ]
+
+
+class MockPubSub:
+    """Subset of redis.asyncio PubSub: subscribe, listen, unsubscribe, aclose."""
+
+    def __init__(self, redis: MockRedis):
+        self._redis = redis
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._channels: list = []
+
+    async def subscribe(self, *channels: str) -> None:
+        for channel in channels:
+            self._redis._subscribers.setdefault(channel, []).append(self._queue)
+            self._channels.append(channel)
+            self._queue.put_nowait({"type": "subscribe", "channel": channel, "data": 1})
+
+    async def unsubscribe(self, *channels: str) -> None:
+        for channel in channels or list(self._channels):
+            subscribers = self._redis._subscribers.get(channel, [])
+            if self._queue in subscribers:
+                subscribers.remove(self._queue)
+            if channel in self._channels:
+                self._channels.remove(channel)
+
+    async def listen(self):
+        while True:
+            message = await self._queue.get()
+            if isinstance(message, BaseException):
+                raise message
+            yield message
+
+    async def aclose(self) -> None:
+        await self.unsubscribe()
+
+    # For testing convenience
+    def _disconnect(self, error: BaseException) -> None:
+        """Make listen() raise as if the connection dropped."""
+        self._queue.put_nowait(error)
+
+
 class MockRedisManager:
     """Mock Socket.IO Redis manager for testing."""
 
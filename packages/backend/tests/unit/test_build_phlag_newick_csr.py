@@ -0,0 +1,129 @@
+import gzip
+import importlib.util
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+
+SCRIPT_PATH = (
+    Path(__file__).resolve().parents[4]
+    / "scripts"
+    / "build_phlag_newick_csr.py"
+)
+
+NEWICKS = [
+    "((A:1,B:2.5):0.5,(C:1e-3,(D:0.25,E:0.75):1):2);",
+    "((B:1,A:1)0.95:1,C:3,D : 2 ,E);",
+    "(A:0.1,(B,(C:1,D:1)inner:+1.5E0):0.2)root:4;",
+    "A;",
+]
+
+
+def load_script_module():
+    spec = importlib.util.spec_from_file_location(
+        "build_phlag_newick_csr", SCRIPT_PATH
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def write_sources(directory: Path, newicks: list[str]) -> tuple[Path, Path]:
+    directory.mkdir(parents=True, exist_ok=True)
+    trees = directory / "trees.nwk.gz"
+    positions = directory / "positions.txt.gz"
+    with gzip.open(trees, "wt", encoding="utf-8") as handle:
+        handle.write("\n".join(newicks) + "\n")
+    with gzip.open(positions, "wt", encoding="utf-8") as handle:
+        handle.write("\n".join(str(index * 1000) for index in range(len(newicks))))
+    return trees, positions
+
+
+@pytest.mark.parametrize("newick", NEWICKS)
+def test_tokenizer_matches_ete3_parse(newick):
+    from ete3 import Tree
+
+    module = load_script_module()
+    tree = module.tokenize_newick(newick)
+    expected = Tree(newick, format=1)
+    preorder = list(expected.traverse("preorder"))
+    position = {node: offset for offset, node in enumerate(preorder)}
+
+    assert tree.leaf_names == [node.name for node in expected.iter_leaves()]
+    assert tree.parent.tolist() == [
+        -1 if node.up is None else position[node.up] for node in preorder
+    ]
+    assert tree.is_leaf.tolist() == [node.is_leaf() for node in preorder]
+    np.testing.assert_array_equal(
+        tree.branch_length[1:],
+        [node.dist for node in preorder[1:]],
+    )
+    internal_postorder = [
+        position[node]
+        for node in expected.traverse("postorder")
+        if not node.is_leaf()
+    ]
+    assert [
+        int(np.flatnonzero(tree.internal_rank == rank)[0])
+        for rank in range(len(internal_postorder))
+    ] == internal_postorder
+    assert module.newick_leaf_names(newick) == tree.leaf_names
+
+
+@pytest.mark.parametrize(
+    "newick",
+    ["(A,);", "(A,B));", "(A:x,B);", "(A:.5,B);", "(A,B)"],
+)
+def test_tokenizer_rejects_malformed_newick(newick):
+    module = load_script_module()
+    with pytest.raises(ValueError):
+        module.tokenize_newick(newick)
+
+
+def test_parallel_build_is_byte_identical_to_serial(tmp_path):
+    module = load_script_module()
+    newicks = [NEWICKS[index % 3] for index in range(40)]
+
+    sample_ids: dict[str, int] = {}
+    for tree_index, newick in enumerate(newicks[:3]):
+        record, _height, node_count, _edges = module.newick_record_batch(
+            newick,
+            tree_index,
+            0.0,
+            1.0,
+            sample_ids,
+        )
+        assert module.record_nbytes(node_count) == record.nbytes
+
+    # ~2 KiB shards split the 40 trees across more shards than the parallel
+    # build keeps in flight, so shards are planned ahead and collected out of
+    # order.
+    artifacts = {}
+    for workers in (1, 2):
+        trees, positions = write_sources(tmp_path / f"workers-{workers}", newicks)
+        result = module.build_chromosome(
+            tmp_path,
+            "chr1",
+            final_window_bp=500,
+            target_shard_mb=2 / 1024,
+            compression="zstd",
+            force=False,
+            limit=None,
+            trees_path=trees,
+            positions_path=positions,
+            workers=workers,
+        )
+        artifacts[workers] = Path(result["artifact_dir"])
+        assert result["num_trees"] == len(newicks)
+
+    serial, parallel = artifacts[1], artifacts[2]
+    names = sorted(path.name for path in serial.iterdir())
+    assert names == sorted(path.name for path in parallel.iterdir())
+    shard_files = [name for name in names if name.startswith("csr-")]
+    assert len(shard_files) > 4, shard_files
+    for name in names:
+        if name != "manifest.json":
+            assert (serial / name).read_bytes() == (parallel / name).read_bytes()
@@ -0,0 +1,91 @@
+"""
+Unit tests for cancellation of superseded requests.
+"""
+
+import asyncio
+
+import pytest
+
+
+class TestRequestGenerations:
+    def test_newer_request_cancels_older_on_same_channel(self):
+        from lorax.cancellation import RequestCancelled, RequestGenerations
+
+        generations = RequestGenerations()
+        first = generations.begin(("sid-1", "socket-1"))
+        other = generations.begin(("sid-1", "socket-2"))
+        second = generations.begin(("sid-1", "socket-1"))
+
+        assert first.cancelled
+        assert not second.cancelled
+        assert not other.cancelled
+        with pytest.raises(RequestCancelled):
+            first.raise_if_cancelled()
+        second.raise_if_cancelled()
+
+        # Finishing a superseded request keeps the newer one current.
+        generations.finish(("sid-1", "socket-1"), first)
+        assert not second.cancelled
+        generations.finish(("sid-1", "socket-1"), second)
+        generations.finish(("sid-1", "socket-2"), other)
+        generations.record_cancelled()
+        assert generations.get_stats() == {
+            "active_channels": 0,
+            "requests": 3,
+            "superseded": 1,
+            "cancelled": 1,
+        }
+
+    def test_construct_trees_batch_stops_between_trees(self, minimal_ts, monkeypatch):
+        from lorax.cancellation import CancelToken, RequestCancelled
+        from lorax.tree_graph import construct_trees_batch
+
+        monkeypatch.setattr("lorax.tree_graph.tree_graph.PARALLEL_TREE_THRESHOLD", 100)
+
+        checks = []
+
+        def cancelled():
+            checks.append(len(checks))
+            return len(checks) > 2
+
+        with pytest.raises(RequestCancelled):
+            construct_trees_batch(minimal_ts, [0, 0, 0], cancel_token=CancelToken(cancelled))
+        # One check before starting, then one per tree until cancelled.
+        assert len(checks) == 3
+
+        with pytest.raises(RequestCancelled):
+            construct_trees_batch(minimal_ts, [0], cancel_token=CancelToken(lambda: True))
+
+        result = construct_trees_batch(minimal_ts, [0], cancel_token=CancelToken())
+        assert result[3] == [0]
+
+
+class TestSharedWorkCancellation:
+    @pytest.mark.asyncio
+    async def test_shared_work_is_abandoned_only_when_every_waiter_is(self):
+        from lorax.cache.singleflight import SingleFlight
+
+        flight = SingleFlight()
+        key = flight.key("/data/a.trees", "tree_graph", tree_indices=[0])
+        wanted = {"a": True, "b": True}
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def render():
+            started.set()
+            await release.wait()
+            return flight.abandoned(key)
+
+        a = asyncio.create_task(flight.do(key, render, cancelled=lambda: not wanted["a"]))
+        b = asyncio.create_task(flight.do(key, render, cancelled=lambda: not wanted["b"]))
+        await started.wait()
+
+        wanted["a"] = False
+        assert not flight.abandoned(key)
+        wanted["b"] = False
+        assert flight.abandoned(key)
+
+        release.set()
+        assert await a is True and await b is True
+        assert not flight.abandoned(key)
+        assert flight.get_stats()["in_flight"] == 0
@@ -0,0 +1,154 @@
+"""
+Unit tests for the multi-process compute pool.
+"""
+
+import os
+import signal
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+
+@pytest.fixture
+def compute_pool():
+    from lorax.compute import ComputePool
+
+    pool = ComputePool(2)
+    pool.start()
+    yield pool
+    pool.shutdown()
+
+
+class TestRouting:
+    def test_files_have_stable_home_workers(self):
+        from lorax.compute import ComputePool
+
+        pool = ComputePool(4)
+        homes = {pool.home_worker(f"/data/project/{i}.trees") for i in range(64)}
+        assert homes == {0, 1, 2, 3}
+        assert pool.home_worker("/data/a.trees") == pool.home_worker("/data/../data/a.trees")
+
+    def test_busy_home_worker_spills_to_least_loaded(self):
+        from lorax.compute import ComputePool
+
+        pool = ComputePool(3, spill_depth=2)
+        home = pool.home_worker("/data/hot.trees")
+        pool._queued[home] = 1
+        assert pool.worker_for("/data/hot.trees") == home
+        pool._queued[home] = 2
+        other = pool.worker_for("/data/hot.trees")
+        assert other != home
+        assert pool.snapshot()["spilled"] == 1
+
+    @pytest.mark.asyncio
+    async def test_disabled_pool_refuses_jobs(self):
+        from lorax.compute import ComputePool
+
+        pool = ComputePool(0)
+        pool.start()
+        assert not pool.enabled
+        with pytest.raises(RuntimeError):
+            await pool.submit("worker_info")
+
+
+class TestWorkers:
+    @pytest.mark.asyncio
+    async def test_render_matches_in_process_result(self, compute_pool, minimal_ts_file):
+        from lorax.handlers import handle_tree_graph_query
+
+        path = str(minimal_ts_file)
+        expected = await handle_tree_graph_query(path, [0], sparsification=True)
+        result = await compute_pool.submit(
+            "tree_graph", path, tree_indices=[0], sparsification=True, session_id="sid-1"
+        )
+        assert result["buffer"] == expected["buffer"]
+        assert result["tree_indices"] == expected["tree_indices"]
+
+        # The file stays loaded in its home worker only.
+        info = await compute_pool.submit("worker_info", path)
+        assert info["pid"] != os.getpid()
+        assert [e["file_path"] for e in info["file_cache"]["entries"]] == [path]
+
+        metadata = await compute_pool.submit("metadata_array", path, key="sample")
+        assert len(metadata["sample_node_ids"]) == 20
+
+        with pytest.raises(ValueError):
+            await compute_pool.submit("no_such_job", path)
+        assert compute_pool.snapshot()["failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_dead_worker_is_replaced(self, compute_pool, minimal_ts_file):
+        path = str(minimal_ts_file)
+        pid = (await compute_pool.submit("worker_info", path))["pid"]
+        os.kill(pid, signal.SIGKILL)
+
+        with pytest.raises(BrokenProcessPool):
+            await compute_pool.submit("worker_info", path)
+        replacement = await compute_pool.submit("worker_info", path)
+        assert replacement["pid"] != pid
+        assert compute_pool.snapshot()["restarts"] == 1
+
+    def test_stale_failures_do_not_restart_the_replacement(self):
+        from lorax.compute import ComputePool
+
+        class FakeExecutor:
+            def __init__(self):
+                self.shut_down = False
+
+            def shutdown(self, wait=True, cancel_futures=False):
+                self.shut_down = True
+
+        pool = ComputePool(1)
+        dead, replacement = FakeExecutor(), FakeExecutor()
+        pool._executors[0] = dead
+        pool._restart(0, dead)
+        assert dead.shut_down and pool._executors[0] is None
+
+        # A second job that was queued on the dead worker fails after a new
+        # submit already started the replacement.
+        pool._executors[0] = replacement
+        pool._restart(0, dead)
+        assert not replacement.shut_down
+        assert pool._executors[0] is replacement
+        assert pool.snapshot()["restarts"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cold_worker_loads_go_through_admission(self, minimal_ts_file):
+        from contextlib import asynccontextmanager
+
+        from lorax.compute import ComputePool
+
+        admitted = []
+
+        @asynccontextmanager
+        async def admit(file_path):
+            admitted.append(file_path)
+            yield
+
+        pool = ComputePool(1)
+        pool.start(admit=admit)
+        try:
+            path = str(minimal_ts_file)
+            await pool.submit("metadata_array", path, key="sample")
+            await pool.submit("metadata_array", path, key="sample")
+            assert admitted == [path]
+            snapshot = pool.snapshot()
+            assert snapshot["resident"] == [[path]]
+            assert snapshot["admitted_loads"] == 1
+        finally:
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_workers_get_their_own_cache_budgets(self, monkeypatch):
+        from lorax.compute import ComputePool
+
+        monkeypatch.setenv("LORAX_WORKER_FILE_CACHE_MAX_MB", "7")
+        monkeypatch.setenv("LORAX_WORKER_TREE_GRAPH_SHARED_MAX_MB", "3")
+        pool = ComputePool(1)
+        pool.start()
+        try:
+            info = await pool.submit("worker_info")
+            assert info["file_cache"]["max_bytes"] == 7 * 1024 * 1024
+            assert info["tree_graph_shared"]["max_bytes"] == 3 * 1024 * 1024
+        finally:
+            pool.shutdown()
@@ -251,6 +251,96 @@ def test_multiprocess_ranges_match_single_worker_artifact(tmp_path):
         assert expected_tree == parallel_reader.num_trees
 
 
+def test_memory_plan_fits_auto_workers_to_memory_limit(tmp_path):
+    from lorax.artifacts.build_tuning import (
+        estimate_worker_rss_bytes,
+        plan_build_memory,
+        process_rss_bytes,
+    )
+
+    tree_sequence = _many_tree_sequence(tmp_path / "plan.trees")
+    per_worker = estimate_worker_rss_bytes(
+        tree_sequence,
+        target_shard_bytes=1024 * 1024,
+        start_method="spawn",
+    )
+    assert per_worker > tree_sequence.nbytes
+    kwargs = {
+        "workers": "auto",
+        "trees_per_range": "auto",
+        "target_shard_bytes": 1024 * 1024,
+        "start_method": "spawn",
+        "max_trees_per_range": 10_000,
+        "cpu_count": 8,
+    }
+
+    constrained = plan_build_memory(
+        tree_sequence,
+        memory_limit_bytes=process_rss_bytes() + 2 * per_worker + 1,
+        **kwargs,
+    )
+    assert constrained.workers == 2
+    assert constrained.trees_per_range == 48
+    assert constrained.workers_requested == "auto"
+
+    starved = plan_build_memory(tree_sequence, memory_limit_bytes=1, **kwargs)
+    assert starved.workers == 1
+    unconstrained = plan_build_memory(
+        tree_sequence,
+        memory_limit_bytes=process_rss_bytes() + 100 * per_worker,
+        **kwargs,
+    )
+    assert unconstrained.workers == 8
+
+    explicit = plan_build_memory(
+        tree_sequence,
+        memory_limit_bytes=1,
+        **{**kwargs, "workers": 3, "trees_per_range": 5},
+    )
+    assert (explicit.workers, explicit.trees_per_range) == (3, 5)
+
+
+def test_auto_tuned_build_records_memory_plan_and_throttles(tmp_path):
+    from lorax.artifacts import CSRArtifactReader, build_csr_artifact
+
+    source = tmp_path / "auto-many.trees"
+    _many_tree_sequence(source)
+    events = []
+
+    auto = build_csr_artifact(
+        source,
+        target_shard_mb=1,
+        workers="auto",
+        trees_per_range="auto",
+        format_version=2,
+        progress=events.append,
+    )
+    plan = auto["manifest"]["build"]["memory_plan"]
+    assert plan["workers_requested"] == "auto"
+    assert plan["trees_per_range_requested"] == "auto"
+    assert plan["workers"] >= 1
+    assert auto["manifest"]["build"]["trees_per_range"] == plan["trees_per_range"]
+    assert any(event.get("event") == "memory-plan" for event in events)
+
+    # A limit below the builder's own RSS throttles every extra range, so the
+    # build degrades to one range at a time instead of failing.
+    throttled = build_csr_artifact(
+        source,
+        target_shard_mb=1,
+        workers=2,
+        trees_per_range=5,
+        memory_limit_mb=1,
+        format_version=2,
+        force=True,
+    )
+    build = throttled["manifest"]["build"]
+    assert build["memory_plan"]["memory_limit_bytes"] == 1024 * 1024
+    assert build["memory_throttle_events"] > 0
+    assert build["peak_build_rss_bytes"] > 1024 * 1024
+    with CSRArtifactReader.open(throttled["artifact_dir"]) as reader:
+        assert reader.num_trees == 48
+
+
 def test_spawn_workers_load_source_and_emit_memory_warning(
     tmp_path,
     monkeypatch,
@@ -380,6 +470,60 @@ def test_corrupt_index_is_rejected_and_shard_is_verified_lazily(tmp_path):
             reader.tree_at_index(0)
 
 
+def test_sampled_verify_is_stratified_and_incremental(tmp_path):
+    from lorax.artifacts import build_csr_artifact
+    from lorax.artifacts.csr_reader import (
+        CSRArtifactCorruptError,
+        CSRArtifactReader,
+    )
+
+    source = tmp_path / "verify.trees"
+    _many_tree_sequence(source)
+    result = build_csr_artifact(
+        source,
+        target_shard_mb=1,
+        trees_per_range=5,
+        format_version=2,
+    )
+    artifact = Path(result["artifact_dir"])
+
+    with CSRArtifactReader.open(artifact) as reader:
+        num_shards = len(reader._shards)
+        assert num_shards > 1
+        full = reader.verify(sample_rate=1.0)
+        assert full["decoded_trees"] == 48
+        sampled = reader.verify(sample_rate=0.01, seed=7)
+        assert sampled["decoded_trees"] == num_shards
+        assert sampled["verified_bytes"] == full["verified_bytes"]
+        assert reader.verify(sample_rate=0.0)["decoded_trees"] == 0
+        with pytest.raises(ValueError):
+            reader.verify(sample_rate=1.5)
+
+    with CSRArtifactReader.open(artifact) as reader:
+        first = reader.verify(incremental=True)
+        assert first["skipped_shards"] == 0
+    manifest = json.loads((artifact / "manifest.json").read_text())
+    assert len(manifest["verification"]["shards"]) == num_shards
+
+    with CSRArtifactReader.open(artifact) as reader:
+        shard_path = artifact / reader._shards[0]["name"]
+        again = reader.verify(incremental=True)
+        assert again["skipped_shards"] == num_shards
+        assert again["decoded_trees"] == 0
+
+        # Restoring from a cache rewrites mtimes but not contents.
+        for shard in reader._shards:
+            restored = artifact / shard["name"]
+            os.utime(restored, ns=(restored.stat().st_atime_ns, 1_000_000_000))
+        restored_run = reader.verify(incremental=True)
+        assert restored_run["skipped_shards"] == num_shards
+
+        original = shard_path.read_bytes()
+        shard_path.write_bytes(original[:-1] + bytes([original[-1] ^ 0xFF]))
+        with pytest.raises(CSRArtifactCorruptError, match="Checksum mismatch"):
+            reader.verify(incremental=True)
+
+
 def test_existing_ready_artifact_is_reused_and_force_rebuilds(tmp_path):
     source = tmp_path / "reuse.trees"
     _recombining_tree_sequence(source)
@@ -1170,6 +1314,169 @@ def test_v3_node_tree_range_capability_must_match_its_indexes(tmp_path):
         CSRArtifactReader.open(complete["artifact_dir"])
 
 
+def _internal_sample_tree_sequence(path: Path) -> tskit.TreeSequence:
+    tables = tskit.TableCollection(sequence_length=20)
+    sample_a = tables.nodes.add_row(flags=tskit.NODE_IS_SAMPLE, time=0)
+    sample_b = tables.nodes.add_row(flags=tskit.NODE_IS_SAMPLE, time=0)
+    sample_c = tables.nodes.add_row(flags=tskit.NODE_IS_SAMPLE, time=0)
+    internal_sample = tables.nodes.add_row(flags=tskit.NODE_IS_SAMPLE, time=1)
+    root = tables.nodes.add_row(time=2)
+    tables.edges.add_row(0, 10, internal_sample, sample_a)
+    tables.edges.add_row(0, 10, internal_sample, sample_b)
+    tables.edges.add_row(0, 20, root, sample_c)
+    tables.edges.add_row(0, 10, root, internal_sample)
+    tables.edges.add_row(10, 20, root, sample_a)
+    tables.edges.add_row(10, 20, root, sample_b)
+    tables.sort()
+    tree_sequence = tables.tree_sequence()
+    tree_sequence.dump(path)
+    return tree_sequence
+
+
+@pytest.mark.parametrize("time_scale", ["linear", "log"])
+def test_sample_tip_order_positions_match_decoded_genealogies(
+    tmp_path,
+    time_scale,
+):
+    import msprime
+
+    from lorax.artifacts import CSRArtifactReader
+    from lorax.sockets.node_search import (
+        _artifact_genealogy_positions,
+        _artifact_positions,
+    )
+
+    simulated_source = tmp_path / "simulated.trees"
+    msprime.sim_ancestry(
+        samples=12,
+        sequence_length=50_000,
+        recombination_rate=1e-7,
+        population_size=1_000,
+        random_seed=7,
+    ).dump(simulated_source)
+    internal_source = tmp_path / "internal-sample.trees"
+    internal_ts = _internal_sample_tree_sequence(internal_source)
+
+    for source in (simulated_source, internal_source):
+        result = _build(source)
+        manifest = result["manifest"]
+        assert manifest["capabilities"]["sample_tip_order"] is True
+        assert manifest["build"]["skip_sample_tip_order"] is False
+        with CSRArtifactReader.open(result["artifact_dir"]) as reader:
+            context = type("Context", (), {"reader": reader})()
+            node_ids = list(range(int(manifest["dataset"]["num_nodes"])))
+            tree_indices = list(range(reader.num_trees))
+            fast, fast_lineages = _artifact_positions(
+                context,
+                node_ids,
+                tree_indices,
+                time_scale,
+                show_lineages=True,
+            )
+            decoded, decoded_lineages = _artifact_genealogy_positions(
+                context,
+                node_ids,
+                tree_indices,
+                time_scale,
+                show_lineages=True,
+            )
+
+            def by_key(positions):
+                return {
+                    (item["tree_idx"], item["node_id"]): (item["x"], item["y"])
+                    for item in positions
+                }
+
+            assert by_key(fast) == by_key(decoded)
+            assert len(fast) == len(decoded)
+            assert {
+                tree: sorted(path["path_node_ids"] for path in paths)
+                for tree, paths in fast_lineages.items()
+            } == {
+                tree: sorted(path["path_node_ids"] for path in paths)
+                for tree, paths in decoded_lineages.items()
+            }
+
+    with CSRArtifactReader.open(f"{internal_source}.artifact") as reader:
+        gathered = reader.sample_tip_positions([3, 4, 99], [1, 0, 1, 7])
+        assert gathered.tree_indices.tolist() == [1]
+        assert gathered.node_ids.tolist() == [3]
+        assert gathered.internal_tree_indices.tolist() == [0]
+        assert gathered.internal_node_ids.tolist() == [3]
+        assert gathered.unresolved_node_ids.tolist() == [4, 99]
+        assert internal_ts.num_trees == 2
+
+
+def test_skipped_sample_tip_order_falls_back_to_genealogies(tmp_path):
+    from lorax.artifacts import CSRArtifactCapabilityError, CSRArtifactReader
+    from lorax.sockets.node_search import _artifact_positions
+
+    source = tmp_path / "skip-tip-order.trees"
+    _recombining_tree_sequence(source)
+    result = _build(source, skip_sample_tip_order=True)
+    manifest = result["manifest"]
+    assert manifest["capabilities"]["sample_tip_order"] is False
+    assert manifest["build"]["skip_sample_tip_order"] is True
+    assert "sample_tip_order" not in manifest["indexes"]
+    with CSRArtifactReader.open(result["artifact_dir"]) as reader:
+        with pytest.raises(
+            CSRArtifactCapabilityError,
+            match="--skip-sample-tip-order",
+        ):
+            reader.sample_tip_positions([0], [0])
+        context = type("Context", (), {"reader": reader})()
+        positions, _lineages = _artifact_positions(context, [0], [0, 1], "linear")
+    assert sorted(item["tree_idx"] for item in positions) == [0, 1]
+
+
+def test_sample_tip_order_over_size_cap_is_left_out(tmp_path, monkeypatch):
+    from lorax.artifacts import CSRArtifactReader
+    from lorax.artifacts import csr_builder
+
+    source = tmp_path / "capped-tip-order.trees"
+    _recombining_tree_sequence(source)
+    # Stand in for a large dataset: each rank cell takes 1 MiB.
+    monkeypatch.setattr(
+        csr_builder,
+        "_sample_tip_order_dtype",
+        lambda num_samples: np.dtype((np.uint16, (512 * 1024,))),
+    )
+    result = _build(source, sample_tip_order_max_mb=1)
+    manifest = result["manifest"]
+    assert manifest["capabilities"]["sample_tip_order"] is False
+    assert manifest["build"]["skip_sample_tip_order"] is False
+    assert "byte cap" in manifest["build"]["sample_tip_order_skipped"]
+    assert "sample_tip_rows" not in manifest["indexes"]
+    with CSRArtifactReader.open(result["artifact_dir"]) as reader:
+        assert not reader.has_capability("sample_tip_order")
+
+
+def test_sample_tip_order_without_disk_space_writes_nothing(tmp_path, monkeypatch):
+    import shutil
+
+    from lorax.artifacts.csr_builder import _write_sample_tip_order_sidecars
+
+    disk_usage = shutil.disk_usage
+    monkeypatch.setattr(
+        shutil, "disk_usage", lambda path: disk_usage(path)._replace(free=0)
+    )
+    checkpoints = []
+    skipped = _write_sample_tip_order_sidecars(
+        tmp_path,
+        [],
+        samples=np.arange(100),
+        sample_times=np.zeros(100),
+        num_trees=10,
+        num_nodes=200,
+        indexes={},
+        checkpoint=lambda key, metadata: checkpoints.append(key),
+        max_bytes=1024 * 1024,
+    )
+    assert "of disk are free" in skipped
+    assert checkpoints == []
+    assert list(tmp_path.iterdir()) == []
+
+
 @pytest.mark.parametrize("sparsification", [False, True])
 @pytest.mark.parametrize("time_scale", ["linear", "log"])
 def test_csr_frontend_serializer_matches_legacy_contract(
@@ -1210,6 +1517,284 @@ def test_csr_frontend_serializer_matches_legacy_contract(
     assert artifact_result["tree_indices"] == indices
 
 
+@pytest.mark.parametrize("sparsification", [False, True])
+def test_mutation_dense_render_keeps_states_in_arrow(tmp_path, sparsification):
+    import msprime
+
+    from lorax.artifacts import CSRArtifactReader
+    from lorax.artifacts.render import serialize_csr_genealogies
+    from lorax.tree_graph import construct_trees_batch
+
+    source = tmp_path / "dense.trees"
+    tree_sequence = msprime.sim_mutations(
+        msprime.sim_ancestry(
+            20,
+            sequence_length=10_000,
+            recombination_rate=1e-7,
+            population_size=1_000,
+            random_seed=11,
+        ),
+        rate=1e-5,
+        model=msprime.JC69(),
+        random_seed=11,
+    )
+    tree_sequence.dump(source)
+    assert tree_sequence.num_mutations > 100
+    result = _build(source)
+    indices = [0, 2, 3]
+
+    legacy_buffer, *_ = construct_trees_batch(
+        tree_sequence,
+        indices,
+        sparsification=sparsification,
+        sparsify_mutations=sparsification,
+    )
+    with CSRArtifactReader.open(result["artifact_dir"]) as reader:
+        genealogies = reader.trees_at_indices(indices)
+        artifact_result = serialize_csr_genealogies(
+            genealogies,
+            global_min_time=reader.global_min_time,
+            global_max_time=reader.global_max_time,
+            sparsification=sparsification,
+        )
+
+    for genealogy in genealogies:
+        assert "derived_states" not in vars(genealogy.mutations)
+    _legacy_nodes, legacy_mutations = _split_frontend_buffer(legacy_buffer)
+    _csr_nodes, csr_mutations = _split_frontend_buffer(artifact_result["buffer"])
+    _assert_arrow_tables_equal_with_nan(csr_mutations, legacy_mutations)
+
+    # Pooled per-tree processing fills the same slices as the serial path.
+    with CSRArtifactReader.open(result["artifact_dir"]) as reader:
+        everything = reader.trees_at_indices(range(reader.num_trees))
+        kwargs = {
+            "global_min_time": reader.global_min_time,
+            "global_max_time": reader.global_max_time,
+            "sparsification": sparsification,
+        }
+        with patch("lorax.artifacts.render.PARALLEL_RENDER_THRESHOLD", 1):
+            pooled = serialize_csr_genealogies(everything, **kwargs)
+        with patch("lorax.artifacts.render.PARALLEL_RENDER_THRESHOLD", 10**9):
+            serial = serialize_csr_genealogies(everything, **kwargs)
+    assert pooled["buffer"] == serial["buffer"]
+    assert pooled["tree_indices"] == list(range(tree_sequence.num_trees))
+
+
+@pytest.mark.parametrize("sparsification", [False, True])
+@pytest.mark.parametrize("time_scale", ["linear", "log"])
+def test_precomputed_layout_y_matches_computed_render(
+    tmp_path,
+    sparsification,
+    time_scale,
+):
+    from lorax.artifacts import CSRArtifactReader
+    from lorax.artifacts.graph import CompactGenealogyGraph
+    from lorax.artifacts.render import serialize_csr_genealogies
+
+    source = tmp_path / "layout-y.trees"
+    _recombining_tree_sequence(source)
+    result = _build(source, precompute_layout_y=True)
+    manifest = result["manifest"]
+    assert manifest["capabilities"]["layout_y"] is True
+    assert manifest["build"]["precomputed_layout_y"] is True
+    assert {"node_y_linear", "node_y_log"}.issubset(manifest["indexes"])
+
+    with CSRArtifactReader.open(result["artifact_dir"]) as reader:
+        node_y = reader.layout_y(time_scale)
+        assert node_y.dtype == np.float32
+        assert len(node_y) == manifest["dataset"]["num_nodes"]
+        genealogies = reader.trees_at_indices([0, 1])
+        kwargs = {
+            "global_min_time": reader.global_min_time,
+            "global_max_time": reader.global_max_time,
+            "sparsification": sparsification,
+            "time_scale": time_scale,
+        }
+        computed = serialize_csr_genealogies(genealogies, **kwargs)
+        gathered = serialize_csr_genealogies(
+            genealogies,
+            node_y=node_y,
+            **kwargs,
+        )
+        graph = CompactGenealogyGraph.from_genealogy(
+            genealogies[0],
+            global_min_time=reader.global_min_time,
+            global_max_time=reader.global_max_time,
+            time_scale=time_scale,
+            node_y=node_y,
+        )
+        expected_graph = CompactGenealogyGraph.from_genealogy(
+            genealogies[0],
+            global_min_time=reader.global_min_time,
+            global_max_time=reader.global_max_time,
+            time_scale=time_scale,
+        )
+
+    assert gathered["buffer"] == computed["buffer"]
+    np.testing.assert_array_equal(graph.y, expected_graph.y)
+
+    plain = _build(tmp_path / "layout-y.trees", force=True)
+    assert plain["manifest"]["capabilities"]["layout_y"] is False
+    assert "node_y_linear" not in plain["manifest"]["indexes"]
+    with CSRArtifactReader.open(plain["artifact_dir"]) as reader:
+        assert reader.layout_y(time_scale) is None
+
+
+async def test_lazy_graph_handle_decodes_on_first_lineage_access(tmp_path):
+    from lorax.artifacts import CSRArtifactReader
+    from lorax.artifacts.graph import (
+        CompactGenealogyGraph,
+        LazyCompactGenealogyGraph,
+    )
+    from lorax.cache.tree_graph import TreeGraphCache
+    from lorax.lineage import get_ancestors
+
+    source = tmp_path / "lazy.trees"
+    _recombining_tree_sequence(source)
+    result = _build(source)
+    cache = TreeGraphCache()
+
+    with CSRArtifactReader.open(result["artifact_dir"]) as reader:
+        handle = LazyCompactGenealogyGraph(reader, 1, time_scale="log")
+        await cache.set("lazy-session", 1, handle)
+        with patch.object(
+            reader,
+            "tree_at_index",
+            wraps=reader.tree_at_index,
+        ) as decode:
+            assert not handle.is_materialized
+            assert decode.call_count == 0
+            expected = CompactGenealogyGraph.from_genealogy(
+                reader.trees_at_indices([1])[0],
+                global_min_time=reader.global_min_time,
+                global_max_time=reader.global_max_time,
+                time_scale="log",
+            )
+            tip = int(expected.node_ids[expected.node_ids < 4][0])
+            ancestors = await get_ancestors(cache, "lazy-session", 1, tip)
+            assert decode.call_count == 1
+            handle.edges()
+            assert decode.call_count == 1
+
+    assert handle.is_materialized
+    assert handle.reader is None
+    assert handle.edges() == expected.edges()
+    assert ancestors["ancestors"] == expected.ancestors(tip)[1:]
+    assert ancestors["path"][0]["y"] == expected.node_y(tip)
+
+
+def _tree_csv(path: Path) -> Path:
+    import pandas as pd
+
+    pd.DataFrame(
+        {
+            "genomic_positions": [5000, 0, 10000],
+            "newick": [
+                "((A:1,C:1):1,(B:0.5,D:0.5):1.5);",
+                "((A:2,B:2):1,(C:1,D:1):2);",
+                None,
+            ],
+            "max_branch_length": [2.0, 3.0, None],
+        }
+    ).to_csv(path, index=False)
+    return path
+
+
+def _decoded_nodes(buffer: bytes) -> dict[str, np.ndarray]:
+    import struct
+
+    (node_bytes,) = struct.unpack("<I", buffer[:4])
+    table = pa.ipc.open_stream(buffer[4 : 4 + node_bytes]).read_all()
+    order = np.lexsort(
+        (
+            table.column("node_id").to_numpy(),
+            table.column("tree_idx").to_numpy(),
+        )
+    )
+    return {
+        name: table.column(name).to_numpy()[order]
+        for name in ("node_id", "parent_id", "is_tip", "tree_idx", "x", "y")
+    }
+
+
+@pytest.mark.parametrize("time_scale", ["linear", "log"])
+@pytest.mark.parametrize("shift_tips_to_one", [False, True])
+def test_csv_artifact_render_matches_legacy_csv_layout(
+    tmp_path,
+    time_scale,
+    shift_tips_to_one,
+):
+    import pandas as pd
+
+    from lorax.artifacts import CSRArtifactReader, build_csv_csr_artifact
+    from lorax.artifacts.render import serialize_csr_genealogies
+    from lorax.csv.config import _sorted_reset, build_csv_config
+    from lorax.csv.layout import build_csv_layout_response
+
+    source = _tree_csv(tmp_path / "trees.csv")
+    result = build_csv_csr_artifact(
+        source,
+        target_shard_mb=1,
+        shift_tips_to_one=shift_tips_to_one,
+    )
+    manifest = result["manifest"]
+    assert manifest["build"]["source_format"] == "newick-csv"
+    assert manifest["dataset"]["num_trees"] == 3
+    assert manifest["dataset"]["num_samples"] == 4
+    assert manifest["capabilities"]["sample_tip_order"] is False
+    assert manifest["capabilities"]["layout_y"] is False
+
+    frame = pd.read_csv(source)
+    config = build_csv_config(frame, str(source))
+    expected = build_csv_layout_response(
+        _sorted_reset(frame),
+        [0, 1, 2],
+        config["times"]["values"][1],
+        samples_order=config["samples"],
+        shift_tips_to_one=shift_tips_to_one,
+        time_scale=time_scale,
+    )
+    with CSRArtifactReader.open(result["artifact_dir"]) as reader:
+        assert reader.verify()["ok"] is True
+        assert reader.frontend_config()["samples"] == config["samples"]
+        assert reader.search_samples("c")[0]["node_id"] == 2
+        assert reader.tree_at_index(2).node_ids.size == 0
+        assert reader.tree_ranges_for_node(4) == [(0, 2)]
+        actual = serialize_csr_genealogies(
+            reader.trees_at_indices([0, 1, 2]),
+            global_min_time=reader.global_min_time,
+            global_max_time=reader.global_max_time,
+            time_scale=time_scale,
+        )
+
+    expected_nodes = _decoded_nodes(expected["buffer"])
+    actual_nodes = _decoded_nodes(actual["buffer"])
+    for name in ("node_id", "parent_id", "is_tip", "tree_idx", "x"):
+        np.testing.assert_array_equal(actual_nodes[name], expected_nodes[name])
+    np.testing.assert_allclose(actual_nodes["y"], expected_nodes["y"], atol=1e-6)
+
+
+def test_csv_artifact_resolves_for_csv_sessions(tmp_path):
+    from types import SimpleNamespace
+
+    from lorax.artifacts import build_csv_csr_artifact
+    from lorax.artifacts.runtime import ArtifactResolver
+    from lorax.sockets.utils import is_csv_session
+
+    source = _tree_csv(tmp_path / "trees.csv")
+    assert is_csv_session(
+        SimpleNamespace(file_path=str(source), dataset_backend="csv")
+    )
+    build_csv_csr_artifact(source, target_shard_mb=1)
+
+    assert ArtifactResolver().resolve(source) is not None
+    assert not is_csv_session(
+        SimpleNamespace(file_path=str(source), dataset_backend="csr-v3")
+    )
+    reused = build_csv_csr_artifact(source, target_shard_mb=1)
+    assert reused["manifest"]["build"]["source_format"] == "newick-csv"
+
+
 def test_resolver_and_context_registry_open_adjacent_artifact(tmp_path):
     from lorax.artifacts.runtime import ArtifactContextRegistry, ArtifactResolver
 
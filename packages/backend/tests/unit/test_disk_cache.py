@@ -389,3 +389,272 @@ class TestDiskCacheManager:
 
         path = await manager.get_cached_path("bucket", "path")
         assert path is None
+
+
+class TestSqliteManifest:
+    """Tests for the SQLite-backed manifest and its JSON migration."""
+
+    @staticmethod
+    def _cached(temp_dir, name, size, last_access):
+        from lorax.cache.disk import CachedFile
+
+        return CachedFile(
+            gcs_path=f"bucket/{name}",
+            local_path=str(temp_dir / name),
+            size_bytes=size,
+            last_access=last_access,
+            download_complete=True,
+        )
+
+    @pytest.mark.asyncio
+    async def test_migrates_legacy_json_once(self, temp_dir):
+        """Test that an existing JSON manifest is imported and retired."""
+        import json
+
+        from lorax.cache.disk import DiskCacheManifest
+
+        manifest_path = temp_dir / "manifest.json"
+        legacy = self._cached(temp_dir, "a.trees", 10, "2024-01-01T00:00:00+00:00")
+        manifest_path.write_text(json.dumps({
+            "version": 1,
+            "files": {"key-a": legacy.to_dict()},
+            "total_size_bytes": 10,
+        }))
+
+        manifest = DiskCacheManifest(manifest_path)
+        assert (await manifest.get_file("key-a")) == legacy
+        assert await manifest.get_total_size() == 10
+        assert not manifest_path.exists()
+        assert manifest_path.with_suffix(".json.migrated").exists()
+        assert manifest.db_path.exists()
+
+        # A second process opening the same cache sees the migrated rows.
+        other = DiskCacheManifest(manifest_path)
+        assert await other.get_file_count() == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_updates_keep_totals_consistent(self, temp_dir):
+        """Test that triggers keep the running size total exact."""
+        from lorax.cache.disk import DiskCacheManifest
+
+        manifest_path = temp_dir / "manifest.json"
+        writers = [DiskCacheManifest(manifest_path) for _ in range(2)]
+
+        await asyncio.gather(*(
+            writers[i % 2].set_file(
+                f"key{i}",
+                self._cached(temp_dir, f"f{i}", 100 + i, f"2024-01-01T00:00:{i:02d}+00:00"),
+            )
+            for i in range(20)
+        ))
+        # Re-recording an entry replaces its size rather than adding to it.
+        await writers[0].set_file(
+            "key0", self._cached(temp_dir, "f0", 50, "2024-01-01T00:00:00+00:00")
+        )
+        expected = 50 + sum(100 + i for i in range(1, 20))
+        assert await writers[1].get_total_size() == expected
+        assert await writers[1].get_file_count() == 20
+
+        touched = await writers[1].touch("key0")
+        assert touched.last_access > "2024-01-01T00:00:59+00:00"
+        assert await writers[0].touch("missing") is None
+
+    @pytest.mark.asyncio
+    async def test_pop_oldest_evicts_in_access_order(self, temp_dir):
+        """Test that eviction removes least recently used entries atomically."""
+        from lorax.cache.disk import DiskCacheManifest
+
+        manifest = DiskCacheManifest(temp_dir / "manifest.json")
+        for i in range(4):
+            await manifest.set_file(
+                f"key{i}",
+                self._cached(temp_dir, f"f{i}", 10, f"2024-01-0{i + 1}T00:00:00+00:00"),
+            )
+        await manifest.touch("key0")
+
+        evicted = await manifest.pop_victims(target_size=20)
+        assert [key for key, _ in evicted] == ["key1", "key2"]
+        assert await manifest.get_total_size() == 20
+        assert await manifest.pop_victims(target_size=20) == []
+
+        data = await manifest.load()
+        assert set(data["files"]) == {"key0", "key3"}
+        assert data["total_size_bytes"] == 20
+
+
+class TestEvictionPolicies:
+    """Tests for size-aware eviction, watermarks and the trace simulator."""
+
+    def test_incomplete_policy_fails_at_instantiation(self):
+        """Test that a policy without a priority function cannot be created."""
+        from lorax.cache.eviction import EvictionPolicy
+
+        class NoPriority(EvictionPolicy):
+            name = "incomplete"
+
+        with pytest.raises(TypeError):
+            NoPriority()
+
+    @pytest.mark.asyncio
+    async def test_gdsf_keeps_popular_small_files_over_one_off_upload(self, temp_dir):
+        """Test that a large one-off file is evicted before small hot files."""
+        from lorax.cache.disk import DiskCacheManager
+
+        mb = 1024 * 1024
+        manager = DiskCacheManager(
+            cache_dir=temp_dir / "cache",
+            max_size_bytes=100 * mb,
+            policy="gdsf",
+            high_watermark=0.9,
+            low_watermark=0.5,
+        )
+        sizes = {"small0.trees": 5 * mb, "small1.trees": 5 * mb, "upload.trees": 60 * mb}
+        for name, size in sizes.items():
+            path = manager.files_dir / name
+            path.write_bytes(b"x")
+            await manager.cache_file("bucket", name, path, size)
+        for _ in range(3):
+            assert await manager.get_cached_path("bucket", "small0.trees")
+            assert await manager.get_cached_path("bucket", "small1.trees")
+
+        # 70 MB + 25 MB crosses the 90 MB high watermark; evict to 50 - 25 MB.
+        await manager.evict_if_needed(required_bytes=25 * mb)
+        assert await manager.get_cached_path("bucket", "upload.trees") is None
+        assert await manager.get_cached_path("bucket", "small0.trees")
+        assert await manager.manifest.get_total_size() == 10 * mb
+        assert await manager.manifest.get_inflation() > 0
+
+        # Below the high watermark nothing is evicted.
+        await manager.evict_if_needed(required_bytes=10 * mb)
+        assert await manager.manifest.get_file_count() == 2
+
+        stats = await manager.get_stats()
+        assert stats["eviction_policy"] == "gdsf"
+        assert (stats["low_watermark"], stats["high_watermark"]) == (0.5, 0.9)
+
+    @pytest.mark.asyncio
+    async def test_upgrades_manifest_without_priority_columns(self, temp_dir):
+        """Test that manifests created before priorities gain them in place."""
+        import sqlite3
+
+        from lorax.cache.disk import DiskCacheManifest
+
+        manifest_path = temp_dir / "manifest.json"
+        conn = sqlite3.connect(manifest_path.with_suffix(".sqlite"))
+        conn.executescript("""
+            CREATE TABLE files (
+                cache_key TEXT PRIMARY KEY, gcs_path TEXT NOT NULL,
+                local_path TEXT NOT NULL, size_bytes INTEGER NOT NULL,
+                last_access TEXT NOT NULL, download_complete INTEGER NOT NULL,
+                etag TEXT
+            );
+            CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+            INSERT INTO meta VALUES ('json_migrated', '1');
+            INSERT INTO files VALUES ('old', 'b/old', '/tmp/old', 10,
+                                      '2024-01-01T00:00:00+00:00', 1, NULL);
+            INSERT INTO files VALUES ('new', 'b/new', '/tmp/new', 10,
+                                      '2024-01-02T00:00:00+00:00', 1, NULL);
+        """)
+        conn.close()
+
+        manifest = DiskCacheManifest(manifest_path, policy="lru")
+        evicted = await manifest.pop_victims(target_size=10)
+        assert [key for key, _ in evicted] == ["old"]
+
+    def test_simulator_replays_trace_under_each_policy(self):
+        """Test that GDSF beats LRU when one-off uploads flush hot files."""
+        from lorax.cache.eviction import compare_policies, get_eviction_policy
+
+        hot = [(f"hot{i}", 10) for i in range(4)]
+        trace = []
+        for round_index in range(20):
+            trace.extend(hot)
+            trace.append((f"upload{round_index}", 60))
+        results = {r.policy: r for r in compare_policies(trace, capacity_bytes=90)}
+
+        assert results["lru"].requests == results["gdsf"].requests == len(trace)
+        assert results["gdsf"].hit_rate > results["lru"].hit_rate
+        assert results["gdsf"].bytes_fetched < results["lru"].bytes_fetched
+
+        with pytest.raises(ValueError):
+            get_eviction_policy("arc")
+
+
+class TestPinnedFiles:
+    """Tests for eviction-exempt disk cache entries."""
+
+    @pytest.mark.asyncio
+    async def test_pinned_files_are_never_evicted(self, temp_dir):
+        """Test that pinned entries are skipped and reported in stats."""
+        from lorax.cache.disk import DiskCacheManager
+
+        manager = DiskCacheManager(
+            cache_dir=temp_dir / "cache", max_size_bytes=100, policy="lru",
+            high_watermark=1.0, low_watermark=1.0,
+        )
+        for name in ("demo.trees", "other.trees"):
+            path = manager.files_dir / name
+            path.write_bytes(b"x")
+            await manager.cache_file("bucket", name, path, 60)
+        assert await manager.pin("bucket", "demo.trees") is True
+        assert await manager.pin("bucket", "absent.trees") is False
+
+        await manager.evict_if_needed()
+        assert await manager.get_cached_path("bucket", "demo.trees")
+        assert await manager.get_cached_path("bucket", "other.trees") is None
+        assert (await manager.get_stats())["pinned_files"] == ["bucket/demo.trees"]
+
+        most_used = await manager.manifest.get_most_used_files(1)
+        assert most_used[0][1].gcs_path == "bucket/demo.trees"
+
+
+class TestDerivedFiles:
+    """Tests for cache entries derived from local source files."""
+
+    @pytest.mark.asyncio
+    async def test_derived_copy_is_accounted_and_revalidated(self, temp_dir):
+        """Test that derived files count towards the budget and follow their source."""
+        import os
+
+        from lorax.cache.disk import DiskCacheManager
+
+        manager = DiskCacheManager(cache_dir=temp_dir / "cache", max_size_bytes=10_000)
+        source = temp_dir / "a.trees.tsz"
+        source.write_bytes(b"compressed")
+
+        def write(path):
+            with open(path, "wb") as f:
+                f.write(b"x" * 500)
+
+        assert await manager.get_derived_path(str(source), "decompressed") is None
+        stored = await manager.store_derived(str(source), "decompressed", write, suffix=".trees")
+        assert stored.suffix == ".trees"
+        assert await manager.get_derived_path(str(source), "decompressed") == stored
+        assert await manager.manifest.get_total_size() == 500
+        assert await manager.pin_derived(str(source), "decompressed") is True
+
+        # A rewritten source invalidates the copy and frees its space.
+        stat = source.stat()
+        os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert await manager.get_derived_path(str(source), "decompressed") is None
+        assert not stored.exists()
+        assert await manager.manifest.get_total_size() == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_write_leaves_no_entry(self, temp_dir):
+        """Test that a failing writer leaves neither a file nor a manifest row."""
+        from lorax.cache.disk import DiskCacheManager
+
+        manager = DiskCacheManager(cache_dir=temp_dir / "cache", max_size_bytes=10_000)
+        source = temp_dir / "a.trees.tsz"
+        source.write_bytes(b"compressed")
+
+        def write(path):
+            with open(path, "wb") as f:
+                f.write(b"partial")
+            raise OSError("disk full")
+
+        with pytest.raises(OSError):
+            await manager.store_derived(str(source), "decompressed", write)
+        assert list(manager.files_dir.iterdir()) == []
+        assert await manager.manifest.get_file_count() == 0
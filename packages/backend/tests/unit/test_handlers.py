@@ -468,6 +468,118 @@ class TestTreeGraphQuery:
         assert len(result["tree_indices"]) == num_trees
 
 
+class TestRenderL2Cache:
+    """Tests for the Redis-backed render cache."""
+
+    @pytest.fixture
+    def busy_ts_file(self, temp_dir):
+        import msprime
+
+        ts = msprime.sim_ancestry(
+            samples=20,
+            population_size=1000,
+            sequence_length=100_000,
+            recombination_rate=1e-7,
+            random_seed=7,
+        )
+        ts = msprime.sim_mutations(ts, rate=1e-7, random_seed=7)
+        path = temp_dir / "busy.trees"
+        ts.dump(str(path))
+        return path
+
+    @pytest.mark.asyncio
+    async def test_cached_render_matches_fresh_render(self, busy_ts_file, mock_redis):
+        from lorax.cache.render_cache import RenderL2Cache
+        from lorax.handlers import handle_tree_graph_query
+        from lorax.tree_graph import construct_trees_batch
+
+        cache = RenderL2Cache(mock_redis, ttl_seconds=60)
+        kwargs = dict(sparsification=True, time_scale="log")
+        expected = await handle_tree_graph_query(
+            str(busy_ts_file), [0, 1, 2, 3], **kwargs
+        )
+        assert expected["tree_indices"] == [0, 1, 2, 3]
+
+        # Populate trees 1 and 2, then request a window that overlaps them.
+        await handle_tree_graph_query(
+            str(busy_ts_file), [1, 2], render_cache=cache, **kwargs
+        )
+        await cache.drain()
+        assert cache.get_stats()["stores"] == 2
+        # Both trees went out in a single pipelined round-trip.
+        assert mock_redis.pipeline_executions == 1
+        with patch(
+            "lorax.handlers.construct_trees_batch", wraps=construct_trees_batch
+        ) as construct:
+            mixed = await handle_tree_graph_query(
+                str(busy_ts_file), [0, 1, 2, 3], render_cache=cache, **kwargs
+            )
+            assert construct.call_args.args[1] == [0, 3]
+            await cache.drain()
+
+            cached = await handle_tree_graph_query(
+                str(busy_ts_file), [0, 1, 2, 3], render_cache=cache, **kwargs
+            )
+            assert construct.call_count == 1
+
+        for result in (mixed, cached):
+            assert result["buffer"] == expected["buffer"]
+            assert result["tree_indices"] == expected["tree_indices"]
+            assert result["global_max_time"] == expected["global_max_time"]
+        stats = cache.get_stats()
+        assert stats["hits"] == 2 + 4
+        assert stats["misses"] == 2 + 2
+
+    @pytest.mark.asyncio
+    async def test_params_and_adaptive_requests_are_not_shared(self, busy_ts_file, mock_redis):
+        from lorax.cache.render_cache import RenderL2Cache
+        from lorax.handlers import handle_tree_graph_query
+
+        cache = RenderL2Cache(mock_redis)
+        await handle_tree_graph_query(
+            str(busy_ts_file), [0], sparsification=True, render_cache=cache
+        )
+        await handle_tree_graph_query(
+            str(busy_ts_file), [0], sparsification=False, render_cache=cache
+        )
+        await handle_tree_graph_query(
+            str(busy_ts_file),
+            [0],
+            sparsification=True,
+            adaptive_sparsify_bbox={"min_x": 0, "max_x": 0.5, "min_y": 0, "max_y": 0.5},
+            adaptive_target_tree_idx=0,
+            render_cache=cache,
+        )
+        await cache.drain()
+        stats = cache.get_stats()
+        assert stats["hits"] == 0
+        assert stats["stores"] == 2
+        assert len(await mock_redis.keys("lorax:render:*")) == 2
+
+    @pytest.mark.asyncio
+    async def test_oversize_entries_and_redis_errors_fall_back(self, busy_ts_file, mock_redis):
+        from lorax.cache.render_cache import RenderL2Cache
+        from lorax.handlers import handle_tree_graph_query
+
+        expected = await handle_tree_graph_query(str(busy_ts_file), [0, 1])
+
+        cache = RenderL2Cache(mock_redis, max_entry_bytes=64)
+        result = await handle_tree_graph_query(str(busy_ts_file), [0, 1], render_cache=cache)
+        assert result["buffer"] == expected["buffer"]
+        await cache.drain()
+        assert cache.get_stats()["skipped_oversize"] == 2
+        assert await mock_redis.keys("lorax:render:*") == []
+
+        broken = MagicMock()
+        broken.mget.side_effect = ConnectionError("redis down")
+        broken.pipeline.return_value.execute.side_effect = ConnectionError("redis down")
+        cache = RenderL2Cache(broken)
+        result = await handle_tree_graph_query(str(busy_ts_file), [0, 1], render_cache=cache)
+        assert result["buffer"] == expected["buffer"]
+        await cache.drain()
+        assert cache.get_stats()["errors"] == 2
+
+
 class TestCacheStatus:
     """Tests for cache status reporting."""
 
@@ -484,6 +596,23 @@ class TestCacheStatus:
         assert "pid" in status
         assert isinstance(status["rss_MB"], float)
 
+    @pytest.mark.asyncio
+    async def test_cache_status_reports_file_context_sizes(self, minimal_ts_file):
+        """Test that cache_status lists per-file size estimates."""
+        from lorax.cache import get_file_context
+        from lorax.handlers import cache_status
+
+        ctx = await get_file_context(str(minimal_ts_file))
+        status = await cache_status()
+
+        entries = {e["file_path"]: e for e in status["file_cache"]["entries"]}
+        entry = entries[str(minimal_ts_file)]
+        assert entry["nbytes"] == ctx.nbytes
+        assert set(entry["breakdown"]) == {
+            "tree_sequence", "config", "column_views", "metadata",
+        }
+        assert status["file_cache"]["total_bytes"] >= entry["nbytes"]
+
 
 class TestFileContext:
     """Tests for FileContext functionality."""
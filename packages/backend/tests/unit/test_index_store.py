@@ -0,0 +1,160 @@
+"""
+Unit tests for persisted derived indexes (DerivedIndexStore).
+"""
+
+import shutil
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def index_store(temp_dir, monkeypatch):
+    from lorax.cache import file_cache
+    from lorax.cache.index_store import DerivedIndexStore
+
+    store = DerivedIndexStore(temp_dir / "indexes", version="test")
+    monkeypatch.setattr(file_cache, "_index_store", store)
+    return store
+
+
+class TestDerivedIndexStore:
+    def test_metadata_round_trips_through_mmapped_files(self, temp_dir):
+        from lorax.cache.index_store import DerivedIndexStore
+        from lorax.metadata.loader import _build_metadata_array_result
+
+        store = DerivedIndexStore(temp_dir, version="1")
+        metadata_array = _build_metadata_array_result(
+            [3, 4, 5], ["EUR", "AFR"], np.array([0, 1, 0], dtype=np.uint32)
+        )
+        value_index = {
+            "EUR": np.array([3, 5], dtype=np.int32),
+            "AFR": np.array([4], dtype=np.int32),
+        }
+        name_map = {"tsk_3": 3, "tsk_4": 4}
+        key = "population:value_to_sample_nodes:individual,node:name"
+
+        assert store.save_metadata("abc", "population:array", metadata_array)
+        assert store.save_metadata("abc", key, value_index)
+        assert store.save_metadata("abc", "sample_name_map:name", name_map)
+        assert not store.save_metadata("abc", "population", {"tsk_3": "EUR"})
+
+        assert store.load_metadata("abc", "population:array") == metadata_array
+        loaded_index = store.load_metadata("abc", key)
+        assert isinstance(loaded_index["EUR"].base, np.memmap)
+        assert {k: v.tolist() for k, v in loaded_index.items()} == {"EUR": [3, 5], "AFR": [4]}
+        assert store.load_metadata("abc", "sample_name_map:name") == name_map
+
+        # Another Lorax version or file content starts clean.
+        assert DerivedIndexStore(temp_dir, version="2").load_metadata("abc", key) is None
+        assert store.load_metadata("def", key) is None
+
+    def test_unreadable_entry_is_discarded(self, temp_dir):
+        from lorax.cache.index_store import DerivedIndexStore
+
+        store = DerivedIndexStore(temp_dir, version="1")
+        store.save_metadata("abc", "sample_name_map:name", {"a": 1})
+        entry_dir = next(store.file_dir("abc").iterdir())
+        (entry_dir / "names.arrow").write_bytes(b"garbage")
+
+        assert store.load_metadata("abc", "sample_name_map:name") is None
+        assert not entry_dir.exists()
+        assert store.get_stats()["errors"] == 1
+
+    def test_size_cap_evicts_least_recently_used_fingerprints(self, temp_dir):
+        import os
+
+        from lorax.cache.index_store import DerivedIndexStore
+
+        names = {f"tsk_{i}": i for i in range(2000)}
+        (temp_dir / "0.0.1" / "old").mkdir(parents=True)
+        store = DerivedIndexStore(temp_dir, version="1")
+        store.save_metadata("a", "sample_name_map:name", names)
+        entry_bytes = store.get_stats()["total_bytes"]
+        assert not (temp_dir / "0.0.1").exists()
+        assert store.get_stats()["stale_versions_removed"] == 1
+
+        store = DerivedIndexStore(temp_dir, version="1", max_bytes=int(entry_bytes * 2.5))
+        store.save_metadata("b", "sample_name_map:name", names)
+        os.utime(store.file_dir("a"), (0, 0))
+        os.utime(store.file_dir("b"), (1, 1))
+        assert store.load_metadata("a", "sample_name_map:name") == names
+        store.save_metadata("c", "sample_name_map:name", names)
+
+        assert store.file_dir("a").exists()
+        assert not store.file_dir("b").exists()
+        assert store.file_dir("c").exists()
+        assert store.get_stats()["evictions"] == 1
+        assert store.get_stats()["total_bytes"] <= store.max_bytes
+
+    def test_fingerprint_is_memoized_by_path_size_and_mtime(self, temp_dir):
+        import os
+
+        from lorax.cache import file_context
+        from lorax.cache.index_store import DerivedIndexStore
+
+        data = temp_dir / "data.trees"
+        data.write_bytes(b"first")
+        store = DerivedIndexStore(temp_dir / "indexes", version="1")
+        first = store.fingerprint(str(data))
+
+        file_context._fingerprint_memo.clear()
+        restarted = DerivedIndexStore(temp_dir / "indexes", version="1")
+        with patch.object(file_context.hashlib, "sha256", side_effect=AssertionError("rehashed")):
+            assert restarted.fingerprint(str(data)) == first
+
+        data.write_bytes(b"second")
+        os.utime(data, ns=(1, 1))
+        assert restarted.fingerprint(str(data)) != first
+
+
+class TestFileContextPersistence:
+    @pytest.mark.asyncio
+    async def test_reload_reuses_config_and_metadata(self, minimal_ts_file, index_store):
+        from lorax.cache import evict_file, get_file_context
+        from lorax.handlers import _get_sample_name_mapping, _get_value_to_sample_nodes_index
+        from lorax.metadata.loader import get_metadata_array_for_key
+
+        path = str(minimal_ts_file)
+        evict_file(path)
+        ctx = await get_file_context(path)
+        expected_config = ctx.config
+        expected_array = get_metadata_array_for_key(ctx, "sample")
+        expected_index = _get_value_to_sample_nodes_index(ctx, "sample")
+        expected_names = _get_sample_name_mapping(ctx)
+        evict_file(path)
+
+        with patch(
+            "lorax.loaders.loader.compute_config", side_effect=AssertionError("recomputed")
+        ), patch(
+            "lorax.metadata.loader.ensure_json_dict", side_effect=AssertionError("decoded")
+        ):
+            ctx = await get_file_context(path)
+            assert ctx.config == expected_config
+            assert get_metadata_array_for_key(ctx, "sample") == expected_array
+            index = _get_value_to_sample_nodes_index(ctx, "sample")
+            assert index.keys() == expected_index.keys()
+            assert all(np.array_equal(index[k], expected_index[k]) for k in index)
+            assert _get_sample_name_mapping(ctx) == expected_names
+        evict_file(path)
+
+    @pytest.mark.asyncio
+    async def test_same_content_elsewhere_gets_its_own_path_fields(
+        self, minimal_ts_file, index_store, temp_dir
+    ):
+        from lorax.cache import evict_file, get_file_context
+
+        original = await get_file_context(str(minimal_ts_file))
+        copy_path = temp_dir / "Other" / "copy.trees"
+        copy_path.parent.mkdir()
+        shutil.copy(minimal_ts_file, copy_path)
+
+        copy = await get_file_context(str(copy_path))
+        assert copy.content_fingerprint() == original.content_fingerprint()
+        assert index_store.get_stats()["hits"] >= 1
+        assert copy.config["filename"] == "copy.trees"
+        assert copy.config["project"] == "Other"
+        assert copy.config["intervals"] == original.config["intervals"]
+        evict_file(str(minimal_ts_file))
+        evict_file(str(copy_path))
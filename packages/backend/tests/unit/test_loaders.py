@@ -223,6 +223,155 @@ class TestFileContextCaching:
         ctx2 = await get_file_context(str(minimal_ts_file))
         assert ctx2 is not ctx  # New object after cache clear
 
+    @pytest.mark.asyncio
+    async def test_file_context_size_counts_metadata_and_columns(self, minimal_ts_file):
+        """Test that FileContext size estimates grow with cached data."""
+        import numpy as np
+
+        from lorax.cache import get_file_context
+        from lorax.cache.file_cache import _file_cache
+
+        _file_cache.cache.clear()
+        ctx = await get_file_context(str(minimal_ts_file))
+        before = ctx.size_breakdown()
+        assert before["tree_sequence"] == ctx.tree_sequence.nbytes
+        assert before["metadata"] == 0
+
+        ctx.set_metadata("group:array", {"indices": np.zeros(1000, dtype=np.int32)})
+        ctx.tree_sequence.mutations_derived_state
+        after = ctx.size_breakdown()
+        assert after["metadata"] >= 4000
+        assert after["column_views"] >= before["column_views"]
+        assert ctx.nbytes == sum(after.values())
+
+        ctx.clear_metadata()
+        assert ctx.size_breakdown()["metadata"] == 0
+
+    @pytest.mark.asyncio
+    async def test_tsz_is_decompressed_once(self, minimal_ts, temp_dir, monkeypatch):
+        """Test that reloads of a .tsz read the decompressed disk cache copy."""
+        import asyncio
+
+        import tszip
+        from unittest.mock import patch
+
+        from lorax.cache import evict_file, get_file_context
+        from lorax.cache import file_cache
+        from lorax.cache.disk import DiskCacheManager
+
+        manager = DiskCacheManager(cache_dir=temp_dir / "cache", max_size_bytes=10**9)
+        monkeypatch.setattr(file_cache, "_tsz_cache", manager)
+        tsz_file = temp_dir / "sample.trees.tsz"
+        tszip.compress(minimal_ts, str(tsz_file))
+
+        store_derived = manager.store_derived
+        release = asyncio.Event()
+
+        async def _slow_store(*args, **kwargs):
+            await release.wait()
+            return await store_derived(*args, **kwargs)
+
+        monkeypatch.setattr(manager, "store_derived", _slow_store)
+        # The load returns before its decompressed copy is written.
+        ctx = await get_file_context(str(tsz_file))
+        assert ctx is not None
+        assert (await manager.get_stats())["file_count"] == 0
+        release.set()
+        await file_cache.drain_decompressed_stores()
+        assert (await manager.get_stats())["file_count"] == 1
+        evict_file(str(tsz_file))
+
+        with patch("lorax.cache.file_cache.tszip.load", side_effect=AssertionError):
+            reloaded = await get_file_context(str(tsz_file))
+        assert reloaded is not ctx
+        assert reloaded.tree_sequence.equals(minimal_ts)
+        evict_file(str(tsz_file))
+
+    @pytest.mark.asyncio
+    async def test_cache_misses_reserve_memory_unless_already_admitted(
+        self, minimal_ts_file, monkeypatch
+    ):
+        """Test that reloads outside load_file go through the load admission hook."""
+        from contextlib import asynccontextmanager
+
+        from lorax.cache import evict_file, get_file_context, load_admitted
+        from lorax.cache import file_cache
+
+        admitted = []
+
+        @asynccontextmanager
+        async def admit(file_path):
+            admitted.append(file_path)
+            yield
+
+        monkeypatch.setattr(file_cache, "_load_admission", admit)
+        evict_file(str(minimal_ts_file))
+
+        assert await get_file_context(str(minimal_ts_file)) is not None
+        assert admitted == [str(minimal_ts_file)]
+        # Cache hits need no admission.
+        assert await get_file_context(str(minimal_ts_file)) is not None
+        assert len(admitted) == 1
+
+        evict_file(str(minimal_ts_file))
+        with load_admitted():
+            assert await get_file_context(str(minimal_ts_file)) is not None
+        assert len(admitted) == 1
+        evict_file(str(minimal_ts_file))
+
+    @pytest.mark.asyncio
+    async def test_estimate_load_bytes_by_format(self, minimal_ts, temp_dir):
+        """Test load memory estimates for .trees, .tsz and already-loaded files."""
+        import tszip
+
+        from lorax.cache import estimate_load_bytes, evict_file, get_file_context
+        from lorax.cache import file_cache
+
+        trees_file = temp_dir / "estimate.trees"
+        minimal_ts.dump(str(trees_file))
+        tsz_file = temp_dir / "estimate.tsz"
+        tszip.compress(minimal_ts, str(tsz_file))
+
+        trees_estimate = await estimate_load_bytes(str(trees_file))
+        assert trees_estimate == int(trees_file.stat().st_size * file_cache.LOAD_PEAK_FACTOR_TREES)
+
+        # .tsz estimates come from the uncompressed array sizes in the archive.
+        table_bytes = file_cache._tsz_table_bytes(str(tsz_file))
+        assert table_bytes >= minimal_ts.tables.nbytes // 2
+        assert await estimate_load_bytes(str(tsz_file)) == int(
+            tsz_file.stat().st_size + table_bytes * file_cache.LOAD_PEAK_FACTOR_TSZ_TABLES
+        )
+
+        assert await get_file_context(str(trees_file)) is not None
+        assert await estimate_load_bytes(str(trees_file)) == 0
+        evict_file(str(trees_file))
+        assert await estimate_load_bytes(str(temp_dir / "missing.trees")) == 0
+
+    def test_byte_budget_evicts_least_recently_used(self):
+        """Test that the file cache honours a byte ceiling as well as a count."""
+        from lorax.cache.lru import LRUCacheWithMeta
+
+        cache = LRUCacheWithMeta(max_size=5, max_bytes=100, sizeof=len)
+        cache.set("a", "x" * 40, meta=1)
+        cache.set("b", "x" * 40, meta=1)
+        cache.get("a")
+        cache.set("c", "x" * 40, meta=1)
+
+        assert list(cache.cache) == ["a", "c"]
+        assert cache.total_bytes == 80
+        assert cache.evictions == 1
+
+        # An entry that grows in place is re-measured on refresh.
+        grown = "x" * 90
+        cache.cache["a"] = (grown, 1)
+        cache.get("a")
+        cache.refresh_size("a")
+        assert list(cache.cache) == ["a"]
+
+        # The newest entry is kept even when it alone exceeds the budget.
+        cache.set("big", "x" * 500)
+        assert list(cache.cache) == ["big"]
+
 
 class TestLoaderEdgeCases:
     """Tests for loader edge cases."""
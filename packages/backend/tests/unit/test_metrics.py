@@ -0,0 +1,99 @@
+"""
+Unit tests for the Prometheus metrics registry.
+"""
+
+import pytest
+
+
+class TestRegistry:
+    @pytest.mark.asyncio
+    async def test_histogram_buckets_are_cumulative(self):
+        from lorax.metrics import MetricsRegistry, sample
+
+        registry = MetricsRegistry()
+        latency = registry.histogram(
+            "test_latency_seconds", "Test latency.", ("event",), buckets=(0.01, 0.1, 1.0)
+        )
+        for seconds in (0.0078125, 0.0625, 0.0625, 4.0):
+            latency.observe(seconds, event="details")
+        registry.add_collector(
+            lambda: [sample("test_queue_depth", "gauge", "Test depth.", 3, queue='a"b')]
+        )
+
+        async def _broken():
+            raise RuntimeError("stats unavailable")
+
+        registry.add_collector(_broken)
+        text = await registry.render()
+
+        assert "# TYPE test_latency_seconds histogram" in text
+        assert 'test_latency_seconds_bucket{event="details",le="0.01"} 1' in text
+        assert 'test_latency_seconds_bucket{event="details",le="0.1"} 3' in text
+        assert 'test_latency_seconds_bucket{event="details",le="1"} 3' in text
+        assert 'test_latency_seconds_bucket{event="details",le="+Inf"} 4' in text
+        assert 'test_latency_seconds_count{event="details"} 4' in text
+        assert 'test_latency_seconds_sum{event="details"} 4.1328125' in text
+        assert 'test_queue_depth{queue="a\\"b"} 3' in text
+        assert latency.count(event="details") == 4
+
+        with pytest.raises(ValueError):
+            latency.observe(1.0, stage="render")
+        with pytest.raises(ValueError):
+            registry.counter("test_latency_seconds", "Duplicate.")
+
+
+class TestSocketEventMetrics:
+    @pytest.mark.asyncio
+    async def test_registered_events_record_latency_outcome_and_bytes(self, socket_harness, mock_sio):
+        from lorax.metrics import bytes_served_total, socket_event_seconds, socket_events_total
+        from lorax.sockets import TimedEvents
+
+        sio = TimedEvents(mock_sio)
+
+        @sio.event
+        async def metrics_test_render(sid, data):
+            if data.get("fail"):
+                return {"error": "bad request"}
+            return {"buffer": b"\x00" * 128, "request_id": 1}
+
+        @sio.event
+        async def metrics_test_crash(sid, data):
+            raise RuntimeError("boom")
+
+        handler = socket_harness._event_handlers["metrics_test_render"]
+        assert handler.__name__ == "metrics_test_render"
+        await handler("socket-1", {})
+        await handler("socket-1", {"fail": True})
+        with pytest.raises(RuntimeError):
+            await socket_harness._event_handlers["metrics_test_crash"]("socket-1", {})
+
+        assert socket_event_seconds.count(event="metrics_test_render") == 2
+        assert socket_events_total.value(event="metrics_test_render", outcome="ok") == 1
+        assert socket_events_total.value(event="metrics_test_render", outcome="error") == 1
+        assert socket_events_total.value(event="metrics_test_crash", outcome="exception") == 1
+        assert bytes_served_total.value(event="metrics_test_render") == 128
+
+    @pytest.mark.asyncio
+    async def test_emitted_payloads_count_bytes_and_errors(self, socket_harness, mock_sio):
+        from lorax.metrics import bytes_served_total, socket_emits_total, socket_events_total
+        from lorax.sockets import TimedEvents
+
+        sio = TimedEvents(mock_sio)
+
+        @sio.event
+        async def metrics_test_emitter(sid, data):
+            if data.get("fail"):
+                await sio.emit("metrics-test-result", {"error": "not found"}, to=sid)
+                return
+            await sio.emit("metrics-test-result", {"buffer": b"\x00" * 64}, to=sid)
+
+        handler = socket_harness._event_handlers["metrics_test_emitter"]
+        await handler("socket-1", {})
+        await handler("socket-1", {"fail": True})
+
+        assert len(socket_harness.get_emitted("metrics-test-result")) == 2
+        assert bytes_served_total.value(event="metrics-test-result") == 64
+        assert socket_emits_total.value(event="metrics-test-result", outcome="ok") == 1
+        assert socket_emits_total.value(event="metrics-test-result", outcome="error") == 1
+        assert socket_events_total.value(event="metrics_test_emitter", outcome="ok") == 1
+        assert socket_events_total.value(event="metrics_test_emitter", outcome="error") == 1
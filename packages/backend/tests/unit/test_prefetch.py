@@ -0,0 +1,95 @@
+"""
+Unit tests for pinned-file prefetch and eviction exemption.
+"""
+
+import pytest
+
+
+def test_parse_pin_list():
+    from lorax.cache.prefetch import PinnedFile, parse_pin_list
+
+    pins = parse_pin_list(" Demo/a.trees, /Demo/b.tsz/ ,bad,, Demo/a.trees")
+    assert pins == [PinnedFile("Demo", "a.trees"), PinnedFile("Demo", "b.tsz")]
+    assert pins[1].blob_path == "Demo/b.tsz"
+
+
+@pytest.mark.asyncio
+async def test_prefetch_warms_and_pins_file_context(temp_dir, minimal_ts):
+    from lorax.cache import get_file_cache_status, unpin_file
+    from lorax.cache.file_cache import _file_cache
+    from lorax.cache.prefetch import FilePrefetcher, PinnedFile
+
+    (temp_dir / "Demo").mkdir()
+    minimal_ts.dump(str(temp_dir / "Demo" / "flagship.trees"))
+    pins = [PinnedFile("Demo", "flagship.trees"), PinnedFile("Demo", "missing.trees")]
+    prefetcher = FilePrefetcher(temp_dir, pins=pins)
+
+    await prefetcher.start()
+    snapshot = prefetcher.snapshot()
+    assert snapshot["files"]["Demo/flagship.trees"]["state"] == "warm"
+    assert snapshot["files"]["Demo/missing.trees"]["state"] == "failed"
+
+    flagship = str(temp_dir / "Demo" / "flagship.trees")
+    try:
+        status = get_file_cache_status()
+        assert flagship in status["pinned"]
+        assert any(e["pinned"] for e in status["entries"] if e["file_path"] == flagship)
+    finally:
+        unpin_file(flagship)
+        _file_cache.remove(flagship)
+
+
+@pytest.mark.asyncio
+async def test_prefetch_holds_bulk_slot_only_around_the_load(temp_dir, minimal_ts, monkeypatch):
+    from lorax.cache import unpin_file
+    from lorax.cache import prefetch as prefetch_module
+    from lorax.cache.file_cache import _file_cache
+    from lorax.cache.prefetch import FilePrefetcher, PinnedFile
+    from lorax.cloud import gcs_utils
+    from lorax.scheduling import BULK, INTERACTIVE, VIEWPORT, PriorityScheduler
+
+    scheduler = PriorityScheduler(
+        {INTERACTIVE: 1, VIEWPORT: 1, BULK: 1}, max_concurrency=1
+    )
+    running = []
+
+    async def download(bucket_name, blob_path, local_path):
+        running.append(("download", scheduler.snapshot()["classes"][BULK]["running"]))
+        (temp_dir / "Demo").mkdir(exist_ok=True)
+        minimal_ts.dump(local_path)
+
+    async def load(path):
+        running.append(("load", scheduler.snapshot()["classes"][BULK]["running"]))
+        return await real_load(path)
+
+    real_load = prefetch_module.get_file_context
+    monkeypatch.setattr(gcs_utils, "download_gcs_file", download)
+    monkeypatch.setattr(prefetch_module, "get_file_context", load)
+    prefetcher = FilePrefetcher(
+        temp_dir, bucket_name="bucket", pins=[PinnedFile("Demo", "remote.trees")],
+        scheduler=scheduler,
+    )
+
+    await prefetcher.start()
+    flagship = str(temp_dir / "Demo" / "remote.trees")
+    try:
+        assert prefetcher.snapshot()["files"]["Demo/remote.trees"]["state"] == "warm"
+        assert running == [("download", 0), ("load", 1)]
+    finally:
+        unpin_file(flagship)
+        _file_cache.remove(flagship)
+
+
+def test_pinned_entries_survive_count_and_byte_limits():
+    from lorax.cache.lru import LRUCacheWithMeta
+
+    cache = LRUCacheWithMeta(max_size=2, max_bytes=100, sizeof=len)
+    cache.pin("demo")
+    cache.set("demo", "x" * 50)
+    cache.set("a", "x" * 10)
+    cache.set("b", "x" * 10)
+    assert list(cache.cache) == ["demo", "b"]
+
+    cache.set("big", "x" * 80)
+    assert list(cache.cache) == ["demo", "big"]
+    assert cache.total_bytes > cache.max_bytes
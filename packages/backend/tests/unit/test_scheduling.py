@@ -0,0 +1,97 @@
+"""
+Unit tests for priority scheduling of socket work.
+"""
+
+import asyncio
+
+import pytest
+
+
+def _scheduler(interactive=2, viewport=1, bulk=1, total=2):
+    from lorax.scheduling import BULK, INTERACTIVE, VIEWPORT, PriorityScheduler
+
+    return PriorityScheduler(
+        {INTERACTIVE: interactive, VIEWPORT: viewport, BULK: bulk},
+        max_concurrency=total,
+    )
+
+
+class TestPriorityScheduler:
+    @pytest.mark.asyncio
+    async def test_freed_slots_go_to_highest_priority_first(self):
+        from lorax.scheduling import BULK, INTERACTIVE, VIEWPORT
+
+        scheduler = _scheduler()
+        order = []
+        releases = {}
+
+        async def job(name, priority):
+            releases[name] = asyncio.Event()
+            async with scheduler.slot(priority):
+                order.append(name)
+                await releases[name].wait()
+
+        tasks = [
+            asyncio.create_task(job("bulk-1", BULK)),
+            asyncio.create_task(job("viewport-1", VIEWPORT)),
+        ]
+        await asyncio.sleep(0)
+        for name, priority in (
+            ("bulk-2", BULK),
+            ("viewport-2", VIEWPORT),
+            ("interactive-1", INTERACTIVE),
+        ):
+            tasks.append(asyncio.create_task(job(name, priority)))
+        await asyncio.sleep(0.01)
+        assert order == ["bulk-1", "viewport-1"]
+        assert scheduler.snapshot()["classes"][BULK]["queued"] == 1
+
+        for name in ("bulk-1", "viewport-1", "interactive-1", "viewport-2", "bulk-2"):
+            releases[name].set()
+            await asyncio.sleep(0.01)
+        await asyncio.gather(*tasks)
+
+        assert order == ["bulk-1", "viewport-1", "interactive-1", "viewport-2", "bulk-2"]
+        snapshot = scheduler.snapshot()["classes"]
+        assert snapshot[INTERACTIVE]["completed"] == 1
+        assert snapshot[BULK]["started"] == 2
+        assert snapshot[BULK]["queue_wait_ms"]["count"] == 2
+        assert snapshot[INTERACTIVE]["queue_wait_ms"]["p99"] > 0
+        assert all(s["running"] == 0 and s["queued"] == 0 for s in snapshot.values())
+
+    @pytest.mark.asyncio
+    async def test_class_limit_leaves_room_for_other_classes(self):
+        from lorax.scheduling import BULK, INTERACTIVE
+
+        scheduler = _scheduler(total=4)
+        hold = asyncio.Event()
+
+        async def bulk_job():
+            async with scheduler.slot(BULK):
+                await hold.wait()
+
+        bulk = [asyncio.create_task(bulk_job()) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        bulk_stats = scheduler.snapshot()["classes"][BULK]
+        assert (bulk_stats["limit"], bulk_stats["running"], bulk_stats["queued"]) == (1, 1, 2)
+
+        # Interactive work runs immediately despite the bulk backlog.
+        async with scheduler.slot(INTERACTIVE):
+            pass
+
+        # A cancelled waiter leaves the queue without taking a slot.
+        bulk[2].cancel()
+        await asyncio.sleep(0)
+        assert scheduler.snapshot()["classes"][BULK]["queued"] == 1
+
+        hold.set()
+        await asyncio.gather(*bulk[:2])
+        assert scheduler.snapshot()["classes"][BULK]["completed"] == 2
+
+        with pytest.raises(RuntimeError):
+            async with scheduler.slot(BULK):
+                raise RuntimeError("boom")
+        assert scheduler.snapshot()["classes"][BULK]["failed"] == 1
+        with pytest.raises(ValueError):
+            async with scheduler.slot("background"):
+                pass
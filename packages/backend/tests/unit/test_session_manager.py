@@ -5,11 +5,12 @@ Tests session creation, serialization, socket tracking,
 and connection limit enforcement.
 """
 
+import asyncio
 import pytest
 import json
 from datetime import datetime, timezone, timedelta
 from types import SimpleNamespace
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 from fastapi import Response
 
@@ -305,3 +306,221 @@ class TestSessionManagerRedis:
         """Test health check with Redis backend."""
         result = await session_manager_redis.health_check()
         assert result is True
+
+
+async def _wait_until_live(manager):
+    for _ in range(100):
+        if manager.get_cache_stats()["live"]:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("invalidation subscription did not start")
+
+
+class TestSessionLocalCache:
+    """Tests for the local read-through cache in front of Redis."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_reads_skip_redis_until_another_instance_writes(self, mock_redis):
+        from lorax.session_manager import SessionManager
+
+        instance_a = SessionManager(redis_client=mock_redis)
+        instance_b = SessionManager(redis_client=mock_redis)
+        instance_a.start()
+        instance_b.start()
+        try:
+            await _wait_until_live(instance_a)
+            await _wait_until_live(instance_b)
+            session = await instance_b.create_session()
+
+            redis_get = AsyncMock(wraps=mock_redis.get)
+            mock_redis.get = redis_get
+            first = await instance_a.get_session(session.sid)
+            first.file_path = "/not/saved.trees"
+            first.socket_connections["socket-x"] = "2024-01-01T00:00:00+00:00"
+            second = await instance_a.get_session(session.sid)
+            assert redis_get.await_count == 1
+            # Unsaved changes to a returned session do not leak into the cache.
+            assert second.file_path is None
+            assert second.socket_connections == {}
+
+            # The session moves to instance B, which loads a file.
+            moved = await instance_b.get_session(session.sid)
+            moved.file_path = "/data/moved.trees"
+            moved.add_socket("socket-b")
+            await instance_b.save_session(moved)
+            await asyncio.sleep(0.01)
+
+            current = await instance_a.get_session(session.sid)
+            assert current.file_path == "/data/moved.trees"
+            assert "socket-b" in current.socket_connections
+            assert redis_get.await_count == 2
+
+            stats = instance_a.get_cache_stats()
+            assert stats["hits"] == 1
+            assert stats["invalidations"] == 1
+        finally:
+            await instance_a.stop()
+            await instance_b.stop()
+
+    @pytest.mark.asyncio
+    async def test_lost_subscription_drops_local_copies(self, mock_redis, monkeypatch):
+        from lorax import session_manager as session_module
+        from lorax.session_manager import SessionManager
+
+        monkeypatch.setattr(session_module, "_INVALIDATION_RETRY_SEC", 0.01)
+        subscriptions = []
+        make_pubsub = mock_redis.pubsub
+
+        def _pubsub():
+            subscriptions.append(make_pubsub())
+            return subscriptions[-1]
+
+        mock_redis.pubsub = _pubsub
+        manager = SessionManager(redis_client=mock_redis)
+        manager.start()
+        try:
+            await _wait_until_live(manager)
+            session = await manager.create_session()
+            assert manager.get_cache_stats()["entries"] == 1
+
+            subscriptions[-1]._disconnect(ConnectionError("connection reset"))
+            await asyncio.sleep(0)
+            assert manager.get_cache_stats()["entries"] == 0
+            assert (await manager.get_session(session.sid)).sid == session.sid
+            assert manager.get_cache_stats()["entries"] == 0
+
+            await _wait_until_live(manager)
+            assert manager.get_cache_stats()["resubscribes"] == 1
+            await manager.get_session(session.sid)
+            assert manager.get_cache_stats()["entries"] == 1
+        finally:
+            await manager.stop()
+
+    @pytest.mark.asyncio
+    async def test_client_without_pubsub_reads_through_to_redis(self, mock_redis):
+        from lorax.session_manager import SessionManager
+
+        mock_redis.pubsub = None
+        manager = SessionManager(redis_client=mock_redis)
+        manager.start()
+        try:
+            await asyncio.wait_for(manager._invalidation_task, timeout=1)
+            stats = manager.get_cache_stats()
+            assert stats["pubsub_unavailable"] is True
+            assert stats["live"] is False
+
+            session = await manager.create_session()
+            redis_get = AsyncMock(wraps=mock_redis.get)
+            mock_redis.get = redis_get
+            await manager.get_session(session.sid)
+            await manager.get_session(session.sid)
+            assert redis_get.await_count == 2
+            assert manager.get_cache_stats()["hits"] == 0
+        finally:
+            await manager.stop()
+
+    @pytest.mark.asyncio
+    async def test_failing_pubsub_call_is_retried(self, mock_redis, monkeypatch):
+        from lorax import session_manager as session_module
+        from lorax.session_manager import SessionManager
+
+        monkeypatch.setattr(session_module, "_INVALIDATION_RETRY_SEC", 0.01)
+        make_pubsub = mock_redis.pubsub
+        calls = []
+
+        def _pubsub():
+            calls.append(None)
+            if len(calls) == 1:
+                raise ConnectionError("cluster not ready")
+            return make_pubsub()
+
+        mock_redis.pubsub = _pubsub
+        manager = SessionManager(redis_client=mock_redis)
+        manager.start()
+        try:
+            await _wait_until_live(manager)
+            assert len(calls) == 2
+            assert manager.get_cache_stats()["resubscribes"] == 1
+        finally:
+            await manager.stop()
+
+    @pytest.mark.asyncio
+    async def test_cluster_client_subscribes_through_one_node(self, mock_redis, monkeypatch):
+        import redis.asyncio
+
+        from lorax.session_manager import SessionManager
+
+        class _Cluster:
+            """Commands but no pubsub(), like redis-py 5.2's async RedisCluster."""
+
+            def __init__(self, backend):
+                self._backend = backend
+
+            def __getattr__(self, name):
+                if name == "pubsub":
+                    raise AttributeError(name)
+                return getattr(self._backend, name)
+
+            async def initialize(self):
+                return self
+
+            def get_default_node(self):
+                return SimpleNamespace(
+                    connection_class=redis.asyncio.Connection,
+                    connection_kwargs={"host": "node-1", "port": 7000},
+                )
+
+        node_clients = []
+
+        class _NodeClient:
+            def __init__(self, connection_pool):
+                self.connection_kwargs = connection_pool.connection_kwargs
+                self.closed = False
+                node_clients.append(self)
+
+            def pubsub(self):
+                return mock_redis.pubsub()
+
+            async def aclose(self):
+                self.closed = True
+
+        monkeypatch.setattr(redis.asyncio, "Redis", _NodeClient)
+        cluster_a = SessionManager(redis_client=_Cluster(mock_redis))
+        cluster_b = SessionManager(redis_client=_Cluster(mock_redis))
+        cluster_a.start()
+        try:
+            await _wait_until_live(cluster_a)
+            kwargs = node_clients[0].connection_kwargs
+            assert (kwargs["host"], kwargs["port"]) == ("node-1", 7000)
+
+            session = await cluster_b.create_session()
+            await cluster_a.get_session(session.sid)
+            session.file_path = "/data/moved.trees"
+            await cluster_b.save_session(session)
+            await asyncio.sleep(0.01)
+            assert (await cluster_a.get_session(session.sid)).file_path == "/data/moved.trees"
+            assert cluster_a.get_cache_stats()["invalidations"] == 1
+        finally:
+            await cluster_a.stop()
+        assert node_clients[0].closed
+
+    @pytest.mark.asyncio
+    async def test_local_copies_expire(self, mock_redis):
+        from lorax.session_manager import SessionManager
+
+        manager = SessionManager(redis_client=mock_redis, local_cache_seconds=0.05)
+        manager.start()
+        try:
+            await _wait_until_live(manager)
+            session = await manager.create_session()
+            # A write nobody announced, e.g. from an instance without the cache.
+            await mock_redis.setex(
+                f"sessions:{session.sid}",
+                60,
+                json.dumps({**session.to_dict(), "file_path": "/data/direct.trees"}),
+            )
+            assert (await manager.get_session(session.sid)).file_path is None
+            await asyncio.sleep(0.06)
+            assert (await manager.get_session(session.sid)).file_path == "/data/direct.trees"
+        finally:
+            await manager.stop()
@@ -0,0 +1,115 @@
+"""
+Unit tests for cross-session request coalescing.
+"""
+
+import asyncio
+import os
+
+import pytest
+
+
+class TestSingleFlight:
+    @pytest.mark.asyncio
+    async def test_identical_requests_share_one_execution(self, minimal_ts_file):
+        from lorax.cache.singleflight import SingleFlight
+
+        flight = SingleFlight()
+        calls = []
+
+        async def render(tag):
+            calls.append(tag)
+            await asyncio.sleep(0.05)
+            return {"buffer": b"tree", "tag": tag}
+
+        key = flight.key(str(minimal_ts_file), "tree_graph", tree_indices=[0, 1], time_scale="log")
+        same = flight.key(str(minimal_ts_file), "tree_graph", time_scale="log", tree_indices=[0, 1])
+        other = flight.key(str(minimal_ts_file), "tree_graph", tree_indices=[1, 0], time_scale="log")
+        assert key == same != other
+
+        results = await asyncio.gather(
+            *(flight.do(key, lambda: render("a")) for _ in range(5)),
+            flight.do(other, lambda: render("b")),
+        )
+        assert calls == ["a", "b"]
+        assert all(result is results[0] for result in results[:5])
+
+        stats = flight.get_stats()
+        assert stats["in_flight"] == 0
+        assert stats["operations"]["tree_graph"] == {
+            "calls": 6,
+            "executions": 2,
+            "errors": 0,
+            "coalesced": 4,
+            "coalescing_ratio": round(4 / 6, 4),
+        }
+
+        # Completed calls are not cached: the next request runs again.
+        await flight.do(key, lambda: render("c"))
+        assert calls[-1] == "c"
+
+    @pytest.mark.asyncio
+    async def test_errors_propagate_and_cancelled_waiters_do_not_cancel_work(self, temp_dir):
+        from lorax.cache.singleflight import SingleFlight
+
+        flight = SingleFlight()
+        path = temp_dir / "a.trees"
+        path.write_bytes(b"x")
+
+        async def fail():
+            await asyncio.sleep(0.02)
+            raise ValueError("bad tree")
+
+        key = flight.key(str(path), "compare_trees")
+        outcomes = await asyncio.gather(
+            flight.do(key, fail), flight.do(key, fail), return_exceptions=True
+        )
+        assert all(isinstance(outcome, ValueError) for outcome in outcomes)
+        assert flight.get_stats()["operations"]["compare_trees"]["errors"] == 1
+
+        async def slow():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        leader = asyncio.create_task(flight.do(key, slow))
+        follower = asyncio.create_task(flight.do(key, slow))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        assert await follower == "done"
+
+        # A rewritten file is a different request.
+        os.utime(path, ns=(0, 10**9))
+        assert flight.key(str(path), "compare_trees") != key
+
+    @pytest.mark.asyncio
+    async def test_request_joining_abandoned_work_runs_again(self, temp_dir):
+        from lorax.cache.singleflight import SingleFlight
+        from lorax.cancellation import RequestCancelled
+
+        flight = SingleFlight()
+        path = temp_dir / "a.trees"
+        path.write_bytes(b"x")
+        key = flight.key(str(path), "tree_graph")
+        superseded = [False]
+        frames = []
+        newest = []
+
+        async def render():
+            await asyncio.sleep(0.02)
+            if not frames and flight.abandoned(key):
+                # The newest request arrives as the abandoned work stops.
+                newest.append(asyncio.ensure_future(
+                    flight.do(key, render, cancelled=lambda: False)
+                ))
+                raise RequestCancelled("superseded")
+            frames.append("frame")
+            return "frame"
+
+        stale = asyncio.create_task(
+            flight.do(key, render, cancelled=lambda: superseded[0])
+        )
+        await asyncio.sleep(0)
+        superseded[0] = True
+        with pytest.raises(RequestCancelled):
+            await stale
+        assert await newest[0] == "frame"
+        assert flight.get_stats()["operations"]["tree_graph"]["executions"] == 2
@@ -52,3 +52,89 @@ class TestTreeGraphCacheStore:
 
         retrieved = await cache.get("sid-expired", 1)
         assert retrieved is None
+
+
+def _tree_graph(num_nodes: int):
+    import numpy as np
+
+    from lorax.tree_graph import TreeGraph
+
+    return TreeGraph(
+        parent=np.full(num_nodes, -1, dtype=np.int32),
+        time=np.zeros(num_nodes, dtype=np.float32),
+        children_indptr=np.zeros(num_nodes + 1, dtype=np.int32),
+        children_data=np.zeros(0, dtype=np.int32),
+        x=np.zeros(num_nodes, dtype=np.float32),
+        y=np.zeros(num_nodes, dtype=np.float32),
+        in_tree=np.ones(num_nodes, dtype=np.bool_),
+    )
+
+
+class TestSharedTreeGraphTier:
+    @pytest.mark.asyncio
+    async def test_sessions_share_arrays_but_not_adaptive_state(self):
+        from lorax.cache.tree_graph import TreeGraphCache
+
+        cache = TreeGraphCache()
+        key = ("file", "/data/a.trees", 1.0, 7)
+        graph = _tree_graph(100)
+        await cache.set("sid-1", 7, graph, content_key=key)
+
+        assert await cache.get("sid-2", 7) is None
+        shared = await cache.get("sid-2", 7, content_key=key)
+        assert shared is not None
+        assert shared.parent is graph.parent
+        shared.last_outside_cell_size = 0.01
+        first = await cache.get("sid-1", 7)
+        assert first.last_outside_cell_size is None
+
+        stats = cache.get_stats()
+        assert stats["sessions"] == 2
+        assert stats["shared"]["graphs"] == 1
+        assert stats["shared"]["bytes"] == graph.nbytes
+        assert stats["shared"]["hits"] == 1
+
+        # A rebuilt copy does not replace the graph other sessions share.
+        await cache.set("sid-3", 7, _tree_graph(100), content_key=key)
+        third = await cache.get("sid-3", 7)
+        assert third.parent is graph.parent
+
+    @pytest.mark.asyncio
+    async def test_byte_budget_evicts_lru_graphs_and_their_references(self):
+        from lorax.cache.tree_graph import TreeGraphCache
+
+        size = _tree_graph(100).nbytes
+        cache = TreeGraphCache(shared_max_bytes=2 * size)
+        keys = [("file", "/data/a.trees", 1.0, index) for index in range(3)]
+        await cache.set("sid-1", 0, _tree_graph(100), content_key=keys[0])
+        await cache.set("sid-2", 1, _tree_graph(100), content_key=keys[1])
+        await cache.get("sid-1", 0)
+        await cache.set("sid-2", 2, _tree_graph(100), content_key=keys[2])
+
+        stats = cache.get_stats()["shared"]
+        assert stats["graphs"] == 2
+        assert stats["bytes"] == 2 * size
+        assert stats["evictions"] == 1
+        assert await cache.get("sid-2", 1) is None
+        assert await cache.get("sid-1", 0) is not None
+
+        oversized = _tree_graph(1_000)
+        await cache.set("sid-1", 5, oversized, content_key=("big",))
+        assert await cache.get("sid-1", 5) is oversized
+        assert cache.get_stats()["shared"]["graphs"] == 2
+
+    @pytest.mark.asyncio
+    async def test_session_eviction_keeps_shared_graph_for_others(self):
+        from lorax.cache.tree_graph import TreeGraphCache
+
+        cache = TreeGraphCache()
+        key = ("csr", "fingerprint", "linear", 3)
+        await cache.set("sid-1", 3, _tree_graph(10), content_key=key)
+
+        assert await cache.evict_not_visible("sid-1", set()) == 1
+        await cache.clear_session("sid-1")
+        assert await cache.get("sid-2", 3, content_key=key) is not None
+
+        await cache.discard_shared(key)
+        assert await cache.get("sid-2", 3) is None
+        assert cache.get_stats()["shared"]["bytes"] == 0
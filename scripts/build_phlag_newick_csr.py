@@ -11,20 +11,28 @@ Newick artifacts the stored values are branch heights, not times: for a node,
 ``tree_height - cumulative_distance_from_root``.  Parent-child differences
 therefore exactly preserve the input Newick branch lengths, including for
 non-ultrametric trees.
+
+With ``--workers N`` the input is streamed once to plan shard boundaries and
+sample IDs, and whole shards are parsed and written by N processes.  The
+output is byte-identical to a single-process build.
 """
 
 from __future__ import annotations
 
 import argparse
 import contextlib
+import functools
 import gzip
 import json
+import multiprocessing
 import os
 import re
 import shutil
 import sys
 import time
 import uuid
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Iterator
 
@@ -37,7 +45,6 @@ if str(BACKEND_DIRECTORY) not in sys.path:
 
 with contextlib.redirect_stdout(sys.stderr):
     import pyarrow as pa  # noqa: E402
-    from ete3 import Tree  # noqa: E402
     from lorax.artifacts.csr_builder import (  # noqa: E402
         CSR_ARTIFACT_V2_FORMAT,
         CSR_ARTIFACT_V2_SCHEMA_VERSION,
@@ -45,6 +52,9 @@ with contextlib.redirect_stdout(sys.stderr):
         MUTATION_TYPE,
         SHARD_INDEX_SCHEMA,
         _checksum,
+        _child_csr,
+        _list_array,
+        _parallel_start_method,
         _write_json_atomic,
         _write_shard,
         artifact_path_for_source,
@@ -125,81 +135,190 @@ def newick_rows(path: Path) -> Iterator[tuple[int, str]]:
             yield line_number - 1, newick
 
 
-def _list_array(values: np.ndarray, value_type: pa.DataType) -> pa.Array:
-    return pa.array([values], type=pa.list_(value_type))
+_NEWICK_FLOAT = r"\s*[+-]?\d+\.?\d*(?:[eE][-+]?\d+)?\s*"
+_NEWICK_NHX = r"\[&&NHX:[^\]]*\]"
+# Node data grammar of ete3's format=1 reader, so accepted inputs, names and
+# branch lengths stay identical to the original ete3-based builder.
+_LEAF_DATA = re.compile(
+    rf"^\s*([^():,;]+?)\s*(:{_NEWICK_FLOAT})?\s*({_NEWICK_NHX})?\s*$"
+)
+_INTERNAL_DATA = re.compile(
+    rf"^\s*([^():,;]+?)?\s*(:{_NEWICK_FLOAT})?\s*({_NEWICK_NHX})?\s*$"
+)
+_NEWICK_DISTANCE = re.compile(r"[+-]?\d+\.?\d*(?:[eE][-+]?\d+)?")
+_NEWICK_TOKEN = re.compile(r"[(),]|[^(),]+")
+_LEAF_LABEL = re.compile(r"[(,]([^(),]*)")
+# ete3 assigns this distance to nodes without an explicit branch length.
+DEFAULT_BRANCH_LENGTH = 1.0
+
+
+@dataclass(frozen=True)
+class NewickArrays:
+    """Newick topology in preorder with postorder ranks for internal nodes."""
+
+    parent: np.ndarray
+    branch_length: np.ndarray
+    is_leaf: np.ndarray
+    internal_rank: np.ndarray
+    layout_x: np.ndarray
+    leaf_names: list[str]
+
+
+def _newick_body(newick: str) -> str:
+    text = newick.strip()
+    if not text.endswith(";"):
+        raise ValueError("Malformed Newick tree: missing terminating ';'")
+    if text.startswith("(") and text.count("(") != text.count(")"):
+        raise ValueError("Parentheses do not match. Broken tree structure?")
+    return re.sub("[\n\r\t]+", "", text).rstrip(";")
+
+
+def _node_data(text: str, matcher: re.Pattern[str]) -> tuple[str, float]:
+    if "[" not in text:
+        # Fast path for plain ``name:length`` labels; NHX comments use the regex.
+        name, separator, distance = text.partition(":")
+        name = name.strip()
+        distance = distance.strip()
+        if (
+            (name or matcher is _INTERNAL_DATA)
+            and ";" not in name
+            and (not separator or _NEWICK_DISTANCE.fullmatch(distance))
+        ):
+            return name, float(distance) if separator else DEFAULT_BRANCH_LENGTH
+    data = matcher.match(text.strip())
+    if data is None:
+        raise ValueError(f"Unexpected newick format {text.strip()[:50]!r}")
+    name = (data.group(1) or "").strip()
+    distance = data.group(2)
+    return name, (
+        DEFAULT_BRANCH_LENGTH if not distance else float(distance[1:].strip())
+    )
 
 
-def newick_record_batch(
-    newick: str,
-    tree_index: int,
-    interval_left: float,
-    interval_right: float,
-    sample_ids: dict[str, int],
-) -> tuple[pa.RecordBatch, float, int, int]:
-    tree = Tree(newick, format=1)
-    nodes = list(tree.traverse("postorder"))
-    if not nodes:
-        raise ValueError(f"Tree {tree_index} has no nodes")
-
-    assigned: dict[object, int] = {}
-    internal_offset = 0
-    for node in nodes:
-        if node.is_leaf():
-            name = str(node.name)
-            if name not in sample_ids:
-                if len(sample_ids) >= INTERNAL_NODE_BASE:
-                    raise ValueError("Too many distinct samples for reserved CSR node IDs")
-                sample_ids[name] = len(sample_ids)
-            assigned[node] = sample_ids[name]
-        else:
-            assigned[node] = INTERNAL_NODE_BASE + internal_offset
-            internal_offset += 1
-
-    root_distance: dict[object, float] = {tree: 0.0}
-    for node in tree.traverse("preorder"):
-        if node.up is not None:
-            branch_length = float(node.dist or 0.0)
-            if not np.isfinite(branch_length) or branch_length < 0:
-                raise ValueError(
-                    f"Tree {tree_index} has invalid branch length {branch_length!r}"
-                )
-            root_distance[node] = root_distance[node.up] + branch_length
-    tree_height = max(root_distance.values(), default=0.0)
-
-    x_by_node: dict[object, float] = {}
-    tip_count = 0
-    for node in nodes:
-        if node.is_leaf():
-            x_by_node[node] = float(tip_count)
-            tip_count += 1
+def newick_leaf_names(newick: str) -> list[str]:
+    """Return leaf names in Newick (postorder) order without parsing topology."""
+    body = _newick_body(newick)
+    if not body.startswith("("):
+        return [_node_data(body, _INTERNAL_DATA)[0]]
+    return [
+        _node_data(label, _LEAF_DATA)[0]
+        for label in _LEAF_LABEL.findall(body)
+        if label.strip()
+    ]
+
+
+def tokenize_newick(newick: str) -> NewickArrays:
+    """Parse one Newick tree into preorder parent and branch-length arrays.
+
+    Leaves receive sequential layout positions in postorder and internal nodes
+    the midpoint of their extreme children, as in the legacy ete3 layout.
+    """
+    body = _newick_body(newick)
+    if not body.startswith("("):
+        name, _distance = _node_data(body, _INTERNAL_DATA)
+        return NewickArrays(
+            parent=np.full(1, -1, dtype=np.int32),
+            branch_length=np.full(1, DEFAULT_BRANCH_LENGTH, dtype=np.float64),
+            is_leaf=np.ones(1, dtype=np.bool_),
+            internal_rank=np.full(1, -1, dtype=np.int32),
+            layout_x=np.zeros(1, dtype=np.float64),
+            leaf_names=[name],
+        )
+
+    parent: list[int] = []
+    branch_length: list[float] = []
+    is_leaf: list[bool] = []
+    internal_rank: list[int] = []
+    layout_x: list[float] = []
+    child_min: list[float] = []
+    child_max: list[float] = []
+    leaf_names: list[str] = []
+    stack: list[int] = []
+    closed_internal = 0
+    expect_child = False
+    last_closed = -1
+
+    for token in _NEWICK_TOKEN.findall(body):
+        if token == "(":
+            if (stack and not expect_child) or (not stack and parent):
+                raise ValueError("Broken newick structure")
+            stack.append(len(parent))
+            parent.append(stack[-2] if len(stack) > 1 else -1)
+            branch_length.append(DEFAULT_BRANCH_LENGTH)
+            is_leaf.append(False)
+            internal_rank.append(-1)
+            layout_x.append(0.0)
+            child_min.append(np.inf)
+            child_max.append(-np.inf)
+            expect_child = True
+            last_closed = -1
+            continue
+        if token == "," or token == ")":
+            if expect_child or not stack:
+                raise ValueError("Empty leaf node found")
+            last_closed = -1
+            if token == ",":
+                expect_child = True
+                continue
+            node = stack.pop()
+            internal_rank[node] = closed_internal
+            closed_internal += 1
+            x = (child_min[node] + child_max[node]) / 2.0
+            last_closed = node
+        elif expect_child:
+            if not token.strip():
+                continue
+            node = len(parent)
+            name, distance = _node_data(token, _LEAF_DATA)
+            parent.append(stack[-1])
+            branch_length.append(distance)
+            is_leaf.append(True)
+            internal_rank.append(-1)
+            child_min.append(np.inf)
+            child_max.append(-np.inf)
+            x = float(len(leaf_names))
+            layout_x.append(x)
+            leaf_names.append(name)
+            expect_child = False
+        elif last_closed != -1:
+            _name, branch_length[last_closed] = _node_data(token, _INTERNAL_DATA)
+            last_closed = -1
+            continue
+        elif token.strip():
+            raise ValueError(f"Unexpected newick format {token.strip()[:50]!r}")
         else:
-            child_x = [x_by_node[child] for child in node.children]
-            x_by_node[node] = (min(child_x) + max(child_x)) / 2.0
-    denominator = max(1, tip_count - 1)
-
-    ordered = sorted(nodes, key=assigned.__getitem__)
-    node_ids = np.asarray([assigned[node] for node in ordered], dtype=np.int32)
-    parent_ids = np.asarray(
-        [-1 if node.up is None else assigned[node.up] for node in ordered], dtype=np.int32
-    )
-    node_heights = np.asarray(
-        [tree_height - root_distance[node] for node in ordered], dtype=np.float64
+            continue
+        layout_x[node] = x
+        parent_node = parent[node]
+        if parent_node != -1:
+            if x < child_min[parent_node]:
+                child_min[parent_node] = x
+            if x > child_max[parent_node]:
+                child_max[parent_node] = x
+    if stack or not parent:
+        raise ValueError("Broken newick structure")
+    return NewickArrays(
+        parent=np.asarray(parent, dtype=np.int32),
+        branch_length=np.asarray(branch_length, dtype=np.float64),
+        is_leaf=np.asarray(is_leaf, dtype=np.bool_),
+        internal_rank=np.asarray(internal_rank, dtype=np.int32),
+        layout_x=np.asarray(layout_x, dtype=np.float64),
+        leaf_names=leaf_names,
     )
-    node_flags = np.asarray([1 if node.is_leaf() else 0 for node in ordered], dtype=np.uint32)
-    layout_x = np.asarray([x_by_node[node] / denominator for node in ordered], dtype=np.float32)
-
-    local_by_id = {int(node_id): offset for offset, node_id in enumerate(node_ids)}
-    children: list[list[int]] = [[] for _ in ordered]
-    for node_id, parent_id in zip(node_ids, parent_ids):
-        if int(parent_id) != -1:
-            children[local_by_id[int(parent_id)]].append(int(node_id))
-    child_offsets = np.zeros(len(ordered) + 1, dtype=np.int32)
-    child_node_ids_list: list[int] = []
-    for offset, child_ids in enumerate(children):
-        child_node_ids_list.extend(child_ids)
-        child_offsets[offset + 1] = len(child_node_ids_list)
-    child_node_ids = np.asarray(child_node_ids_list, dtype=np.int32)
 
+
+def _genealogy_batch(
+    tree_index: int,
+    interval_left: float,
+    interval_right: float,
+    node_ids: np.ndarray,
+    parent_ids: np.ndarray,
+    child_offsets: np.ndarray,
+    child_node_ids: np.ndarray,
+    node_heights: np.ndarray,
+    node_flags: np.ndarray,
+    layout_x: np.ndarray,
+) -> pa.RecordBatch:
     arrays = [
         pa.array([tree_index], type=pa.int64()),
         pa.array([interval_left], type=pa.float64()),
@@ -213,12 +332,130 @@ def newick_record_batch(
         _list_array(layout_x, pa.float32()),
         pa.array([[]], type=pa.list_(MUTATION_TYPE)),
     ]
-    return (
-        pa.RecordBatch.from_arrays(arrays, schema=GENEALOGY_SCHEMA),
-        tree_height,
-        len(nodes),
-        len(nodes) - 1,
+    return pa.RecordBatch.from_arrays(arrays, schema=GENEALOGY_SCHEMA)
+
+
+@functools.lru_cache(maxsize=4096)
+def record_nbytes(num_nodes: int) -> int:
+    """Return ``RecordBatch.nbytes`` of a genealogy with ``num_nodes`` nodes.
+
+    Every column length is fixed by the node count, so shard boundaries can be
+    planned from the Newick text before any tree is parsed.
+    """
+    node_ints = np.zeros(num_nodes, dtype=np.int32)
+    return int(
+        _genealogy_batch(
+            0,
+            0.0,
+            0.0,
+            node_ints,
+            node_ints,
+            np.zeros(num_nodes + 1, dtype=np.int32),
+            np.zeros(max(0, num_nodes - 1), dtype=np.int32),
+            np.zeros(num_nodes, dtype=np.float64),
+            np.zeros(num_nodes, dtype=np.uint32),
+            np.zeros(num_nodes, dtype=np.float32),
+        ).nbytes
+    )
+
+
+def newick_record_batch(
+    newick: str,
+    tree_index: int,
+    interval_left: float,
+    interval_right: float,
+    sample_ids: dict[str, int],
+) -> tuple[pa.RecordBatch, float, int, int]:
+    try:
+        tree = tokenize_newick(newick)
+    except ValueError as error:
+        raise ValueError(f"Tree {tree_index}: {error}") from error
+    num_nodes = len(tree.parent)
+
+    node_ids = np.empty(num_nodes, dtype=np.int32)
+    node_ids[~tree.is_leaf] = INTERNAL_NODE_BASE + tree.internal_rank[~tree.is_leaf]
+    leaf_ids = []
+    for name in tree.leaf_names:
+        if name not in sample_ids:
+            if len(sample_ids) >= INTERNAL_NODE_BASE:
+                raise ValueError("Too many distinct samples for reserved CSR node IDs")
+            sample_ids[name] = len(sample_ids)
+        leaf_ids.append(sample_ids[name])
+    node_ids[tree.is_leaf] = leaf_ids
+
+    root_distance = [0.0] * num_nodes
+    parents = tree.parent.tolist()
+    branch_lengths = tree.branch_length.tolist()
+    # Nodes are in preorder, so every parent distance is final before use.
+    for node in range(1, num_nodes):
+        branch_length = branch_lengths[node]
+        if not np.isfinite(branch_length) or branch_length < 0:
+            raise ValueError(
+                f"Tree {tree_index} has invalid branch length {branch_length!r}"
+            )
+        root_distance[node] = root_distance[parents[node]] + branch_length
+    tree_height = max(root_distance, default=0.0)
+    denominator = max(1, len(tree.leaf_names) - 1)
+
+    parent_ids = np.full(num_nodes, -1, dtype=np.int32)
+    has_parent = tree.parent != -1
+    parent_ids[has_parent] = node_ids[tree.parent[has_parent]]
+    ordered = np.argsort(node_ids, kind="stable")
+    node_ids = node_ids[ordered]
+    parent_ids = parent_ids[ordered]
+    child_offsets, ordered_child_local = _child_csr(
+        node_ids,
+        parent_ids,
+        tree_index=tree_index,
+    )
+    record = _genealogy_batch(
+        tree_index,
+        interval_left,
+        interval_right,
+        node_ids,
+        parent_ids,
+        child_offsets,
+        node_ids[ordered_child_local].astype(np.int32, copy=True),
+        tree_height - np.asarray(root_distance, dtype=np.float64)[ordered],
+        tree.is_leaf[ordered].astype(np.uint32),
+        (tree.layout_x[ordered] / denominator).astype(np.float32),
     )
+    return record, tree_height, num_nodes, num_nodes - 1
+
+
+def _build_shard(task: dict[str, object]) -> dict[str, object]:
+    """Parse and write one planned shard; shard files are named by shard ID."""
+    sample_ids = dict(task["sample_ids"])
+    records = []
+    max_branch_height = 0.0
+    total_nodes = 0
+    total_edges = 0
+    first_tree = int(task["first_tree"])
+    for offset, (newick, (left, right)) in enumerate(
+        zip(task["newicks"], task["intervals"])
+    ):
+        record, height, node_count, edge_count = newick_record_batch(
+            newick,
+            first_tree + offset,
+            left,
+            right,
+            sample_ids,
+        )
+        records.append(record)
+        max_branch_height = max(max_branch_height, height)
+        total_nodes += node_count
+        total_edges += edge_count
+    return {
+        "shard": _write_shard(
+            Path(str(task["staging"])),
+            int(task["shard_id"]),
+            records,
+            str(task["compression"]),
+        ),
+        "max_branch_height": max_branch_height,
+        "num_nodes": total_nodes,
+        "num_edges": total_edges,
+    }
 
 
 def write_shard_index(path: Path, shards: list[dict[str, object]]) -> None:
@@ -240,6 +477,7 @@ def build_chromosome(
     trees_path: Path | None = None,
     positions_path: Path | None = None,
     dataset_name: str = "avian",
+    workers: int = 1,
 ) -> dict[str, object]:
     if trees_path is None or positions_path is None:
         trees_path, positions_path = source_paths(input_directory, chromosome)
@@ -266,55 +504,124 @@ def build_chromosome(
     staging.mkdir(parents=True)
     started = time.perf_counter()
     sample_ids: dict[str, int] = {}
-    pending: list[pa.RecordBatch] = []
+    pending: list[tuple[str, tuple[float, float]]] = []
+    pending_names: set[str] = set()
     pending_bytes = 0
-    shards: list[dict[str, object]] = []
-    max_branch_height = 0.0
-    total_nodes = 0
-    total_edges = 0
+    shard_results: dict[int, dict[str, object]] = {}
+    planned_shards = 0
+    trees_written = 0
     target_bytes = target_shard_mb * 1024 * 1024
+    executor = None
+    in_flight: dict[object, int] = {}
+
+    def record(shard_id: int, result: dict[str, object]) -> None:
+        nonlocal trees_written
+        shard_results[shard_id] = result
+        trees_written += int(result["shard"]["last_tree_exclusive"]) - int(
+            result["shard"]["first_tree"]
+        )
+        print(
+            json.dumps(
+                {
+                    "chromosome": chromosome,
+                    "shards_written": len(shard_results),
+                    "trees_processed": trees_written,
+                }
+            ),
+            file=sys.stderr,
+            flush=True,
+        )
 
-    def flush() -> None:
-        nonlocal pending, pending_bytes
-        if pending:
-            shards.append(_write_shard(staging, len(shards), pending, compression))
-            pending = []
-            pending_bytes = 0
+    def collect(future) -> None:
+        record(in_flight.pop(future), future.result())
+
+    def flush(first_tree: int) -> None:
+        # Shard boundaries depend only on per-tree node counts, so planning them
+        # here keeps every shard identical to a serial build.
+        nonlocal pending, pending_names, pending_bytes, planned_shards
+        if not pending:
+            return
+        task = {
+            "staging": str(staging),
+            "shard_id": planned_shards,
+            "compression": compression,
+            "first_tree": first_tree,
+            "newicks": [newick for newick, _interval in pending],
+            "intervals": [interval for _newick, interval in pending],
+            "sample_ids": {name: sample_ids[name] for name in pending_names},
+        }
+        planned_shards += 1
+        pending = []
+        pending_names = set()
+        pending_bytes = 0
+        if executor is None:
+            record(int(task["shard_id"]), _build_shard(task))
+            return
+        while len(in_flight) >= 2 * workers:
+            done, _not_done = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                collect(future)
+        in_flight[executor.submit(_build_shard, task)] = task["shard_id"]
 
     try:
+        if workers > 1:
+            executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context(
+                    _parallel_start_method(workers)
+                ),
+            )
         seen_trees = 0
         for tree_index, newick in newick_rows(trees_path):
             if tree_index >= expected_trees:
                 if limit is not None:
                     break
                 raise ValueError(f"{trees_path} has more trees than {positions_path} has positions")
-            record, height, node_count, edge_count = newick_record_batch(
-                newick,
-                tree_index,
-                float(breakpoints[tree_index]),
-                float(breakpoints[tree_index + 1]),
-                sample_ids,
+            try:
+                leaf_names = newick_leaf_names(newick)
+            except ValueError as error:
+                raise ValueError(f"Tree {tree_index}: {error}") from error
+            for name in leaf_names:
+                if name not in sample_ids:
+                    if len(sample_ids) >= INTERNAL_NODE_BASE:
+                        raise ValueError("Too many distinct samples for reserved CSR node IDs")
+                    sample_ids[name] = len(sample_ids)
+            node_count = newick.count("(") + newick.count(",") + 1
+            record_bytes = record_nbytes(node_count)
+            if pending and pending_bytes + record_bytes > target_bytes:
+                flush(tree_index - len(pending))
+            pending.append(
+                (
+                    newick,
+                    (
+                        float(breakpoints[tree_index]),
+                        float(breakpoints[tree_index + 1]),
+                    ),
+                )
             )
-            if pending and pending_bytes + record.nbytes > target_bytes:
-                flush()
-            pending.append(record)
-            pending_bytes += record.nbytes
-            max_branch_height = max(max_branch_height, height)
-            total_nodes += node_count
-            total_edges += edge_count
+            pending_names.update(leaf_names)
+            pending_bytes += record_bytes
             seen_trees += 1
-            if seen_trees % 500 == 0:
-                print(
-                    json.dumps({"chromosome": chromosome, "trees_processed": seen_trees}),
-                    file=sys.stderr,
-                    flush=True,
-                )
         if seen_trees != expected_trees:
             raise ValueError(
                 f"Row mismatch for {chromosome}: {seen_trees} trees and "
                 f"{expected_trees} positions"
             )
-        flush()
+        flush(seen_trees - len(pending))
+        while in_flight:
+            done, _not_done = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                collect(future)
+        if executor is not None:
+            executor.shutdown(wait=True)
+            executor = None
+        shards = [shard_results[shard_id]["shard"] for shard_id in range(planned_shards)]
+        max_branch_height = max(
+            (float(result["max_branch_height"]) for result in shard_results.values()),
+            default=0.0,
+        )
+        total_nodes = sum(int(result["num_nodes"]) for result in shard_results.values())
+        total_edges = sum(int(result["num_edges"]) for result in shard_results.values())
 
         breakpoints_path = staging / "breakpoints.npy"
         np.save(breakpoints_path, breakpoints, allow_pickle=False)
@@ -407,7 +714,9 @@ def build_chromosome(
             "num_samples": len(sample_ids),
             "max_branch_height": max_branch_height,
         }
-    except Exception:
+    except BaseException:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
         shutil.rmtree(staging, ignore_errors=True)
         raise
 
@@ -425,6 +734,12 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--final-window-bp", type=int, default=10_000)
     parser.add_argument("--target-shard-mb", type=int, default=DEFAULT_TARGET_SHARD_MB)
     parser.add_argument("--compression", choices=("zstd", "lz4", "none"), default="zstd")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes that parse and write shards in parallel",
+    )
     parser.add_argument("--force", action="store_true")
     parser.add_argument("--limit", type=int, help="Smoke-test only: at most N trees per chromosome")
     parser.add_argument("--verify", action="store_true")
@@ -435,6 +750,8 @@ def main() -> int:
     args = parse_args()
     if args.final_window_bp < 1 or args.target_shard_mb < 1:
         raise SystemExit("--final-window-bp and --target-shard-mb must be positive")
+    if args.workers < 1:
+        raise SystemExit("--workers must be positive")
     if args.limit is not None and args.limit < 1:
         raise SystemExit("--limit must be positive")
     default_directory = (
@@ -471,6 +788,7 @@ def main() -> int:
             trees_path=trees_override,
             positions_path=positions_override,
             dataset_name=args.dataset,
+            workers=args.workers,
         )
         if args.verify:
             from lorax.artifacts.csr_reader import CSRArtifactReader